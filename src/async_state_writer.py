@@ -3,13 +3,15 @@ Async write-behind queue for packing state files.
 
 Eliminates UI freezes caused by synchronous writes to a slow network share.
 The latest state is always kept in a single pending slot — never accumulates stale writes.
+An optional append channel carries journal lines, which are never coalesced.
 """
 
 import copy
 import threading
-from typing import Callable, Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional
 
 from logger import get_logger
+from fs_instrumentation import fs_operation
 
 logger = get_logger(__name__)
 
@@ -22,12 +24,17 @@ class AsyncStateWriter:
     - schedule(state_dict): non-blocking, replaces any pending write
     - flush(): blocking, waits until the background thread has finished writing
     - shutdown(): flush then stop daemon thread
+    - append(line): non-blocking, queues a journal line (requires append_fn);
+      unlike schedule(), every appended line is written, in order, and all
+      lines queued before a schedule() are written before that state
 
     Concurrency model:
     - schedule() and flush() must only be called from the main/UI thread
     - Background daemon thread calls the write_fn
     - Incoming state_dict is deep-copied on schedule() so the caller can freely
-      mutate its in-memory state immediately after scheduling
+      mutate its in-memory state immediately after scheduling, unless the caller
+      passes copy_state=False for a snapshot it already detached (see
+      state_snapshot — PackerLogic does this to keep the UI-thread cost flat)
 
     sync_mode=True skips the background thread and writes synchronously;
     useful for unit tests that assert file content after each call.
@@ -37,8 +44,10 @@ class AsyncStateWriter:
         self,
         write_fn: Callable[[Dict[str, Any]], None],
         sync_mode: bool = False,
+        append_fn: Optional[Callable[[List[str]], None]] = None,
     ) -> None:
         self._write_fn = write_fn
+        self._append_fn = append_fn
         self._sync_mode = sync_mode
 
         if sync_mode:
@@ -46,6 +55,7 @@ class AsyncStateWriter:
 
         self._condition = threading.Condition()
         self._pending: Optional[Dict[str, Any]] = None
+        self._pending_lines: List[str] = []
         self._is_writing: bool = False  # True while write_fn is executing
         self._stop = False
         self._thread = threading.Thread(
@@ -57,7 +67,7 @@ class AsyncStateWriter:
     # Public API
     # ------------------------------------------------------------------
 
-    def schedule(self, state_dict: Dict[str, Any]) -> None:
+    def schedule(self, state_dict: Dict[str, Any], copy_state: bool = True) -> None:
         """
         Non-blocking: schedule state_dict for writing.
 
@@ -66,16 +76,36 @@ class AsyncStateWriter:
 
         A deep copy of state_dict is made immediately so the caller is free to
         continue mutating its in-memory state without risking torn writes.
+        Pass copy_state=False only if nothing reachable from state_dict is
+        mutated after this call.
         """
         if self._sync_mode:
             self._write_fn(state_dict)
             return
 
-        snapshot = copy.deepcopy(state_dict)
+        snapshot = copy.deepcopy(state_dict) if copy_state else state_dict
         with self._condition:
             self._pending = snapshot
             self._condition.notify()
 
+    def append(self, line: str) -> None:
+        """
+        Non-blocking: queue one pre-encoded journal line for append_fn.
+
+        Lines are batched but never dropped or reordered. They are written
+        before any state scheduled after them.
+        """
+        if self._append_fn is None:
+            raise RuntimeError("AsyncStateWriter.append() requires append_fn")
+
+        if self._sync_mode:
+            self._append_fn([line])
+            return
+
+        with self._condition:
+            self._pending_lines.append(line)
+            self._condition.notify()
+
     def flush(self) -> None:
         """
         Blocking: wait until no pending write remains AND the current write (if
@@ -89,7 +119,7 @@ class AsyncStateWriter:
             return  # Already written synchronously
 
         with self._condition:
-            while self._pending is not None or self._is_writing:
+            while self._pending is not None or self._pending_lines or self._is_writing:
                 self._condition.wait()
 
     def shutdown(self) -> None:
@@ -115,19 +145,30 @@ class AsyncStateWriter:
         while True:
             with self._condition:
                 # Wait until there is work to do or we should stop
-                while self._pending is None and not self._stop:
+                while self._pending is None and not self._pending_lines and not self._stop:
                     self._condition.wait()
 
-                if self._stop and self._pending is None:
+                if self._stop and self._pending is None and not self._pending_lines:
                     break
 
                 state = self._pending
+                lines = self._pending_lines
                 self._pending = None      # Claim the work
+                self._pending_lines = []
                 self._is_writing = True   # Signal that a write is in progress
 
-            # Perform the write outside the lock so schedule() is never blocked
+            # Perform the write outside the lock so schedule() is never blocked.
+            # Journal lines go first: they were queued before (or together with)
+            # the claimed state, whose snapshot covers them.
             try:
-                self._write_fn(state)
+                with fs_operation("persist packing state"):
+                    try:
+                        if lines:
+                            self._append_fn(lines)
+                    except Exception:
+                        logger.exception("AsyncStateWriter: journal append failed")
+                    if state is not None:
+                        self._write_fn(state)
             except Exception:
                 logger.exception("AsyncStateWriter: write failed")
             finally:
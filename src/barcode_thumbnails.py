@@ -0,0 +1,151 @@
+"""
+Background loading and local caching of barcode label thumbnails.
+
+Barcode PNGs are generated at printer resolution and live in the session's
+barcodes folder on the file server. PrintDialog used to read and scale every
+one of them on the UI thread before showing anything, which for a 2,000-order
+session meant minutes of SMB reads.
+
+ThumbnailLoader decodes labels on a small thread pool, only when the preview
+grid asks for them (i.e. when they scroll into view), and reports each one
+with the loaded signal. Scaled thumbnails are kept in a local on-disk cache
+keyed by the label's path, mtime and size, so reopening the dialog reads a
+few kilobytes from the local disk instead of the full label from the server:
+
+    ~/.packers_assistant/cache/thumbnails/<sha1(path|mtime_ns|size|width)>.png
+
+A regenerated label has a new mtime and therefore a new key; stale entries
+are never read again. Decoding uses QImage, which (unlike QPixmap) may be
+used outside the GUI thread.
+"""
+
+import hashlib
+import itertools
+import os
+from pathlib import Path
+from typing import Optional, Set
+
+from PySide6.QtCore import QObject, QThreadPool, Qt, Signal
+from PySide6.QtGui import QImage
+
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+THUMBNAIL_WIDTH = 250
+
+# Parallel label reads; the file server, not the CPU, is the bottleneck
+MAX_LOADER_THREADS = 4
+
+
+def default_cache_dir() -> Path:
+    return Path(os.path.expanduser("~")) / ".packers_assistant" / "cache" / "thumbnails"
+
+
+class ThumbnailCache:
+    """
+    Scaled label images on the local disk, keyed by source path + mtime + size.
+
+    Attributes:
+        cache_dir (Path): Directory holding the cached thumbnails.
+        width (int): Thumbnail width in pixels.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, width: int = THUMBNAIL_WIDTH):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+        self.width = width
+
+    def cache_path(self, path: str, stat: os.stat_result) -> Path:
+        key = f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}|{self.width}"
+        return self.cache_dir / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.png"
+
+    def load(self, path: str) -> Optional[QImage]:
+        """
+        Thumbnail of a label, from the cache or decoded (and cached) from the source.
+
+        Safe to call from worker threads.
+
+        Returns:
+            The scaled image, or None if the label is missing or unreadable.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        cached = self.cache_path(path, stat)
+        if cached.exists():
+            image = QImage(str(cached))
+            if not image.isNull():
+                return image
+
+        image = QImage(path)
+        if image.isNull():
+            logger.warning(f"Could not decode barcode image: {path}")
+            return None
+        thumbnail = image.scaledToWidth(self.width, Qt.TransformationMode.SmoothTransformation)
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Write under a temporary name so a concurrent reader never sees half a file
+            tmp = cached.with_name(f"{cached.stem}.{os.getpid()}.{id(thumbnail)}.tmp.png")
+            if thumbnail.save(str(tmp), "PNG"):
+                os.replace(tmp, cached)
+        except OSError as e:
+            logger.debug(f"Thumbnail cache write failed for {path}: {e}")
+        return thumbnail
+
+
+class ThumbnailLoader(QObject):
+    """
+    Loads thumbnails on a thread pool; the most recently requested ones first.
+
+    Signals:
+        loaded (str, QImage): Source path and its thumbnail (a null QImage if
+                              the label could not be loaded). Delivered on the
+                              thread the loader lives in.
+    """
+
+    loaded = Signal(str, QImage)
+
+    def __init__(self, cache: Optional[ThumbnailCache] = None, parent: QObject = None,
+                 max_threads: int = MAX_LOADER_THREADS):
+        super().__init__(parent)
+        self.cache = cache if cache is not None else ThumbnailCache()
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max_threads)
+        self._pending: Set[str] = set()
+        # Later requests get a higher priority: while scrolling, the labels now
+        # on screen are loaded before the ones scrolled past
+        self._priority = itertools.count()
+        self.loaded.connect(self._on_loaded)
+
+    def request(self, path: str) -> None:
+        """Queue a label for loading (no-op if it is already queued)."""
+        if path in self._pending:
+            return
+        self._pending.add(path)
+        self._pool.start(lambda: self._load(path), min(next(self._priority), 2**31 - 1))
+
+    def is_pending(self, path: str) -> bool:
+        return path in self._pending
+
+    def _load(self, path: str) -> None:
+        try:
+            image = self.cache.load(path)
+        except Exception as e:
+            logger.error(f"Thumbnail load failed for {path}: {e}", exc_info=True)
+            image = None
+        self.loaded.emit(path, image if image is not None else QImage())
+
+    def _on_loaded(self, path: str, _image: QImage) -> None:
+        self._pending.discard(path)
+
+    def wait(self, msecs: int = -1) -> bool:
+        """Block until queued loads are done (tests, or before shutdown)."""
+        return self._pool.waitForDone(msecs)
+
+    def shutdown(self) -> None:
+        """Drop queued loads and wait for the ones already reading."""
+        self._pool.clear()
+        self._pool.waitForDone()
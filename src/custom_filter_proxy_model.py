@@ -1,7 +1,12 @@
+from typing import Any, Optional, Set
+
 from PySide6.QtCore import QSortFilterProxyModel, Qt, QModelIndex
 from PySide6.QtWidgets import QWidget
 import pandas as pd
 
+from order_search_index import OrderSearchIndex
+from session_store import SessionStore
+
 class CustomFilterProxyModel(QSortFilterProxyModel):
     """
     A custom filter proxy model for advanced, multi-column filtering.
@@ -9,12 +14,15 @@ class CustomFilterProxyModel(QSortFilterProxyModel):
     This class extends QSortFilterProxyModel to provide a more sophisticated
     filtering mechanism tailored for the Packer's Assistant application. It
     allows filtering the main order table based on a single search term that is
-    matched against the 'Order_Number', 'Status', and associated 'SKU' values
-    for each order.
+    matched against the 'Order_Number', 'Status', and associated 'SKU' and
+    product name values for each order.
 
     Attributes:
-        _processed_df (pd.DataFrame): A DataFrame containing the detailed order
-                                      information, including SKUs.
+        _session_store (SessionStore): Orders grouped with their SKU lines
+                                       (per-order row ranges, built in one pass).
+        _search_index (OrderSearchIndex): Lowercased per-order search text, built
+                                          on the first search.
+        _matching_orders (Set): Orders matching search_term by SKU / product.
         search_term (str): The current search term used for filtering.
     """
     def __init__(self, parent: QWidget = None):
@@ -25,32 +33,52 @@ class CustomFilterProxyModel(QSortFilterProxyModel):
             parent (QWidget, optional): The parent widget. Defaults to None.
         """
         super().__init__(parent)
-        self._processed_df = None
+        self._session_store = None
+        self._search_index: Optional[OrderSearchIndex] = None
+        self._matching_orders: Set[Any] = set()
         self.search_term = ""
 
+    def set_session_store(self, store: SessionStore):
+        """
+        Sets the session store used for the SKU-based search logic in the filter.
+
+        Args:
+            store (SessionStore): Orders with their lines (see PackerLogic.session_store).
+        """
+        self._session_store = store
+        self._search_index = None
+        self._matching_orders = set()
+
     def set_processed_df(self, df: pd.DataFrame):
         """
         Sets the DataFrame containing detailed order and SKU information.
 
-        This DataFrame is used for the SKU-based search logic in the filter.
+        The rows are grouped by order once (see SessionStore.from_dataframe)
+        instead of masking the whole DataFrame for every filtered row.
 
         Args:
             df (pd.DataFrame): The DataFrame with detailed order data.
         """
-        self._processed_df = df
+        self.set_session_store(SessionStore.from_dataframe(df) if df is not None else None)
 
     def setFilterFixedString(self, text: str):
         """
         Sets the search term and triggers a filter invalidation.
 
         This method overrides the base class method to store the search term
-        in a normalized (lowercase) format and then forces the model to
-        re-evaluate its filter.
+        in a normalized (lowercase) format, looks up the orders whose SKUs or
+        product names match it once in the search index, and then forces the
+        model to re-evaluate its filter.
 
         Args:
             text (str): The search string entered by the user.
         """
         self.search_term = text.lower()
+        self._matching_orders = set()
+        if self.search_term and self._session_store is not None:
+            if self._search_index is None:
+                self._search_index = OrderSearchIndex(self._session_store)
+            self._matching_orders = self._search_index.search(self.search_term)
         self.invalidateFilter()
 
     def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
@@ -60,7 +88,8 @@ class CustomFilterProxyModel(QSortFilterProxyModel):
         This is the core filtering logic. It checks if the search term matches:
         1. The order number for the row.
         2. The status for the row.
-        3. Any of the SKUs associated with the order number for that row.
+        3. Any of the SKUs or product names of the order (a set lookup; the
+           search index was queried once in setFilterFixedString).
 
         Args:
             source_row (int): The row number in the source model.
@@ -94,16 +123,6 @@ class CustomFilterProxyModel(QSortFilterProxyModel):
         if self.search_term in order_number_str or self.search_term in status_str:
             return True
 
-        # 2. Check SKU from the detailed processed_df
-        if self._processed_df is not None:
-            current_order_number = source_model.data(order_number_index, Qt.DisplayRole)
-
-            # This can be slow on very large datasets, but should be acceptable for typical packing lists.
-            # It finds all rows in the detailed df matching the order number.
-            order_items = self._processed_df[self._processed_df['Order_Number'] == current_order_number]
-
-            # It then checks if the search term is present in any of the SKUs for that order.
-            if order_items['SKU'].str.lower().str.contains(self.search_term, na=False).any():
-                return True
-
-        return False
+        # 2. Check the SKUs and product names of the order
+        current_order_number = source_model.data(order_number_index, Qt.DisplayRole)
+        return current_order_number in self._matching_orders
@@ -0,0 +1,317 @@
+"""
+Optional file-system round-trip instrumentation per user action.
+
+Every open/stat/scandir/rename on the file share is an SMB round trip, and it
+is not visible from the code which UI action causes how many of them: a
+single Path.exists() in a loop, a JSON read behind a cache, a lock heartbeat.
+
+When enabled, this module wraps the os / io functions the managers reach the
+file system through (SessionRegistryManager, SessionHistoryManager,
+StatsManager, SessionLockManager, ProfileManager, PackerLogic persistence, and
+the caches beneath them) and attributes each call to the innermost active
+operation scope:
+
+    with fs_operation("end session"):
+        ...                                   # all file-system calls counted
+
+    @fs_operation("scan SKU")                 # or as a decorator
+    def on_scanner_input(self, text): ...
+
+When a scope ends it logs one structured record through the JSON logger:
+
+    {"message": "FS scope 'scan SKU': 3 ops in 12 ms", ...,
+     "extra": {"fs_scope": "scan SKU", "ops": {"open": 1, "stat": 2},
+               "total_ops": 3, "op_ms": {...}, "bytes_read": 0,
+               "bytes_written": 1804, "wall_ms": 12.4}}
+
+so a regression in round-trip counts shows up in the logs. Nested scopes are
+reported separately and also counted in their enclosing scope.
+
+Scopes follow the thread (a ContextVar, like the logging context). A worker
+thread doing I/O for a scope attaches to it explicitly:
+
+    self._fs_scope = current_fs_scope()        # in the worker's __init__
+    with attach_fs_scope(self._fs_scope):      # in run()
+        ...
+
+Counted operations: open (builtins / io.open, Path.open, os.open), stat (os.stat,
+os.lstat, and through them Path.exists()/is_dir() and os.path.*), scandir
+(os.scandir, os.listdir, Path.iterdir), rename (os.rename, os.replace,
+shutil.move), unlink (os.remove, os.unlink) and mkdir. Bytes are the size of
+files opened for reading plus the final size of files opened for writing or
+renamed into place; an approximation that does not cost extra round trips
+while the scope runs.
+
+Disabled (the default), nothing is wrapped and fs_operation() is a no-op.
+Enable with [Logging] FSInstrumentation = true in config.ini.
+"""
+
+import builtins
+import io
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+OP_OPEN = "open"
+OP_STAT = "stat"
+OP_SCANDIR = "scandir"
+OP_RENAME = "rename"
+OP_UNLINK = "unlink"
+OP_MKDIR = "mkdir"
+
+# (module, attribute, counted as) for every wrapped function; os.open covers
+# tempfile (atomic writes), builtins.open of an fd is not a new round trip
+_TARGETS = (
+    (builtins, "open", OP_OPEN),
+    (io, "open", OP_OPEN),
+    (os, "open", OP_OPEN),
+    (os, "stat", OP_STAT),
+    (os, "lstat", OP_STAT),
+    (os, "scandir", OP_SCANDIR),
+    (os, "listdir", OP_SCANDIR),
+    (os, "rename", OP_RENAME),
+    (os, "replace", OP_RENAME),
+    (os, "remove", OP_UNLINK),
+    (os, "unlink", OP_UNLINK),
+    (os, "mkdir", OP_MKDIR),
+)
+
+_current: ContextVar[Optional["FSScope"]] = ContextVar('fs_scope', default=None)
+
+_install_lock = threading.Lock()
+_originals: Dict[tuple, Callable] = {}   # (module name, attribute) -> original
+_enabled = False
+
+# Unwrapped stat, for measuring written files without counting it
+_raw_stat = os.stat
+
+
+class FSScope:
+    """
+    File-system operations counted for one named user action.
+
+    Attributes:
+        name (str): Scope name, e.g. "end session"
+        parent (Optional[FSScope]): Enclosing scope, also credited with every operation
+        ops (Dict[str, int]): Calls per operation (OP_* names)
+        op_seconds (Dict[str, float]): Time spent in each operation
+        bytes_read (int): Size of files opened for reading
+        bytes_written (int): Final size of files opened for writing (set on close)
+        wall_seconds (float): Duration of the scope (set on close)
+    """
+
+    def __init__(self, name: str, parent: Optional["FSScope"] = None):
+        self.name = name
+        self.parent = parent
+        self.ops: Dict[str, int] = {}
+        self.op_seconds: Dict[str, float] = {}
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.wall_seconds = 0.0
+        self._written_paths: List[Any] = []
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+
+    @property
+    def total_ops(self) -> int:
+        return sum(self.ops.values())
+
+    def _record(self, op: str, seconds: float):
+        scope = self
+        while scope is not None:
+            with scope._lock:
+                scope.ops[op] = scope.ops.get(op, 0) + 1
+                scope.op_seconds[op] = scope.op_seconds.get(op, 0.0) + seconds
+            scope = scope.parent
+
+    def _record_read(self, size: int):
+        scope = self
+        while scope is not None:
+            with scope._lock:
+                scope.bytes_read += size
+            scope = scope.parent
+
+    def _record_write(self, path: Any):
+        scope = self
+        while scope is not None:
+            with scope._lock:
+                scope._written_paths.append(path)
+            scope = scope.parent
+
+    def _close(self):
+        self.wall_seconds = time.perf_counter() - self._started
+        with self._lock:
+            written = set(self._written_paths)
+            self._written_paths = []
+        for path in written:
+            try:
+                self.bytes_written += _raw_stat(path).st_size
+            except OSError:
+                pass  # Renamed away (an atomic write's temp file) or deleted
+
+    def summary(self) -> Dict[str, Any]:
+        """Structured record of the scope, as logged when it ends."""
+        with self._lock:
+            return {
+                'fs_scope': self.name,
+                'ops': dict(self.ops),
+                'total_ops': sum(self.ops.values()),
+                'op_ms': {op: round(s * 1000, 2) for op, s in self.op_seconds.items()},
+                'bytes_read': self.bytes_read,
+                'bytes_written': self.bytes_written,
+                'wall_ms': round(self.wall_seconds * 1000, 2),
+            }
+
+
+# ============================================================================
+# Wrappers
+# ============================================================================
+
+def _counting(original: Callable, op: str) -> Callable:
+    """Wrap an os function so calls inside a scope are counted and timed."""
+    def wrapper(*args, **kwargs):
+        scope = _current.get()
+        if scope is None:
+            return original(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            scope._record(op, time.perf_counter() - start)
+            if op == OP_RENAME and len(args) > 1 and not isinstance(args[1], int):
+                # Atomic writes end in a rename: credit the file's final size
+                scope._record_write(os.fspath(args[1]))
+    wrapper.__wrapped__ = original
+    wrapper.__name__ = getattr(original, '__name__', op)
+    wrapper.__doc__ = getattr(original, '__doc__', None)
+    return wrapper
+
+
+def _counting_open(original: Callable) -> Callable:
+    """Like _counting(), also crediting the file's size to bytes read / written."""
+    def wrapper(file, *args, **kwargs):
+        scope = _current.get()
+        if scope is None or isinstance(file, int) or kwargs.get('opener') is not None:
+            # An fd or a custom opener (tempfile) does not open the path here
+            return original(file, *args, **kwargs)
+        start = time.perf_counter()
+        try:
+            f = original(file, *args, **kwargs)
+        finally:
+            scope._record(OP_OPEN, time.perf_counter() - start)
+
+        mode = args[0] if args else kwargs.get('mode', 'r')
+        if any(c in mode for c in 'wax+'):
+            scope._record_write(os.fspath(file))
+        else:
+            try:
+                scope._record_read(os.fstat(f.fileno()).st_size)
+            except (OSError, AttributeError, ValueError):
+                pass
+        return f
+    wrapper.__wrapped__ = original
+    wrapper.__name__ = 'open'
+    wrapper.__doc__ = getattr(original, '__doc__', None)
+    return wrapper
+
+
+# ============================================================================
+# Public API
+# ============================================================================
+
+def enable_fs_instrumentation():
+    """Install the counting wrappers (idempotent)."""
+    global _enabled
+    with _install_lock:
+        if _enabled:
+            return
+        for module, attr, op in _TARGETS:
+            original = getattr(module, attr)
+            _originals[(module.__name__, attr)] = original
+            if op == OP_OPEN and module is not os:
+                setattr(module, attr, _counting_open(original))
+            else:
+                setattr(module, attr, _counting(original, op))
+        _enabled = True
+    logger.info("File-system instrumentation enabled")
+
+
+def disable_fs_instrumentation():
+    """Restore the original functions (idempotent)."""
+    global _enabled
+    with _install_lock:
+        if not _enabled:
+            return
+        for module, attr, _op in _TARGETS:
+            original = _originals.pop((module.__name__, attr), None)
+            if original is not None and getattr(getattr(module, attr), '__wrapped__', None) is original:
+                setattr(module, attr, original)
+        _enabled = False
+
+
+def is_fs_instrumentation_enabled() -> bool:
+    return _enabled
+
+
+def current_fs_scope() -> Optional[FSScope]:
+    """Innermost active scope of this thread (None if none or disabled)."""
+    return _current.get()
+
+
+@contextmanager
+def fs_operation(name: str) -> Iterator[Optional[FSScope]]:
+    """
+    Count the file-system operations of a named user action.
+
+    Usable as a context manager or a decorator. Yields the FSScope, or None
+    when instrumentation is disabled.
+
+    Args:
+        name: Scope name for the summary record, e.g. "open session browser"
+    """
+    if not _enabled:
+        yield None
+        return
+
+    scope = FSScope(name, parent=_current.get())
+    token = _current.set(scope)
+    try:
+        yield scope
+    finally:
+        _current.reset(token)
+        scope._close()
+        summary = scope.summary()
+        # The log file lives on the share too; keep this record's own I/O
+        # out of the enclosing scope
+        quiet = _current.set(None)
+        try:
+            logger.info(
+                f"FS scope '{name}': {summary['total_ops']} ops in {summary['wall_ms']:.0f} ms",
+                extra={'extra_data': summary}
+            )
+        finally:
+            _current.reset(quiet)
+
+
+@contextmanager
+def attach_fs_scope(scope: Optional[FSScope]) -> Iterator[Optional[FSScope]]:
+    """
+    Count this thread's operations in a scope opened on another thread.
+
+    Does not end the scope or log anything; a None scope is a no-op.
+    """
+    if scope is None:
+        yield None
+        return
+    token = _current.set(scope)
+    try:
+        yield scope
+    finally:
+        _current.reset(token)
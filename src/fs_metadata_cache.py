@@ -0,0 +1,378 @@
+"""
+Shared cache of directory listings for existence probes on the file share.
+
+The scanners (session registry, session history, session selector, profile
+manager) probe the file server constantly: "does work_dir/session_summary.json
+exist?", "is there a .session.lock?", "is this entry a directory?". Each
+Path.exists() / is_dir() is a separate SMB round trip, and scanning one
+session directory used to cost four or more of them per packing list.
+
+FSMetadataCache answers those probes from one os.scandir() listing per
+directory:
+
+- A listing stores the names in a directory and whether each is a directory.
+- Scanners run as a scan pass (fs_scan_pass()). Within a pass each listing is
+  revalidated on its first use only; every further probe of the directory in
+  the same pass costs nothing. Each pass starts from a fresh view, so a
+  refresh sees sessions created by other PCs a moment earlier.
+- Outside a pass (single probes from the UI), a listing is used without any
+  I/O for VALIDATE_INTERVAL seconds after it was read or last revalidated.
+- Changes made by this process are seen at once either way: the code that
+  makes them calls invalidate_fs_cache().
+- After the interval, one stat of the directory revalidates the listing. An
+  unchanged directory mtime means no entry was added, removed or renamed, so
+  the listing is still valid; a changed mtime triggers a rescan.
+- A listing read within RACY_WINDOW seconds of the directory's last change is
+  not trusted on an unchanged mtime at revalidation (the change may have
+  landed in the same mtime tick, 2 s on FAT-backed shares), so it is rescanned
+  instead. Busy session directories (lock heartbeats, state writes) therefore
+  cost a stat and a scan once per pass or interval, not once per probe.
+- A directory found missing is remembered as missing for NEGATIVE_TTL
+  seconds, so probes under it (legacy sessions without packing/, sessions
+  without analysis/) cost nothing.
+
+Only names and entry types are cached, never file contents or sizes. Use
+json_cache for contents.
+
+Usage Example:
+    from fs_metadata_cache import fs_exists, fs_is_dir, fs_scan_pass, scan_dir
+
+    @fs_scan_pass()                                 # or: with fs_scan_pass():
+    def scan_sessions(client_dir):
+        for entry in scan_dir(client_dir):          # one listing
+            if entry.is_dir and fs_exists(Path(entry.path) / "session_info.json"):
+                ...
+
+    # After creating or deleting something the scanners look at
+    invalidate_fs_cache(new_dir)
+"""
+
+import itertools
+import os
+import stat as stat_module
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+# Seconds a listing is used without re-checking the directory's mtime
+# (outside a scan pass)
+VALIDATE_INTERVAL = 2.0
+
+# A listing scanned this close to the directory's mtime may have missed a
+# change made in the same mtime tick
+RACY_WINDOW = 2.0
+
+# Seconds a missing directory is remembered as missing
+NEGATIVE_TTL = 5.0
+
+# Listings kept in memory (least recently used are dropped first)
+MAX_DIRECTORIES = 4096
+
+
+class FSEntry(NamedTuple):
+    """One directory entry from a cached listing."""
+    name: str
+    path: str
+    is_dir: bool
+
+
+class _Listing:
+    __slots__ = ("mtime_ns", "entries", "checked_at", "checked_pass", "racy")
+
+    def __init__(self, mtime_ns: int, entries: Dict[str, Tuple[str, bool]],
+                 checked_at: float, checked_pass: Optional[int], scanned_at_ns: int):
+        self.mtime_ns = mtime_ns
+        self.entries = entries  # normcase(name) -> (name, is_dir)
+        self.checked_at = checked_at
+        self.checked_pass = checked_pass  # scan pass that last validated it
+        self.racy = scanned_at_ns - mtime_ns < RACY_WINDOW * 1e9
+
+
+# Scan pass of the current thread / context (None outside a pass)
+_current_pass: ContextVar[Optional[int]] = ContextVar('fs_scan_pass', default=None)
+_pass_ids = itertools.count(1)
+
+
+# Windows shares are case-insensitive; normcase() is a no-op elsewhere
+_normcase = os.path.normcase
+
+
+def _key(path: str) -> str:
+    return _normcase(os.path.abspath(path))
+
+
+class FSMetadataCache:
+    """
+    Directory listings validated by directory mtime, plus negative lookups.
+
+    Thread Safety:
+        Bookkeeping is done under a lock. Directory I/O happens outside it, so
+        the UI thread and scanner threads (RegistryRefreshWorker,
+        SessionScanWorker, ...) can share one instance.
+
+    Attributes:
+        validate_interval (float): Seconds a listing is used without a stat
+            outside a scan pass (0: every such lookup stats the directory)
+        negative_ttl (float): Seconds a missing directory is remembered
+        max_dirs (int): Maximum number of cached listings
+    """
+
+    def __init__(
+        self,
+        validate_interval: float = VALIDATE_INTERVAL,
+        negative_ttl: float = NEGATIVE_TTL,
+        max_dirs: int = MAX_DIRECTORIES
+    ):
+        self.validate_interval = validate_interval
+        self.negative_ttl = negative_ttl
+        self.max_dirs = max_dirs
+        self._listings: "OrderedDict[str, _Listing]" = OrderedDict()
+        self._missing: "OrderedDict[str, float]" = OrderedDict()  # key -> expires at
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._negative_hits = 0
+        self._revalidations = 0
+        self._scans = 0
+        self._evictions = 0
+
+    # ------------------------------------------------------------------ #
+    #  Listings                                                            #
+    # ------------------------------------------------------------------ #
+
+    def _listing(self, dir_path: str) -> Optional[_Listing]:
+        """Listing of a directory, or None if it is missing / not a directory."""
+        key = _key(dir_path)
+        now = time.monotonic()
+        scan_pass = _current_pass.get()
+
+        with self._lock:
+            expires = self._missing.get(key)
+            if expires is not None:
+                if now < expires:
+                    self._negative_hits += 1
+                    return None
+                del self._missing[key]
+
+            listing = self._listings.get(key)
+            if listing is not None and (
+                listing.checked_pass == scan_pass if scan_pass is not None
+                else now - listing.checked_at < self.validate_interval
+            ):
+                self._listings.move_to_end(key)
+                self._hits += 1
+                return listing
+
+        wall_ns = time.time_ns()
+        try:
+            st = os.stat(dir_path)
+            if not stat_module.S_ISDIR(st.st_mode):
+                raise NotADirectoryError(dir_path)
+        except OSError:
+            self._mark_missing(key, now)
+            return None
+
+        with self._lock:
+            listing = self._listings.get(key)
+            if (listing is not None and not listing.racy
+                    and listing.mtime_ns == st.st_mtime_ns):
+                listing.checked_at = now
+                listing.checked_pass = scan_pass
+                self._listings.move_to_end(key)
+                self._revalidations += 1
+                return listing
+
+        # Stat first, then scan: an entry added during the scan changes the
+        # mtime again, so the listing is rescanned on its next revalidation
+        entries: Dict[str, Tuple[str, bool]] = {}
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    entries[_normcase(entry.name)] = (entry.name, is_dir)
+        except OSError:
+            self._mark_missing(key, now)
+            return None
+
+        listing = _Listing(st.st_mtime_ns, entries, now, scan_pass, wall_ns)
+        with self._lock:
+            self._listings[key] = listing
+            self._listings.move_to_end(key)
+            self._scans += 1
+            while len(self._listings) > self.max_dirs:
+                self._listings.popitem(last=False)
+                self._evictions += 1
+        return listing
+
+    def _mark_missing(self, key: str, now: float):
+        with self._lock:
+            self._listings.pop(key, None)
+            self._missing[key] = now + self.negative_ttl
+            self._missing.move_to_end(key)
+            while len(self._missing) > self.max_dirs:
+                self._missing.popitem(last=False)
+
+    def scan_dir(self, dir_path: PathLike) -> List[FSEntry]:
+        """
+        Entries of a directory (empty if it is missing).
+
+        Equivalent to os.scandir() / Path.iterdir(), without a round trip when
+        the directory was listed recently.
+        """
+        dir_path = os.fspath(dir_path)
+        listing = self._listing(dir_path)
+        if listing is None:
+            return []
+        return [
+            FSEntry(name, os.path.join(dir_path, name), is_dir)
+            for name, is_dir in listing.entries.values()
+        ]
+
+    # ------------------------------------------------------------------ #
+    #  Probes                                                              #
+    # ------------------------------------------------------------------ #
+
+    def _lookup(self, path: PathLike) -> Optional[Tuple[str, bool]]:
+        """(name, is_dir) of path from its parent's listing, or None if absent."""
+        path = os.fspath(path)
+        parent, name = os.path.split(os.path.abspath(path))
+        if not name:
+            # Filesystem root: nothing to list it from
+            return (path, True) if os.path.isdir(path) else None
+        listing = self._listing(parent)
+        if listing is None:
+            return None
+        return listing.entries.get(_normcase(name))
+
+    def exists(self, path: PathLike) -> bool:
+        return self._lookup(path) is not None
+
+    def is_dir(self, path: PathLike) -> bool:
+        found = self._lookup(path)
+        return found is not None and found[1]
+
+    def is_file(self, path: PathLike) -> bool:
+        found = self._lookup(path)
+        return found is not None and not found[1]
+
+    # ------------------------------------------------------------------ #
+    #  Maintenance                                                         #
+    # ------------------------------------------------------------------ #
+
+    def invalidate(self, path: PathLike):
+        """
+        Forget what is cached about a path and its parent directory.
+
+        Call after creating, deleting or renaming something that a scanner
+        probes, so this process sees the change immediately.
+        """
+        path = os.path.abspath(os.fspath(path))
+        keys = {_key(path), _key(os.path.dirname(path))}
+        with self._lock:
+            for key in keys:
+                self._listings.pop(key, None)
+                self._missing.pop(key, None)
+
+    def clear(self):
+        """Drop all listings and negative entries and reset the counters."""
+        with self._lock:
+            self._listings.clear()
+            self._missing.clear()
+            self._hits = self._negative_hits = self._revalidations = 0
+            self._scans = self._evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Cache statistics for monitoring and debugging.
+
+        Returns:
+            Dictionary with 'directories' (cached listings), 'missing'
+            (remembered missing directories), 'hits' (answered with no I/O),
+            'negative_hits', 'revalidations' (one stat, listing unchanged),
+            'scans' (directory listings read) and 'evictions'.
+        """
+        with self._lock:
+            return {
+                'directories': len(self._listings),
+                'missing': len(self._missing),
+                'hits': self._hits,
+                'negative_hits': self._negative_hits,
+                'revalidations': self._revalidations,
+                'scans': self._scans,
+                'evictions': self._evictions,
+            }
+
+
+# ============================================================================
+# GLOBAL CACHE INSTANCE
+# ============================================================================
+# Shared by all scanners so a directory listed by one is reused by the others
+
+_fs_cache = FSMetadataCache()
+
+
+@contextmanager
+def fs_scan_pass() -> Iterator[int]:
+    """
+    Run probes as one scan pass (also usable as a decorator).
+
+    Each cached listing is revalidated on its first use in the pass and
+    trusted for the rest of it. Nested passes join the enclosing one.
+    Applies to every FSMetadataCache, not only the shared one.
+    """
+    current = _current_pass.get()
+    if current is not None:
+        yield current
+        return
+    token = _current_pass.set(next(_pass_ids))
+    try:
+        yield _current_pass.get()
+    finally:
+        _current_pass.reset(token)
+
+
+def scan_dir(dir_path: PathLike) -> List[FSEntry]:
+    """Entries of a directory from the shared cache (empty if missing)."""
+    return _fs_cache.scan_dir(dir_path)
+
+
+def fs_exists(path: PathLike) -> bool:
+    """Path.exists() answered from the parent directory's cached listing."""
+    return _fs_cache.exists(path)
+
+
+def fs_is_dir(path: PathLike) -> bool:
+    """Path.is_dir() answered from the parent directory's cached listing."""
+    return _fs_cache.is_dir(path)
+
+
+def fs_is_file(path: PathLike) -> bool:
+    """Path.is_file() answered from the parent directory's cached listing."""
+    return _fs_cache.is_file(path)
+
+
+def invalidate_fs_cache(path: PathLike):
+    """Forget cached listings of a path and its parent (after a change)."""
+    _fs_cache.invalidate(path)
+
+
+def clear_fs_cache():
+    """Drop everything from the shared cache (tests, forced refresh)."""
+    _fs_cache.clear()
+
+
+def get_fs_cache_stats() -> Dict[str, Any]:
+    """Statistics of the shared cache (see FSMetadataCache.stats())."""
+    return _fs_cache.stats()
@@ -0,0 +1,173 @@
+"""
+Painted action buttons for the Actions column of Packer Mode's items table.
+
+PackerModeWidget used to put a QWidget with a QHBoxLayout and three or four
+QPushButtons into every row (setCellWidget). Opening a 300-line order created
+over a thousand widgets, and every one of them was laid out and styled even
+when scrolled out of view.
+
+ItemActionsDelegate draws the same buttons with the current style, only for
+the rows being painted, and hit-tests mouse clicks itself. The per-row state
+is kept on the Actions cell's item under the roles below; changing it (e.g.
+COMPLETE_ROLE when an item is packed) repaints just that cell.
+
+Buttons, left to right (same as the previous widgets):
+  Confirm — confirm one unit manually; disabled once the item is complete
+  Undo    — undo the last scan for this item
+  Force   — force-confirm all remaining quantity; enabled only for qty > 5
+  Map     — add a barcode mapping; shown only when the SKU has none
+"""
+
+from typing import List, Optional, Tuple
+
+from PySide6.QtCore import QEvent, QPoint, QRect, QSize, Qt, Signal
+from PySide6.QtWidgets import (
+    QApplication, QStyle, QStyledItemDelegate, QStyleOptionButton, QToolTip,
+)
+
+ACTION_CONFIRM = "confirm"
+ACTION_UNDO = "undo"
+ACTION_FORCE = "force"
+ACTION_MAP = "map"
+
+# Item data roles of the Actions cell
+SKU_ROLE = Qt.UserRole + 1        # str: original SKU of the row
+REQUIRED_ROLE = Qt.UserRole + 2   # int: required quantity
+COMPLETE_ROLE = Qt.UserRole + 3   # bool: row fully packed
+MAPPED_ROLE = Qt.UserRole + 4     # bool: SKU already has a barcode mapping
+
+# Force confirm is only offered above this quantity
+FORCE_MIN_QTY = 6
+
+_TOOLTIPS = {
+    ACTION_CONFIRM: "Confirm Manually",
+    ACTION_UNDO: "Undo last scan for this item",
+    ACTION_FORCE: "Force confirm all remaining quantity (qty > 5 only)",
+    ACTION_MAP: "Add barcode mapping for this SKU",
+}
+_WIDTHS = {ACTION_CONFIRM: 28, ACTION_UNDO: 28, ACTION_FORCE: 28, ACTION_MAP: 40}
+_MARGIN_X, _MARGIN_Y, _SPACING = 2, 1, 3
+_ICON_SIZE = QSize(16, 16)
+
+
+class ItemActionsDelegate(QStyledItemDelegate):
+    """
+    Draws the row's action buttons and emits action_triggered(row, action) on click.
+
+    Attributes:
+        action_triggered (Signal[int, str]): Row and ACTION_* of a clicked, enabled button.
+    """
+
+    action_triggered = Signal(int, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        style = QApplication.instance().style()
+        self._icons = {
+            ACTION_CONFIRM: style.standardIcon(QStyle.StandardPixmap.SP_DialogApplyButton),
+            ACTION_UNDO: style.standardIcon(QStyle.StandardPixmap.SP_ArrowLeft),
+            ACTION_FORCE: style.standardIcon(QStyle.StandardPixmap.SP_MediaSkipForward),
+        }
+        # (row, action) under a mouse press, drawn sunken until release
+        self._pressed: Optional[Tuple[int, str]] = None
+
+    @staticmethod
+    def actions(index) -> List[Tuple[str, bool]]:
+        """(action, enabled) of the buttons shown for a row, left to right."""
+        complete = bool(index.data(COMPLETE_ROLE))
+        required = index.data(REQUIRED_ROLE) or 1
+        buttons = [
+            (ACTION_CONFIRM, not complete),
+            (ACTION_UNDO, True),
+            (ACTION_FORCE, required >= FORCE_MIN_QTY and not complete),
+        ]
+        if not index.data(MAPPED_ROLE):
+            buttons.append((ACTION_MAP, True))
+        return buttons
+
+    @staticmethod
+    def tooltip(action: str) -> str:
+        return _TOOLTIPS[action]
+
+    def button_rects(self, rect: QRect, index) -> List[Tuple[str, bool, QRect]]:
+        """(action, enabled, rect) of each button within the cell rect."""
+        x = rect.left() + _MARGIN_X
+        height = rect.height() - 2 * _MARGIN_Y
+        result = []
+        for action, enabled in self.actions(index):
+            width = _WIDTHS[action]
+            result.append((action, enabled, QRect(x, rect.top() + _MARGIN_Y, width, height)))
+            x += width + _SPACING
+        return result
+
+    @staticmethod
+    def _repaint(option) -> None:
+        widget = option.widget
+        if widget is not None:
+            # Item rects are in viewport coordinates
+            viewport = widget.viewport() if hasattr(widget, 'viewport') else widget
+            viewport.update(option.rect)
+
+    def _hit(self, rect: QRect, index, pos: QPoint) -> Optional[Tuple[str, bool]]:
+        for action, enabled, button_rect in self.button_rects(rect, index):
+            if button_rect.contains(pos):
+                return action, enabled
+        return None
+
+    # ------------------------------------------------------------------
+    # QStyledItemDelegate
+    # ------------------------------------------------------------------
+
+    def paint(self, painter, option, index):
+        widget = option.widget
+        style = widget.style() if widget is not None else QApplication.instance().style()
+        style.drawPrimitive(QStyle.PrimitiveElement.PE_PanelItemViewItem, option, painter, widget)
+
+        for action, enabled, rect in self.button_rects(option.rect, index):
+            button = QStyleOptionButton()
+            button.rect = rect
+            button.state = QStyle.StateFlag.State_Raised
+            if enabled:
+                button.state |= QStyle.StateFlag.State_Enabled
+                if self._pressed == (index.row(), action):
+                    button.state |= QStyle.StateFlag.State_Sunken
+            if action == ACTION_MAP:
+                button.text = "Map"
+            else:
+                button.icon = self._icons[action]
+                button.iconSize = _ICON_SIZE
+            style.drawControl(QStyle.ControlElement.CE_PushButton, button, painter, widget)
+
+    def sizeHint(self, option, index):
+        width = sum(_WIDTHS[action] + _SPACING for action, _ in self.actions(index)) + 2 * _MARGIN_X
+        return QSize(width, super().sizeHint(option, index).height())
+
+    def editorEvent(self, event, model, option, index):
+        event_type = event.type()
+        if event_type not in (QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonRelease,
+                              QEvent.Type.MouseButtonDblClick):
+            return False
+        if event.button() != Qt.MouseButton.LeftButton:
+            return False
+
+        hit = self._hit(option.rect, index, event.position().toPoint())
+        if event_type == QEvent.Type.MouseButtonRelease:
+            pressed, self._pressed = self._pressed, None
+            if pressed is not None:
+                self._repaint(option)
+            if hit is not None and hit[1] and pressed == (index.row(), hit[0]):
+                self.action_triggered.emit(index.row(), hit[0])
+            return hit is not None
+
+        if hit is not None and hit[1]:
+            self._pressed = (index.row(), hit[0])
+            self._repaint(option)
+        return hit is not None
+
+    def helpEvent(self, event, view, option, index):
+        if event.type() == QEvent.Type.ToolTip:
+            hit = self._hit(option.rect, index, event.pos())
+            if hit is not None:
+                QToolTip.showText(event.globalPos(), _TOOLTIPS[hit[0]], view)
+                return True
+        return super().helpEvent(event, view, option, index)
@@ -2,16 +2,17 @@
 JSON file caching utilities for performance optimization.
 
 Provides LRU cache for frequently read JSON files with:
-- Time-based expiration (files older than N seconds are re-read)
-- Size-based eviction (keep only N most recent files in memory)
+- Stat validation (an entry is served only while the file's mtime and size
+  are unchanged, so writes from other PCs are picked up on the next read)
+- Byte-budget eviction (least recently used files are dropped first)
 - Thread-safe access for multi-threaded environments
-- Automatic invalidation on file modification
+- Hit / miss / revalidation counters for monitoring
 - Simple API for drop-in replacement of json.load()
 
 Performance Benefits:
-- Network storage: 10-50ms per file read → <1ms cache hit
+- Network storage: 10-50ms per file read → one stat round-trip on a hit
 - Session Browser scanning 100 sessions: 1-5 seconds → <100ms
-- Repeated state file reads: Instant from cache
+- Unchanged multi-MB files (analysis_data.json) are parsed once, not every minute
 
 Usage Example:
     from json_cache import get_cached_json, invalidate_json_cache
@@ -26,11 +27,14 @@ Usage Example:
 
 Author: Claude Code
 Created: 2025-11-26
-Version: 1.0.0
+Version: 1.1.0
 """
 
 import json
+import os
+import threading
 import time
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, Any, Optional
 import logging
@@ -38,71 +42,111 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+class _Entry:
+    """One cached file: parsed data plus the stat it was read under."""
+
+    __slots__ = ("data", "mtime_ns", "size", "loaded_at", "accessed_at")
+
+    def __init__(self, data: Any, stat: os.stat_result, now: float):
+        self.data = data
+        self.mtime_ns = stat.st_mtime_ns
+        self.size = stat.st_size
+        self.loaded_at = now
+        self.accessed_at = now
+
+
 class JSONCache:
     """
-    LRU cache for JSON files with time-based expiration.
+    Stat-validated LRU cache for JSON files with a byte budget.
 
     This cache improves performance when JSON files are read repeatedly,
     especially on network storage or slow file systems. It uses:
 
-    1. **Time-To-Live (TTL)**: Cached entries expire after N seconds
-    2. **LRU Eviction**: Oldest entries are removed when cache is full
-    3. **Graceful Degradation**: Returns default values on errors
+    1. **Stat validation**: Every get() stats the file; the cached data is
+       served only if (mtime, size) still match what was read. A stat is a
+       single metadata round-trip, far cheaper than re-reading and parsing.
+    2. **LRU eviction**: Entries live in an OrderedDict in access order, so a
+       hit and an eviction are both O(1).
+    3. **Byte budget**: Eviction keeps the summed on-disk size of cached files
+       under max_bytes (file size is a proxy for the parsed size). An optional
+       max_size additionally caps the number of entries.
+    4. **Graceful Degradation**: Returns default values on errors
 
     The cache is particularly effective for:
     - Session scanning (session_info.json, packing_state.json)
-    - Repeated reads of the same packing list
+    - Repeated reads of large read-mostly files (analysis_data.json)
     - SKU mapping lookups
     - Configuration files
 
     Thread Safety:
-        This implementation is NOT thread-safe. For multi-threaded use,
-        wrap cache access with threading.Lock()
+        All bookkeeping is done under a lock, so the cache can be shared by
+        the UI thread and worker threads (RegistryRefreshWorker,
+        SessionScanWorker, ...). File reads happen outside the lock, so a slow
+        read never blocks hits on other files. Cached objects are shared
+        between callers and must be treated as read-only.
 
     Attributes:
-        max_size (int): Maximum number of files to cache
-        ttl_seconds (int): Time-to-live for cached entries
-        _cache (Dict): Internal cache storage
-        _access_times (Dict): Last access timestamp for each file
+        max_bytes (int): Budget for the summed file size of cached entries
+        max_size (Optional[int]): Maximum number of entries (None: no limit)
+        ttl_seconds (Optional[float]): Re-read entries older than this even if
+            their stat is unchanged (None: trust the stat). A safety net for
+            file systems with coarse mtime resolution.
 
     Example:
-        >>> cache = JSONCache(max_size=100, ttl_seconds=60)
+        >>> cache = JSONCache(max_bytes=16 * 1024 * 1024)
         >>> data = cache.get('/path/to/file.json')
         >>> cache.invalidate('/path/to/file.json')  # After modification
         >>> stats = cache.stats()
-        >>> print(f"Cache size: {stats['size']}/{stats['max_size']}")
+        >>> print(f"Hit rate: {stats['hit_rate']:.0%}")
     """
 
-    def __init__(self, max_size: int = 100, ttl_seconds: int = 60):
+    def __init__(
+        self,
+        max_size: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        max_bytes: int = 16 * 1024 * 1024
+    ):
         """
         Initialize JSON cache.
 
         Args:
-            max_size: Maximum number of files to cache (default: 100)
-                     Larger values use more memory but improve hit rate
-            ttl_seconds: Time-to-live for cached entries in seconds (default: 60)
-                        Shorter values ensure fresher data, longer values improve performance
+            max_size: Maximum number of files to cache (default: no limit,
+                     only the byte budget applies)
+            ttl_seconds: Maximum age of an entry before it is re-read even if
+                        the file looks unchanged (default: None, the stat decides)
+            max_bytes: Budget for the summed size of cached files (default: 16 MB).
+                      A file larger than the budget is returned but not cached.
 
         Memory Usage Estimate:
-            Average JSON file: ~5-50 KB
-            100 files cached: ~500 KB - 5 MB memory usage
-            Adjust max_size based on available memory
+            Parsed JSON takes several times its file size in memory;
+            a 16 MB file budget is roughly 50-150 MB of Python objects.
         """
         self.max_size = max_size
         self.ttl_seconds = ttl_seconds
-        self._cache: Dict[str, Dict[str, Any]] = {}
-        self._access_times: Dict[str, float] = {}
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._misses = 0
+        self._revalidations = 0
+        self._stale_reloads = 0
+        self._evictions = 0
 
-        logger.debug(f"JSONCache initialized: max_size={max_size}, ttl={ttl_seconds}s")
+        logger.debug(
+            f"JSONCache initialized: max_bytes={max_bytes}, max_size={max_size}, ttl={ttl_seconds}"
+        )
 
     def get(self, file_path: Path, default: Optional[Any] = None) -> Any:
         """
         Get JSON data from file with caching.
 
-        This method implements a simple caching strategy:
-        1. Check if file is in cache and not expired → return cached data
-        2. If expired or not cached → read from disk and cache
-        3. If file doesn't exist or is invalid → return default value
+        This method implements a stat-validated caching strategy:
+        1. Stat the file; if it is gone → drop any entry, return default
+        2. If cached and (mtime, size) match (and not past ttl) → return cached data
+        3. Otherwise → read from disk and cache
+        4. If the file is invalid → return default value
 
         Args:
             file_path: Path to JSON file (absolute or relative)
@@ -113,7 +157,7 @@ class JSONCache:
             Parsed JSON data (dict, list, etc.) or default value
 
         Performance:
-            - Cache hit: <1ms (memory access only)
+            - Cache hit: one stat call (a metadata round-trip on network storage)
             - Cache miss: 10-50ms on network storage, 1-5ms on local SSD
             - First read is always a miss (cold cache)
 
@@ -121,88 +165,105 @@ class JSONCache:
             >>> cache = JSONCache()
             >>> # First read: cache miss (slow)
             >>> data = cache.get('/network/share/session_info.json')
-            >>> # Second read: cache hit (fast!)
+            >>> # Second read: stat only, cache hit (fast!)
             >>> data = cache.get('/network/share/session_info.json')
         """
         file_path = Path(file_path)
         cache_key = str(file_path.absolute())
-        current_time = time.time()
 
-        # Check if cached and not expired
-        if cache_key in self._cache:
-            cache_age = current_time - self._access_times[cache_key]
+        try:
+            stat = os.stat(cache_key)
+        except FileNotFoundError:
+            logger.debug(f"File not found: {file_path}")
+            self.invalidate(file_path)
+            return default
+        except OSError as e:
+            logger.error(f"Error reading {file_path}: {e}")
+            return default
 
-            if cache_age < self.ttl_seconds:
-                # Cache hit - update access time for LRU tracking
-                self._access_times[cache_key] = current_time
-                logger.debug(f"Cache HIT: {file_path.name} (age: {cache_age:.1f}s)")
-                return self._cache[cache_key]
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                self._revalidations += 1
+                expired = self.ttl_seconds is not None and now - entry.loaded_at >= self.ttl_seconds
+                if (not expired and entry.mtime_ns == stat.st_mtime_ns
+                        and entry.size == stat.st_size):
+                    # Cache hit - move to the most recently used end
+                    entry.accessed_at = now
+                    self._entries.move_to_end(cache_key)
+                    self._hits += 1
+                    logger.debug(f"Cache HIT: {file_path.name}")
+                    return entry.data
+
+                # Changed on disk (or expired) - drop the stale entry
+                logger.debug(f"Cache STALE: {file_path.name}")
+                self._remove(cache_key)
+                self._stale_reloads += 1
             else:
-                # Cache expired - remove stale entry
-                logger.debug(f"Cache EXPIRED: {file_path.name} (age: {cache_age:.1f}s)")
-                del self._cache[cache_key]
-                del self._access_times[cache_key]
+                self._misses += 1
 
-        # Cache miss - read from file
+        # Read outside the lock so a slow read doesn't block other files.
+        # The stat was taken first: if the file changes during the read, the
+        # entry carries the older stat and is re-read on the next access.
         try:
-            if not file_path.exists():
-                logger.debug(f"File not found: {file_path}")
-                return default
-
-            # Read and parse JSON
             with open(file_path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
 
-            # Add to cache
-            self._cache[cache_key] = data
-            self._access_times[cache_key] = current_time
-
-            # Evict oldest entries if cache is full
-            if len(self._cache) > self.max_size:
-                self._evict_oldest()
-
-            logger.debug(f"Cache MISS: {file_path.name} loaded and cached")
-            return data
-
         except json.JSONDecodeError as e:
             # Invalid JSON format
             logger.warning(f"Invalid JSON in {file_path}: {e}")
             return default
+        except FileNotFoundError:
+            logger.debug(f"File not found: {file_path}")
+            return default
         except Exception as e:
             # Other errors (permissions, I/O errors, etc.)
             logger.error(f"Error reading {file_path}: {e}")
             return default
 
-    def _evict_oldest(self):
-        """
-        Evict oldest entries from cache to maintain max_size limit.
+        if stat.st_size > self.max_bytes:
+            logger.debug(f"Not caching {file_path.name}: {stat.st_size} bytes exceeds the cache budget")
+            return data
 
-        This implements an LRU (Least Recently Used) eviction policy:
-        - Sort entries by access time
-        - Remove oldest 10% of entries
-        - This batch eviction is more efficient than removing one at a time
+        with self._lock:
+            if cache_key in self._entries:
+                self._remove(cache_key)  # another thread cached it meanwhile
+            self._entries[cache_key] = _Entry(data, stat, now)
+            self._bytes += stat.st_size
+            self._evict()
 
-        Called automatically when cache exceeds max_size.
-        """
-        # Sort by access time (oldest first)
-        sorted_keys = sorted(self._access_times.items(), key=lambda x: x[1])
+        logger.debug(f"Cache MISS: {file_path.name} loaded and cached")
+        return data
 
-        # Remove oldest 10% of entries (minimum 1)
-        remove_count = max(1, self.max_size // 10)
+    def _remove(self, cache_key: str):
+        """Drop one entry. Caller holds the lock."""
+        entry = self._entries.pop(cache_key)
+        self._bytes -= entry.size
 
-        for cache_key, _ in sorted_keys[:remove_count]:
-            del self._cache[cache_key]
-            del self._access_times[cache_key]
-            logger.debug(f"Evicted from cache: {Path(cache_key).name}")
+    def _evict(self):
+        """
+        Evict least recently used entries until the cache is within budget.
 
-        logger.debug(f"Cache eviction: removed {remove_count} entries")
+        The OrderedDict is kept in access order, so the least recently used
+        entry is always the first one. Caller holds the lock.
+        """
+        while self._entries and (
+            self._bytes > self.max_bytes
+            or (self.max_size is not None and len(self._entries) > self.max_size)
+        ):
+            cache_key, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            self._evictions += 1
+            logger.debug(f"Evicted from cache: {Path(cache_key).name}")
 
     def invalidate(self, file_path: Path):
         """
         Invalidate cache entry for specific file.
 
-        Call this method after writing to a JSON file to ensure
-        the next read gets fresh data from disk.
+        Writes through this process are also caught by stat validation, but
+        invalidating right after a write avoids serving data from a write
+        that landed within the file system's mtime resolution.
 
         Args:
             file_path: Path to file to invalidate
@@ -216,23 +277,26 @@ class JSONCache:
             >>> cache.invalidate(state_file)
         """
         cache_key = str(Path(file_path).absolute())
-        if cache_key in self._cache:
-            del self._cache[cache_key]
-            del self._access_times[cache_key]
-            logger.debug(f"Cache invalidated: {file_path.name if isinstance(file_path, Path) else file_path}")
+        with self._lock:
+            if cache_key in self._entries:
+                self._remove(cache_key)
+                logger.debug(f"Cache invalidated: {file_path.name if isinstance(file_path, Path) else file_path}")
 
     def clear(self):
         """
-        Clear entire cache.
+        Clear entire cache and reset its counters.
 
         Removes all cached entries. Useful for:
         - Resetting cache during testing
         - Freeing memory when cache is no longer needed
         - Force-refreshing all data from disk
         """
-        entry_count = len(self._cache)
-        self._cache.clear()
-        self._access_times.clear()
+        with self._lock:
+            entry_count = len(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+            self._hits = self._misses = self._revalidations = 0
+            self._stale_reloads = self._evictions = 0
         logger.info(f"Cache cleared: {entry_count} entries removed")
 
     def stats(self) -> Dict[str, Any]:
@@ -243,41 +307,56 @@ class JSONCache:
             Dictionary with cache statistics:
             {
                 'size': 42,              # Current number of cached files
-                'max_size': 100,         # Maximum cache size
-                'ttl_seconds': 60,       # Time-to-live setting
-                'oldest_age': 45.2,      # Age of oldest entry in seconds
-                'hit_rate': 0.85         # Not implemented yet (future enhancement)
+                'max_size': None,        # Entry cap (None: byte budget only)
+                'bytes': 5242880,        # Summed file size of cached entries
+                'max_bytes': 16777216,   # Byte budget
+                'ttl_seconds': None,     # Age limit setting
+                'oldest_age': 45.2,      # Seconds since the least recently used entry was used
+                'hits': 120,             # Served from memory after a stat check
+                'misses': 30,            # Not cached, read from disk
+                'revalidations': 135,    # Stat checks of cached entries
+                'stale_reloads': 15,     # Cached entries re-read because the file changed
+                'evictions': 4,          # Entries dropped to stay within budget
+                'hit_rate': 0.8          # hits / (hits + misses + stale_reloads)
             }
 
         Example:
             >>> stats = cache.stats()
-            >>> print(f"Cache utilization: {stats['size']}/{stats['max_size']}")
-            >>> print(f"Oldest entry: {stats['oldest_age']:.1f}s old")
+            >>> print(f"Cache: {stats['bytes']}/{stats['max_bytes']} bytes, {stats['hit_rate']:.0%} hits")
         """
-        oldest_age = 0
-        if self._access_times:
-            oldest_time = min(self._access_times.values())
-            oldest_age = time.time() - oldest_time
-
-        return {
-            'size': len(self._cache),
-            'max_size': self.max_size,
-            'ttl_seconds': self.ttl_seconds,
-            'oldest_age': round(oldest_age, 1)
-        }
+        with self._lock:
+            oldest_age = 0
+            if self._entries:
+                least_recent = next(iter(self._entries.values()))
+                oldest_age = time.monotonic() - least_recent.accessed_at
+            lookups = self._hits + self._misses + self._stale_reloads
+
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'ttl_seconds': self.ttl_seconds,
+                'oldest_age': round(oldest_age, 1),
+                'hits': self._hits,
+                'misses': self._misses,
+                'revalidations': self._revalidations,
+                'stale_reloads': self._stale_reloads,
+                'evictions': self._evictions,
+                'hit_rate': round(self._hits / lookups, 3) if lookups else 0.0,
+            }
 
 
 # ============================================================================
 # GLOBAL CACHE INSTANCE
 # ============================================================================
 # Singleton cache instance shared across the application
-# Default settings: 100 files, 60 second TTL
+# Default settings: 16 MB of JSON files, validated by stat on every read
 # These can be adjusted based on profiling results:
-# - Increase max_size if you have many session directories
-# - Decrease ttl_seconds if data changes frequently
-# - Increase ttl_seconds if data is mostly read-only
+# - Increase max_bytes if large files (analysis_data.json) keep getting evicted
+# - Set ttl_seconds if a share reports unreliable mtimes
 
-_json_cache = JSONCache(max_size=100, ttl_seconds=60)
+_json_cache = JSONCache(max_bytes=16 * 1024 * 1024)
 
 
 # ============================================================================
@@ -357,11 +436,12 @@ def get_json_cache_stats() -> Dict[str, Any]:
     Get statistics from global JSON cache.
 
     Returns:
-        Dictionary with cache statistics
+        Dictionary with cache statistics, including the hit / miss /
+        revalidation counters (see JSONCache.stats())
 
     Example:
         >>> from json_cache import get_json_cache_stats
         >>> stats = get_json_cache_stats()
-        >>> logger.info(f"JSON cache: {stats['size']}/{stats['max_size']} files cached")
+        >>> logger.info(f"JSON cache: {stats['size']} files, {stats['hit_rate']:.0%} hits")
     """
     return _json_cache.stats()
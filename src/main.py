@@ -34,11 +34,11 @@ if str(project_root) not in sys.path:
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QLabel, QPushButton, QVBoxLayout, QWidget, QFileDialog, QStackedWidget,
     QHBoxLayout, QMessageBox, QLineEdit, QComboBox, QDialog, QFormLayout, QDialogButtonBox, QTabWidget,
-    QTreeWidget, QTreeWidgetItem, QTableWidget, QTableWidgetItem, QGroupBox, QScrollArea, QInputDialog,
+    QTreeView, QTableWidget, QTableWidgetItem, QGroupBox, QScrollArea, QInputDialog,
     QProgressDialog
 )
 from PySide6.QtGui import QAction, QFont, QCloseEvent, QKeySequence
-from PySide6.QtCore import QTimer, QSettings, QSize, Qt, QThread, Signal
+from PySide6.QtCore import QTimer, QSettings, QSize, Qt, QThread, Signal, QModelIndex
 from datetime import datetime
 from openpyxl.styles import PatternFill
 import pandas as pd
@@ -50,7 +50,14 @@ from exceptions import SessionLockedError, StaleLockError
 from session_selector import SessionSelectorDialog
 from print_dialog import PrintDialog
 from packer_mode_widget import PackerModeWidget
+from order_tree_model import OrderTreeModel
+from session_statistics import SessionStatistics
+from refresh_scheduler import RefreshScheduler
+from fs_instrumentation import (
+    fs_operation, current_fs_scope, attach_fs_scope, enable_fs_instrumentation
+)
 from packer_logic import PackerLogic, REQUIRED_COLUMNS
+from wave_packing import Wave, DEFAULT_WAVE_SIZE, TIE_BREAK_SLOT
 from session_manager import SessionManager
 from shared.stats_manager import StatsManager
 from shared.worker_manager import WorkerManager
@@ -65,6 +72,9 @@ logger = get_logger(__name__)
 
 DEFAULT_CONFIG_PATH = "config.ini"
 
+# Delay after the last keystroke before the order search is applied
+SEARCH_DEBOUNCE_MS = 150
+
 def find_latest_session_dir(base_dir: str = ".") -> str | None:
     """
     Finds the most recent, valid, and incomplete session directory.
@@ -106,7 +116,8 @@ class SessionStartWorker(QThread):
     Background worker for the slow I/O steps when starting a session.
 
     Performs PackerLogic construction (reads packer_config + packing_state from server)
-    and load_packing_list_json (reads + parses the packing list JSON) off the UI thread.
+    and load_packing_list_json (reads the compiled packing list when valid, otherwise
+    parses the packing list JSON and compiles it) off the UI thread.
 
     Lock acquisition and heartbeat setup remain on the main thread because stale-lock
     handling requires a QMessageBox interaction.
@@ -127,6 +138,8 @@ class SessionStartWorker(QThread):
         self._profile_manager = profile_manager
         self._work_dir = work_dir
         self._packing_list_path = packing_list_path
+        # File-system operations count towards the caller's scope (e.g. "resume")
+        self._fs_scope = current_fs_scope()
         # Results (read by main thread after wait())
         self.logic = None
         self.order_count = 0
@@ -136,12 +149,16 @@ class SessionStartWorker(QThread):
     def run(self) -> None:
         try:
             from packer_logic import PackerLogic
-            logic = PackerLogic(
-                client_id=self._client_id,
-                profile_manager=self._profile_manager,
-                work_dir=str(self._work_dir),
-            )
-            order_count, list_name = logic.load_packing_list_json(str(self._packing_list_path))
+            with attach_fs_scope(self._fs_scope):
+                logic = PackerLogic(
+                    client_id=self._client_id,
+                    profile_manager=self._profile_manager,
+                    work_dir=str(self._work_dir),
+                )
+                # Reuse the compiled packing list in work_dir when the source is unchanged
+                order_count, list_name = logic.load_packing_list_json(
+                    str(self._packing_list_path), use_compiled_cache=True
+                )
             # Move Qt object ownership back to the main thread
             logic.moveToThread(QApplication.instance().thread())
             self.logic = logic
@@ -171,11 +188,13 @@ class SessionEndWorker(QThread):
     def __init__(self, write_fn, parent=None):
         super().__init__(parent)
         self._write_fn = write_fn
+        self._fs_scope = current_fs_scope()  # the "end session" scope
         self.error = None
 
     def run(self) -> None:
         try:
-            self._write_fn()
+            with attach_fs_scope(self._fs_scope):
+                self._write_fn()
         except Exception as exc:
             logger.error(f"SessionEndWorker: unexpected error: {exc}", exc_info=True)
             self.error = exc
@@ -259,6 +278,10 @@ class MainWindow(QMainWindow):
         if self._sim_mode:
             logger.info("Scan Simulator Mode enabled (dev/test environment)")
 
+        # Optional per-action file-system round-trip counts in the log (diagnostics)
+        if self.profile_manager.config.getboolean('Logging', 'FSInstrumentation', fallback=False):
+            enable_fs_instrumentation()
+
         # Worker state
         self.current_worker_id = None
         self.current_worker_name = None
@@ -274,6 +297,25 @@ class MainWindow(QMainWindow):
         self.current_work_dir = None      # Work directory for packing results
         self.packing_data = None          # Loaded packing list data
 
+        # Statistics tab aggregates (rebuilt per packing list, updated by deltas)
+        self._session_stats = None
+        self._stats_dirty = False
+        self._stats_dirty_rows = set()
+        self._stats_columns_sized = False
+
+        # Order tree, statistics and session progress follow scans at most once
+        # per frame; scan feedback (beep, notification, item row) stays immediate
+        self.refresh_scheduler = RefreshScheduler(self)
+        self.refresh_scheduler.register("tree", self._refresh_orders_in_tree)
+        self.refresh_scheduler.register("stats", self._refresh_statistics)
+        self.refresh_scheduler.register("progress", self._refresh_session_progress)
+
+        # Scan flash of the Packer Mode table frame (see flash_border)
+        self._flash_color = None
+        self._flash_timer = QTimer(self)
+        self._flash_timer.setSingleShot(True)
+        self._flash_timer.timeout.connect(self._end_flash)
+
         # Phase 1.4: Unified StatsManager for integration with Shopify Tool statistics
         # Records packing statistics to shared Stats/global_stats.json on file server
         # Used for:
@@ -349,7 +391,12 @@ class MainWindow(QMainWindow):
 
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Search by Order Number, SKU, or Status...")
-        self.search_input.textChanged.connect(self._filter_orders)
+        # Filter once typing pauses, not on every keystroke
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self._search_timer.timeout.connect(lambda: self._filter_orders(self.search_input.text()))
+        self.search_input.textChanged.connect(lambda _text: self._search_timer.start())
         main_layout.addWidget(self.search_input)
 
         # Create tab widget for session views (Packing and Statistics)
@@ -366,11 +413,12 @@ class MainWindow(QMainWindow):
         self.session_tabs.addTab(packing_tab, "Packing")
 
         # Tab 2: Statistics View
-        stats_tab = QWidget()
-        stats_layout = QVBoxLayout(stats_tab)
+        self.stats_tab = QWidget()
+        stats_layout = QVBoxLayout(self.stats_tab)
         stats_layout.setContentsMargins(0, 0, 0, 0)
         self._setup_statistics_tab(stats_layout)
-        self.session_tabs.addTab(stats_tab, "Statistics")
+        self.session_tabs.addTab(self.stats_tab, "Statistics")
+        self.session_tabs.currentChanged.connect(self._on_session_tab_changed)
 
         main_layout.addWidget(self.session_tabs)
 
@@ -394,6 +442,7 @@ class MainWindow(QMainWindow):
         self.packer_mode_widget.force_confirm_requested.connect(self._on_force_confirm)
         self.packer_mode_widget.map_sku_requested.connect(self._on_map_sku_from_packer)
         self.packer_mode_widget.extra_confirmed.connect(self._on_extra_confirmed)
+        self.packer_mode_widget.wave_mode_toggled.connect(self._on_wave_mode_toggled)
         self.packer_mode_widget.extra_removed.connect(self._on_extra_removed)
 
         # Stacked widget to switch between session view and packer mode
@@ -524,10 +573,10 @@ class MainWindow(QMainWindow):
 
     def _setup_order_tree(self):
         """Setup expandable order tree view."""
-        self.order_tree = QTreeWidget()
-        self.order_tree.setHeaderLabels([
-            "Order / Item", "Product", "Quantity", "Status", "Courier"
-        ])
+        self.order_tree_model = OrderTreeModel(self)
+        self.order_tree = QTreeView()
+        self.order_tree.setModel(self.order_tree_model)
+        self._hidden_order_rows = set()
 
         # Column widths (interactive, with sensible defaults)
         from PySide6.QtWidgets import QHeaderView
@@ -548,178 +597,93 @@ class MainWindow(QMainWindow):
 
         # Row height and styling
         self.order_tree.setStyleSheet("""
-            QTreeWidget::item {
+            QTreeView::item {
                 height: 30px;
                 padding: 5px;
             }
         """)
 
     def _populate_order_tree(self):
-        """Populate tree with orders and items."""
-        self.order_tree.clear()
+        """
+        Point the tree model at the loaded packing list.
 
-        if not self.logic or not hasattr(self.logic, 'processed_df') or self.logic.processed_df is None:
+        Full reset, only needed when a list is loaded; scans update single
+        orders through _refresh_order_in_tree().
+        """
+        store = getattr(self.logic, 'session_store', None) if self.logic else None
+        self.order_tree_model.set_logic(self.logic if store is not None else None)
+        # A model reset drops the view's hidden rows
+        self._hidden_order_rows = set()
+        if store is None:
             return
 
-        # Group by order number
-        grouped = self.logic.processed_df.groupby('Order_Number')
+        # Expand pending orders to show current work, keep completed ones compact
+        self.order_tree.expandAll()
+        for row in range(self.order_tree_model.rowCount()):
+            order_num = self.order_tree_model.order_number(row)
+            if self.order_tree_model.is_completed(order_num):
+                self.order_tree.collapse(self.order_tree_model.order_index(order_num))
 
-        # Get completed and in-progress orders
-        completed_orders = self.logic.session_packing_state.get('completed_orders', [])
-        in_progress_orders = self.logic.session_packing_state.get('in_progress', {})
+        if self.search_input.text():
+            self._filter_orders(self.search_input.text())
 
-        for order_num, order_items in grouped:
-            items_df = order_items
-            total_items = len(items_df)
-
-            # Check order status
-            is_completed = order_num in completed_orders
-
-            # Count scanned items
-            scanned_count = 0
-            if order_num in in_progress_orders:
-                order_state = in_progress_orders[order_num]
-                # Handle both list format (current) and dict format (legacy)
-                if isinstance(order_state, list):
-                    scanned_count = sum(1 for s in order_state if s.get('packed', 0) >= s.get('required', 1))
+    def _refresh_order_in_tree(self, order_number: str):
+        """Repaint one order's rows (and collapse it once completed)."""
+        if not hasattr(self, 'order_tree_model'):
+            return
+        self.order_tree_model.order_changed(order_number)
+        if self.order_tree_model.is_completed(order_number):
+            self.order_tree.collapse(self.order_tree_model.order_index(order_number))
+
+        # Its status may have changed: re-check it against an active search
+        text = self.search_input.text()
+        row = self.order_tree_model.order_row(order_number)
+        if text and row >= 0:
+            hidden = not self.order_tree_model.search_index.matches(order_number, text)
+            if hidden != (row in self._hidden_order_rows):
+                self.order_tree.setRowHidden(row, QModelIndex(), hidden)
+                if hidden:
+                    self._hidden_order_rows.add(row)
                 else:
-                    scanned_count = sum(1 for s in order_state.values() if s.get('packed', 0) >= s.get('required', 1))
-            elif is_completed:
-                scanned_count = total_items
-
-            # Order status
-            if is_completed:
-                status_text = "✅ Completed"
-                status_icon = "✅"
-            else:
-                status_text = f"⏳ {scanned_count}/{total_items} items"
-                status_icon = "⏳"
-
-            # Courier
-            courier = items_df.iloc[0].get('Courier', 'N/A') if 'Courier' in items_df.columns else 'N/A'
-
-            # Create top-level order item
-            order_item = QTreeWidgetItem([
-                f"{order_num}",
-                f"{total_items} items",
-                "",
-                status_text,
-                courier
-            ])
-
-            # Bold font for order
-            font = QFont()
-            font.setBold(True)
-            font.setPointSize(11)
-            for col in range(5):
-                order_item.setFont(col, font)
-
-            # Add child items (SKUs) - OPTIMIZED: replaced iterrows() with itertuples()
-            # itertuples() is 5-10x faster than iterrows() for DataFrame iteration
-            for row_tuple in items_df.itertuples(index=False):
-                # Access by column index from tuple
-                sku = getattr(row_tuple, 'SKU', 'Unknown') if hasattr(row_tuple, 'SKU') else 'Unknown'
-                product = getattr(row_tuple, 'Product_Name', 'Unknown') if hasattr(row_tuple, 'Product_Name') else 'Unknown'
-                qty = getattr(row_tuple, 'Quantity', 1) if hasattr(row_tuple, 'Quantity') else 1
-
-                # Check if scanned
-                scanned_qty = 0
-                if order_num in in_progress_orders:
-                    order_state = in_progress_orders[order_num]
-                    # Find this SKU in the order state
-                    if isinstance(order_state, list):
-                        for item_state in order_state:
-                            # CRITICAL FIX: Validate item_state is dict before calling .get()
-                            if not isinstance(item_state, dict):
-                                logger.warning(f"Skipping invalid item_state in {order_num}: {type(item_state).__name__}")
-                                continue
-
-                            if item_state.get('original_sku') == sku:
-                                scanned_qty = item_state.get('packed', 0)
-                                break
-                    else:
-                        # Legacy dict format
-                        for item_state in order_state.values():
-                            # CRITICAL FIX: Validate item_state is dict before calling .get()
-                            if not isinstance(item_state, dict):
-                                logger.warning(f"Skipping invalid item_state in {order_num}: {type(item_state).__name__}")
-                                continue
-
-                            if item_state.get('original_sku') == sku:
-                                scanned_qty = item_state.get('packed', 0)
-                                break
-                elif is_completed:
-                    try:
-                        scanned_qty = int(qty)
-                    except:
-                        scanned_qty = 1
+                    self._hidden_order_rows.discard(row)
 
-                try:
-                    qty_int = int(qty)
-                except:
-                    qty_int = 1
+    def _refresh_orders_in_tree(self, order_numbers):
+        """Refresh-scheduler callback: repaint the orders changed during the frame."""
+        if order_numbers is None:
+            self._populate_order_tree()
+            return
+        for order_number in order_numbers:
+            self._refresh_order_in_tree(order_number)
 
-                if scanned_qty >= qty_int:
-                    item_status = "✅ Scanned"
-                else:
-                    item_status = f"⏳ Pending ({scanned_qty}/{qty_int})"
-
-                # Create child item
-                child_item = QTreeWidgetItem([
-                    f"  {sku}",
-                    product,
-                    str(qty),
-                    item_status,
-                    ""
-                ])
-
-                # Normal font for items
-                item_font = QFont()
-                item_font.setPointSize(10)
-                for col in range(5):
-                    child_item.setFont(col, item_font)
-
-                order_item.addChild(child_item)
-
-            self.order_tree.addTopLevelItem(order_item)
-
-            # Expand completed orders, collapse pending
-            if is_completed:
-                order_item.setExpanded(False)  # Keep compact
-            else:
-                order_item.setExpanded(True)   # Show current work
+    def _mark_order_dirty(self, order_number: str):
+        """Schedule the tree and statistics refresh for one changed order."""
+        self.refresh_scheduler.mark_dirty("tree", order_number)
+        self.refresh_scheduler.mark_dirty("stats", order_number)
 
     def _filter_orders(self, text: str):
-        """Filter tree items by search text."""
-        if not hasattr(self, 'order_tree'):
-            return
+        """
+        Filter tree items by search text.
 
-        if not text:
-            # Show all
-            for i in range(self.order_tree.topLevelItemCount()):
-                self.order_tree.topLevelItem(i).setHidden(False)
+        Matches come from the model's search index (order number, SKUs,
+        product names, status); only rows whose visibility changes are touched.
+        """
+        if not hasattr(self, 'order_tree'):
             return
 
-        text = text.lower()
-
-        for i in range(self.order_tree.topLevelItemCount()):
-            order_item = self.order_tree.topLevelItem(i)
-            order_text = order_item.text(0).lower()
+        model = self.order_tree_model
+        index = model.search_index if text else None
+        matches = index.search(text) if index is not None else None
 
-            # Check if order matches
-            order_match = text in order_text
-
-            # Check if any child (SKU) matches
-            child_match = False
-            for j in range(order_item.childCount()):
-                child = order_item.child(j)
-                child_text = f"{child.text(0)} {child.text(1)}".lower()
-                if text in child_text:
-                    child_match = True
-                    break
+        if matches is None:
+            # Show all
+            hidden = set()
+        else:
+            hidden = {row for row in range(model.rowCount()) if model.order_number(row) not in matches}
 
-            # Show if order or child matches
-            order_item.setHidden(not (order_match or child_match))
+        root = QModelIndex()
+        for row in hidden ^ self._hidden_order_rows:
+            self.order_tree.setRowHidden(row, root, row in hidden)
+        self._hidden_order_rows = hidden
 
     def _setup_statistics_tab(self, layout):
         """Create statistics overview tab."""
@@ -800,144 +764,139 @@ class MainWindow(QMainWindow):
         scroll.setWidget(scroll_widget)
         layout.addWidget(scroll)
 
-    def _update_statistics(self):
-        """Refresh statistics tab with current data."""
-        if not self.logic or not hasattr(self.logic, 'processed_df') or self.logic.processed_df is None:
+    def _update_statistics(self, order_number: str = None):
+        """
+        Update statistics after a state change.
+
+        Args:
+            order_number: The order whose state changed; None recounts everything
+                          (packing list loaded or state restored).
+
+        Aggregates are kept current on every call (per-order deltas); the
+        widgets are only touched while the Statistics tab is visible, otherwise
+        the refresh waits until it is shown.
+        """
+        self._refresh_statistics(None if order_number is None else (order_number,))
+
+    def _refresh_statistics(self, order_numbers):
+        """
+        Apply the changes of several orders, then refresh the widgets once.
+
+        Refresh-scheduler callback; None recounts everything (see _update_statistics).
+        """
+        store = getattr(self.logic, 'session_store', None) if self.logic else None
+        if store is None:
             return
 
-        df = self.logic.processed_df
+        state = self.logic.session_packing_state
+        if self._session_stats is None or self._session_stats.store is not store:
+            self._session_stats = SessionStatistics(store)
+            self._session_stats.rebuild(state)
+            self._build_statistics_widgets()
+        elif order_numbers is None:
+            self._session_stats.rebuild(state)
+            self._stats_dirty_rows.update(range(len(self._session_stats.sku_rows)))
+        else:
+            for order_number in order_numbers:
+                changed = self._session_stats.order_changed(order_number, state)
+                self._stats_dirty_rows.update(self._session_stats.rows_for_skus(changed))
 
-        # Session totals
-        unique_orders = df['Order_Number'].unique()
-        total_orders = len(unique_orders)
-        completed_orders_list = self.logic.session_packing_state.get('completed_orders', [])
-        completed_orders = len(completed_orders_list)
-        total_items = len(df)
-        unique_skus = df['SKU'].nunique()
-        progress_pct = int((completed_orders / total_orders * 100)) if total_orders > 0 else 0
+        self._stats_dirty = True
+        if self.stats_tab.isVisible():
+            self._refresh_statistics_widgets()
 
-        self.stats_total_orders.setText(str(total_orders))
-        self.stats_completed_orders.setText(str(completed_orders))
-        self.stats_total_items.setText(str(total_items))
-        self.stats_unique_skus.setText(str(unique_skus))
-        self.stats_progress_pct.setText(f"{progress_pct}%")
+    def _build_statistics_widgets(self):
+        """Create the courier cards and SKU table rows for a newly loaded packing list."""
+        stats = self._session_stats
 
-        # By Courier
-        # Clear existing
+        # By Courier: counts depend only on the packing list, so cards are built once per list
         for i in reversed(range(self.courier_stats_layout.count())):
             widget = self.courier_stats_layout.itemAt(i).widget()
             if widget:
                 widget.setParent(None)
 
-        if 'Courier' in df.columns:
-            courier_stats = df.groupby('Courier').agg({
-                'Order_Number': 'nunique',
-                'Quantity': lambda x: pd.to_numeric(x, errors='coerce').sum()
-            }).reset_index()
-
-            # OPTIMIZED: replaced iterrows() with itertuples() for 5-10x speedup
-            card_bold_font = QFont()
-            card_bold_font.setPointSize(18)
-            card_bold_font.setBold(True)
-            card_label_font = QFont()
-            card_label_font.setPointSize(9)
-            for row_tuple in courier_stats.itertuples(index=False):
-                courier = row_tuple.Courier
-                orders = row_tuple.Order_Number
-                items = int(row_tuple.Quantity) if pd.notna(row_tuple.Quantity) else 0
-                card = QWidget()
-                card_layout = QVBoxLayout(card)
-                card_layout.setContentsMargins(12, 8, 12, 8)
-                card_layout.setSpacing(2)
-                card.setObjectName("courier_card")
-                card.setStyleSheet("#courier_card { border: 1px solid #2a2a2a; border-radius: 4px; }")
-                value_lbl = QLabel(str(orders))
-                value_lbl.setFont(card_bold_font)
-                value_lbl.setAlignment(Qt.AlignCenter)
-                courier_lbl = QLabel(courier)
-                courier_lbl.setFont(card_label_font)
-                courier_lbl.setAlignment(Qt.AlignCenter)
-                courier_lbl.setStyleSheet("color: #888888; border: none;")
-                items_lbl = QLabel(f"{items} items")
-                items_lbl.setFont(card_label_font)
-                items_lbl.setAlignment(Qt.AlignCenter)
-                items_lbl.setStyleSheet("color: #666666; border: none;")
-                card_layout.addWidget(value_lbl)
-                card_layout.addWidget(courier_lbl)
-                card_layout.addWidget(items_lbl)
-                self.courier_stats_layout.addWidget(card)
-
-        # SKU Summary
-        sku_summary = df.groupby(['SKU', 'Product_Name']).agg({
-            'Quantity': lambda x: pd.to_numeric(x, errors='coerce').sum()
-        }).reset_index()
-
-        self.sku_table.setRowCount(len(sku_summary))
-
-        # Get scanned items tracking
-        in_progress_orders = self.logic.session_packing_state.get('in_progress', {})
-        scanned_by_sku = {}
-
-        # Count scanned quantities per SKU
-        for order_state in in_progress_orders.values():
-            if isinstance(order_state, list):
-                for item_state in order_state:
-                    # CRITICAL FIX: Validate item_state is dict before calling .get()
-                    if not isinstance(item_state, dict):
-                        logger.warning(f"Skipping invalid item_state (not a dict): {type(item_state).__name__}")
-                        continue
-
-                    sku = item_state.get('original_sku')
-                    packed = item_state.get('packed', 0)
-                    if sku:
-                        scanned_by_sku[sku] = scanned_by_sku.get(sku, 0) + packed
-            else:
-                for item_state in order_state.values():
-                    # CRITICAL FIX: Validate item_state is dict before calling .get()
-                    if not isinstance(item_state, dict):
-                        logger.warning(f"Skipping invalid item_state (not a dict): {type(item_state).__name__}")
-                        continue
-
-                    sku = item_state.get('original_sku')
-                    packed = item_state.get('packed', 0)
-                    if sku:
-                        scanned_by_sku[sku] = scanned_by_sku.get(sku, 0) + packed
-
-        # Add completed orders to scanned count
-        # OPTIMIZED: replaced nested loops + iterrows() with vectorized groupby
-        # This reduces O(n*m) iteration to O(n) vectorized operation
-        if completed_orders_list:
-            completed_items_df = df[df['Order_Number'].isin(completed_orders_list)]
-            if not completed_items_df.empty:
-                # Group by SKU and sum quantities (vectorized)
-                completed_by_sku = completed_items_df.groupby('SKU')['Quantity'].apply(
-                    lambda x: pd.to_numeric(x, errors='coerce').sum()
-                ).fillna(0).astype(int)
-
-                # Add to scanned_by_sku dict
-                for sku, qty in completed_by_sku.items():
-                    scanned_by_sku[sku] = scanned_by_sku.get(sku, 0) + qty
-
-        # OPTIMIZED: replaced iterrows() with enumerate(itertuples()) for 5-10x speedup
-        for idx, row_tuple in enumerate(sku_summary.itertuples(index=False)):
-            sku = row_tuple.SKU
-            product = row_tuple.Product_Name
-            qty = row_tuple.Quantity
-            qty_int = int(qty) if pd.notna(qty) else 0
+        card_bold_font = QFont()
+        card_bold_font.setPointSize(18)
+        card_bold_font.setBold(True)
+        card_label_font = QFont()
+        card_label_font.setPointSize(9)
+        for courier, orders, quantity in stats.courier_summary:
+            items = int(quantity)
+            card = QWidget()
+            card_layout = QVBoxLayout(card)
+            card_layout.setContentsMargins(12, 8, 12, 8)
+            card_layout.setSpacing(2)
+            card.setObjectName("courier_card")
+            card.setStyleSheet("#courier_card { border: 1px solid #2a2a2a; border-radius: 4px; }")
+            value_lbl = QLabel(str(orders))
+            value_lbl.setFont(card_bold_font)
+            value_lbl.setAlignment(Qt.AlignCenter)
+            courier_lbl = QLabel(courier)
+            courier_lbl.setFont(card_label_font)
+            courier_lbl.setAlignment(Qt.AlignCenter)
+            courier_lbl.setStyleSheet("color: #888888; border: none;")
+            items_lbl = QLabel(f"{items} items")
+            items_lbl.setFont(card_label_font)
+            items_lbl.setAlignment(Qt.AlignCenter)
+            items_lbl.setStyleSheet("color: #666666; border: none;")
+            card_layout.addWidget(value_lbl)
+            card_layout.addWidget(courier_lbl)
+            card_layout.addWidget(items_lbl)
+            self.courier_stats_layout.addWidget(card)
+
+        # SKU Summary: static columns now, status cells are updated in place
+        self.sku_table.setRowCount(len(stats.sku_rows))
+        for idx, (sku, product, qty) in enumerate(stats.sku_rows):
+            self.sku_table.setItem(idx, 0, QTableWidgetItem(sku))
+            self.sku_table.setItem(idx, 1, QTableWidgetItem(product))
+            self.sku_table.setItem(idx, 2, QTableWidgetItem(str(int(qty))))
+            self.sku_table.setItem(idx, 3, QTableWidgetItem(""))
+
+        self._stats_dirty_rows = set(range(len(stats.sku_rows)))
+        self._stats_columns_sized = False
+
+    def _refresh_statistics_widgets(self):
+        """Push pending aggregate changes into the Statistics tab widgets."""
+        stats = self._session_stats
+        if stats is None or not self._stats_dirty:
+            return
+
+        # Session totals (from the logic layer's progress accumulator — no per-scan pandas)
+        session_progress = self.logic.get_session_progress() if self.logic else None
+        total_orders = stats.total_orders
+        completed_orders = stats.completed_orders
+        progress_pct = int((completed_orders / total_orders * 100)) if total_orders > 0 else 0
+
+        self.stats_total_orders.setText(str(total_orders))
+        self.stats_completed_orders.setText(str(completed_orders))
+        if session_progress is not None:
+            self.stats_total_items.setText(str(session_progress.total_lines))
+            self.stats_unique_skus.setText(str(session_progress.unique_skus))
+        self.stats_progress_pct.setText(f"{progress_pct}%")
+
+        for idx in self._stats_dirty_rows:
+            sku, _, qty = stats.sku_rows[idx]
+            qty_int = int(qty)
 
             # Check if fully scanned
-            scanned = scanned_by_sku.get(sku, 0)
+            scanned = stats.scanned(sku)
             if scanned >= qty_int:
                 status = "✅ Complete"
             else:
                 status = f"⏳ {scanned}/{qty_int}"
+            self.sku_table.item(idx, 3).setText(status)
 
-            self.sku_table.setItem(idx, 0, QTableWidgetItem(sku))
-            self.sku_table.setItem(idx, 1, QTableWidgetItem(product))
-            self.sku_table.setItem(idx, 2, QTableWidgetItem(str(qty_int)))
-            self.sku_table.setItem(idx, 3, QTableWidgetItem(status))
+        if not self._stats_columns_sized:
+            self.sku_table.resizeColumnsToContents()
+            self._stats_columns_sized = True
 
-        self.sku_table.resizeColumnsToContents()
+        self._stats_dirty_rows = set()
+        self._stats_dirty = False
+
+    def _on_session_tab_changed(self, index: int):
+        """Apply statistics updates that were deferred while the tab was hidden."""
+        if self.session_tabs.widget(index) is self.stats_tab:
+            self._refresh_statistics_widgets()
 
     def _select_worker(self) -> bool:
         """Show worker selection dialog
@@ -1098,13 +1057,18 @@ class MainWindow(QMainWindow):
             duration_ms (int): Duration of the flash in milliseconds.
         """
         hex_color = self._FLASH_COLORS.get(color, color)
-        self.packer_mode_widget.table_frame.setStyleSheet(
-            f"QFrame#TableFrame {{ border: 2px solid {hex_color}; border-radius: 3px; }}"
-        )
-        QTimer.singleShot(
-            duration_ms,
-            lambda: self.packer_mode_widget.table_frame.setStyleSheet(self._FRAME_DEFAULT_STYLE)
-        )
+        # Back-to-back scans of the same result keep the frame as it is and only
+        # extend the flash, instead of swapping the stylesheet twice per scan
+        if hex_color != self._flash_color:
+            self.packer_mode_widget.table_frame.setStyleSheet(
+                f"QFrame#TableFrame {{ border: 2px solid {hex_color}; border-radius: 3px; }}"
+            )
+            self._flash_color = hex_color
+        self._flash_timer.start(duration_ms)
+
+    def _end_flash(self):
+        self.packer_mode_widget.table_frame.setStyleSheet(self._FRAME_DEFAULT_STYLE)
+        self._flash_color = None
 
 
     def start_session(self, file_path: str = None, restore_dir: str = None):
@@ -1152,8 +1116,9 @@ class MainWindow(QMainWindow):
             return
 
         # Clear existing tree
-        if hasattr(self, 'order_tree'):
-            self.order_tree.clear()
+        if hasattr(self, 'order_tree_model'):
+            self.order_tree_model.clear()
+            self._hidden_order_rows = set()
 
         logger.info(f"Starting session for client {self.current_client_id} with path: {file_path}")
 
@@ -1257,6 +1222,7 @@ class MainWindow(QMainWindow):
                 try:
                     new_map = self.profile_manager.load_sku_mapping(self.current_client_id)
                     self.logic.set_sku_map(new_map)
+                    self.packer_mode_widget.set_sku_map(self.logic.sku_map)
                     self.status_label.setText("SKU mapping updated and synchronized across all PCs.")
                     logger.info("SKU mapping reloaded into active session")
                 except Exception as e:
@@ -1278,6 +1244,7 @@ class MainWindow(QMainWindow):
         self.heartbeat_timer.start(60000)  # 60 seconds
         logger.debug("Heartbeat timer started")
 
+    @fs_operation("heartbeat")
     def _update_session_heartbeat(self):
         """Update heartbeat for active session lock."""
         if self.logic and hasattr(self, 'current_work_dir') and self.current_work_dir:
@@ -1537,12 +1504,8 @@ class MainWindow(QMainWindow):
             # 9b. Register session start in registry (enables fast browser loading)
             try:
                 _reg_total_items = 0
-                if self.logic and self.logic.processed_df is not None:
-                    _reg_total_items = int(
-                        pd.to_numeric(
-                            self.logic.processed_df['Quantity'], errors='coerce'
-                        ).fillna(0).sum()
-                    )
+                if self.logic and self.logic.session_store is not None:
+                    _reg_total_items = self.logic.get_session_progress().total_items
                 self.registry_manager.register_session_start(
                     client_id=client_id,
                     session_id=session_path.name,
@@ -1624,6 +1587,7 @@ class MainWindow(QMainWindow):
             )
             return False
 
+    @fs_operation("end session")
     def end_session(self):
         """
         Ends the current session gracefully.
@@ -1666,7 +1630,8 @@ class MainWindow(QMainWindow):
             completed_orders_set = set(self.logic.session_packing_state.get('completed_orders', []))
             in_progress_orders = self.logic.session_packing_state.get('in_progress', {})
 
-            final_df = self.logic.packing_list_df.copy()
+            # packing_list_df is materialised from the session store on access
+            final_df = self.logic.packing_list_df
 
             # Add Status column
             final_df['Status'] = final_df['Order_Number'].apply(
@@ -1727,30 +1692,15 @@ class MainWindow(QMainWindow):
                 _in_progress_orders = len(_in_progress_orders_dict)
 
                 _items_packed = 0
-                try:
-                    if self.logic.processed_df is not None and _completed_orders_list:
-                        _ci = pd.to_numeric(
-                            self.logic.processed_df[
-                                self.logic.processed_df['Order_Number'].isin(_completed_orders_list)
-                            ]['Quantity'],
-                            errors='coerce'
-                        ).sum()
-                        _items_packed += int(_ci)
-                    for _osl in _in_progress_orders_dict.values():
-                        if isinstance(_osl, list):
-                            for _sd in _osl:
-                                if isinstance(_sd, dict):
-                                    _items_packed += _sd.get('packed', 0)
-                except Exception as e:
-                    logger.error(f"Error calculating items_packed: {e}", exc_info=True)
-
                 _total_orders, _total_items = 0, 0
                 try:
-                    if self.logic.processed_df is not None:
-                        _total_orders = len(self.logic.processed_df['Order_Number'].unique())
-                        _total_items = int(pd.to_numeric(self.logic.processed_df['Quantity'], errors='coerce').sum())
+                    _session_progress = self.logic.get_session_progress()
+                    _items_packed = _session_progress.packed_items
+                    if self.logic.session_store is not None:
+                        _total_orders = _session_progress.total_orders
+                        _total_items = _session_progress.total_items
                 except Exception as e:
-                    logger.error(f"Error calculating totals: {e}", exc_info=True)
+                    logger.error(f"Error calculating session totals: {e}", exc_info=True)
 
                 if _is_shopify:
                     _session_id = f"{getattr(self, 'current_session_path', '')}_{getattr(self, 'current_packing_list', '')}"
@@ -1770,13 +1720,17 @@ class MainWindow(QMainWindow):
                 _worker_mgr = self.worker_manager
                 _sess_mgr = self.session_manager
                 _cur_sess_path = getattr(self, 'current_session_path', None)
+                _history_mgr = self.session_history_manager
+                # packing/<list>/session_summary.json or barcodes/session_summary.json
+                _summary_session_dir = Path(_summary_path).parents[2 if _is_shopify else 1]
                 _cur_pack_list = getattr(self, 'current_packing_list', None)
                 _registry_mgr = getattr(self, 'registry_manager', None)
 
-                # Flush any pending state write on the main thread *before*
-                # handing off to the background worker.  AsyncStateWriter's
-                # flush() must only be called from the main/UI thread.
-                _logic_ref._state_writer.flush()
+                # Write the final state snapshot on the main thread *before*
+                # handing off to the background worker (session-end checkpoint;
+                # also compacts the scan journal).  AsyncStateWriter's flush()
+                # must only be called from the main/UI thread.
+                _logic_ref.save_state()
 
                 def _do_slow_writes():
                     # 1. Save session summary
@@ -1875,6 +1829,13 @@ class MainWindow(QMainWindow):
                     except Exception as exc:
                         logger.warning(f"Registry update (session complete) failed: {exc}")
 
+                    # 6. Index the summary for history and analytics rollups
+                    try:
+                        if _history_mgr and _client_id:
+                            _history_mgr.refresh_session(_client_id, _summary_session_dir)
+                    except Exception as exc:
+                        logger.warning(f"Session history index update failed: {exc}")
+
                 # Show progress dialog while writes happen in background
                 _end_progress = QProgressDialog("Saving session…", None, 0, 0, self)
                 _end_progress.setWindowTitle("Please Wait")
@@ -1910,6 +1871,17 @@ class MainWindow(QMainWindow):
             except Exception as e:
                 logger.error(f"Failed to release lock: {e}")
 
+        # Drop refreshes queued for this session and report how much they coalesced
+        self.refresh_scheduler.cancel()
+        refresh_metrics = self.refresh_scheduler.metrics()
+        logger.info(
+            f"UI refresh: {refresh_metrics['frames']} frames, "
+            f"{refresh_metrics['skipped']} refreshes coalesced, "
+            f"~{refresh_metrics['saved_ms']:.0f} ms main-thread time saved",
+            extra={'refresh_metrics': refresh_metrics},
+        )
+        self.refresh_scheduler.reset_metrics()
+
         # Cleanup PackerLogic state
         if self.logic:
             self.logic.end_session_cleanup()
@@ -1937,8 +1909,9 @@ class MainWindow(QMainWindow):
         if hasattr(self, 'session_info_label'):
             self.session_info_label.setText("No active session")
 
-        if hasattr(self, 'order_tree'):
-            self.order_tree.clear()
+        if hasattr(self, 'order_tree_model'):
+            self.order_tree_model.clear()
+            self._hidden_order_rows = set()
         self.status_label.setText("Session ended. Start a new session to begin.")
 
         # Return user to session view (avoids leaving a blank packer mode screen)
@@ -2002,6 +1975,12 @@ class MainWindow(QMainWindow):
     def switch_to_packer_mode(self):
         """Switches the view to the Packer Mode widget."""
         self.stacked_widget.setCurrentWidget(self.packer_mode_widget)
+        wave = getattr(self.logic, 'wave', None)
+        is_wave = isinstance(wave, Wave)
+        self.packer_mode_widget.set_wave_mode(is_wave)
+        if is_wave:
+            # Resumed (or still open) wave: show its slots
+            self.packer_mode_widget.set_wave_slots(self.logic.get_wave_slots(), wave.max_orders)
         self.packer_mode_widget.set_focus_to_scanner()
 
     def switch_to_session_view(self):
@@ -2011,15 +1990,21 @@ class MainWindow(QMainWindow):
         if self.packer_mode_widget:
             self.packer_mode_widget.clear_screen()
         self.stacked_widget.setCurrentWidget(self.session_widget)
+        if self.session_tabs.currentWidget() is self.stats_tab:
+            self._refresh_statistics_widgets()
 
     def open_print_dialog(self):
         """Opens the dialog for printing order barcodes."""
         if not self.logic.orders_data:
             self.status_label.setText("No data to print.")
             return
-        dialog = PrintDialog(self.logic.orders_data, self)
+        dialog = PrintDialog(
+            self.logic.orders_data, self,
+            cache_dir=self.profile_manager.cache_dir / "thumbnails",
+        )
         dialog.exec()
 
+    @fs_operation("scan SKU")
     def on_scanner_input(self, text: str):
         """
         Handles input from the barcode scanner in Packer Mode.
@@ -2033,14 +2018,13 @@ class MainWindow(QMainWindow):
         self.packer_mode_widget.update_raw_scan_display(text)
         self.packer_mode_widget.show_notification("", "transparent")
 
+        if self.logic.wave is not None:
+            self._on_wave_scan(text)
+            return
+
         if self.logic.current_order_number is None:
-            # Find order by normalized comparison
-            order_number_from_scan = None
-            scanned_normalized = self.logic._normalize_order_number(text)
-            for order_num in self.logic.orders_data.keys():
-                if self.logic._normalize_order_number(order_num) == scanned_normalized:
-                    order_number_from_scan = order_num
-                    break
+            # Find order via the logic layer's normalized order index (O(1))
+            order_number_from_scan = self.logic.resolve_order(text)
 
             if not order_number_from_scan:
                 self.packer_mode_widget.show_notification("ORDER NOT FOUND", "#c0392b")
@@ -2064,8 +2048,6 @@ class MainWindow(QMainWindow):
                     metadata=order_metadata,
                     sku_map=self.logic.sku_map,
                 )
-                completed = len(self.logic.session_packing_state.get('completed_orders', []))
-                self.packer_mode_widget.update_session_progress(completed, len(self.logic.orders_data))
                 self.update_order_status(order_number_from_scan, "In Progress")
                 _beep(1000, 120)
             else:
@@ -2074,37 +2056,132 @@ class MainWindow(QMainWindow):
                 _beep(400, 350)
         else:
             result, status = self.logic.process_sku_scan(text)
-            if status == "SKU_OK":
-                self.packer_mode_widget.update_item_row(result["row"], result["packed"], result["is_complete"])
-                self.packer_mode_widget.show_notification("ITEM OK", "#43a047")
-                self.flash_border("green")
-                _beep(1200, 80)
-            elif status == "SKU_NOT_FOUND":
-                unknown_list = self.logic.unknown_scans
-                if len(unknown_list) > 1:
-                    detail = f"({len(unknown_list)} unknown scans)\nLast: {text}"
-                else:
-                    detail = f"Unknown: {text}"
+            self._handle_sku_scan_result(text, result, status)
+
+    def _handle_sku_scan_result(self, text: str, result, status: str):
+        """Update Packer Mode for the outcome of a product scan (single-order and wave mode)."""
+        if status == "SKU_OK":
+            self.packer_mode_widget.update_item_row(result["row"], result["packed"], result["is_complete"])
+            self.packer_mode_widget.show_notification("ITEM OK", "#43a047")
+            self.flash_border("green")
+            _beep(1200, 80)
+        elif status == "SKU_NOT_FOUND":
+            unknown_list = self.logic.unknown_scans
+            if len(unknown_list) > 1:
+                detail = f"({len(unknown_list)} unknown scans)\nLast: {text}"
+            else:
+                detail = f"Unknown: {text}"
+            self.packer_mode_widget.show_notification(
+                f"INCORRECT ITEM!\n{detail}", "#c0392b"
+            )
+            self.flash_border("red")
+            _beep(400, 350)
+        elif status == "SKU_EXTRA":
+            self.packer_mode_widget.show_notification("EXTRA ITEM!", "#b06020")
+            self.flash_border("orange")
+            _beep(700, 200)
+            self.packer_mode_widget.show_extras_panel(self.logic.current_extra_items)
+        elif status == "ORDER_COMPLETE_WITH_EXTRAS":
+            self.packer_mode_widget.update_item_row(result["row"], result["packed"], result["is_complete"])
+            self.packer_mode_widget.show_notification("REVIEW EXTRA ITEMS!", "#e67e22")
+            self.flash_border("orange")
+            self.packer_mode_widget.show_extras_panel(self.logic.current_extra_items)
+        elif status == "ORDER_COMPLETE":
+            current_order_num = self.logic.current_order_number
+            self.packer_mode_widget.update_item_row(result["row"], result["packed"], result["is_complete"])
+            self._handle_order_completion(current_order_num)
+            self.logic.clear_current_order()
+
+    def _on_wave_scan(self, text: str):
+        """
+        Handle a scan in wave mode: order barcodes open (or focus) a slot,
+        everything else is a product scan routed to the open order that needs it.
+        """
+        wave = self.logic.wave
+        order_number = self.logic.resolve_order(text)
+
+        if order_number and order_number in self.logic.session_packing_state.get('completed_orders', []):
+            self.packer_mode_widget.show_notification(f"ORDER {order_number} ALREADY COMPLETED", "#b06020")
+            self.flash_border("orange")
+        elif order_number:
+            items, status = self.logic.open_wave_order(text)
+            if status == "ORDER_LOADED":
+                slot = wave.get(order_number).slot
+                self.packer_mode_widget.add_order_to_history(order_number, f"[SLOT {slot}]")
+                self._display_current_order(items)
+                self.packer_mode_widget.show_notification(f"SLOT {slot} ← {order_number}", "#43a047")
+                self.update_order_status(order_number, "In Progress")
+                _beep(1000, 120)
+            elif status == "ORDER_ALREADY_IN_WAVE":
+                self._display_current_order()
                 self.packer_mode_widget.show_notification(
-                    f"INCORRECT ITEM!\n{detail}", "#c0392b"
+                    f"SLOT {wave.get(order_number).slot}: {order_number}", "#2980b9"
                 )
-                self.flash_border("red")
-                _beep(400, 350)
-            elif status == "SKU_EXTRA":
-                self.packer_mode_widget.show_notification("EXTRA ITEM!", "#b06020")
+            elif status == "WAVE_FULL":
+                self.packer_mode_widget.show_notification("WAVE FULL — scan items", "#b06020")
                 self.flash_border("orange")
                 _beep(700, 200)
-                self.packer_mode_widget.show_extras_panel(self.logic.current_extra_items)
-            elif status == "ORDER_COMPLETE_WITH_EXTRAS":
-                self.packer_mode_widget.update_item_row(result["row"], result["packed"], result["is_complete"])
-                self.packer_mode_widget.show_notification("REVIEW EXTRA ITEMS!", "#e67e22")
-                self.flash_border("orange")
-                self.packer_mode_widget.show_extras_panel(self.logic.current_extra_items)
-            elif status == "ORDER_COMPLETE":
-                current_order_num = self.logic.current_order_number
-                self.packer_mode_widget.update_item_row(result["row"], result["packed"], result["is_complete"])
-                self._handle_order_completion(current_order_num)
-                self.logic.clear_current_order()
+            else:
+                self.packer_mode_widget.show_notification("ORDER NOT FOUND", "#c0392b")
+                self.flash_border("red")
+                _beep(400, 350)
+        else:
+            previous = self.logic.current_order_number
+            result, status = self.logic.process_wave_scan(text)
+            if status == "NO_ACTIVE_ORDER":
+                self.packer_mode_widget.show_notification("WAVE EMPTY — scan an order", "#c0392b")
+                self.flash_border("red")
+                _beep(400, 350)
+            else:
+                if self.logic.current_order_number and self.logic.current_order_number != previous:
+                    self._display_current_order()
+                self._handle_sku_scan_result(text, result, status)
+                if result and status in ("SKU_OK", "ORDER_COMPLETE_WITH_EXTRAS"):
+                    self.packer_mode_widget.show_notification(
+                        f"→ SLOT {result['slot']}  ({result['order_number']})", "#43a047"
+                    )
+
+        self.packer_mode_widget.set_wave_slots(self.logic.get_wave_slots(), wave.max_orders)
+
+    def _display_current_order(self, items=None):
+        """Show logic.current_order_number in Packer Mode (wave focus changes)."""
+        order_number = self.logic.current_order_number
+        order_data = self.logic.orders_data.get(order_number, {})
+        self.packer_mode_widget.display_order(
+            items if items is not None else order_data.get('items', []),
+            self.logic.current_order_state,
+            metadata=order_data.get('metadata', {}),
+            sku_map=self.logic.sku_map,
+        )
+        if self.logic.current_extra_items:
+            self.packer_mode_widget.show_extras_panel(self.logic.current_extra_items)
+        self.refresh_scheduler.mark_dirty("progress")
+
+    def _on_wave_mode_toggled(self, enabled: bool):
+        """Start or end wave packing (slot count / tie-break from packing_rules.wave)."""
+        if not self.logic:
+            self.packer_mode_widget.set_wave_mode(False)
+            return
+        if enabled:
+            rules = {}
+            if self.current_client_id:
+                config = self.profile_manager.load_client_config(self.current_client_id) or {}
+                rules = (config.get('packing_rules') or {}).get('wave') or {}
+            try:
+                wave = self.logic.start_wave(
+                    max_orders=int(rules.get('max_orders', DEFAULT_WAVE_SIZE)),
+                    tie_break=rules.get('tie_break', TIE_BREAK_SLOT),
+                )
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Invalid wave settings {rules}: {e}; using defaults")
+                wave = self.logic.start_wave()
+            self.packer_mode_widget.set_wave_slots(self.logic.get_wave_slots(), wave.max_orders)
+            self.packer_mode_widget.status_label.setText("Wave mode\nScan order barcodes to fill slots")
+        else:
+            self.logic.end_wave()
+            if self.logic.current_order_number is None:
+                self.packer_mode_widget.clear_screen()
+        self.packer_mode_widget.set_focus_to_scanner()
 
     # REMOVED: _process_shopify_packing_data() method (dead code)
     # This method was never called. Functionality replaced by PackerLogic.load_packing_list_json()
@@ -2115,16 +2192,15 @@ class MainWindow(QMainWindow):
         Slot to handle real-time progress updates from the logic layer.
 
         This method is connected to the `item_packed` signal from PackerLogic.
-        It refreshes the tree and statistics to reflect the updated progress.
+        It repaints the order's tree rows and statistics to reflect the updated progress.
 
         Args:
             order_number (str): The order number that was updated.
             packed_count (int): The new total of items packed for the order.
             required_count (int): The total items required for the order.
         """
-        # Refresh tree and statistics to show updated progress
-        self._populate_order_tree()
-        self._update_statistics()
+        # Repaint just this order's rows and statistics, once per frame
+        self._mark_order_dirty(order_number)
         logger.debug(f"Order {order_number} progress: {packed_count}/{required_count}")
 
     def update_order_status(self, order_number: str, status: str):
@@ -2135,11 +2211,18 @@ class MainWindow(QMainWindow):
             order_number (str): The order number to update.
             status (str): The new status ('In Progress' or 'Completed').
         """
-        # Simply refresh the tree and statistics to reflect the new status
-        self._populate_order_tree()
-        self._update_statistics()
+        # Repaint the order's rows, statistics and session progress (next frame)
+        self._mark_order_dirty(order_number)
+        self.refresh_scheduler.mark_dirty("progress")
         logger.debug(f"Order {order_number} status updated to: {status}")
 
+    def _refresh_session_progress(self, _keys=None):
+        """Refresh-scheduler callback: completed/total orders bar of Packer Mode."""
+        if not self.logic:
+            return
+        completed = len(self.logic.session_packing_state.get('completed_orders', []))
+        self.packer_mode_widget.update_session_progress(completed, len(self.logic.orders_data))
+
     # ─── Packer Mode new action handlers ─────────────────────────────────────
 
     def _handle_order_completion(self, order_number: str):
@@ -2149,9 +2232,10 @@ class MainWindow(QMainWindow):
         _beep(1200, 80)
         QTimer.singleShot(180, lambda: _beep(1200, 80))
         self.update_order_status(order_number, "Completed")
-        if self.logic:
-            completed = len(self.logic.session_packing_state.get('completed_orders', []))
-            self.packer_mode_widget.update_session_progress(completed, len(self.logic.orders_data))
+        if self.logic and self.logic.wave is not None:
+            # Wave mode: the next product scan goes straight to another slot
+            self.packer_mode_widget.set_wave_slots(self.logic.get_wave_slots(), self.logic.wave.max_orders)
+            return
         self.packer_mode_widget.scanner_input.setEnabled(False)
         QTimer.singleShot(3000, self.packer_mode_widget.clear_screen)
 
@@ -2163,6 +2247,8 @@ class MainWindow(QMainWindow):
         self.logic.skip_order()
         self.packer_mode_widget.add_order_to_history(skipped, "[SKIPPED]")
         self.packer_mode_widget.clear_screen()
+        if self.logic.wave is not None:
+            self.packer_mode_widget.set_wave_slots(self.logic.get_wave_slots(), self.logic.wave.max_orders)
         logger.info(f"Order {skipped} skipped")
 
     def _on_cancel_item(self, row: int):
@@ -2172,6 +2258,7 @@ class MainWindow(QMainWindow):
         result, status = self.logic.cancel_item_scan(row)
         if status == "ITEM_DECREMENTED":
             self.packer_mode_widget.update_item_row(row, result["packed"], False)
+            self._mark_order_dirty(self.logic.current_order_number)
             self.flash_border("orange")
         elif status == "ITEM_ALREADY_ZERO":
             self.packer_mode_widget.show_notification("Already at 0!", "#b06020")
@@ -2184,6 +2271,7 @@ class MainWindow(QMainWindow):
         result, status = self.logic.force_confirm_item(row)
         if status == "FORCE_CONFIRMED":
             self.packer_mode_widget.update_item_row(row, result["packed"], True)
+            self._mark_order_dirty(self.logic.current_order_number)
             if result.get("order_complete"):
                 self.flash_border("green")
                 order_num = self.logic.current_order_number
@@ -2240,6 +2328,7 @@ class MainWindow(QMainWindow):
                     self.logic.sku_map = {
                         self.logic._normalize_sku(k): v for k, v in existing.items()
                     }
+                    self.packer_mode_widget.set_sku_map(self.logic.sku_map)
                     logger.info(f"Quick-mapped barcode '{barcode}' → SKU '{sku}'")
                 self.packer_mode_widget.show_notification(f"Mapped: {barcode} → {sku}", "#43a047")
             else:
@@ -2319,6 +2408,7 @@ class MainWindow(QMainWindow):
     # This method was never called. Functionality replaced by Session Browser's
     # Active/Completed tabs which provide a better UX for session restoration
 
+    @fs_operation("start session")
     def open_shopify_session(self):
         """
         Open Shopify session and select packing list to work on.
@@ -2618,16 +2708,18 @@ class MainWindow(QMainWindow):
 
         layout = QVBoxLayout(browser_dialog)
 
-        # Create Session Browser widget
-        browser = SessionBrowserWidget(
-            profile_manager=self.profile_manager,
-            session_manager=self.session_manager,
-            session_lock_manager=self.lock_manager,
-            session_history_manager=self.session_history_manager,
-            worker_manager=self.worker_manager,
-            registry_manager=self.registry_manager,
-            parent=browser_dialog
-        )
+        # Create Session Browser widget (the registry refresh it starts is
+        # counted in its own "refresh session registry" scope)
+        with fs_operation("open session browser"):
+            browser = SessionBrowserWidget(
+                profile_manager=self.profile_manager,
+                session_manager=self.session_manager,
+                session_lock_manager=self.lock_manager,
+                session_history_manager=self.session_history_manager,
+                worker_manager=self.worker_manager,
+                registry_manager=self.registry_manager,
+                parent=browser_dialog
+            )
 
         # Connect signals
         browser.resume_session_requested.connect(
@@ -2642,6 +2734,7 @@ class MainWindow(QMainWindow):
         # Show dialog
         browser_dialog.exec()
 
+    @fs_operation("resume")
     def _handle_resume_session_from_browser(self, dialog, session_info: dict):
         """
         Handle resume request from Session Browser.
@@ -2715,6 +2808,7 @@ class MainWindow(QMainWindow):
             )
             logger.info("Session resumed successfully from Session Browser")
 
+    @fs_operation("start session")
     def _handle_start_packing_from_browser(self, dialog, packing_info: dict):
         """
         Handle start packing request from Session Browser Available tab.
@@ -0,0 +1,119 @@
+"""
+Per-session search index for filtering orders by free text.
+
+The order filters (CustomFilterProxyModel and the packing view's order tree)
+used to look at every line of every order on each keystroke: reading SKU and
+product texts row by row and lowercasing them again for every search.
+
+OrderSearchIndex lowercases each order's searchable text once per packing list:
+
+    "<order number>\\x1f<sku>\\x1f<product>\\x1f<sku>\\x1f..."
+
+A search is then one substring test per order (the separator keeps a term
+from matching across two fields). Typing usually extends the previous term,
+so when the new term contains the previous one only the previous matches are
+re-tested, which narrows the work with every keystroke.
+
+Order statuses change while packing, so they are not part of the text: the
+owner keeps them current with set_status() and a search adds every order
+whose status contains the term (there are only a handful of distinct statuses).
+"""
+
+from typing import Any, Dict, List, Optional, Set
+
+_SEPARATOR = "\x1f"
+
+
+def _text(value: Any) -> Optional[str]:
+    if value is None or value != value:  # missing / NaN
+        return None
+    return str(value).lower()
+
+
+class OrderSearchIndex:
+    """
+    Lowercased order number, SKU and product name text of every order, plus statuses.
+
+    Attributes:
+        order_numbers (List[Any]): Indexed orders, in packing-list order.
+    """
+
+    def __init__(self, store):
+        """
+        Build the index from a SessionStore (one pass over its lines).
+
+        Args:
+            store (SessionStore): Orders with their lines.
+        """
+        self.order_numbers: List[Any] = list(store.order_numbers)
+        self._positions: Dict[Any, int] = {order: i for i, order in enumerate(self.order_numbers)}
+        self._texts: List[str] = []
+        for order in self.order_numbers:
+            parts = [str(order).lower()]
+            for sku, product, _ in store.iter_lines(order):
+                for value in (sku, product):
+                    text = _text(value)
+                    if text:
+                        parts.append(text)
+            self._texts.append(_SEPARATOR.join(parts))
+
+        self._status: Dict[Any, str] = {}
+        self._orders_by_status: Dict[str, Set[Any]] = {}
+
+        # Previous search, reused when the next term contains it
+        self._last_term: Optional[str] = None
+        self._last_positions: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.order_numbers)
+
+    def set_status(self, order_number: Any, status: Optional[str]) -> None:
+        """Set (or clear, with None) the searchable status of an order."""
+        new = status.lower() if status else None
+        old = self._status.get(order_number)
+        if old == new:
+            return
+        if old is not None:
+            self._orders_by_status[old].discard(order_number)
+            del self._status[order_number]
+        if new is not None:
+            self._status[order_number] = new
+            self._orders_by_status.setdefault(new, set()).add(order_number)
+
+    def status(self, order_number: Any) -> Optional[str]:
+        return self._status.get(order_number)
+
+    def matches(self, order_number: Any, term: str) -> bool:
+        """Whether one order matches term (e.g. after its status changed)."""
+        term = term.lower()
+        position = self._positions.get(order_number)
+        if not term or position is None:
+            return position is not None
+        status = self._status.get(order_number)
+        return term in self._texts[position] or (status is not None and term in status)
+
+    def search(self, term: str) -> Optional[Set[Any]]:
+        """
+        Orders whose number, SKUs, product names or status contain term (case-insensitive).
+
+        Returns:
+            Set of matching order numbers, or None for an empty term (everything matches).
+        """
+        term = term.lower()
+        if not term:
+            return None
+
+        if self._last_term is not None and self._last_term in term:
+            candidates = self._last_positions
+        else:
+            candidates = range(len(self._texts))
+        texts = self._texts
+        positions = [i for i in candidates if term in texts[i]]
+        self._last_term = term
+        self._last_positions = positions
+
+        matches = {self.order_numbers[i] for i in positions}
+        for status, orders in self._orders_by_status.items():
+            if term in status:
+                matches.update(orders)
+        return matches
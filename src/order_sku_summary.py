@@ -0,0 +1,88 @@
+"""
+Per-SKU packed/total aggregate of the order shown in Packer Mode.
+
+Shopify exports can list the same SKU on several lines, so Packer Mode shows a
+summary with one row per SKU. PackerModeWidget used to rebuild that summary on
+every scan by walking the items table, splitting the "packed / total" cell
+texts and re-sorting all SKUs.
+
+OrderSkuSummary is built once per displayed order from its items and packing
+state. Each item row knows its SKU's summary row, so a scan (a new packed
+count for one item row) adjusts one SKU's total by the delta and tells the
+caller which single summary row to repaint.
+"""
+
+from typing import Any, Dict, List, Optional
+
+
+def _quantity(item: Dict[str, Any]) -> int:
+    try:
+        return int(float(item.get('Quantity', item.get('quantity', 1))))
+    except (ValueError, TypeError):
+        return 1
+
+
+class OrderSkuSummary:
+    """
+    Packed and total quantity per SKU, sorted by SKU.
+
+    Attributes:
+        skus (List[str]): SKUs in summary-row order.
+        names (List[str]): Product name of each SKU (from its first line).
+        packed (List[int]): Units packed per SKU.
+        totals (List[int]): Units required per SKU.
+    """
+
+    def __init__(self, items: List[Dict[str, Any]], order_state: List[Dict[str, Any]] = ()):
+        """
+        Args:
+            items: The order's lines, in items-table row order.
+            order_state: Packing state rows ('row', 'packed') of the order, if resumed.
+        """
+        totals: Dict[str, int] = {}
+        names: Dict[str, str] = {}
+        row_skus = []
+        for item in items:
+            sku = item.get('SKU', item.get('sku', ''))
+            row_skus.append(sku)
+            totals[sku] = totals.get(sku, 0) + _quantity(item)
+            if sku not in names:
+                names[sku] = item.get('Product_Name', item.get('product_name', ''))
+
+        self.skus: List[str] = sorted(totals)
+        self.names: List[str] = [names[sku] for sku in self.skus]
+        self.totals: List[int] = [totals[sku] for sku in self.skus]
+        self.packed: List[int] = [0] * len(self.skus)
+
+        position = {sku: i for i, sku in enumerate(self.skus)}
+        # Summary row and packed count of each item row
+        self._row_summary: List[int] = [position[sku] for sku in row_skus]
+        self._row_packed: List[int] = [0] * len(row_skus)
+
+        for state in order_state:
+            row = state.get('row')
+            if row is not None:
+                self.set_packed(row, state.get('packed', 0))
+
+    def __len__(self) -> int:
+        return len(self.skus)
+
+    def set_packed(self, row: int, packed: int) -> Optional[int]:
+        """
+        Record the packed count of one item row.
+
+        Returns:
+            The summary row whose packed count changed, or None if nothing changed.
+        """
+        if not 0 <= row < len(self._row_packed):
+            return None
+        delta = packed - self._row_packed[row]
+        if not delta:
+            return None
+        self._row_packed[row] = packed
+        index = self._row_summary[row]
+        self.packed[index] += delta
+        return index
+
+    def is_done(self, index: int) -> bool:
+        return self.packed[index] >= self.totals[index]
@@ -2,7 +2,15 @@ from PySide6.QtCore import QAbstractTableModel, Qt, QModelIndex
 from PySide6.QtGui import QColor
 from PySide6.QtWidgets import QWidget
 import pandas as pd
-from typing import Any
+from typing import Any, List
+
+# Background of rows whose 'Status' is 'Completed' (one shared instance)
+COMPLETED_ROW_COLOR = QColor('lightgreen')
+
+# Role values looked up once: each Qt.<Role> attribute access costs
+# microseconds in PySide6, more than the cached cell lookup itself.
+_DISPLAY_ROLE = Qt.DisplayRole
+_BACKGROUND_ROLE = Qt.BackgroundRole
 
 class OrderTableModel(QAbstractTableModel):
     """
@@ -12,8 +20,15 @@ class OrderTableModel(QAbstractTableModel):
     containing summarized order information and a QTableView widget. It handles
     data retrieval, header information, and cell styling based on order status.
 
+    Views call data() for every visible cell on every repaint, so the model
+    does not touch pandas there: the display text of each column is converted
+    to a list of strings once, and the 'Completed' status of each row is kept
+    in a flag list. setData() updates the DataFrame and these caches together.
+
     Attributes:
         _data (pd.DataFrame): The underlying DataFrame holding the order data.
+        _display (List[List[str]]): Display text per column, then per row.
+        _completed (List[bool]): Per row, whether its Status is 'Completed'.
     """
     def __init__(self, data: pd.DataFrame, parent: QWidget = None):
         """
@@ -25,6 +40,16 @@ class OrderTableModel(QAbstractTableModel):
         """
         super().__init__(parent)
         self._data = data
+        self._columns = [str(column) for column in data.columns]
+        self._row_count = data.shape[0]
+        self._display: List[List[str]] = [
+            [str(value) for value in data.iloc[:, col]] for col in range(data.shape[1])
+        ]
+        self._status_col = self.get_column_index('Status')
+        if self._status_col >= 0:
+            self._completed = [text == 'Completed' for text in self._display[self._status_col]]
+        else:
+            self._completed = [False] * self._row_count
 
     def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
         """
@@ -36,7 +61,7 @@ class OrderTableModel(QAbstractTableModel):
         Returns:
             int: The number of rows in the DataFrame.
         """
-        return self._data.shape[0]
+        return self._row_count
 
     def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
         """
@@ -48,7 +73,7 @@ class OrderTableModel(QAbstractTableModel):
         Returns:
             int: The number of columns in the DataFrame.
         """
-        return self._data.shape[1]
+        return len(self._columns)
 
     def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
         """
@@ -67,19 +92,11 @@ class OrderTableModel(QAbstractTableModel):
         if not index.isValid():
             return None
 
-        row = index.row()
-        col = index.column()
-
-        if role == Qt.DisplayRole:
-            return str(self._data.iloc[row, col])
+        if role == _DISPLAY_ROLE:
+            return self._display[index.column()][index.row()]
 
-        if role == Qt.BackgroundRole:
-            try:
-                status_col_index = self.get_column_index('Status')
-                if self._data.iloc[row, status_col_index] == 'Completed':
-                    return QColor('lightgreen')
-            except KeyError:
-                pass  # 'Status' column might not exist
+        if role == _BACKGROUND_ROLE and self._completed[index.row()]:
+            return COMPLETED_ROW_COLOR
 
         return None
 
@@ -96,7 +113,7 @@ class OrderTableModel(QAbstractTableModel):
             str | None: The column header text, or None for other cases.
         """
         if role == Qt.DisplayRole and orientation == Qt.Horizontal:
-            return str(self._data.columns[section])
+            return self._columns[section]
         return None
 
     def setData(self, index: QModelIndex, value: Any, role: int = Qt.EditRole) -> bool:
@@ -104,7 +121,9 @@ class OrderTableModel(QAbstractTableModel):
         Sets the data for a given index.
 
         This allows the model's data to be updated externally, for instance,
-        when the status or progress of an order changes.
+        when the status or progress of an order changes. dataChanged covers
+        just the edited cell, or the whole row when the Status change flips
+        the row's background.
 
         Args:
             index (QModelIndex): The index of the data to set.
@@ -114,11 +133,24 @@ class OrderTableModel(QAbstractTableModel):
         Returns:
             bool: True if the data was set successfully, False otherwise.
         """
-        if role == Qt.EditRole:
+        if role == Qt.EditRole and index.isValid():
             row = index.row()
             col = index.column()
             self._data.iloc[row, col] = value
-            self.dataChanged.emit(index, index)
+            # Read back: the DataFrame may have coerced the value to the column dtype
+            stored = self._data.iat[row, col]
+            self._display[col][row] = str(stored)
+            if col == self._status_col:
+                completed = stored == 'Completed'
+                if completed != self._completed[row]:
+                    self._completed[row] = completed
+                    self.dataChanged.emit(
+                        self.index(row, 0),
+                        self.index(row, len(self._columns) - 1),
+                        [Qt.DisplayRole, Qt.EditRole, Qt.BackgroundRole],
+                    )
+                    return True
+            self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
             return True
         return False
 
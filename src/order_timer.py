@@ -0,0 +1,106 @@
+"""
+Monotonic-clock timing for the order currently being packed.
+
+Every scan used to call get_current_timestamp() and then calculate_duration(),
+re-parsing both ISO strings (fromisoformat + timezone handling) just to get
+the seconds since the order started; order completion did the same. Those
+wall-clock differences also jumped whenever Windows corrected the clock via
+NTP in the middle of an order.
+
+OrderTimer captures a time.monotonic() anchor when the order starts and
+derives every offset from monotonic deltas. Wall-clock ISO strings are only
+formatted for the records that get persisted (scanned_at, completed_at),
+as start time + monotonic offset, so they stay consistent with the offsets.
+
+Across a resume (new process, monotonic clock unrelated) the persisted ISO
+start time is parsed once and the anchor is placed that many seconds in the
+past, so offsets continue from the original start exactly as before.
+"""
+
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from shared.metadata_utils import parse_timestamp
+
+
+class OrderTimer:
+    """
+    Timing anchor for one order.
+
+    Attributes:
+        started_at (Optional[str]): ISO start timestamp the timer is anchored to,
+            or None if not started.
+    """
+
+    def __init__(
+        self,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], datetime] = lambda: datetime.now().astimezone(),
+    ):
+        """
+        Args:
+            clock: Monotonic clock in seconds (injectable for tests)
+            wall_clock: Returns the current timezone-aware datetime
+        """
+        self._clock = clock
+        self._wall_clock = wall_clock
+        self.started_at: Optional[str] = None
+        self._start_dt: Optional[datetime] = None
+        self._anchor: Optional[float] = None
+
+    def start(self) -> str:
+        """
+        Anchor a new order at the current time.
+
+        Returns:
+            str: ISO start timestamp (same format as get_current_timestamp())
+        """
+        self._anchor = self._clock()
+        self._start_dt = self._wall_clock()
+        self.started_at = self._start_dt.isoformat()
+        return self.started_at
+
+    def resume(self, started_at: str) -> None:
+        """
+        Anchor to a persisted ISO start timestamp (order resumed after restart).
+
+        If started_at cannot be parsed, elapsed_seconds() returns 0, matching
+        calculate_duration()'s behaviour for unparsable timestamps.
+        """
+        self.started_at = started_at
+        start_dt = parse_timestamp(started_at)
+        if start_dt is None:
+            self._start_dt = None
+            self._anchor = None
+            return
+        elapsed = max(0.0, (self._wall_clock() - start_dt).total_seconds())
+        self._start_dt = start_dt
+        self._anchor = self._clock() - elapsed
+
+    def elapsed(self) -> float:
+        """Seconds since the order started (monotonic, never negative)."""
+        if self._anchor is None:
+            return 0.0
+        return max(0.0, self._clock() - self._anchor)
+
+    def elapsed_seconds(self) -> int:
+        """Whole seconds since the order started (truncated, as calculate_duration())."""
+        return int(self.elapsed())
+
+    def timestamp(self, elapsed: Optional[float] = None) -> str:
+        """
+        ISO timestamp for an offset from the order start.
+
+        Args:
+            elapsed: Offset in seconds; defaults to now (elapsed())
+
+        Returns:
+            str: start time + offset, or the current wall-clock time if the
+                 timer has no valid start.
+        """
+        if self._start_dt is None:
+            return self._wall_clock().isoformat()
+        if elapsed is None:
+            elapsed = self.elapsed()
+        return (self._start_dt + timedelta(seconds=elapsed)).isoformat()
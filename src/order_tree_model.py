@@ -0,0 +1,286 @@
+"""
+Tree model of the session's orders and their lines for the packing view.
+
+The order tree used to be a QTreeWidget that MainWindow cleared and rebuilt
+from scratch (one QTreeWidgetItem + five QFonts per order and per line, plus a
+linear SKU search per line) on every item_packed and status signal, so each
+scan cost O(session) in the UI thread.
+
+OrderTreeModel instead reads straight from the logic layer: the SessionStore
+for the static columns (order number, product, quantity, courier) and
+session_packing_state for the packed counts. Nothing is copied, so a scan
+only has to tell the model which order changed (order_changed()); it emits
+dataChanged for that order's row and its line rows and the view repaints
+whatever of them is visible. A full reset happens only when a packing list is
+loaded or the session ends.
+
+The model also owns the OrderSearchIndex used by the search box, keeping the
+indexed order statuses ("New" / "In Progress" / "Completed") current as orders
+change.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from PySide6.QtCore import QAbstractItemModel, QModelIndex, Qt
+from PySide6.QtGui import QFont
+
+from logger import get_logger
+from order_search_index import OrderSearchIndex
+from packing_progress import CompletedOrderSet
+
+logger = get_logger(__name__)
+
+HEADERS = ["Order / Item", "Product", "Quantity", "Status", "Courier"]
+
+# internalId of top-level (order) indexes; line indexes store parent row + 1
+_ORDER_ID = 0
+
+# Looked up once (Qt.<Role> attribute access is slow in PySide6)
+_DISPLAY_ROLE = Qt.DisplayRole
+_FONT_ROLE = Qt.FontRole
+
+
+def _to_int(value: Any, default: int = 1) -> int:
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return default
+
+
+class OrderTreeModel(QAbstractItemModel):
+    """
+    Two-level model: orders (sorted by order number) with their lines as children.
+
+    The logic object only needs `session_store` and `session_packing_state`
+    attributes (PackerLogic in the app).
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._logic = None
+        self._store = None
+        self._orders: List[Any] = []
+        self._order_rows: Dict[Any, int] = {}
+
+        self._completed = CompletedOrderSet()
+
+        # order -> (state container, {line row: item state}, {sku: item state});
+        # values are the live state dicts, so only a new container invalidates them.
+        self._line_states: Dict[Any, tuple] = {}
+        self._search_index: Optional[OrderSearchIndex] = None
+
+        self._order_font = QFont()
+        self._order_font.setBold(True)
+        self._order_font.setPointSize(11)
+        self._line_font = QFont()
+        self._line_font.setPointSize(10)
+
+    # ------------------------------------------------------------------
+    # Source
+    # ------------------------------------------------------------------
+
+    def set_logic(self, logic) -> None:
+        """Show the orders of logic's packing list (None clears the model)."""
+        self.beginResetModel()
+        self._logic = logic
+        self._store = getattr(logic, 'session_store', None) if logic is not None else None
+        self._orders = sorted(self._store.order_numbers, key=str) if self._store is not None else []
+        self._order_rows = {order: row for row, order in enumerate(self._orders)}
+        self._completed = CompletedOrderSet()
+        self._line_states = {}
+        self._search_index = None
+        self.endResetModel()
+
+    def clear(self) -> None:
+        self.set_logic(None)
+
+    def order_row(self, order_number: Any) -> int:
+        """Row of an order, or -1 if it is not in the model."""
+        return self._order_rows.get(order_number, -1)
+
+    def order_index(self, order_number: Any, column: int = 0) -> QModelIndex:
+        row = self.order_row(order_number)
+        if row < 0:
+            return QModelIndex()
+        return self.createIndex(row, column, _ORDER_ID)
+
+    def order_number(self, row: int) -> Any:
+        return self._orders[row]
+
+    def order_changed(self, order_number: Any) -> None:
+        """
+        Repaint one order after a scan, cancel, status change or completion.
+
+        Emits dataChanged for the order row and one range for its line rows.
+        """
+        row = self.order_row(order_number)
+        if row < 0:
+            return
+        self._line_states.pop(order_number, None)
+        if self._search_index is not None:
+            self._search_index.set_status(order_number, self.order_status_name(order_number))
+        last_column = len(HEADERS) - 1
+        self.dataChanged.emit(self.createIndex(row, 0, _ORDER_ID), self.createIndex(row, last_column, _ORDER_ID))
+        line_count = len(self._store.line_range(order_number))
+        if line_count:
+            self.dataChanged.emit(
+                self.createIndex(0, 0, row + 1),
+                self.createIndex(line_count - 1, last_column, row + 1),
+            )
+
+    @property
+    def search_index(self) -> Optional[OrderSearchIndex]:
+        """Search index of the shown orders, built on first use (None when empty)."""
+        if self._search_index is None and self._store is not None:
+            self._search_index = OrderSearchIndex(self._store)
+            for order_number in self._orders:
+                self._search_index.set_status(order_number, self.order_status_name(order_number))
+        return self._search_index
+
+    def order_status_name(self, order_number: Any) -> str:
+        """Plain status of an order: "Completed", "In Progress" or "New"."""
+        if self.is_completed(order_number):
+            return "Completed"
+        if self._order_state(order_number) is not None:
+            return "In Progress"
+        return "New"
+
+    def is_completed(self, order_number: Any) -> bool:
+        state = self._logic.session_packing_state if self._logic is not None else {}
+        return self._completed.contains(state.get('completed_orders', []), order_number)
+
+    # ------------------------------------------------------------------
+    # State lookups
+    # ------------------------------------------------------------------
+
+    def _order_state(self, order_number: Any):
+        in_progress = self._logic.session_packing_state.get('in_progress', {})
+        return in_progress.get(order_number)
+
+    def _line_state(self, order_number: Any, line: int) -> Optional[Dict[str, Any]]:
+        """Item state of an order line, matched by its 'row' (SKU for legacy states)."""
+        order_state = self._order_state(order_number)
+        if order_state is None:
+            return None
+        cached = self._line_states.get(order_number)
+        if cached is None or cached[0] is not order_state:
+            items = order_state if isinstance(order_state, list) else list(order_state.values())
+            by_row: Dict[int, Dict[str, Any]] = {}
+            by_sku: Dict[Any, Dict[str, Any]] = {}
+            for item_state in items:
+                if not isinstance(item_state, dict):
+                    logger.warning(f"Skipping invalid item_state in {order_number}: {type(item_state).__name__}")
+                    continue
+                if 'row' in item_state:
+                    by_row.setdefault(item_state['row'], item_state)
+                by_sku.setdefault(item_state.get('original_sku'), item_state)
+            cached = (order_state, by_row, by_sku)
+            self._line_states[order_number] = cached
+        _, by_row, by_sku = cached
+        if by_row:
+            return by_row.get(line)
+        sku, _, _ = self._store.line(self._store.line_range(order_number)[line])
+        return by_sku.get(sku)
+
+    def _order_status(self, order_number: Any, line_count: int) -> str:
+        if self.is_completed(order_number):
+            return "✅ Completed"
+        scanned = 0
+        order_state = self._order_state(order_number)
+        if order_state is not None:
+            items = order_state if isinstance(order_state, list) else order_state.values()
+            scanned = sum(
+                1 for s in items
+                if isinstance(s, dict) and s.get('packed', 0) >= s.get('required', 1)
+            )
+        return f"⏳ {scanned}/{line_count} items"
+
+    def _line_status(self, order_number: Any, line: int, qty: Any) -> str:
+        qty_int = _to_int(qty)
+        if self.is_completed(order_number):
+            scanned = qty_int
+        else:
+            item_state = self._line_state(order_number, line)
+            scanned = item_state.get('packed', 0) if item_state is not None else 0
+        if scanned >= qty_int:
+            return "✅ Scanned"
+        return f"⏳ Pending ({scanned}/{qty_int})"
+
+    # ------------------------------------------------------------------
+    # QAbstractItemModel
+    # ------------------------------------------------------------------
+
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        if column < 0 or column >= len(HEADERS) or row < 0:
+            return QModelIndex()
+        if not parent.isValid():
+            if row >= len(self._orders):
+                return QModelIndex()
+            return self.createIndex(row, column, _ORDER_ID)
+        if parent.internalId() != _ORDER_ID or parent.row() >= len(self._orders):
+            return QModelIndex()
+        if row >= len(self._store.line_range(self._orders[parent.row()])):
+            return QModelIndex()
+        return self.createIndex(row, column, parent.row() + 1)
+
+    def parent(self, index: QModelIndex = QModelIndex()) -> QModelIndex:
+        if not index.isValid() or index.internalId() == _ORDER_ID:
+            return QModelIndex()
+        return self.createIndex(index.internalId() - 1, 0, _ORDER_ID)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if not parent.isValid():
+            return len(self._orders)
+        if parent.internalId() != _ORDER_ID or parent.column() != 0:
+            return 0
+        return len(self._store.line_range(self._orders[parent.row()]))
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return len(HEADERS)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole) -> Any:
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal and 0 <= section < len(HEADERS):
+            return HEADERS[section]
+        return None
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        is_order = index.internalId() == _ORDER_ID
+
+        if role == _FONT_ROLE:
+            return self._order_font if is_order else self._line_font
+        if role != _DISPLAY_ROLE:
+            return None
+
+        column = index.column()
+        if is_order:
+            order_number = self._orders[index.row()]
+            if column == 0:
+                return f"{order_number}"
+            if column == 1:
+                return f"{len(self._store.line_range(order_number))} items"
+            if column == 3:
+                return self._order_status(order_number, len(self._store.line_range(order_number)))
+            if column == 4:
+                return self._store.courier(order_number)
+            return ""
+
+        order_number = self._orders[index.internalId() - 1]
+        line = index.row()
+        sku, product, qty = self._store.line(self._store.line_range(order_number)[line])
+        if column == 0:
+            return f"  {'Unknown' if sku is None else sku}"
+        if column == 1:
+            return 'Unknown' if product is None else product
+        qty = 1 if qty is None else qty
+        if column == 2:
+            return str(qty)
+        if column == 3:
+            return self._line_status(order_number, line, qty)
+        return ""
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlags:
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
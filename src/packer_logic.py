@@ -7,6 +7,7 @@ import shutil
 import pandas as pd  # Excel file handling and data manipulation
 
 # Data persistence and utilities
+import copy
 import json
 from pathlib import Path
 from datetime import datetime
@@ -20,7 +21,17 @@ from typing import List, Dict, Any, Tuple
 # Local imports
 from logger import get_logger
 from json_cache import get_cached_json, invalidate_json_cache
+from fs_metadata_cache import invalidate_fs_cache
 from async_state_writer import AsyncStateWriter
+from state_journal import StateJournal, JOURNAL_FILE_NAME
+from state_snapshot import CompletedOrdersEncoder, dumps_state
+from packing_progress import OrderProgress, SessionProgress
+from order_timer import OrderTimer
+from session_store import SessionStore, SessionStoreBuilder, OrdersView
+from wave_packing import Wave, WaveOrderContext, DEFAULT_WAVE_SIZE, TIE_BREAK_SLOT
+from packing_list_cache import (
+    COMPILED_FILE_NAME, CompiledPackingList, hash_bytes, load_compiled, save_compiled,
+)
 
 # Initialize module-level logger
 logger = get_logger(__name__)
@@ -62,12 +73,13 @@ class PackerLogic(QObject):
                         (e.g., Sessions/CLIENT_M/2025-11-10_1/packing/DHL_Orders/)
         barcode_dir (Path): Subdirectory for generated barcodes (work_dir/barcodes/)
         reports_dir (Path): Subdirectory for packing reports (work_dir/reports/)
-        packing_list_df (pd.DataFrame): The original, unprocessed DataFrame
-                                        loaded from the Excel file.
-        processed_df (pd.DataFrame): The DataFrame after column mapping and
-                                     validation.
-        orders_data (Dict): A dictionary containing details for each order,
-                            including its barcode path and item list.
+        session_store (SessionStore): Columnar store of the packing list's orders
+                                      and lines — the single source of truth.
+        packing_list_df (pd.DataFrame): DataFrame view of session_store, built
+                                        on access (Excel export).
+        processed_df (pd.DataFrame): Same view as packing_list_df (legacy name).
+        orders_data (Mapping): Per-order items + metadata (an OrdersView over
+                               session_store after loading).
         current_order_number (str | None): The order number currently being packed.
         current_order_state (Dict): The detailed packing state for the current
                                     order (required vs. packed counts for each SKU).
@@ -78,7 +90,7 @@ class PackerLogic(QObject):
     item_packed = Signal(str, int, int)  # order_number, packed_count, required_count
     all_orders_complete = Signal()  # Emitted when every order in the session is packed
 
-    def __init__(self, client_id: str, profile_manager, work_dir: str):
+    def __init__(self, client_id: str, profile_manager, work_dir: str, use_state_journal: bool = True):
         """
         Initialize PackerLogic instance for a specific client.
 
@@ -88,6 +100,10 @@ class PackerLogic(QObject):
             work_dir: Work directory for this packing list
                      (e.g., Sessions/CLIENT_M/2025-11-10_1/packing/DHL_Orders/)
                      For legacy Excel workflow, this will be the barcodes directory
+            use_state_journal: Append hot-path events to packing_state.journal and
+                     write full packing_state.json snapshots only at checkpoints
+                     (see state_journal). False restores the legacy behaviour of
+                     rewriting the whole state file on every scan.
         """
         super().__init__()
 
@@ -104,11 +120,19 @@ class PackerLogic(QObject):
         # Ensure reports directory exists (barcodes dir created by Shopify Tool)
         self.reports_dir.mkdir(parents=True, exist_ok=True)
 
-        self.packing_list_df = None
-        self.processed_df = None
+        # Session-wide item counters, derived lazily from session_store (see get_session_progress())
+        self._session_progress: SessionProgress | None = None
+        # Packing list orders/lines (see session_store); DataFrames are views of it
+        self.session_store = None
+        # Normalized order number -> original order number (see resolve_order()).
+        # Kept in sync by the orders_data setter; must exist before the first assignment.
+        self._order_index: Dict[str, str] = {}
+        self.order_number_collisions: Dict[str, List[str]] = {}
         self.orders_data = {}
         self.current_order_number = None
         self.current_order_state = {}
+        # SKU index + running counters for current_order_state (see packing_progress)
+        self._current_progress: OrderProgress | None = None
 
         # Session metadata (for new state structure)
         self.session_id = None  # Will be set when loading packing list
@@ -128,8 +152,12 @@ class PackerLogic(QObject):
         # Phase 2b: Order-level timing tracking — initialized BEFORE _load_session_state()
         # so that _load_session_state() can populate them from disk without being overwritten.
         self.current_order_start_time = None  # ISO timestamp when order scanning started
+        # Monotonic anchor for current_order_start_time (see _get_order_timer())
+        self._order_timer = OrderTimer()
         self.current_order_items_scanned = []  # List of items with scan timestamps
         self.completed_orders_metadata = []  # List of completed orders with timing data
+        # Completed-order records are frozen, so they are JSON-encoded once (see state_snapshot)
+        self._completed_encoder = CompletedOrdersEncoder()
 
         # Per-order counters for 1.7 metrics — reset by start_order_packing()
         self.current_order_corrections: int = 0           # cancel_item_scan() events
@@ -139,6 +167,17 @@ class PackerLogic(QObject):
         # Load SKU mapping from ProfileManager
         self.sku_map = self._load_sku_mapping()
 
+        # Wave packing (see wave_packing): None = single-order mode.
+        # _load_session_state() stores a persisted wave here; restored below.
+        self.wave: Wave | None = None
+        self._loaded_wave_block: Dict[str, Any] | None = None
+
+        # Scan journal (None = legacy full-write mode); must exist before loading
+        # so _load_session_state() can replay it on top of the last snapshot.
+        self._journal: StateJournal | None = (
+            StateJournal(Path(self._get_journal_file_path())) if use_state_journal else None
+        )
+
         # Load session state if exists (must come AFTER Phase 2b vars are declared)
         self._load_session_state()
 
@@ -148,9 +187,15 @@ class PackerLogic(QObject):
         # Unknown/incorrect scan tracking: raw barcodes that didn't match any SKU
         self.unknown_scans: List[str] = []
 
+        # Reopen a wave that was active when the session was interrupted
+        self._restore_wave(self._loaded_wave_block)
+
         # Write-behind queue: state writes happen in background to avoid UI freezes.
         # sync_mode=True is used in tests to keep writes synchronous.
-        self._state_writer = AsyncStateWriter(self._do_atomic_write)
+        self._state_writer = AsyncStateWriter(
+            self._do_atomic_write,
+            append_fn=self._journal.write_lines if self._journal is not None else None,
+        )
 
         logger.info(f"PackerLogic initialized for client {client_id}")
         logger.debug(f"Work directory: {self.work_dir}")
@@ -159,6 +204,72 @@ class PackerLogic(QObject):
         logger.debug(f"Loaded {len(self.sku_map)} SKU mappings")
         logger.debug("Phase 2b timing variables initialized (loaded from state if available)")
 
+    @property
+    def orders_data(self) -> Dict[str, Dict[str, Any]]:
+        """Per-order details (items + metadata), keyed by original order number."""
+        return self._orders_data
+
+    @orders_data.setter
+    def orders_data(self, value: Dict[str, Dict[str, Any]]) -> None:
+        # Every assignment rebuilds the order-barcode index so resolve_order()
+        # can never drift from the orders it resolves against.
+        self._orders_data = value if value is not None else {}
+        self._rebuild_order_index()
+
+    def _set_orders_view(self, view: OrdersView, order_index: Dict[str, str],
+                         collisions: Dict[str, List[str]]) -> None:
+        """Install orders_data with an order index computed earlier (compiled packing list)."""
+        self._orders_data = view
+        self._order_index = order_index
+        self.order_number_collisions = collisions
+
+    @property
+    def session_store(self) -> SessionStore | None:
+        """Columnar store of the loaded packing list, or None before loading."""
+        return self._session_store
+
+    @session_store.setter
+    def session_store(self, value: SessionStore | None) -> None:
+        # A new packing list invalidates the session totals derived from the old one
+        self._session_store = value
+        self._session_progress = None
+
+    @property
+    def processed_df(self) -> pd.DataFrame | None:
+        """
+        The packing list as a DataFrame, materialised from session_store.
+
+        A new DataFrame is built on every access — fine for export, too
+        expensive for per-scan code, which should use session_store.
+        """
+        if self._session_store is None:
+            return None
+        return self._session_store.to_dataframe()
+
+    @processed_df.setter
+    def processed_df(self, value: pd.DataFrame | None) -> None:
+        self.session_store = SessionStore.from_dataframe(value) if value is not None else None
+
+    # Kept as a separate name for callers of the original (pre-processing) DataFrame;
+    # the two were always identical copies.
+    packing_list_df = processed_df
+
+    def get_session_progress(self) -> SessionProgress:
+        """
+        Return the session progress accumulator (total/packed items).
+
+        Built once from session_store on first use and then maintained
+        incrementally by scans, cancels, force-confirms and order completions.
+        """
+        if self._session_progress is None:
+            try:
+                self._session_progress = SessionProgress.from_store(self._session_store)
+            except Exception as e:
+                logger.warning(f"Could not calculate session totals: {e}")
+                self._session_progress = SessionProgress({})
+        self._session_progress.sync(self.session_packing_state)
+        return self._session_progress
+
     def _load_sku_mapping(self) -> Dict[str, str]:
         """
         Load SKU mapping from ProfileManager for the current client.
@@ -240,6 +351,10 @@ class PackerLogic(QObject):
             # Unified workflow: state in work_dir root
             return str(self.work_dir / STATE_FILE_NAME)
 
+    def _get_journal_file_path(self) -> str:
+        """Return path to packing_state.journal, next to packing_state.json."""
+        return str(Path(self._get_state_file_path()).with_name(JOURNAL_FILE_NAME))
+
     def _get_summary_file_path(self) -> str:
         """
         Return path to session_summary.json in work_dir root.
@@ -270,6 +385,8 @@ class PackerLogic(QObject):
         if not os.path.exists(state_file):
             logger.debug("No existing session state found, starting fresh")
             self.session_packing_state = {'in_progress': {}, 'completed_orders': [], 'skipped_orders': [], 'skipped_orders_timing': {}}
+            # Crash before the first snapshot: everything is in the journal
+            self._replay_state_journal(after_seq=0)
             return
 
         try:
@@ -446,6 +563,20 @@ class PackerLogic(QObject):
             # Restore extra items if present (crash recovery)
             self.current_extra_items = state_data.get('_current_extras', {})
 
+            # Wave packing: open orders of an active wave (restored in __init__)
+            wave_block = state_data.get('in_progress', {}).get('_wave')
+            self._loaded_wave_block = wave_block if isinstance(wave_block, dict) else None
+
+            # Journaled mode: apply events recorded after this snapshot
+            if self._journal is not None:
+                if 'journal_seq' in state_data:
+                    self._replay_state_journal(after_seq=state_data.get('journal_seq') or 0)
+                elif self._journal.path.exists():
+                    # Snapshot written without journaling (legacy mode / older
+                    # version) after the journal: its records are stale.
+                    logger.warning("State snapshot has no journal_seq, discarding stale journal")
+                    self._journal.discard()
+
             in_progress_count = len(self.session_packing_state['in_progress'])
             completed_count = len(self.session_packing_state['completed_orders'])
 
@@ -455,46 +586,122 @@ class PackerLogic(QObject):
             logger.error(f"Error loading session state: {e}, starting fresh")
             self.session_packing_state = {'in_progress': {}, 'completed_orders': [], 'skipped_orders': [], 'skipped_orders_timing': {}}
 
+    def _replay_state_journal(self, after_seq: int) -> None:
+        """
+        Apply journal records newer than the loaded snapshot (see state_journal).
+
+        Records are order-level and last-writer-wins, so each one simply
+        overwrites the state of the order it touches plus the small
+        session-level fields (current timing, extras, skipped orders).
+
+        Args:
+            after_seq: journal_seq of the loaded snapshot (0 = no snapshot)
+        """
+        if self._journal is None:
+            return
+
+        records = self._journal.read_records(after_seq=after_seq)
+        if not records:
+            return
+
+        in_progress = self.session_packing_state['in_progress']
+        completed = self.session_packing_state['completed_orders']
+
+        for record in records:
+            order_num = record.get('order_number')
+
+            if record.get('event') == 'complete':
+                if order_num:
+                    in_progress.pop(order_num, None)
+                    if order_num not in completed:
+                        completed.append(order_num)
+                        if isinstance(record.get('completed'), dict):
+                            self.completed_orders_metadata.append(record['completed'])
+            else:
+                order_state = record.get('order_state')
+                if order_num and isinstance(order_state, list) and order_num not in completed:
+                    in_progress[order_num] = [item for item in order_state if isinstance(item, dict)]
+
+            timing_data = record.get('timing')
+            if isinstance(timing_data, dict):
+                self.current_order_start_time = timing_data.get('current_order_start_time')
+                self.current_order_items_scanned = timing_data.get('items_scanned', [])
+                self.current_order_corrections = timing_data.get('corrections', 0)
+                self.current_order_extra_scan_count = timing_data.get('extra_scan_count', 0)
+                self.current_order_unknown_scan_count = timing_data.get('unknown_scan_count', 0)
+            else:
+                self.current_order_start_time = None
+                self.current_order_items_scanned = []
+                self.current_order_corrections = 0
+                self.current_order_extra_scan_count = 0
+                self.current_order_unknown_scan_count = 0
+
+            self.current_extra_items = record.get('current_extras') or {}
+            wave_block = record.get('wave')
+            self._loaded_wave_block = wave_block if isinstance(wave_block, dict) else None
+            if 'skipped_orders' in record:
+                self.session_packing_state['skipped_orders'] = list(record['skipped_orders'])
+            if 'skipped_orders_timing' in record:
+                self.session_packing_state['skipped_orders_timing'] = dict(record['skipped_orders_timing'])
+
+        logger.info(
+            f"Replayed {len(records)} journal records after snapshot seq {after_seq}: "
+            f"{len(in_progress)} in progress, {len(completed)} completed"
+        )
+
+    def _build_timing_block(self) -> Dict[str, Any] | None:
+        """Return the in-progress timing block for the current order, or None."""
+        if not (self.current_order_number and self.current_order_start_time):
+            return None
+        return {
+            "current_order_start_time": self.current_order_start_time,
+            "items_scanned": self.current_order_items_scanned,
+            "corrections": self.current_order_corrections,
+            "extra_scan_count": self.current_order_extra_scan_count,
+            "unknown_scan_count": self.current_order_unknown_scan_count,
+        }
+
+    def _build_wave_block(self) -> Dict[str, Any] | None:
+        """
+        Return the persisted form of the active wave, or None.
+
+        Stored under in_progress['_wave'] (underscore keys are skipped by every
+        reader of in_progress), one entry per open order with the same timing
+        fields as '_timing' plus its pending extras.
+        """
+        if self.wave is None:
+            return None
+        self._sync_focused_wave_context()
+        return {
+            "max_orders": self.wave.max_orders,
+            "tie_break": self.wave.tie_break,
+            "orders": [
+                {"order_number": ctx.order_number, "slot": ctx.slot, "timing": ctx.timing_block()}
+                for ctx in self.wave.contexts()
+            ],
+        }
+
     def _build_state_dict(self) -> Dict[str, Any]:
         """
         Build the complete state dictionary from current in-memory data.
 
-        Must be called on the main thread (reads self.processed_df and
+        Must be called on the main thread (reads the session progress counters and
         self.session_packing_state which are mutated by packing logic).
         Returns a plain serialisable dict — safe to hand off to a background thread.
         """
         total_orders = len(self.orders_data) if self.orders_data else 0
         completed_orders_count = len(self.session_packing_state.get('completed_orders', []))
 
-        total_items = 0
-        packed_items = 0
-
-        if self.processed_df is not None:
-            try:
-                total_items = int(pd.to_numeric(self.processed_df['Quantity'], errors='coerce').sum())
-            except Exception as e:
-                logger.warning(f"Could not calculate total_items: {e}")
-
-        if self.processed_df is not None and self.session_packing_state.get('completed_orders'):
-            try:
-                completed_items = pd.to_numeric(
-                    self.processed_df[
-                        self.processed_df['Order_Number'].isin(self.session_packing_state['completed_orders'])
-                    ]['Quantity'],
-                    errors='coerce'
-                ).sum()
-                packed_items += int(completed_items)
-            except Exception as e:
-                logger.warning(f"Could not calculate packed items from completed orders: {e}")
-
-        for order_state in self.session_packing_state.get('in_progress', {}).values():
-            if isinstance(order_state, list):
-                for item in order_state:
-                    if isinstance(item, dict):
-                        packed_items += item.get('packed', 0)
+        # O(1) per scan: counters are maintained incrementally (see SessionProgress)
+        session_progress = self.get_session_progress()
+        total_items = session_progress.total_items
+        packed_items = session_progress.packed_items
 
         from shared.metadata_utils import get_current_timestamp
 
+        timing = self._build_timing_block()
+        wave = self._build_wave_block()
+
         return {
             "version": "1.3.0",
             "session_id": self.session_id,
@@ -513,15 +720,8 @@ class PackerLogic(QObject):
             },
             "in_progress": {
                 **self.session_packing_state.get('in_progress', {}),
-                **({
-                    "_timing": {
-                        "current_order_start_time": self.current_order_start_time,
-                        "items_scanned": self.current_order_items_scanned,
-                        "corrections": self.current_order_corrections,
-                        "extra_scan_count": self.current_order_extra_scan_count,
-                        "unknown_scan_count": self.current_order_unknown_scan_count,
-                    }
-                } if self.current_order_number and self.current_order_start_time else {})
+                **({"_timing": timing} if timing else {}),
+                **({"_wave": wave} if wave else {})
             },
             "_current_extras": self.current_extra_items if self.current_extra_items else {},
             "completed": (
@@ -558,12 +758,16 @@ class PackerLogic(QObject):
                 delete=False,
                 encoding='utf-8'
             ) as tmp_file:
-                json.dump(state_data, tmp_file, indent=2, ensure_ascii=False)
+                tmp_file.write(dumps_state(state_data, indent=2))
                 tmp_path = tmp_file.name
 
             shutil.move(tmp_path, state_file)
             invalidate_json_cache(state_file)
 
+            # The snapshot now covers every journal record up to journal_seq
+            if self._journal is not None and 'journal_seq' in state_data:
+                self._journal.compact(state_data['journal_seq'])
+
             logger.debug(f"Session state saved: {completed_orders_count}/{total_orders} orders, {packed_items}/{total_items} items")
 
         except Exception as e:
@@ -577,28 +781,90 @@ class PackerLogic(QObject):
         call this method can rely on the file being present immediately after return.
         """
         self._state_writer.flush()
-        self._state_writer.schedule(self._build_state_dict())
+        self._schedule_snapshot()
         # Flush again so the just-scheduled write completes before we return
         self._state_writer.flush()
 
-    def _save_session_state_async(self) -> None:
+    def _build_state_snapshot(self) -> Dict[str, Any]:
         """
-        Schedule an async write of the current state (non-blocking).
+        Build a state dict the writer thread can serialise without a deep copy.
+
+        Only the mutable sections (in-progress orders, current extras) are
+        copied here; 'completed' is an incrementally pre-encoded, immutable
+        view (see state_snapshot), so the cost does not grow with the number
+        of completed orders.
+        """
+        state = self._build_state_dict()
+        state["in_progress"] = copy.deepcopy(state["in_progress"])
+        state["_current_extras"] = dict(state["_current_extras"])
+        if self.completed_orders_metadata:
+            state["completed"] = self._completed_encoder.encode(self.completed_orders_metadata)
+        if self._journal is not None:
+            state["journal_seq"] = self._journal.mark_snapshot()
+        return state
+
+    def _schedule_snapshot(self) -> None:
+        """Schedule a full packing_state.json write (stamped with journal_seq when journaling)."""
+        self._state_writer.schedule(self._build_state_snapshot(), copy_state=False)
+
+    def _build_journal_record(self, event: str) -> Dict[str, Any]:
+        """Build the order-level journal record for an event (see state_journal)."""
+        from shared.metadata_utils import get_current_timestamp
+
+        order_num = self.current_order_number
+        record = {
+            "at": get_current_timestamp(),
+            "order_number": order_num,
+            "order_state": self.session_packing_state['in_progress'].get(order_num) if order_num else None,
+            "timing": self._build_timing_block(),
+            "current_extras": self.current_extra_items,
+            "wave": self._build_wave_block(),
+            "skipped_orders": self.session_packing_state.get('skipped_orders', []),
+            "skipped_orders_timing": self.session_packing_state.get('skipped_orders_timing', {}),
+        }
+        if event == "complete" and self.completed_orders_metadata:
+            record["completed"] = self.completed_orders_metadata[-1]
+        return record
+
+    def _append_journal(self, event: str) -> None:
+        """Encode one journal record on the main thread and queue it for append."""
+        self._state_writer.append(self._journal.encode(event, self._build_journal_record(event)))
+
+    def _save_session_state_async(self, event: str = "update") -> None:
+        """
+        Persist the current state without blocking (hot path).
 
         Use on the hot path (every SKU scan, cancel, extra) where a small
         write delay is acceptable and UI responsiveness matters most.
+        In journaled mode only a small record for the event is appended;
+        a full snapshot follows every journal.snapshot_interval events.
+
+        Args:
+            event: Journal event name ("start", "scan", "cancel", "extra", "skip", ...)
         """
-        self._state_writer.schedule(self._build_state_dict())
+        if self._journal is None:
+            self._schedule_snapshot()
+            return
+
+        self._append_journal(event)
+        if self._journal.snapshot_due():
+            self._schedule_snapshot()
 
-    def _save_session_state_sync(self) -> None:
+    def _save_session_state_sync(self, event: str | None = None) -> None:
         """
         Flush any pending async write, write the current state, and wait for it to land.
 
         Use at order-complete and session-end checkpoints to guarantee the
         file on disk is up-to-date before the next significant action.
+
+        Args:
+            event: Optional journal event recorded before the snapshot, so the
+                   event survives even if the snapshot write fails.
         """
+        if event and self._journal is not None:
+            self._append_journal(event)
         self._state_writer.flush()
-        self._state_writer.schedule(self._build_state_dict())
+        self._schedule_snapshot()
         self._state_writer.flush()  # Wait for the just-scheduled write to complete
 
     def save_state(self) -> None:
@@ -609,8 +875,12 @@ class PackerLogic(QObject):
         """
         Flush any pending state write and shut down the background writer thread.
 
-        Call this when the session ends or the PackerLogic instance is discarded.
+        In journaled mode a final snapshot is written first if events were
+        journaled since the last one. Call this when the session ends or the
+        PackerLogic instance is discarded.
         """
+        if self._journal is not None and self._journal.events_since_snapshot:
+            self._save_session_state_sync()
         self._state_writer.shutdown()
 
     def _build_completed_list(self) -> List[Dict[str, Any]]:
@@ -658,22 +928,19 @@ class PackerLogic(QObject):
 
         Phase 2b: Enhanced timing tracking
         """
-        from shared.metadata_utils import get_current_timestamp, calculate_duration
-
         if not self.current_order_number:
             logger.warning("_complete_current_order called but no current order")
             return
 
-        # Record completion time
-        completed_at = get_current_timestamp()
-
-        # Calculate order duration
-        if self.current_order_start_time:
-            duration_seconds = calculate_duration(
-                self.current_order_start_time,
-                completed_at
-            )
+        # Record completion time and duration from the monotonic order anchor
+        timer = self._get_order_timer()
+        if timer is not None:
+            elapsed = timer.elapsed()
+            completed_at = timer.timestamp(elapsed)
+            duration_seconds = int(elapsed)
         else:
+            from shared.metadata_utils import get_current_timestamp
+            completed_at = get_current_timestamp()
             duration_seconds = 0
             logger.warning(f"Order {self.current_order_number} has no start time")
 
@@ -696,7 +963,9 @@ class PackerLogic(QObject):
             "completed_at": completed_at,
             "duration_seconds": duration_seconds,
             "items_count": items_count,
-            "items": self.current_order_items_scanned.copy(),
+            # Copy each scan record: completed-order metadata is treated as frozen
+            # and encoded only once for state snapshots (see state_snapshot)
+            "items": [dict(record) for record in self.current_order_items_scanned],
             # 1.7 per-order counters
             "corrections": self.current_order_corrections,
             "extra_scans_count": self.current_order_extra_scan_count,
@@ -821,6 +1090,60 @@ class PackerLogic(QObject):
 
         return normalized
 
+    def _rebuild_order_index(self) -> None:
+        """
+        Build the normalized-order-number -> original-order-number index.
+
+        Called whenever orders_data is replaced, so lookups by scanned barcode
+        are O(1) regardless of list size. Orders whose numbers normalize to the
+        same string are recorded in order_number_collisions; the first order
+        in list order keeps the index slot, matching the previous linear scan.
+        """
+        index: Dict[str, str] = {}
+        collisions: Dict[str, List[str]] = {}
+
+        for order_number in self._orders_data:
+            normalized = self._normalize_order_number(order_number)
+            if not normalized:
+                continue
+            existing = index.get(normalized)
+            if existing is None:
+                index[normalized] = order_number
+            else:
+                collisions.setdefault(normalized, [existing]).append(order_number)
+
+        for normalized, order_numbers in collisions.items():
+            logger.warning(
+                f"Order number collision: {order_numbers} all normalize to '{normalized}'; "
+                f"scans of '{normalized}' resolve to '{order_numbers[0]}'"
+            )
+
+        self._order_index = index
+        self.order_number_collisions = collisions
+
+    def resolve_order(self, scanned_text: str) -> str | None:
+        """
+        Resolve a scanned order barcode to the original order number.
+
+        An exact match on the original order number wins; otherwise the scan is
+        normalized (see _normalize_order_number) and looked up in the index.
+
+        Args:
+            scanned_text: The content from the scanned order barcode.
+
+        Returns:
+            The original order number as stored in orders_data, or None if no
+            order matches.
+        """
+        if scanned_text in self._orders_data:
+            return scanned_text
+
+        scanned_normalized = self._normalize_order_number(scanned_text)
+        if not scanned_normalized:
+            return None
+
+        return self._order_index.get(scanned_normalized)
+
     def start_order_packing(self, scanned_text: str) -> Tuple[List[Dict] | None, str]:
         """
         Starts or resumes packing an order based on a scanned barcode.
@@ -837,18 +1160,9 @@ class PackerLogic(QObject):
                                            ("ORDER_LOADED", "ORDER_NOT_FOUND",
                                            "ORDER_ALREADY_COMPLETED").
         """
-        # STEP 1: Find order using normalized comparison
-        scanned_normalized = self._normalize_order_number(scanned_text)
-        logger.debug(f"Scanned text: '{scanned_text}' -> Normalized: '{scanned_normalized}'")
-
-        # Find matching order in orders_data
-        matched_order_number = None
-        for order_number in self.orders_data.keys():
-            order_normalized = self._normalize_order_number(order_number)
-            if scanned_normalized == order_normalized:
-                matched_order_number = order_number
-                logger.debug(f"Match found: '{scanned_text}' matches order '{order_number}'")
-                break
+        # STEP 1: Find order using the normalized order index (O(1))
+        matched_order_number = self.resolve_order(scanned_text)
+        logger.debug(f"Scanned text: '{scanned_text}' -> Order: '{matched_order_number}'")
 
         if not matched_order_number:
             logger.info(f"Order not found for scanned text: '{scanned_text}'")
@@ -868,6 +1182,11 @@ class PackerLogic(QObject):
         if not is_new_order:
             self.current_order_state = self.session_packing_state['in_progress'][original_order_number]
         else:
+            # Normalized SKUs precomputed per line when the store backs orders_data
+            normalized_skus = None
+            if isinstance(self._orders_data, OrdersView) and self._orders_data.store is self._session_store:
+                normalized_skus = self._session_store.normalized_skus(original_order_number)
+
             self.current_order_state = []
             for i, item in enumerate(items):
                 sku = item.get('SKU')
@@ -877,7 +1196,7 @@ class PackerLogic(QObject):
                 except (ValueError, TypeError):
                     quantity = 1
 
-                normalized_sku = self._normalize_sku(sku)
+                normalized_sku = normalized_skus[i] if normalized_skus is not None else self._normalize_sku(sku)
                 self.current_order_state.append({
                     'original_sku': sku,
                     'normalized_sku': normalized_sku,
@@ -886,15 +1205,17 @@ class PackerLogic(QObject):
                     'row': i
                 })
             self.session_packing_state['in_progress'][original_order_number] = self.current_order_state
-            self._save_session_state_async()
+            self._save_session_state_async("start")
+
+        # Index the order once so every scan is O(1) instead of O(lines)
+        self._current_progress = OrderProgress(self.current_order_state)
 
         # Phase 2b: Record order start time.
         # Only reset timing for brand-new orders. For orders already in in_progress (resumed
         # from a previous session), preserve the start time and scanned items list that were
         # restored by _load_session_state() so timing continuity is maintained.
-        from shared.metadata_utils import get_current_timestamp
         if is_new_order:
-            self.current_order_start_time = get_current_timestamp()
+            self.current_order_start_time = self._order_timer.start()
             self.current_order_items_scanned = []
             self.current_order_corrections = 0
             self.current_order_extra_scan_count = 0
@@ -905,7 +1226,7 @@ class PackerLogic(QObject):
             # _timing in _load_session_state(); nothing to reset here.
             # If start time is missing despite being in in_progress, fall back gracefully.
             if not self.current_order_start_time:
-                self.current_order_start_time = get_current_timestamp()
+                self.current_order_start_time = self._order_timer.start()
                 logger.warning(
                     f"Order {original_order_number} resumed but had no start time; "
                     "resetting to now"
@@ -918,6 +1239,32 @@ class PackerLogic(QObject):
 
         return items, "ORDER_LOADED"
 
+    def _get_order_timer(self) -> OrderTimer | None:
+        """
+        Return the monotonic timer for current_order_start_time, or None if unset.
+
+        Re-anchored (one ISO parse) whenever current_order_start_time differs
+        from the timer's start, e.g. after resume or direct assignment.
+        """
+        if not self.current_order_start_time:
+            return None
+        if self._order_timer.started_at != self.current_order_start_time:
+            self._order_timer.resume(self.current_order_start_time)
+        return self._order_timer
+
+    def _get_current_progress(self) -> OrderProgress:
+        """
+        Return the OrderProgress index for current_order_state.
+
+        Rebuilt transparently if current_order_state was replaced since the
+        index was created (e.g. state restored or assigned directly).
+        """
+        progress = self._current_progress
+        if progress is None or progress.order_state is not self.current_order_state:
+            progress = OrderProgress(self.current_order_state)
+            self._current_progress = progress
+        return progress
+
     def process_sku_scan(self, sku: str) -> Tuple[Dict | None, str]:
         """
         Processes a scanned SKU for the currently active order.
@@ -984,12 +1331,8 @@ class PackerLogic(QObject):
         # This ensures consistent matching even if mapping returns non-normalized value
         normalized_final_sku = self._normalize_sku(final_sku)
 
-        # The rest of the logic uses the potentially translated SKU.
-        normalized_final_sku = self._normalize_sku(final_sku)
-
         # === STEP 3: Find matching item in current order ===
-        # Search through all items in the order for a match
-        # Important: we look for the FIRST item that:
+        # The per-order SKU index returns the FIRST item that:
         # 1. Matches the SKU
         # 2. Is not yet fully packed (packed < required)
         #
@@ -998,33 +1341,30 @@ class PackerLogic(QObject):
         # - First scan: packed=0 -> packed=1
         # - Second scan: packed=1 -> packed=2
         # - Third scan: packed=2 -> packed=3 (complete!)
-        found_item = None
-        for item_state in self.current_order_state:
-            if item_state['normalized_sku'] == normalized_final_sku and item_state['packed'] < item_state['required']:
-                found_item = item_state
-                break
+        progress = self._get_current_progress()
+        found_item = progress.next_open_item(normalized_final_sku)
 
         # === STEP 4: Process successful match ===
         if found_item:
-            # Increment packed count for this item
-            found_item['packed'] += 1
+            # Increment packed count for this item (keeps index counters in sync)
+            progress.pack_one(found_item)
+            if self._session_progress is not None:
+                self._session_progress.add_packed(1)
 
             # Check if this specific item is now complete
             # (all required quantity for this SKU has been packed)
             is_complete = found_item['packed'] == found_item['required']
 
             # Phase 2b: Record item scan with timestamp
-            from shared.metadata_utils import get_current_timestamp, calculate_duration
-
-            scan_timestamp = get_current_timestamp()
-
-            # Calculate time from order start
-            if self.current_order_start_time:
-                time_from_order_start = calculate_duration(
-                    self.current_order_start_time,
-                    scan_timestamp
-                )
+            # Time from order start comes from the monotonic anchor — no ISO parsing per scan
+            timer = self._get_order_timer()
+            if timer is not None:
+                elapsed = timer.elapsed()
+                time_from_order_start = int(elapsed)
+                scan_timestamp = timer.timestamp(elapsed)
             else:
+                from shared.metadata_utils import get_current_timestamp
+                scan_timestamp = get_current_timestamp()
                 time_from_order_start = 0
                 logger.warning("Order start time not set, cannot calculate timing")
 
@@ -1068,14 +1408,12 @@ class PackerLogic(QObject):
 
             # === Check if ENTIRE order is complete ===
             # An order is complete when ALL items have been packed
-            # (not just the current item)
-            all_items_complete = all(s['packed'] == s['required'] for s in self.current_order_state)
-
-            if all_items_complete:
+            # (not just the current item) — an O(1) counter check
+            if progress.is_complete:
                 if self.current_extra_items:
                     # Extra items detected — wait for worker to resolve them before completing
                     status = "ORDER_COMPLETE_WITH_EXTRAS"
-                    self._save_session_state_sync()
+                    self._save_session_state_sync("extra")
                     return {
                         "row": found_item['row'],
                         "packed": found_item['packed'],
@@ -1088,12 +1426,7 @@ class PackerLogic(QObject):
                 self._complete_current_order()
 
                 # Move order from "in_progress" to "completed_orders"
-                del self.session_packing_state['in_progress'][self.current_order_number]
-
-                # Add to completed list (if not already there)
-                # This check prevents duplicates in case of rare edge cases
-                if self.current_order_number not in self.session_packing_state['completed_orders']:
-                    self.session_packing_state['completed_orders'].append(self.current_order_number)
+                self._move_current_order_to_completed()
 
                 # Remove from skipped list if this order was previously skipped
                 self._unskip_current_order_if_needed()
@@ -1104,23 +1437,20 @@ class PackerLogic(QObject):
                 # Order still in progress
                 status = "SKU_OK"
 
-                # Calculate overall progress for this order
-                # (total items packed vs total items required)
-                total_packed = sum(s['packed'] for s in self.current_order_state)
-                total_required = sum(s['required'] for s in self.current_order_state)
-
-                # Emit Qt signal to update UI progress display
-                # This allows the UI to show "5/8 items packed" in real-time
-                self.item_packed.emit(self.current_order_number, total_packed, total_required)
+                # Emit Qt signal to update UI progress display with the running
+                # order totals. This allows the UI to show "5/8 items packed" in real-time
+                self.item_packed.emit(
+                    self.current_order_number, progress.packed_total, progress.required_total
+                )
 
             # === Save state to disk ===
             # ORDER_COMPLETE: flush first (checkpoint) so the completed order is persisted
             # before the UI transitions away.
             # SKU_OK / other: async write — UI returns immediately, write happens in background.
             if status == "ORDER_COMPLETE":
-                self._save_session_state_sync()
+                self._save_session_state_sync("complete")
             else:
-                self._save_session_state_async()
+                self._save_session_state_async("scan")
 
             # Return success with detailed information
             return {"row": found_item['row'], "packed": found_item['packed'], "is_complete": is_complete}, status
@@ -1129,15 +1459,13 @@ class PackerLogic(QObject):
         # If we reach here, the scanned SKU didn't match any unpacked item
 
         # Check if SKU exists in order but all items are already packed
-        is_sku_in_order = any(s['normalized_sku'] == normalized_final_sku for s in self.current_order_state)
-
-        if is_sku_in_order:
+        if progress.contains_sku(normalized_final_sku):
             # SKU is in order, but all required quantity already packed — track as extra
             self.current_extra_items[normalized_final_sku] = (
                 self.current_extra_items.get(normalized_final_sku, 0) + 1
             )
             self.current_order_extra_scan_count += 1
-            self._save_session_state_async()
+            self._save_session_state_async("extra")
             return None, "SKU_EXTRA"
         else:
             # SKU is not in this order at all
@@ -1148,8 +1476,11 @@ class PackerLogic(QObject):
 
     def clear_current_order(self):
         """Clears the currently active order from memory."""
+        # A focused wave order stays open in its slot; keep its latest context
+        self._sync_focused_wave_context()
         self.current_order_number = None
         self.current_order_state = {}
+        self._current_progress = None
         self.current_extra_items = {}
         self.unknown_scans = []
 
@@ -1159,6 +1490,8 @@ class PackerLogic(QObject):
             return
         from shared.metadata_utils import get_current_timestamp
         order_num = self.current_order_number
+        if self.wave is not None:
+            self.wave.remove(order_num)
         skipped = self.session_packing_state['skipped_orders']
         if order_num not in skipped:
             skipped.append(order_num)
@@ -1166,7 +1499,23 @@ class PackerLogic(QObject):
         self.session_packing_state.setdefault('skipped_orders_timing', {})[order_num] = get_current_timestamp()
         self.clear_current_order()
         self._check_all_complete()
-        self._save_session_state_async()
+        self._save_session_state_async("skip")
+
+    def _move_current_order_to_completed(self) -> None:
+        """Move current_order_number from in_progress to completed_orders."""
+        order_num = self.current_order_number
+        self.session_packing_state['in_progress'].pop(order_num, None)
+        if self.wave is not None:
+            self.wave.remove(order_num)
+
+        # Add to completed list (if not already there)
+        # This check prevents duplicates in case of rare edge cases
+        if order_num not in self.session_packing_state['completed_orders']:
+            self.session_packing_state['completed_orders'].append(order_num)
+            if self._session_progress is not None:
+                self._session_progress.order_completed(
+                    order_num, self._get_current_progress().packed_total
+                )
 
     def _unskip_current_order_if_needed(self) -> None:
         """Remove current_order_number from skipped_orders if it was previously skipped."""
@@ -1187,12 +1536,15 @@ class PackerLogic(QObject):
         """
         if not self.current_order_number:
             return {}, "NO_ACTIVE_ORDER"
-        item = next((s for s in self.current_order_state if s.get('row') == row), None)
+        progress = self._get_current_progress()
+        item = progress.get_item(row)
         if item is None:
             return {}, "NO_ACTIVE_ORDER"
         if item['packed'] <= 0:
             return {"row": row, "packed": 0}, "ITEM_ALREADY_ZERO"
-        item['packed'] -= 1
+        progress.unpack_one(item)
+        if self._session_progress is not None:
+            self._session_progress.remove_packed(1)
         self.current_order_corrections += 1
 
         # Adjust the most recent scan record for this item so that items_count in the
@@ -1211,7 +1563,7 @@ class PackerLogic(QObject):
                 break
 
         self.session_packing_state['in_progress'][self.current_order_number] = self.current_order_state
-        self._save_session_state_async()
+        self._save_session_state_async("cancel")
         return {"row": row, "packed": item['packed']}, "ITEM_DECREMENTED"
 
     def force_confirm_item(self, row: int) -> Tuple[Dict, str]:
@@ -1228,18 +1580,22 @@ class PackerLogic(QObject):
         """
         if not self.current_order_number:
             return {}, "NO_ACTIVE_ORDER"
-        item = next((s for s in self.current_order_state if s.get('row') == row), None)
+        progress = self._get_current_progress()
+        item = progress.get_item(row)
         if item is None:
             return {}, "NO_ACTIVE_ORDER"
 
         # Add a scan record for the force-confirmed quantity (remaining unpacked qty).
         # This ensures _complete_current_order() sees a full items list with timestamps.
-        from shared.metadata_utils import get_current_timestamp, calculate_duration
-        force_timestamp = get_current_timestamp()
-        time_from_start = (
-            calculate_duration(self.current_order_start_time, force_timestamp)
-            if self.current_order_start_time else 0
-        )
+        timer = self._get_order_timer()
+        if timer is not None:
+            elapsed = timer.elapsed()
+            force_timestamp = timer.timestamp(elapsed)
+            time_from_start = int(elapsed)
+        else:
+            from shared.metadata_utils import get_current_timestamp
+            force_timestamp = get_current_timestamp()
+            time_from_start = 0
         items_list = self.orders_data[self.current_order_number]['items']
         item_idx = item.get('row', 0)
         item_title = (
@@ -1262,19 +1618,19 @@ class PackerLogic(QObject):
         if remaining_qty > 0:
             self.current_order_items_scanned.append(force_record)
 
-        item['packed'] = item['required']
+        added = progress.force_complete(item)
+        if self._session_progress is not None:
+            self._session_progress.add_packed(added)
         self.session_packing_state['in_progress'][self.current_order_number] = self.current_order_state
-        all_done = all(s['packed'] >= s['required'] for s in self.current_order_state)
+        all_done = progress.is_complete
         if all_done and not self.current_extra_items:
             self._complete_current_order()
-            del self.session_packing_state['in_progress'][self.current_order_number]
-            if self.current_order_number not in self.session_packing_state['completed_orders']:
-                self.session_packing_state['completed_orders'].append(self.current_order_number)
+            self._move_current_order_to_completed()
             self._unskip_current_order_if_needed()
             self._check_all_complete()
-            self._save_session_state_sync()  # Checkpoint: order now complete
+            self._save_session_state_sync("complete")  # Checkpoint: order now complete
         else:
-            self._save_session_state_async()
+            self._save_session_state_async("force_confirm")
         return {
             "row": row,
             "packed": item['required'],
@@ -1282,6 +1638,237 @@ class PackerLogic(QObject):
             "order_complete": all_done and not self.current_extra_items,
         }, "FORCE_CONFIRMED"
 
+    # ------------------------------------------------------------------
+    # Wave packing (see wave_packing)
+    # ------------------------------------------------------------------
+
+    def start_wave(self, max_orders: int = DEFAULT_WAVE_SIZE, tie_break: str = TIE_BREAK_SLOT) -> Wave:
+        """
+        Switch the station to wave mode: up to max_orders orders open at once.
+
+        An order that is currently being packed becomes the wave's first order.
+
+        Args:
+            max_orders: Number of slots (totes)
+            tie_break: How to choose between several open orders needing a SKU
+                       (see wave_packing.TIE_BREAK_MODES)
+
+        Raises:
+            ValueError: For an invalid size or tie-break mode.
+        """
+        wave = Wave(max_orders=max_orders, tie_break=tie_break)
+        if self.wave is not None:
+            self.end_wave()
+        self.wave = wave
+        if self.current_order_number and self.current_order_number in self.session_packing_state['in_progress']:
+            self.wave.add(self._new_wave_context(self.current_order_number))
+        logger.info(f"Wave mode started: {max_orders} slots, tie-break '{tie_break}'")
+        self._save_session_state_async("wave")
+        return wave
+
+    def end_wave(self) -> None:
+        """
+        Leave wave mode. Orders still open stay in progress and can be resumed
+        in single-order mode; their parked timing is dropped, as when switching
+        orders in single-order mode.
+        """
+        if self.wave is None:
+            return
+        focused = self.current_order_number if self.current_order_number in self.wave else None
+        if focused is not None:
+            self.wave.remove(focused)
+        self.wave = None
+        if focused is None:
+            self.clear_current_order()
+        logger.info("Wave mode ended")
+        self._save_session_state_async("wave")
+
+    def open_wave_order(self, scanned_text: str) -> Tuple[List[Dict] | None, str]:
+        """
+        Open an order in the next free wave slot.
+
+        The new order becomes the focused order (current_order_*), exactly as
+        start_order_packing() leaves it.
+
+        Returns:
+            Tuple of (items, status). status is one of start_order_packing()'s
+            statuses, or "NO_ACTIVE_WAVE", "ORDER_ALREADY_IN_WAVE", "WAVE_FULL".
+        """
+        if self.wave is None:
+            return None, "NO_ACTIVE_WAVE"
+        order_number = self.resolve_order(scanned_text)
+        if order_number is not None and order_number in self.wave:
+            self.focus_wave_order(order_number)
+            return None, "ORDER_ALREADY_IN_WAVE"
+        if self.wave.is_full:
+            return None, "WAVE_FULL"
+
+        self._park_focused_wave_order()
+        items, status = self.start_order_packing(scanned_text)
+        if status == "ORDER_LOADED":
+            slot = self.wave.add(self._new_wave_context(self.current_order_number))
+            logger.info(f"Order {self.current_order_number} opened in wave slot {slot}")
+        return items, status
+
+    def process_wave_scan(self, sku: str) -> Tuple[Dict | None, str]:
+        """
+        Route a product scan to the open wave order that needs it and pack it.
+
+        The routed order becomes the focused order, then the scan goes through
+        process_sku_scan(), so results, statuses, state saves and completion
+        are identical to single-order mode. Result dicts also carry
+        "order_number" and "slot".
+
+        Returns:
+            Tuple of (result, status) as process_sku_scan(); "NO_ACTIVE_WAVE"
+            outside wave mode, "NO_ACTIVE_ORDER" for an empty wave.
+        """
+        if self.wave is None:
+            return None, "NO_ACTIVE_WAVE"
+        if not len(self.wave):
+            return None, "NO_ACTIVE_ORDER"
+
+        normalized_scan = self._normalize_sku(sku)
+        normalized_final_sku = self._normalize_sku(self.sku_map.get(normalized_scan, normalized_scan))
+        focused = self.current_order_number if self.current_order_number in self.wave else None
+        order_number, _ = self.wave.route(normalized_final_sku, focused=focused)
+
+        if order_number is None:
+            if focused is None:
+                # Not in any open order and no order on screen to charge it to
+                self.unknown_scans.append(sku)
+                return None, "SKU_NOT_FOUND"
+            order_number = focused  # unknown scan is counted against the visible order
+
+        slot = self.wave.get(order_number).slot
+        self.focus_wave_order(order_number)
+        result, status = self.process_sku_scan(sku)
+        if result is not None:
+            result["order_number"] = order_number
+            result["slot"] = slot
+        return result, status
+
+    def focus_wave_order(self, order_number: str) -> bool:
+        """
+        Make an open wave order the current order (e.g. to undo a scan or
+        resolve extras on it). Returns False if the order is not in the wave.
+        """
+        if self.wave is None:
+            return False
+        context = self.wave.get(order_number)
+        if context is None:
+            return False
+        if self.current_order_number == order_number:
+            return True
+
+        self._park_focused_wave_order()
+        self.current_order_number = context.order_number
+        self.current_order_state = context.order_state
+        self._current_progress = context.progress
+        self._order_timer = context.timer
+        self.current_order_start_time = context.start_time
+        self.current_order_items_scanned = context.items_scanned
+        self.current_order_corrections = context.corrections
+        self.current_order_extra_scan_count = context.extra_scan_count
+        self.current_order_unknown_scan_count = context.unknown_scan_count
+        self.current_extra_items = context.extra_items
+        return True
+
+    def get_wave_slots(self) -> List[Dict[str, Any]]:
+        """Open wave orders for display: slot, order_number, packed, required, focused."""
+        if self.wave is None:
+            return []
+        return [
+            {
+                "slot": ctx.slot,
+                "order_number": ctx.order_number,
+                "packed": ctx.progress.packed_total,
+                "required": ctx.progress.required_total,
+                "focused": ctx.order_number == self.current_order_number,
+            }
+            for ctx in self.wave.contexts()
+        ]
+
+    def _new_wave_context(self, order_number: str) -> WaveOrderContext:
+        """Wrap the current order (just loaded by start_order_packing) as a wave context."""
+        context = WaveOrderContext(order_number, self.current_order_state, self._get_current_progress())
+        context.timer = self._order_timer
+        self._sync_focused_wave_context(context)
+        return context
+
+    def _sync_focused_wave_context(self, context: WaveOrderContext | None = None) -> None:
+        """Copy the live current_order_* fields into the focused order's context."""
+        if context is None:
+            if self.wave is None or self.current_order_number is None:
+                return
+            context = self.wave.get(self.current_order_number)
+            if context is None:
+                return
+        context.order_state = self.current_order_state
+        context.progress = self._get_current_progress()
+        context.timer = self._order_timer
+        context.start_time = self.current_order_start_time
+        context.items_scanned = self.current_order_items_scanned
+        context.corrections = self.current_order_corrections
+        context.extra_scan_count = self.current_order_extra_scan_count
+        context.unknown_scan_count = self.current_order_unknown_scan_count
+        context.extra_items = self.current_extra_items
+
+    def _park_focused_wave_order(self) -> None:
+        """
+        Store the focused order's context in the wave and clear current_order_*.
+
+        No-op when nothing from the wave is focused, so timing restored for a
+        single-order resume is left alone.
+        """
+        if self.wave is None or self.current_order_number not in self.wave:
+            if self.current_order_number is not None and self.wave is not None:
+                # Finished (completed / skipped) order still on screen
+                self.clear_current_order()
+            return
+        self._sync_focused_wave_context()
+        self.current_order_number = None
+        self.current_order_state = {}
+        self._current_progress = None
+        self._order_timer = OrderTimer()  # the parked context keeps its own anchor
+        self.current_order_start_time = None
+        self.current_order_items_scanned = []
+        self.current_order_corrections = 0
+        self.current_order_extra_scan_count = 0
+        self.current_order_unknown_scan_count = 0
+        self.current_extra_items = {}
+
+    def _restore_wave(self, block: Dict[str, Any] | None) -> None:
+        """Reopen the wave persisted in packing_state (all orders parked)."""
+        if not block:
+            return
+        try:
+            wave = Wave(max_orders=int(block.get('max_orders', DEFAULT_WAVE_SIZE)),
+                        tie_break=block.get('tie_break', TIE_BREAK_SLOT))
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Ignoring persisted wave: {e}")
+            return
+
+        in_progress = self.session_packing_state['in_progress']
+        for entry in block.get('orders', []):
+            order_number = entry.get('order_number') if isinstance(entry, dict) else None
+            order_state = in_progress.get(order_number)
+            if not isinstance(order_state, list) or order_number in wave or wave.is_full:
+                continue
+            context = WaveOrderContext(order_number, order_state, OrderProgress(order_state))
+            if isinstance(entry.get('timing'), dict):
+                context.restore_timing(entry['timing'])
+            wave.add(context, slot=entry.get('slot'))
+
+        self.wave = wave
+        # The '_timing' block belonged to the focused wave order, now parked in the wave
+        self.current_order_start_time = None
+        self.current_order_items_scanned = []
+        self.current_order_corrections = 0
+        self.current_order_extra_scan_count = 0
+        self.current_order_unknown_scan_count = 0
+        logger.info(f"Restored wave with {len(wave)} open orders")
+
     def _check_all_complete(self):
         """Emit all_orders_complete if every order in the session is packed or skipped."""
         total = len(self.orders_data)
@@ -1320,26 +1907,21 @@ class PackerLogic(QObject):
         and complete the order if so.
         """
         if self.current_extra_items:
-            self._save_session_state_async()
+            self._save_session_state_async("extra_resolved")
             return {}, "EXTRA_PENDING"
         # Extras cleared — verify all required items are actually packed
-        all_items_done = all(
-            s['packed'] >= s['required'] for s in self.current_order_state
-        )
-        if not all_items_done:
-            self._save_session_state_async()
+        if not self._get_current_progress().is_complete:
+            self._save_session_state_async("extra_resolved")
             return {}, "EXTRA_CLEARED"
         # All items packed AND all extras resolved — finalize the order
         self._complete_current_order()
-        del self.session_packing_state['in_progress'][self.current_order_number]
-        if self.current_order_number not in self.session_packing_state['completed_orders']:
-            self.session_packing_state['completed_orders'].append(self.current_order_number)
+        self._move_current_order_to_completed()
         self._unskip_current_order_if_needed()
         self._check_all_complete()
-        self._save_session_state_sync()  # Checkpoint: order now complete
+        self._save_session_state_sync("complete")  # Checkpoint: order now complete
         return {}, "ORDER_NOW_COMPLETE"
 
-    def load_packing_list_json(self, packing_list_path: Path) -> Tuple[int, str]:
+    def load_packing_list_json(self, packing_list_path: Path, use_compiled_cache: bool = False) -> Tuple[int, str]:
         """
         Завантажити конкретний пакінг лист з JSON файлу.
 
@@ -1367,6 +1949,9 @@ class PackerLogic(QObject):
         Args:
             packing_list_path: Повний шлях до JSON файлу пакінг листа
                               (e.g., .../packing_lists/DHL_Orders.json)
+            use_compiled_cache: Load work_dir/packing_list.compiled.json instead of
+                              parsing the JSON when it is still valid, and write it
+                              after a full parse (see packing_list_cache)
 
         Returns:
             Tuple[int, str]: (кількість замовлень, назва листа)
@@ -1387,10 +1972,21 @@ class PackerLogic(QObject):
         # Extract list name from filename (without .json extension)
         list_name = packing_list_path.stem
 
+        compiled_path = self.work_dir / COMPILED_FILE_NAME
+        if use_compiled_cache:
+            compiled = load_compiled(compiled_path, packing_list_path)
+            if compiled is not None:
+                self.session_store = compiled.store
+                self._set_orders_view(OrdersView(compiled.store), compiled.order_index,
+                                      compiled.order_collisions)
+                logger.info(f"Loaded {compiled.store.total_lines} items from compiled packing list {compiled_path}")
+                return self._finish_packing_list_load(packing_list_path, compiled.list_name)
+
         # Load JSON data
         try:
-            with open(packing_list_path, 'r', encoding='utf-8') as f:
-                packing_data = json.load(f)
+            with open(packing_list_path, 'rb') as f:
+                raw = f.read()
+            packing_data = json.loads(raw.decode('utf-8'))
 
             logger.debug(f"Loaded packing list: {packing_data.get('list_name', list_name)}")
 
@@ -1409,12 +2005,9 @@ class PackerLogic(QObject):
             logger.warning(f"No orders found in packing list: {list_name}")
             return 0, packing_data.get('list_name', list_name)
 
-        # Build raw order lookup for metadata preservation
-        order_raw_data = {order.get('order_number', ''): order for order in orders_list}
-
-        # Convert to DataFrame (packing list format)
-        # Each order may have multiple items, need to flatten
-        rows = []
+        # Build the columnar session store in a single pass (see session_store):
+        # lines grouped per order, courier and extra order fields stored once per order
+        builder = SessionStoreBuilder()
 
         for order in orders_list:
             # Validate required order fields
@@ -1437,65 +2030,62 @@ class PackerLogic(QObject):
                 logger.warning(f"Order {order_number} has no items, skipping")
                 continue
 
-            for item in items:
-                row = {
-                    'Order_Number': order_number,
-                    'SKU': item.get('sku', ''),
-                    'Product_Name': item.get('product_name', ''),
-                    'Quantity': str(item.get('quantity', 1)),  # Convert to string for consistency
-                    'Courier': courier
-                }
-
-                # Add any extra fields from order
-                # (e.g., customer name, address, tracking number, etc.)
-                for key, value in order.items():
-                    if key not in ['order_number', 'courier', 'items']:
-                        # Capitalize key to match packing list style
-                        formatted_key = key.replace('_', ' ').title().replace(' ', '_')
-                        row[formatted_key] = str(value)
+            # Courier + any extra fields from the order
+            # (e.g., customer name, address, tracking number, etc.),
+            # keys capitalized to match packing list style
+            order_fields = {'Courier': courier}
+            for key, value in order.items():
+                if key not in ['order_number', 'courier', 'items']:
+                    formatted_key = key.replace('_', ' ').title().replace(' ', '_')
+                    order_fields[formatted_key] = str(value)
+            entry_id = builder.add_entry(order_fields)
 
-                rows.append(row)
+            for item in items:
+                builder.add_line(
+                    order_number,
+                    item.get('sku', ''),
+                    item.get('product_name', ''),
+                    str(item.get('quantity', 1)),  # Convert to string for consistency
+                    entry_id,
+                )
+            builder.set_metadata(order_number, order)
 
-        # Create DataFrame
-        df = pd.DataFrame(rows)
+        store = builder.build()
 
-        if df.empty:
+        if store.total_lines == 0:
             logger.warning("No order items to process")
             return 0, packing_data.get('list_name', list_name)
 
         # Validate required columns
-        missing_cols = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+        missing_cols = [col for col in REQUIRED_COLUMNS if col not in store.columns]
         if missing_cols:
             error_msg = f"Missing required columns in packing list: {missing_cols}"
             logger.error(error_msg)
             raise ValueError(error_msg)
 
-        # Store as packing_list_df and processed_df
-        self.packing_list_df = df
-        self.processed_df = df.copy()
+        # Single source of truth; packing_list_df / processed_df / orders_data are views of it
+        store.normalize_skus(self._normalize_sku)
+        self.session_store = store
+        self.orders_data = OrdersView(store)
 
-        logger.info(f"Converted {len(df)} items from {len(orders_list)} orders to DataFrame")
+        logger.info(f"Loaded {store.total_lines} items from {len(orders_list)} orders into session store")
 
-        # Group items by order and populate orders_data
-        self.orders_data = {}
-        for order_number in df['Order_Number'].unique():
-            order_df = df[df['Order_Number'] == order_number]
-            raw = order_raw_data.get(order_number, {})
-            self.orders_data[order_number] = {
-                'items': order_df.to_dict('records'),
-                'metadata': {
-                    'order_type':               raw.get('order_type') or '',
-                    'shipping_provider':        raw.get('shipping_provider') or raw.get('courier') or '',
-                    'destination_country':      raw.get('destination_country') or raw.get('shipping_country') or '',
-                    'tags':                     list(raw.get('tags') or []),
-                    'notes':                    raw.get('notes') or '',
-                    'system_note':              raw.get('system_note') or '',
-                    'internal_tags':            list(raw.get('internal_tags') or []),
-                    'order_min_box':            raw.get('order_min_box') or '',
-                    'order_fulfillment_status': raw.get('order_fulfillment_status') or '',
-                },
-            }
+        display_name = packing_data.get('list_name', list_name)
+        if use_compiled_cache:
+            save_compiled(
+                compiled_path, packing_list_path, hash_bytes(raw),
+                CompiledPackingList(display_name, store, self._order_index, self.order_number_collisions),
+            )
 
+        return self._finish_packing_list_load(packing_list_path, display_name)
+
+    def _finish_packing_list_load(self, packing_list_path: Path, list_name: str) -> Tuple[int, str]:
+        """
+        Initialize session metadata after a packing list was loaded.
+
+        Returns:
+            Tuple[int, str]: (кількість замовлень, назва листа)
+        """
         # Initialize session metadata
         # Extract session_id from path if available (e.g., .../Sessions/CLIENT_M/2025-11-10_1/...)
         session_id = None
@@ -1511,7 +2101,7 @@ class PackerLogic(QObject):
 
         self._initialize_session_metadata(
             session_id=session_id,
-            packing_list_name=packing_data.get('list_name', list_name)
+            packing_list_name=list_name
         )
 
         # Count orders (barcodes pre-generated by Shopify Tool)
@@ -1519,7 +2109,7 @@ class PackerLogic(QObject):
             order_count = len(self.orders_data)
             logger.info(f"Successfully loaded packing list '{list_name}': {order_count} orders")
 
-            return order_count, packing_data.get('list_name', list_name)
+            return order_count, list_name
 
         except Exception as e:
             error_msg = f"Error generating barcodes from packing list: {e}"
@@ -1600,12 +2190,8 @@ class PackerLogic(QObject):
             logger.warning("No orders found in analysis_data.json")
             return 0, analysis_data.get('analyzed_at', 'Unknown')
 
-        # Build raw order lookup for metadata preservation
-        order_raw_data_analysis = {order.get('order_number', ''): order for order in orders_list}
-
-        # Convert to DataFrame (packing list format)
-        # Each order may have multiple items, need to flatten
-        rows = []
+        # Build the columnar session store in a single pass (see session_store)
+        builder = SessionStoreBuilder()
 
         for order in orders_list:
             # Validate required order fields
@@ -1624,64 +2210,43 @@ class PackerLogic(QObject):
             courier = order.get('courier', 'N/A')
             items = order.get('items', [])
 
-            for item in items:
-                row = {
-                    'Order_Number': order_number,
-                    'SKU': item.get('sku', ''),
-                    'Product_Name': item.get('product_name', ''),
-                    'Quantity': str(item.get('quantity', 1)),  # Convert to string for consistency
-                    'Courier': courier
-                }
+            # Courier + any extra fields from Shopify analysis
+            # (e.g., customer name, address, etc.), keys capitalized to match packing list style
+            order_fields = {'Courier': courier}
+            for key, value in order.items():
+                if key not in ['order_number', 'courier', 'items', 'status']:
+                    formatted_key = key.replace('_', ' ').title().replace(' ', '_')
+                    order_fields[formatted_key] = str(value)
+            entry_id = builder.add_entry(order_fields)
 
-                # Add any extra fields from Shopify analysis
-                # (e.g., customer name, address, etc.)
-                for key, value in order.items():
-                    if key not in ['order_number', 'courier', 'items', 'status']:
-                        # Capitalize key to match packing list style
-                        formatted_key = key.replace('_', ' ').title().replace(' ', '_')
-                        row[formatted_key] = str(value)
-
-                rows.append(row)
+            for item in items:
+                builder.add_line(
+                    order_number,
+                    item.get('sku', ''),
+                    item.get('product_name', ''),
+                    str(item.get('quantity', 1)),  # Convert to string for consistency
+                    entry_id,
+                )
+            builder.set_metadata(order_number, order)
 
-        # Create DataFrame
-        df = pd.DataFrame(rows)
+        store = builder.build()
 
-        if df.empty:
+        if store.total_lines == 0:
             logger.warning("No order items to process")
             return 0, analysis_data.get('analyzed_at', 'Unknown')
 
         # Validate required columns
-        missing_cols = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+        missing_cols = [col for col in REQUIRED_COLUMNS if col not in store.columns]
         if missing_cols:
             error_msg = f"Missing required columns in analysis data: {missing_cols}"
             logger.error(error_msg)
             raise ValueError(error_msg)
 
-        # Store as packing_list_df and processed_df
-        self.packing_list_df = df
-        self.processed_df = df.copy()
+        # Single source of truth; packing_list_df / processed_df / orders_data are views of it
+        self.session_store = store
+        self.orders_data = OrdersView(store)
 
-        logger.info(f"Converted {len(df)} items from {len(orders_list)} orders to DataFrame")
-
-        # Group items by order and populate orders_data
-        self.orders_data = {}
-        for order_number in df['Order_Number'].unique():
-            order_df = df[df['Order_Number'] == order_number]
-            raw = order_raw_data_analysis.get(order_number, {})
-            self.orders_data[order_number] = {
-                'items': order_df.to_dict('records'),
-                'metadata': {
-                    'order_type':               raw.get('order_type') or '',
-                    'shipping_provider':        raw.get('shipping_provider') or raw.get('courier') or '',
-                    'destination_country':      raw.get('destination_country') or raw.get('shipping_country') or '',
-                    'tags':                     list(raw.get('tags') or []),
-                    'notes':                    raw.get('notes') or '',
-                    'system_note':              raw.get('system_note') or '',
-                    'internal_tags':            list(raw.get('internal_tags') or []),
-                    'order_min_box':            raw.get('order_min_box') or '',
-                    'order_fulfillment_status': raw.get('order_fulfillment_status') or '',
-                },
-            }
+        logger.info(f"Loaded {store.total_lines} items from {len(orders_list)} orders into session store")
 
         # Initialize session metadata
         # Extract session_id from session_path (e.g., .../Sessions/CLIENT_M/2025-11-10_1)
@@ -1779,13 +2344,7 @@ class PackerLogic(QObject):
         completed_orders = len(self.session_packing_state.get('completed_orders', []))
 
         # Calculate total items
-        total_items = 0
-        if self.processed_df is not None:
-            try:
-                import pandas as pd
-                total_items = int(pd.to_numeric(self.processed_df['Quantity'], errors='coerce').sum())
-            except Exception as e:
-                logger.warning(f"Could not calculate total_items: {e}")
+        total_items = self.get_session_progress().total_items
 
         # Count unique SKUs
         unique_skus = self._count_unique_skus()
@@ -1922,15 +2481,10 @@ class PackerLogic(QObject):
         Returns:
             int: Number of unique SKUs in the packing list
         """
-        if self.processed_df is None:
+        if self.session_store is None:
             return 0
 
-        try:
-            unique_skus = self.processed_df['SKU'].nunique()
-            return int(unique_skus)
-        except Exception as e:
-            logger.warning(f"Could not count unique SKUs: {e}")
-            return 0
+        return self.get_session_progress().unique_skus
 
     def save_session_summary(
         self,
@@ -1969,6 +2523,7 @@ class PackerLogic(QObject):
         try:
             with open(summary_path, 'w', encoding='utf-8') as f:
                 json.dump(summary, f, indent=2, ensure_ascii=False)
+            invalidate_fs_cache(summary_path)
 
             logger.info(f"Session summary (v1.3.0) saved to: {summary_path}")
             return summary_path
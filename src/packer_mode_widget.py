@@ -1,14 +1,19 @@
 import logging
-from collections import defaultdict
 from functools import partial
 from PySide6.QtWidgets import (
     QWidget, QHBoxLayout, QVBoxLayout, QTableWidget, QTableWidgetItem,
     QLabel, QLineEdit, QHeaderView, QPushButton, QAbstractItemView, QFrame,
-    QGroupBox, QProgressBar, QMessageBox, QApplication, QStyle
+    QGroupBox, QProgressBar, QMessageBox
 )
 from PySide6.QtGui import QFont, QColor, QPalette, QIcon
-from PySide6.QtCore import Qt, Signal, QSize
-from typing import List, Dict, Any
+from PySide6.QtCore import Qt, Signal
+from typing import List, Dict, Any, Optional
+
+from item_actions_delegate import (
+    ItemActionsDelegate, ACTION_CONFIRM, ACTION_UNDO, ACTION_FORCE, ACTION_MAP,
+    SKU_ROLE, REQUIRED_ROLE, COMPLETE_ROLE, MAPPED_ROLE,
+)
+from order_sku_summary import OrderSkuSummary
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +35,7 @@ class PackerModeWidget(QWidget):
         map_sku_requested (Signal[str]): Emitted with original SKU on Map SKU press.
         extra_confirmed (Signal[str]): Emitted with normalized_sku on Keep extra.
         extra_removed (Signal[str]): Emitted with normalized_sku on Remove extra.
+        wave_mode_toggled (Signal[bool]): Emitted when the Wave Mode button is toggled.
         table_frame (QFrame): Frame around items table used for flashing visual feedback.
         table (QTableWidget): Table displaying the SKUs for the current order.
         session_progress_bar (QProgressBar): Shows completed/total orders for the session.
@@ -47,6 +53,7 @@ class PackerModeWidget(QWidget):
     map_sku_requested      = Signal(str)   # original SKU string
     extra_confirmed        = Signal(str)   # normalized_sku
     extra_removed          = Signal(str)   # normalized_sku
+    wave_mode_toggled      = Signal(bool)  # wave packing on/off
 
     FRAME_DEFAULT_STYLE = "QFrame#TableFrame { border: 1px solid palette(mid); border-radius: 3px; }"
     # Shared max-height for the bottom info row (history/extras) and the matching
@@ -128,9 +135,11 @@ class PackerModeWidget(QWidget):
         self.table.setHorizontalHeaderLabels(["Product Name", "SKU", "Qty", "Status", "Actions"])
         hdr = self.table.horizontalHeader()
         hdr.setSectionResizeMode(0, QHeaderView.Stretch)
-        hdr.setSectionResizeMode(1, QHeaderView.ResizeToContents)
-        hdr.setSectionResizeMode(2, QHeaderView.ResizeToContents)
-        hdr.setSectionResizeMode(3, QHeaderView.ResizeToContents)
+        # SKU/Qty/Status are fitted once per order in display_order(): in
+        # ResizeToContents mode every scan would re-measure the whole column.
+        hdr.setSectionResizeMode(1, QHeaderView.Interactive)
+        hdr.setSectionResizeMode(2, QHeaderView.Interactive)
+        hdr.setSectionResizeMode(3, QHeaderView.Interactive)
         hdr.setSectionResizeMode(4, QHeaderView.Fixed)
         hdr.resizeSection(4, 135)
         hdr.setStretchLastSection(False)
@@ -138,6 +147,16 @@ class PackerModeWidget(QWidget):
         self.table.setSelectionMode(QAbstractItemView.NoSelection)
         self.table.setFocusPolicy(Qt.NoFocus)
 
+        # Actions column is painted by a delegate (no per-row button widgets)
+        self.actions_delegate = ItemActionsDelegate(self.table)
+        self.actions_delegate.action_triggered.connect(self._on_item_action)
+        self.table.setItemDelegateForColumn(4, self.actions_delegate)
+
+        # Normalized SKUs that are the target of a barcode mapping, for the Map
+        # button; recomputed only when a different sku_map is passed in.
+        self._sku_map_ref: Optional[Dict[str, str]] = None
+        self._mapped_skus: frozenset = frozenset()
+
         frame_layout.addWidget(self.table)
         left_layout.addWidget(self.table_frame)
 
@@ -219,15 +238,18 @@ class PackerModeWidget(QWidget):
         self.summary_table.setColumnCount(4)
         self.summary_table.setHorizontalHeaderLabels(["SKU", "Product", "Packed/Total", "Status"])
         _shdr = self.summary_table.horizontalHeader()
-        _shdr.setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        # Fitted once per order in _update_summary_panel(), like the items table
+        _shdr.setSectionResizeMode(0, QHeaderView.Interactive)
         _shdr.setSectionResizeMode(1, QHeaderView.Stretch)
-        _shdr.setSectionResizeMode(2, QHeaderView.ResizeToContents)
-        _shdr.setSectionResizeMode(3, QHeaderView.ResizeToContents)
+        _shdr.setSectionResizeMode(2, QHeaderView.Interactive)
+        _shdr.setSectionResizeMode(3, QHeaderView.Interactive)
         _shdr.setStretchLastSection(False)
         self.summary_table.setEditTriggers(QTableWidget.NoEditTriggers)
         self.summary_table.setSelectionMode(QAbstractItemView.NoSelection)
         self.summary_table.setFocusPolicy(Qt.NoFocus)
         _sfl.addWidget(self.summary_table)
+        # Per-SKU totals of the displayed order; scans update one summary row
+        self._sku_summary: Optional[OrderSkuSummary] = None
         # summary_frame lives in the right panel (added there below)
 
         # ─── RIGHT PANEL ─────────────────────────────────────────────────────
@@ -296,6 +318,7 @@ class PackerModeWidget(QWidget):
         self.notification_label.setFont(notif_font)
         self.notification_label.setAlignment(Qt.AlignCenter)
         self.notification_label.setWordWrap(True)
+        self._notification_color: Optional[str] = None  # color of the current stylesheet
         raw_scan_title = QLabel("Last Scan:")
         raw_scan_title.setAlignment(Qt.AlignCenter)
         _rsf = raw_scan_title.font(); _rsf.setPointSize(9); raw_scan_title.setFont(_rsf)
@@ -317,6 +340,26 @@ class PackerModeWidget(QWidget):
         self.skip_order_button.clicked.connect(self.skip_order_requested.emit)
         right_layout.addWidget(self.skip_order_button)
 
+        # [W] Wave packing — several orders open at once, product scans routed to slots
+        self.wave_mode_button = QPushButton("Wave Mode")
+        self.wave_mode_button.setCheckable(True)
+        self.wave_mode_button.setFocusPolicy(Qt.NoFocus)
+        self.wave_mode_button.setToolTip(
+            "Open several orders at once (one per tote); product scans go to the order that needs them"
+        )
+        self.wave_mode_button.toggled.connect(self._on_wave_mode_toggled)
+        right_layout.addWidget(self.wave_mode_button)
+
+        self.wave_slots_label = QLabel("")
+        self.wave_slots_label.setObjectName("WaveSlotsLabel")
+        self.wave_slots_label.setStyleSheet(
+            "QLabel#WaveSlotsLabel { border: 1px solid palette(mid); border-radius: 3px; padding: 4px; }"
+        )
+        _wsf = QFont("Consolas"); _wsf.setPointSize(10)
+        self.wave_slots_label.setFont(_wsf)
+        self.wave_slots_label.setVisible(False)
+        right_layout.addWidget(self.wave_slots_label)
+
         right_layout.addStretch()
 
         # [D] Summary panel — bottom edge aligns with the main scan table's bottom edge.
@@ -372,6 +415,12 @@ class PackerModeWidget(QWidget):
             self.sim_input.clear()
             self.barcode_scanned.emit(text)
 
+    def _on_wave_mode_toggled(self, enabled: bool):
+        """Show/hide the slot list and emit wave_mode_toggled."""
+        self.wave_slots_label.setVisible(enabled)
+        self.wave_mode_toggled.emit(enabled)
+        self.set_focus_to_scanner()
+
     # ─── Action button slots ──────────────────────────────────────────────────
 
     def _on_manual_confirm(self, sku: str):
@@ -383,6 +432,19 @@ class PackerModeWidget(QWidget):
             self.barcode_scanned.emit(sku)
         self.set_focus_to_scanner()
 
+    def _on_item_action(self, row: int, action: str):
+        """Dispatch a click on one of the painted Actions-column buttons."""
+        actions_item = self.table.item(row, 4)
+        sku = actions_item.data(SKU_ROLE) if actions_item is not None else ''
+        if action == ACTION_CONFIRM:
+            self._on_manual_confirm(sku)
+        elif action == ACTION_UNDO:
+            self._on_cancel_item(row)
+        elif action == ACTION_FORCE:
+            self._on_force_confirm(row)
+        elif action == ACTION_MAP:
+            self._on_map_sku_requested(sku)
+
     def _on_cancel_item(self, row: int):
         """Show confirmation dialog then emit cancel_item_requested."""
         reply = QMessageBox.question(
@@ -443,6 +505,14 @@ class PackerModeWidget(QWidget):
         # [A] Show metadata banner if available
         self._update_metadata_banner(metadata)
 
+        if sku_map is not None:
+            self.set_sku_map(sku_map)
+        mapped_skus = self._mapped_skus if sku_map is not None else frozenset()
+
+        # Drop the previous order's rows first: replacing items one by one in a
+        # visible table re-measures the ResizeToContents columns on every
+        # setItem, which made redisplaying an order O(rows²).
+        self.table.setRowCount(0)
         self.table.setRowCount(len(items))
 
         # First, populate the table with all items as 'Pending'
@@ -472,9 +542,20 @@ class PackerModeWidget(QWidget):
             status_item.setForeground(pending_fg)
             self.table.setItem(row, 3, status_item)
 
-            # Actions column: Confirm / -1 / Force / Map
-            actions_widget = self._make_actions_widget(row, sku, quantity_int, sku_map or {})
-            self.table.setCellWidget(row, 4, actions_widget)
+            # Actions column: Confirm / -1 / Force / Map, painted by actions_delegate
+            actions_item = QTableWidgetItem()
+            actions_item.setData(SKU_ROLE, sku)
+            actions_item.setData(REQUIRED_ROLE, quantity_int)
+            actions_item.setData(COMPLETE_ROLE, False)
+            actions_item.setData(MAPPED_ROLE, self._normalize_sku(sku) in mapped_skus)
+            self.table.setItem(row, 4, actions_item)
+
+        # Fit SKU/Qty/Status once; scans never widen them ("Pending", "N / N")
+        for column in (1, 2, 3):
+            self.table.resizeColumnToContents(column)
+
+        # [D] Update summary panel (already includes any resumed progress)
+        self._update_summary_panel(items, order_state)
 
         # Now update rows that have existing progress (e.g., resumed order)
         for state_item in order_state:
@@ -485,9 +566,6 @@ class PackerModeWidget(QWidget):
                 is_complete = packed_count >= required_count
                 self.update_item_row(row_index, packed_count, is_complete)
 
-        # [D] Update summary panel
-        self._update_summary_panel(items, order_state)
-
         # [E] Enable skip button now that an order is active
         self.skip_order_button.setEnabled(True)
 
@@ -529,20 +607,42 @@ class PackerModeWidget(QWidget):
                 self.table.palette().color(QPalette.ColorRole.Text)
             )
             # Disable Confirm and Force buttons; leave -1 active for possible undo
-            cell_widget = self.table.cellWidget(row, 4)
-            if cell_widget:
-                for btn in cell_widget.findChildren(QPushButton):
-                    tip = btn.toolTip()
-                    if tip in ("Confirm Manually", "Force confirm all remaining quantity (qty > 5 only)"):  # noqa: E501
-                        btn.setEnabled(False)
+            actions_item = self.table.item(row, 4)
+            if actions_item is not None:
+                actions_item.setData(COMPLETE_ROLE, True)
         else:
+            actions_item = self.table.item(row, 4)
+            if actions_item is not None and actions_item.data(COMPLETE_ROLE):
+                actions_item.setData(COMPLETE_ROLE, False)  # undone: Confirm is usable again
             # Re-apply amber highlight for multi-qty items still in progress
             if req_int > 1:
                 quantity_item.setBackground(QColor("#5a4000"))
                 quantity_item.setForeground(QColor("#f39c12"))
 
-        # [Fix 8] Keep summary panel live during scanning
-        self._refresh_summary_from_table()
+        # [Fix 8] Keep summary panel live during scanning: only this item's SKU row
+        if self._sku_summary is not None:
+            summary_row = self._sku_summary.set_packed(row, packed_count)
+            if summary_row is not None:
+                self._update_summary_row(summary_row)
+
+    def set_sku_map(self, sku_map: Dict[str, str]):
+        """
+        Use a (new) barcode→SKU mapping for Map SKU detection.
+
+        The set of mapped SKUs is built once per mapping object, so showing an
+        order no longer scans the whole mapping for every row. Rows already on
+        screen get their Map button shown or hidden accordingly.
+        """
+        if sku_map is self._sku_map_ref:
+            return
+        self._sku_map_ref = sku_map
+        self._mapped_skus = frozenset(self._normalize_sku(sku) for sku in (sku_map or {}).values())
+        for row in range(self.table.rowCount()):
+            actions_item = self.table.item(row, 4)
+            if actions_item is not None:
+                mapped = self._normalize_sku(actions_item.data(SKU_ROLE)) in self._mapped_skus
+                if actions_item.data(MAPPED_ROLE) != mapped:
+                    actions_item.setData(MAPPED_ROLE, mapped)
 
     def show_notification(self, text: str, color_name: str):
         """
@@ -551,9 +651,15 @@ class PackerModeWidget(QWidget):
         Args:
             text: The message to display.
             color_name: The color string for the text (e.g., "#c0392b" or "red").
+
+        A stylesheet change re-polishes the label, so it is only applied when
+        the color actually changes and there is text to color (each scan first
+        clears the notification, then shows its result).
         """
         self.notification_label.setText(text)
-        self.notification_label.setStyleSheet(f"color: {color_name};")
+        if text and color_name != self._notification_color:
+            self.notification_label.setStyleSheet(f"color: {color_name};")
+            self._notification_color = color_name
 
     def clear_screen(self):
         """
@@ -570,6 +676,7 @@ class PackerModeWidget(QWidget):
         # [D] Hide summary panel
         self.summary_frame.setVisible(False)
         self.summary_table.setRowCount(0)
+        self._sku_summary = None
         # [E] Disable skip button
         self.skip_order_button.setEnabled(False)
         # [J] Hide extras panel and reset title
@@ -610,6 +717,35 @@ class PackerModeWidget(QWidget):
             item.setForeground(QColor("#b06020"))
         self.history_table.setItem(0, 0, item)
 
+    # [W] Wave packing ──────────────────────────────────────────────────────────
+
+    def set_wave_mode(self, enabled: bool):
+        """Reflect wave mode in the UI without emitting wave_mode_toggled (e.g. resumed wave)."""
+        self.wave_mode_button.blockSignals(True)
+        self.wave_mode_button.setChecked(enabled)
+        self.wave_mode_button.blockSignals(False)
+        self.wave_slots_label.setVisible(enabled)
+
+    def set_wave_slots(self, slots: List[Dict[str, Any]], max_orders: int = 0):
+        """
+        Shows the open wave orders, one line per slot.
+
+        Args:
+            slots: Dicts with slot, order_number, packed, required, focused
+                   (PackerLogic.get_wave_slots()).
+            max_orders: Wave size, to show free slots.
+        """
+        lines = []
+        for slot in slots:
+            marker = "▶" if slot["focused"] else " "
+            lines.append(
+                f"{marker} {slot['slot']:>2}  {slot['order_number']}  {slot['packed']}/{slot['required']}"
+            )
+        free = max_orders - len(slots)
+        if free > 0:
+            lines.append(f"   {free} free slot(s) — scan an order")
+        self.wave_slots_label.setText("\n".join(lines) if lines else "Scan order barcodes to fill slots")
+
     # [B] Feature B ────────────────────────────────────────────────────────────
 
     def update_session_progress(self, completed: int, total: int):
@@ -668,82 +804,6 @@ class PackerModeWidget(QWidget):
 
     # ─── Private helpers ──────────────────────────────────────────────────────
 
-    def _make_actions_widget(
-        self,
-        row: int,
-        sku: str,
-        required_qty: int,
-        sku_map: Dict[str, str],
-    ) -> QWidget:
-        """
-        Builds the multi-button widget for the Actions column.
-
-        Buttons included:
-          OK   — Confirm Manually (always present)
-          -1   — Undo last scan (always present; requires confirmation dialog)
-          F✓   — Force confirm all qty (present, but enabled only when required_qty > 5)
-          Map  — Open SKU mapping dialog (only when this SKU is not a value in sku_map)
-        """
-        container = QWidget()
-        container.setFocusPolicy(Qt.NoFocus)
-        layout = QHBoxLayout(container)
-        layout.setContentsMargins(2, 1, 2, 1)
-        layout.setSpacing(3)
-
-        _style = QApplication.instance().style()
-        _icon_sz = QSize(16, 16)
-
-        def _icon_btn(sp: QStyle.StandardPixmap, tip: str, w: int) -> QPushButton:
-            btn = QPushButton()
-            btn.setIcon(_style.standardIcon(sp))
-            btn.setIconSize(_icon_sz)
-            btn.setToolTip(tip)
-            btn.setFixedWidth(w)
-            btn.setFocusPolicy(Qt.NoFocus)
-            return btn
-
-        # ✓ — Confirm Manually (equivalent to scanning the SKU barcode)
-        confirm_btn = _icon_btn(
-            QStyle.StandardPixmap.SP_DialogApplyButton,
-            "Confirm Manually",
-            28,
-        )
-        confirm_btn.clicked.connect(partial(self._on_manual_confirm, sku))
-        layout.addWidget(confirm_btn)
-
-        # ← — Undo last scan
-        minus_btn = _icon_btn(
-            QStyle.StandardPixmap.SP_ArrowLeft,
-            "Undo last scan for this item",
-            28,
-        )
-        minus_btn.clicked.connect(partial(self._on_cancel_item, row))
-        layout.addWidget(minus_btn)
-
-        # ⏩ — Force confirm all qty (enabled only when qty > 5)
-        force_btn = _icon_btn(
-            QStyle.StandardPixmap.SP_MediaSkipForward,
-            "Force confirm all remaining quantity (qty > 5 only)",
-            28,
-        )
-        force_btn.setEnabled(required_qty > 5)
-        force_btn.clicked.connect(partial(self._on_force_confirm, row))
-        layout.addWidget(force_btn)
-
-        # Map SKU — shown only when SKU has no barcode mapping
-        norm_sku = self._normalize_sku(sku)
-        sku_is_mapped = norm_sku in set(sku_map.values())
-        if not sku_is_mapped:
-            map_btn = QPushButton("Map")
-            map_btn.setToolTip("Add barcode mapping for this SKU")
-            map_btn.setFixedWidth(40)
-            map_btn.setFocusPolicy(Qt.NoFocus)
-            map_btn.clicked.connect(partial(self._on_map_sku_requested, sku))
-            layout.addWidget(map_btn)
-
-        layout.addStretch()
-        return container
-
     def _update_metadata_banner(self, metadata: Dict[str, Any] = None):
         """Populate and show/hide the order metadata banner as chip labels."""
         if not metadata:
@@ -794,90 +854,42 @@ class PackerModeWidget(QWidget):
         order_state: List[Dict[str, Any]],
     ):
         """
-        Deduplicates items by SKU and updates the summary table with summed quantities.
+        Deduplicates items by SKU and fills the summary table with summed quantities.
         This handles duplicate SKU rows that can appear in Shopify exports.
         Columns: SKU | Product | Packed/Total | Status
         """
-        sku_totals: Dict[str, int] = defaultdict(int)
-        sku_packed: Dict[str, int] = defaultdict(int)
-        sku_name: Dict[str, str] = {}
-
-        for item in items:
-            sku = item.get('SKU', item.get('sku', ''))
-            try:
-                qty = int(float(item.get('Quantity', item.get('quantity', 1))))
-            except (ValueError, TypeError):
-                qty = 1
-            sku_totals[sku] += qty
-            if sku not in sku_name:
-                sku_name[sku] = item.get('Product_Name', item.get('product_name', ''))
-
-        for state in order_state:
-            orig = state.get('original_sku', '')
-            sku_packed[orig] += state.get('packed', 0)
-
-        unique_skus = sorted(sku_totals.keys())
-        self.summary_table.setRowCount(len(unique_skus))
-
-        for i, sku in enumerate(unique_skus):
-            total = sku_totals[sku]
-            packed = sku_packed.get(sku, 0)
-            self.summary_table.setItem(i, 0, QTableWidgetItem(sku))
-            self.summary_table.setItem(i, 1, QTableWidgetItem(sku_name.get(sku, '')))
-            self.summary_table.setItem(i, 2, QTableWidgetItem(f"{packed} / {total}"))
-            status_text = "Done" if packed >= total else "Pending"
-            status_item = QTableWidgetItem(status_text)
-            if packed >= total:
-                status_item.setForeground(QColor("#43a047"))
-            self.summary_table.setItem(i, 3, status_item)
-
-        self.summary_frame.setVisible(len(unique_skus) > 0)
-
-    def _refresh_summary_from_table(self):
-        """
-        Rebuild the summary table by reading current row data directly from the
-        items table. Called from update_item_row() so the summary stays live.
-        Main table columns: 0=Product Name, 1=SKU, 2="packed / total", 3=Status, 4=Actions.
-        Summary columns: 0=SKU, 1=Product, 2=Packed/Total, 3=Status.
-        """
-        if not self.summary_frame.isVisible():
-            return
+        summary = OrderSkuSummary(items, order_state)
+        self._sku_summary = summary
 
-        sku_packed: Dict[str, int] = defaultdict(int)
-        sku_totals: Dict[str, int] = defaultdict(int)
-        sku_name: Dict[str, str] = {}
-
-        for r in range(self.table.rowCount()):
-            name_item = self.table.item(r, 0)
-            sku_item  = self.table.item(r, 1)
-            qty_item  = self.table.item(r, 2)
-            if sku_item is None or qty_item is None:
-                continue
-            sku = sku_item.text()
-            if sku not in sku_name:
-                sku_name[sku] = name_item.text() if name_item else ''
-            parts = qty_item.text().split(' / ')
-            try:
-                packed = int(parts[0])
-                total  = int(parts[1]) if len(parts) > 1 else 1
-            except (ValueError, IndexError):
-                packed, total = 0, 1
-            sku_packed[sku] += packed
-            sku_totals[sku] += total
-
-        unique_skus = sorted(sku_totals.keys())
-        self.summary_table.setRowCount(len(unique_skus))
-        for i, sku in enumerate(unique_skus):
-            total  = sku_totals[sku]
-            packed = sku_packed.get(sku, 0)
+        # Cleared first for the same reason as the items table in display_order()
+        self.summary_table.setRowCount(0)
+        self.summary_table.setRowCount(len(summary))
+        for i, sku in enumerate(summary.skus):
             self.summary_table.setItem(i, 0, QTableWidgetItem(sku))
-            self.summary_table.setItem(i, 1, QTableWidgetItem(sku_name.get(sku, '')))
-            self.summary_table.setItem(i, 2, QTableWidgetItem(f"{packed} / {total}"))
-            status_text = "Done" if packed >= total else "Pending"
-            status_item = QTableWidgetItem(status_text)
-            if packed >= total:
-                status_item.setForeground(QColor("#43a047"))
-            self.summary_table.setItem(i, 3, status_item)
+            self.summary_table.setItem(i, 1, QTableWidgetItem(summary.names[i]))
+            self.summary_table.setItem(i, 2, QTableWidgetItem())
+            self.summary_table.setItem(i, 3, QTableWidgetItem())
+            self._update_summary_row(i)
+        # Widths never grow while packing ("Pending" and "total / total" are the widest)
+        for column in (0, 2, 3):
+            self.summary_table.resizeColumnToContents(column)
+
+        self.summary_frame.setVisible(len(summary) > 0)
+
+    def _update_summary_row(self, index: int):
+        """
+        Refresh the Packed/Total and Status cells of one summary row in place.
+        """
+        summary = self._sku_summary
+        packed, total = summary.packed[index], summary.totals[index]
+        self.summary_table.item(index, 2).setText(f"{packed} / {total}")
+        status_item = self.summary_table.item(index, 3)
+        if summary.is_done(index):
+            status_item.setText("Done")
+            status_item.setForeground(QColor("#43a047"))
+        else:
+            status_item.setText("Pending")
+            status_item.setData(Qt.ItemDataRole.ForegroundRole, None)  # back to the default
 
     @staticmethod
     def _normalize_sku(sku: str) -> str:
@@ -0,0 +1,176 @@
+"""
+Compiled form of a packing list, cached in the work directory.
+
+Starting or resuming a session used to re-read the packing list JSON from the
+file server, parse it, rebuild the order grouping and re-normalise every order
+number and SKU. For a large list this took seconds over SMB every time a
+packer reopened the list after a crash or moved to another PC.
+
+After a successful load PackerLogic writes packing_list.compiled.json next to
+packing_state.json. It holds the SessionStore in columnar form (per-order row
+ranges, lines, order metadata), the normalized SKU of every line and the
+normalized order-number index, plus the signature of the source file:
+
+    {"format": 1, "list_name": "DHL_Orders",
+     "source": {"name": "DHL_Orders.json", "mtime_ns": ..., "size": ..., "sha256": "..."},
+     "order_index": {...}, "order_collisions": {...}, "store": {...}}
+
+Validation, cheapest first:
+
+- size differs -> stale (list regenerated by Shopify Tool);
+- size and mtime_ns match -> valid, the source is not read at all;
+- size matches but mtime differs (file copied / restored) -> the source bytes
+  are hashed and compared with the recorded sha256.
+
+A stale, corrupt or unreadable compiled file is simply ignored and rebuilt by
+the next full load; the cache never changes what gets loaded.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from logger import get_logger
+from session_store import SessionStore
+
+logger = get_logger(__name__)
+
+COMPILED_FILE_NAME = "packing_list.compiled.json"
+
+# Bump when the compiled layout (or SessionStore.to_compiled) changes
+COMPILED_FORMAT = 1
+
+
+class CompiledPackingList:
+    """
+    A packing list loaded from its compiled form.
+
+    Attributes:
+        list_name (str): Display name of the packing list.
+        store (SessionStore): Orders and lines, with normalized SKUs.
+        order_index (Dict[str, str]): Normalized order number -> original order number.
+        order_collisions (Dict[str, List[str]]): Normalized numbers shared by several orders.
+    """
+
+    def __init__(self, list_name: str, store: SessionStore, order_index: Dict[str, str],
+                 order_collisions: Dict[str, List[str]]):
+        self.list_name = list_name
+        self.store = store
+        self.order_index = order_index
+        self.order_collisions = order_collisions
+
+
+def hash_bytes(data: bytes) -> str:
+    """sha256 hex digest of the raw packing-list bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def _source_signature(source_path: Path, sha256: str) -> Dict[str, Any]:
+    stat = source_path.stat()
+    return {
+        'name': source_path.name,
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'sha256': sha256,
+    }
+
+
+def _source_matches(source_path: Path, recorded: Dict[str, Any]) -> bool:
+    stat = source_path.stat()
+    if recorded.get('name') != source_path.name or recorded.get('size') != stat.st_size:
+        return False
+    if recorded.get('mtime_ns') == stat.st_mtime_ns:
+        return True
+    # Same size, different mtime (copied / restored file): compare content
+    with open(source_path, 'rb') as f:
+        return hash_bytes(f.read()) == recorded.get('sha256')
+
+
+def load_compiled(cache_path: Path, source_path: Path) -> Optional[CompiledPackingList]:
+    """
+    Load the compiled packing list if it is still valid for source_path.
+
+    Returns:
+        CompiledPackingList, or None if the cache is missing, stale or unreadable.
+    """
+    cache_path = Path(cache_path)
+    source_path = Path(source_path)
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable compiled packing list {cache_path}: {e}")
+        return None
+
+    try:
+        if data.get('format') != COMPILED_FORMAT:
+            logger.info(f"Compiled packing list {cache_path} has an old format, rebuilding")
+            return None
+        if not _source_matches(source_path, data['source']):
+            logger.info(f"Compiled packing list {cache_path} is stale, rebuilding")
+            return None
+        return CompiledPackingList(
+            list_name=data['list_name'],
+            store=SessionStore.from_compiled(data['store']),
+            order_index=data['order_index'],
+            order_collisions=data['order_collisions'],
+        )
+    except (OSError, KeyError, TypeError, ValueError, IndexError, AttributeError) as e:
+        logger.warning(f"Ignoring invalid compiled packing list {cache_path}: {e}")
+        return None
+
+
+def save_compiled(cache_path: Path, source_path: Path, source_sha256: str,
+                  compiled: CompiledPackingList) -> bool:
+    """
+    Write the compiled packing list atomically (temp file + os.replace).
+
+    Failures are logged and reported, never raised: the cache is optional.
+
+    Args:
+        cache_path: Destination (normally work_dir / COMPILED_FILE_NAME)
+        source_path: Packing list JSON the store was built from
+        source_sha256: hash_bytes() of the bytes that were parsed
+        compiled: Data to store
+
+    Returns:
+        bool: True if written.
+    """
+    cache_path = Path(cache_path)
+    tmp_path = None
+    try:
+        data = {
+            'format': COMPILED_FORMAT,
+            'list_name': compiled.list_name,
+            'source': _source_signature(Path(source_path), source_sha256),
+            'order_index': compiled.order_index,
+            'order_collisions': compiled.order_collisions,
+            'store': compiled.store.to_compiled(),
+        }
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            mode='w',
+            dir=cache_path.parent,
+            prefix='.tmp_compiled_',
+            suffix='.json',
+            delete=False,
+            encoding='utf-8'
+        ) as tmp_file:
+            tmp_path = tmp_file.name
+            json.dump(data, tmp_file, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, cache_path)
+        logger.debug(f"Compiled packing list written: {cache_path}")
+        return True
+    except (OSError, TypeError, ValueError) as e:
+        logger.warning(f"Could not write compiled packing list {cache_path}: {e}")
+        if tmp_path is not None:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+        return False
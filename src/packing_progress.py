@@ -0,0 +1,347 @@
+"""
+In-memory progress tracking for the packing hot path.
+
+Every SKU scan used to walk the whole order state several times (find the first
+open row, check SKU membership, all() for completion, two sum() passes for the
+progress signal). For B2B orders with hundreds or thousands of lines that made
+each scan O(lines) several times over.
+
+OrderProgress indexes one order's state once when the order is opened and then
+answers every per-scan question in O(1) (amortised), updating its counters as
+items are packed, cancelled or force-confirmed.
+
+SessionProgress does the same for the session-wide counters written into every
+packing_state.json save (total/packed items), which used to be recomputed with
+pandas over the whole packing list on each scan.
+
+The item-state dicts themselves stay the single source of truth: OrderProgress
+holds references to the same dicts that live in session_packing_state, so
+persistence and the UI keep working on the familiar list-of-dicts structure.
+"""
+
+from bisect import insort
+from typing import Any, Dict, List, Optional
+
+
+class OrderProgress:
+    """
+    Per-order SKU index with running packed/required counters.
+
+    Structures (built once per order, updated in O(1) per event):
+    - normalized SKU -> ordered queue of positions of rows that still need units
+    - normalized SKU -> every position carrying that SKU (membership / extras)
+    - row number -> item state (cancel / force-confirm by row)
+    - packed_total / required_total / open_rows counters
+
+    Order completion is a counter check: the order is complete when no row
+    has packed < required.
+
+    Attributes:
+        order_state (List[Dict]): The item-state list this index was built from.
+        packed_total (int): Sum of 'packed' across all rows.
+        required_total (int): Sum of 'required' across all rows.
+    """
+
+    def __init__(self, order_state: List[Dict[str, Any]]):
+        """
+        Build the index for an order.
+
+        Args:
+            order_state: List of item-state dicts (keys: normalized_sku,
+                         required, packed, row), as stored in
+                         session_packing_state['in_progress'][order_number].
+        """
+        self.order_state = order_state
+        self.packed_total = 0
+        self.required_total = 0
+        self._open_rows = 0
+
+        # normalized_sku -> sorted list of positions (index into order_state)
+        # whose row still has packed < required. Head of the list is the row a
+        # scan of that SKU packs next — same "first unpacked row" rule as before.
+        self._open_by_sku: Dict[str, List[int]] = {}
+        # normalized_sku -> number of rows carrying the SKU (packed or not)
+        self._sku_row_count: Dict[str, int] = {}
+        # row number -> position in order_state
+        self._position_by_row: Dict[int, int] = {}
+
+        for position, item_state in enumerate(order_state):
+            sku = item_state['normalized_sku']
+            packed = item_state['packed']
+            required = item_state['required']
+
+            self.packed_total += packed
+            self.required_total += required
+            self._sku_row_count[sku] = self._sku_row_count.get(sku, 0) + 1
+            self._position_by_row.setdefault(item_state.get('row', position), position)
+
+            if packed < required:
+                self._open_rows += 1
+                self._open_by_sku.setdefault(sku, []).append(position)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    @property
+    def is_complete(self) -> bool:
+        """True when every row has packed >= required."""
+        return self._open_rows == 0
+
+    def contains_sku(self, normalized_sku: str) -> bool:
+        """True if any row of the order carries this SKU (packed or not)."""
+        return normalized_sku in self._sku_row_count
+
+    def skus(self) -> List[str]:
+        """Every normalized SKU carried by the order (packed or not)."""
+        return list(self._sku_row_count)
+
+    @property
+    def remaining_total(self) -> int:
+        """Units still to pack across all rows."""
+        return self.required_total - self.packed_total
+
+    def remaining_for_sku(self, normalized_sku: str) -> int:
+        """Number of rows with this SKU that still need at least one unit."""
+        return len(self._open_by_sku.get(normalized_sku, ()))
+
+    def next_open_item(self, normalized_sku: str) -> Optional[Dict[str, Any]]:
+        """Return the first row with this SKU that still needs units, or None."""
+        positions = self._open_by_sku.get(normalized_sku)
+        if not positions:
+            return None
+        return self.order_state[positions[0]]
+
+    def get_item(self, row: int) -> Optional[Dict[str, Any]]:
+        """Return the item state for a row number, or None if unknown."""
+        position = self._position_by_row.get(row)
+        if position is None:
+            return None
+        return self.order_state[position]
+
+    # ------------------------------------------------------------------
+    # Mutations (the only code paths that change 'packed')
+    # ------------------------------------------------------------------
+
+    def pack_one(self, item_state: Dict[str, Any]) -> None:
+        """Increment packed by one unit for item_state."""
+        was_open = item_state['packed'] < item_state['required']
+        item_state['packed'] += 1
+        self.packed_total += 1
+        if was_open and item_state['packed'] >= item_state['required']:
+            self._close(item_state)
+
+    def unpack_one(self, item_state: Dict[str, Any]) -> None:
+        """Decrement packed by one unit for item_state (caller checks packed > 0)."""
+        was_open = item_state['packed'] < item_state['required']
+        item_state['packed'] -= 1
+        self.packed_total -= 1
+        if not was_open and item_state['packed'] < item_state['required']:
+            self._reopen(item_state)
+
+    def force_complete(self, item_state: Dict[str, Any]) -> int:
+        """
+        Set packed = required for item_state.
+
+        Returns:
+            int: Number of units added (0 if the row was already fully packed).
+        """
+        added = item_state['required'] - item_state['packed']
+        if added <= 0:
+            return 0
+        item_state['packed'] = item_state['required']
+        self.packed_total += added
+        self._close(item_state)
+        return added
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    def _position_of(self, item_state: Dict[str, Any]) -> int:
+        position = self._position_by_row.get(item_state.get('row'))
+        if position is not None and self.order_state[position] is item_state:
+            return position
+        # Rows without a unique 'row' key (legacy state): fall back to identity scan
+        for position, candidate in enumerate(self.order_state):
+            if candidate is item_state:
+                return position
+        raise ValueError("item_state does not belong to this order")
+
+    def _close(self, item_state: Dict[str, Any]) -> None:
+        position = self._position_of(item_state)
+        positions = self._open_by_sku.get(item_state['normalized_sku'])
+        if positions and position in positions:
+            # Scans always close the head of the queue, so this is O(1) in practice
+            positions.remove(position)
+            if not positions:
+                del self._open_by_sku[item_state['normalized_sku']]
+            self._open_rows -= 1
+
+    def _reopen(self, item_state: Dict[str, Any]) -> None:
+        position = self._position_of(item_state)
+        positions = self._open_by_sku.setdefault(item_state['normalized_sku'], [])
+        if position not in positions:
+            insort(positions, position)
+            self._open_rows += 1
+
+
+class SessionProgress:
+    """
+    Session-wide item counters for progress reporting.
+
+    Replaces the per-scan pandas recomputation (to_numeric + isin masks over the
+    whole packing list) that used to feed progress.total_items/packed_items.
+    Totals are derived once from the packing list; packed counts are updated by
+    PackerLogic on every scan, cancel, force-confirm and order completion.
+
+    packed_items keeps the historical definition:
+        sum(Quantity of completed orders) + sum(packed of in-progress rows)
+
+    Attributes:
+        order_items (Dict[str, float]): Order number -> total Quantity of its lines.
+        total_lines (int): Number of lines in the packing list.
+        unique_skus (int): Number of distinct SKUs in the packing list.
+        in_progress_packed (int): Units packed across in-progress orders.
+    """
+
+    def __init__(self, order_items: Dict[str, float], total_lines: int = 0, unique_skus: int = 0):
+        self.order_items = order_items
+        self.total_lines = total_lines
+        self.unique_skus = unique_skus
+        self._total_items = float(sum(order_items.values()))
+        self._completed_items = 0.0
+        self.in_progress_packed = 0
+
+        # Containers the counters were last derived from (see sync()).
+        self._completed_ref: Optional[List[str]] = None
+        self._completed_seen = 0
+        self._in_progress_ref: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_dataframe(cls, df) -> 'SessionProgress':
+        """
+        Build totals from a packing-list DataFrame in a single grouped pass.
+
+        Non-numeric quantities are ignored (same coercion as before).
+        """
+        if df is None or df.empty or 'Quantity' not in df.columns or 'Order_Number' not in df.columns:
+            return cls({}, total_lines=0 if df is None else len(df))
+
+        import pandas as pd
+
+        quantities = pd.to_numeric(df['Quantity'], errors='coerce')
+        per_order = quantities.groupby(df['Order_Number'], sort=False).sum()
+        order_items = {order: float(qty) for order, qty in per_order.items()}
+        unique_skus = int(df['SKU'].nunique()) if 'SKU' in df.columns else 0
+        return cls(order_items, total_lines=len(df), unique_skus=unique_skus)
+
+    @classmethod
+    def from_store(cls, store) -> 'SessionProgress':
+        """Build totals from a SessionStore (cached per-order quantities, no pandas)."""
+        if store is None:
+            return cls({})
+        return cls(
+            dict(store.order_quantities()),
+            total_lines=store.total_lines,
+            unique_skus=store.unique_sku_count(),
+        )
+
+    # ------------------------------------------------------------------
+    # Read API
+    # ------------------------------------------------------------------
+
+    @property
+    def total_orders(self) -> int:
+        return len(self.order_items)
+
+    @property
+    def total_items(self) -> int:
+        return int(self._total_items)
+
+    @property
+    def completed_items(self) -> int:
+        return int(self._completed_items)
+
+    @property
+    def packed_items(self) -> int:
+        return int(self._completed_items) + self.in_progress_packed
+
+    # ------------------------------------------------------------------
+    # Events
+    # ------------------------------------------------------------------
+
+    def add_packed(self, units: int = 1) -> None:
+        """Units packed (scan or force-confirm) on an in-progress order."""
+        self.in_progress_packed += units
+
+    def remove_packed(self, units: int = 1) -> None:
+        """Units un-packed (cancel) on an in-progress order."""
+        self.in_progress_packed -= units
+
+    def order_completed(self, order_number: str, packed_units: int) -> None:
+        """
+        An in-progress order moved to completed_orders.
+
+        Args:
+            order_number: The completed order.
+            packed_units: Units that were counted as in-progress for it.
+        """
+        self.in_progress_packed -= packed_units
+        self._completed_items += self.order_items.get(order_number, 0.0)
+        self._completed_seen += 1
+
+    def sync(self, session_packing_state: Dict[str, Any]) -> None:
+        """
+        Re-derive packed counters if the state containers changed underneath us.
+
+        Normal packing goes through the event methods and this is an O(1)
+        identity/length check. A full recount (dict lookups only, no pandas)
+        happens only after the state was replaced wholesale, e.g. restored
+        from disk.
+        """
+        completed = session_packing_state.get('completed_orders', [])
+        in_progress = session_packing_state.get('in_progress', {})
+        if (
+            completed is self._completed_ref
+            and len(completed) == self._completed_seen
+            and in_progress is self._in_progress_ref
+        ):
+            return
+
+        self._completed_items = float(sum(self.order_items.get(o, 0.0) for o in completed))
+        packed = 0
+        for order_state in in_progress.values():
+            if isinstance(order_state, list):
+                for item in order_state:
+                    if isinstance(item, dict):
+                        packed += item.get('packed', 0)
+        self.in_progress_packed = packed
+
+        self._completed_ref = completed
+        self._completed_seen = len(completed)
+        self._in_progress_ref = in_progress
+
+
+class CompletedOrderSet:
+    """
+    Set mirror of session_packing_state['completed_orders'] for O(1) lookups.
+
+    completed_orders is an append-only list, so each lookup only folds in the
+    entries appended since the previous one; a replaced or shortened list
+    (session restored / reset) is re-read in full.
+    """
+
+    def __init__(self):
+        self._orders: set = set()
+        self._ref: Optional[List[str]] = None
+        self._seen = 0
+
+    def contains(self, completed_orders: List[str], order_number: Any) -> bool:
+        if completed_orders is not self._ref or len(completed_orders) < self._seen:
+            self._orders = set(completed_orders)
+            self._ref = completed_orders
+        elif len(completed_orders) > self._seen:
+            self._orders.update(completed_orders[self._seen:])
+        self._seen = len(completed_orders)
+        return order_number in self._orders
@@ -1,16 +1,126 @@
 import os
 from pathlib import Path
 from PySide6.QtWidgets import (
-    QDialog, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QPushButton,
-    QScrollArea, QWidget, QMessageBox, QCheckBox
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QListView,
+    QStyledItemDelegate, QWidget, QMessageBox
 )
-from PySide6.QtGui import QPixmap
-from PySide6.QtCore import Qt
-from typing import Dict, Any
+from PySide6.QtGui import QColor, QImage, QPixmap
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QSize
+from typing import Dict, Any, List, Optional
+from barcode_thumbnails import THUMBNAIL_WIDTH, ThumbnailCache, ThumbnailLoader
 from logger import get_logger
 
 logger = get_logger(__name__)
 
+# Item data roles resolved once (each Qt.<Role> lookup is slow in PySide6)
+_DISPLAY_ROLE = Qt.ItemDataRole.DisplayRole
+_DECORATION_ROLE = Qt.ItemDataRole.DecorationRole
+_CHECK_STATE_ROLE = Qt.ItemDataRole.CheckStateRole
+_TOOLTIP_ROLE = Qt.ItemDataRole.ToolTipRole
+
+# Preview cell: thumbnail (labels are wider than tall) plus check box and order number
+_THUMBNAIL_SIZE = QSize(THUMBNAIL_WIDTH, 130)
+_CELL_SIZE = QSize(THUMBNAIL_WIDTH + 30, 190)
+
+
+class BarcodeListModel(QAbstractListModel):
+    """
+    One checkable row per order, with its barcode thumbnail as decoration.
+
+    Thumbnails are requested from the ThumbnailLoader the first time the view
+    asks for a row's decoration, i.e. when the row is painted; until it arrives
+    a blank placeholder is shown.
+    """
+
+    def __init__(self, orders_data: Dict[str, Any], loader: ThumbnailLoader, parent=None):
+        super().__init__(parent)
+        self._orders: List[str] = list(orders_data)
+        self._paths: List[str] = [str(orders_data[order]['barcode_path']) for order in self._orders]
+        self._checked: List[bool] = [True] * len(self._orders)  # Default: all selected
+        self._thumbnails: Dict[int, QPixmap] = {}
+        self._rows_by_path: Dict[str, List[int]] = {}
+        for row, path in enumerate(self._paths):
+            self._rows_by_path.setdefault(path, []).append(row)
+
+        self._placeholder = QPixmap(_THUMBNAIL_SIZE)
+        self._placeholder.fill(QColor("#f0f0f0"))
+
+        self._loader = loader
+        loader.loaded.connect(self._on_thumbnail_loaded)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._orders)
+
+    def flags(self, index):
+        return super().flags(index) | Qt.ItemFlag.ItemIsUserCheckable
+
+    def data(self, index, role=_DISPLAY_ROLE):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role == _DISPLAY_ROLE:
+            return self._orders[row]
+        if role == _DECORATION_ROLE:
+            pixmap = self._thumbnails.get(row)
+            if pixmap is None:
+                self._loader.request(self._paths[row])
+                return self._placeholder
+            return pixmap
+        if role == _CHECK_STATE_ROLE:
+            return Qt.CheckState.Checked if self._checked[row] else Qt.CheckState.Unchecked
+        if role == _TOOLTIP_ROLE:
+            return Path(self._paths[row]).name
+        return None
+
+    def setData(self, index, value, role=_CHECK_STATE_ROLE):
+        if not index.isValid() or role != _CHECK_STATE_ROLE:
+            return False
+        self._checked[index.row()] = Qt.CheckState(value) == Qt.CheckState.Checked
+        self.dataChanged.emit(index, index, [_CHECK_STATE_ROLE])
+        return True
+
+    def set_all_checked(self, checked: bool):
+        """Check or uncheck every row (one dataChanged for the whole list)."""
+        self._checked = [checked] * len(self._orders)
+        if self._orders:
+            self.dataChanged.emit(self.index(0), self.index(len(self._orders) - 1), [_CHECK_STATE_ROLE])
+
+    def checked_orders(self) -> List[str]:
+        return [order for order, checked in zip(self._orders, self._checked) if checked]
+
+    def is_checked(self, order_number: str) -> bool:
+        return self._checked[self._orders.index(order_number)]
+
+    def thumbnail(self, row: int) -> Optional[QPixmap]:
+        return self._thumbnails.get(row)
+
+    def _on_thumbnail_loaded(self, path: str, image: QImage):
+        rows = self._rows_by_path.get(path)
+        if not rows:
+            return
+        if image.isNull():
+            logger.warning(f"No preview for barcode: {path}")
+            pixmap = self._placeholder
+        else:
+            pixmap = QPixmap.fromImage(image)
+        for row in rows:
+            self._thumbnails[row] = pixmap
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [_DECORATION_ROLE])
+
+
+class _FixedSizeDelegate(QStyledItemDelegate):
+    """
+    Every preview cell has the same size.
+
+    The icon-mode layout asks each item for its size hint; the default delegate
+    would read every row's decoration to compute it, loading all thumbnails up front.
+    """
+
+    def sizeHint(self, option, index):
+        return _CELL_SIZE
+
+
 class PrintDialog(QDialog):
     """
     A dialog for previewing and printing generated barcode labels.
@@ -18,6 +128,11 @@ class PrintDialog(QDialog):
     This dialog displays a grid of all the barcode labels generated for the
     current session. Users can select specific labels to print using checkboxes.
 
+    The grid is a QListView over BarcodeListModel: only labels scrolled into
+    view are loaded, on a thread pool (ThumbnailLoader), through a local
+    thumbnail cache, so the dialog opens immediately even for thousands of
+    orders on a slow file server.
+
     For thermal label printers (like Citizen CL-E300), this dialog uses Windows
     shell printing which works better than QPrinter for label alignment.
 
@@ -25,11 +140,12 @@ class PrintDialog(QDialog):
         orders_data (Dict[str, Any]): A dictionary containing the data for all
                                       orders, including paths to their barcode
                                       images.
-        checkboxes (Dict[str, QCheckBox]): Checkboxes for selecting labels to print
-        scroll_content (QWidget): The widget inside the scroll area that holds
-                                  the grid of barcode previews.
+        model (BarcodeListModel): Orders, their check state and loaded thumbnails.
+        view (QListView): The preview grid.
+        loader (ThumbnailLoader): Background thumbnail loader.
     """
-    def __init__(self, orders_data: Dict[str, Any], parent: QWidget = None):
+    def __init__(self, orders_data: Dict[str, Any], parent: QWidget = None,
+                 cache_dir: Optional[Path] = None):
         """
         Initializes the PrintDialog.
 
@@ -37,13 +153,16 @@ class PrintDialog(QDialog):
             orders_data (Dict[str, Any]): The dictionary of order data from
                                           PackerLogic.
             parent (QWidget, optional): The parent widget. Defaults to None.
+            cache_dir (Path, optional): Local thumbnail cache directory.
+                                        Defaults to ~/.packers_assistant/cache/thumbnails.
         """
         super().__init__(parent)
         self.setWindowTitle("Print Barcodes")
         self.setMinimumSize(900, 700)
 
         self.orders_data = orders_data
-        self.checkboxes = {}  # Store checkboxes for each order
+        self.loader = ThumbnailLoader(ThumbnailCache(cache_dir), self)
+        self.model = BarcodeListModel(orders_data, self.loader, self)
 
         main_layout = QVBoxLayout(self)
 
@@ -66,66 +185,20 @@ class PrintDialog(QDialog):
 
         main_layout.addLayout(header_layout)
 
-        # === SCROLL AREA: Barcode Previews ===
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        main_layout.addWidget(scroll_area)
-
-        self.scroll_content = QWidget()
-        scroll_area.setWidget(self.scroll_content)
-
-        grid_layout = QGridLayout(self.scroll_content)
-        grid_layout.setSpacing(15)
-
-        # Create grid of barcode previews with checkboxes
-        row, col = 0, 0
-        for order_number, data in self.orders_data.items():
-            barcode_path = data['barcode_path']
-
-            # Item container
-            item_widget = QWidget()
-            item_widget.setStyleSheet("""
-                QWidget {
-                    border: 2px solid #ddd;
-                    border-radius: 5px;
-                    padding: 10px;
-                    background-color: white;
-                }
-            """)
-            item_layout = QVBoxLayout(item_widget)
-
-            # Checkbox for selection
-            checkbox = QCheckBox(f"Print {order_number}")
-            checkbox.setChecked(True)  # Default: all selected
-            checkbox.setStyleSheet("font-weight: bold;")
-            self.checkboxes[order_number] = checkbox
-            item_layout.addWidget(checkbox, alignment=Qt.AlignmentFlag.AlignCenter)
-
-            # Barcode preview image
-            pixmap = QPixmap(barcode_path)
-            barcode_label = QLabel()
-            barcode_label.setPixmap(pixmap.scaledToWidth(250))  # Larger preview
-            barcode_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            item_layout.addWidget(barcode_label)
-
-            # Order number label
-            number_label = QLabel(order_number)
-            number_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            number_label.setStyleSheet("font-size: 10pt; color: #555;")
-            item_layout.addWidget(number_label)
-
-            # Path label (for reference)
-            path_label = QLabel(Path(barcode_path).name)
-            path_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            path_label.setStyleSheet("font-size: 8pt; color: #999;")
-            item_layout.addWidget(path_label)
-
-            grid_layout.addWidget(item_widget, row, col)
-
-            col += 1
-            if col >= 3:  # 3 barcodes per row
-                col = 0
-                row += 1
+        # === PREVIEW GRID: Barcode Previews (loaded as they scroll into view) ===
+        self.view = QListView()
+        self.view.setViewMode(QListView.ViewMode.IconMode)
+        self.view.setMovement(QListView.Movement.Static)
+        self.view.setResizeMode(QListView.ResizeMode.Adjust)
+        self.view.setUniformItemSizes(True)
+        self.view.setSpacing(15)
+        self.view.setIconSize(_THUMBNAIL_SIZE)
+        self.view.setGridSize(_CELL_SIZE + QSize(15, 15))
+        self.view.setSelectionMode(QListView.SelectionMode.NoSelection)
+        self.view.setItemDelegate(_FixedSizeDelegate(self.view))
+        self.view.setStyleSheet("QListView { background-color: white; }")
+        self.view.setModel(self.model)
+        main_layout.addWidget(self.view)
 
         # === FOOTER: Action Buttons ===
         footer_layout = QHBoxLayout()
@@ -187,16 +260,19 @@ class PrintDialog(QDialog):
 
     def select_all(self):
         """Select all barcode checkboxes."""
-        for checkbox in self.checkboxes.values():
-            checkbox.setChecked(True)
+        self.model.set_all_checked(True)
         logger.info("Selected all barcodes for printing")
 
     def deselect_all(self):
         """Deselect all barcode checkboxes."""
-        for checkbox in self.checkboxes.values():
-            checkbox.setChecked(False)
+        self.model.set_all_checked(False)
         logger.info("Deselected all barcodes")
 
+    def done(self, result: int):
+        """Stop loading thumbnails before the dialog goes away."""
+        self.loader.shutdown()
+        super().done(result)
+
     def open_in_photo_viewer(self):
         """
         Open selected barcode images in Windows Photo Viewer.
@@ -222,11 +298,7 @@ class PrintDialog(QDialog):
         - Works with any Windows-compatible printer
         """
         # Get selected barcodes
-        selected_orders = [
-            order_number
-            for order_number, checkbox in self.checkboxes.items()
-            if checkbox.isChecked()
-        ]
+        selected_orders = self.model.checked_orders()
 
         if not selected_orders:
             QMessageBox.warning(
@@ -320,11 +392,7 @@ class PrintDialog(QDialog):
         5. Can print multiple labels in one job
         """
         # Get selected barcodes
-        selected_orders = [
-            order_number
-            for order_number, checkbox in self.checkboxes.items()
-            if checkbox.isChecked()
-        ]
+        selected_orders = self.model.checked_orders()
 
         if not selected_orders:
             QMessageBox.warning(
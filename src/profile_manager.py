@@ -23,6 +23,7 @@ except ImportError:
     WINDOWS_LOCKING_AVAILABLE = False
 
 from logger import get_logger
+from fs_metadata_cache import fs_exists, fs_is_dir, fs_scan_pass, scan_dir, invalidate_fs_cache
 
 logger = get_logger(__name__)
 
@@ -349,6 +350,7 @@ class ProfileManager:
             # Create session directory for this client
             client_sessions = self.sessions_dir / f"CLIENT_{client_id}"
             client_sessions.mkdir(exist_ok=True)
+            invalidate_fs_cache(client_sessions)
 
             logger.info(f"Successfully created client profile: {client_id}")
             return True
@@ -682,6 +684,7 @@ class ProfileManager:
         """
         client_sessions = self.sessions_dir / f"CLIENT_{client_id}"
         client_sessions.mkdir(exist_ok=True)
+        invalidate_fs_cache(client_sessions)
 
         if session_name:
             return client_sessions / session_name
@@ -754,6 +757,7 @@ class ProfileManager:
             logger.error(f"Error listing sessions for {client_id}: {e}")
             return []
 
+    @fs_scan_pass()
     def get_incomplete_sessions(self, client_id: str) -> List[Path]:
         """
         Get list of incomplete sessions for a client.
@@ -769,20 +773,21 @@ class ProfileManager:
         """
         client_sessions_dir = self.sessions_dir / f"CLIENT_{client_id}"
 
-        if not client_sessions_dir.exists():
+        if not fs_is_dir(client_sessions_dir):
             logger.debug(f"No sessions directory for client {client_id}")
             return []
 
         incomplete_sessions = []
 
         try:
-            for session_dir in client_sessions_dir.iterdir():
-                if not session_dir.is_dir():
+            for entry in scan_dir(client_sessions_dir):
+                if not entry.is_dir:
                     continue
 
                 # Check if session has session_info.json (incomplete session marker)
+                session_dir = Path(entry.path)
                 session_info_path = session_dir / "session_info.json"
-                if session_info_path.exists():
+                if fs_exists(session_info_path):
                     incomplete_sessions.append(session_dir)
 
             # Sort by modification time (newest first)
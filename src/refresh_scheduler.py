@@ -0,0 +1,155 @@
+"""
+Frame-coalescing refresh scheduler for the secondary views of the main window.
+
+A fast scanner delivers 3-5 scans per second, sometimes several within a few
+milliseconds when the scanner flushes its buffer. Every scan used to repaint
+the order tree, recompute the statistics tab and move the session progress
+bar on the spot, so a burst did the same work once per scan.
+
+Views register a refresh callback once. Logic signals only mark a view dirty
+(optionally for a key such as an order number); a single-shot timer then runs
+each dirty view once per frame with all keys collected since the last frame.
+Feedback that the packer waits for (beep, notification, the scanned row) is
+not routed through here and stays immediate.
+
+    scheduler = RefreshScheduler(parent=self)
+    scheduler.register("tree", self._refresh_orders_in_tree)   # callback(keys)
+    scheduler.mark_dirty("tree", order_number)
+
+A callback receives the set of dirty keys, or None when the view was marked
+dirty without a key (meaning "refresh everything").
+
+metrics() reports how many refresh requests were coalesced away and an
+estimate of the main-thread time that saved (skipped requests times the
+view's measured average refresh cost).
+"""
+
+import time
+from typing import Any, Callable, Dict, Optional, Set
+
+from PySide6.QtCore import QObject, QTimer
+
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+# One frame: long enough to merge a scanner burst, short enough to look live
+DEFAULT_FRAME_MS = 100
+
+_ALL = object()  # marks a view dirty as a whole
+
+
+class _View:
+    __slots__ = ("callback", "keys", "requests", "refreshes", "seconds")
+
+    def __init__(self, callback: Callable[[Optional[Set[Any]]], None]):
+        self.callback = callback
+        self.keys: Optional[Set[Any]] = None  # None: clean; contains _ALL: full refresh
+        self.requests = 0
+        self.refreshes = 0
+        self.seconds = 0.0
+
+
+class RefreshScheduler(QObject):
+    """
+    Runs each dirty view's refresh callback at most once per frame.
+
+    Attributes:
+        frame_ms (int): Delay between the first dirty mark and the refresh.
+        frames (int): Timer ticks that refreshed at least one view.
+    """
+
+    def __init__(self, parent: QObject = None, frame_ms: int = DEFAULT_FRAME_MS):
+        super().__init__(parent)
+        self.frame_ms = frame_ms
+        self.frames = 0
+        self._views: Dict[str, _View] = {}
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+
+    def register(self, name: str, callback: Callable[[Optional[Set[Any]]], None]) -> None:
+        """Register (or replace) the refresh callback of a view."""
+        self._views[name] = _View(callback)
+
+    def mark_dirty(self, name: str, key: Any = None) -> None:
+        """
+        Schedule a refresh of a view for the next frame.
+
+        Args:
+            name: Registered view name.
+            key: What changed (e.g. an order number); None refreshes the whole view.
+        """
+        view = self._views[name]
+        view.requests += 1
+        if view.keys is None:
+            view.keys = set()
+        view.keys.add(_ALL if key is None else key)
+        if not self._timer.isActive():
+            self._timer.start(self.frame_ms)
+
+    def is_dirty(self, name: str) -> bool:
+        return self._views[name].keys is not None
+
+    def flush(self) -> None:
+        """Refresh every dirty view now (also called by the frame timer)."""
+        self._timer.stop()
+        refreshed = False
+        for name, view in self._views.items():
+            keys, view.keys = view.keys, None
+            if keys is None:
+                continue
+            start = time.perf_counter()
+            try:
+                view.callback(None if _ALL in keys else keys)
+            except Exception as e:
+                logger.error(f"Refresh of view '{name}' failed: {e}", exc_info=True)
+            view.seconds += time.perf_counter() - start
+            view.refreshes += 1
+            refreshed = True
+        if refreshed:
+            self.frames += 1
+
+    def cancel(self) -> None:
+        """Drop pending refreshes (e.g. the session they belong to has ended)."""
+        self._timer.stop()
+        for view in self._views.values():
+            view.keys = None
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Coalescing statistics since creation (or the last reset_metrics()).
+
+        Returns:
+            Dict with 'frames', per-view 'views' entries (requests, refreshes,
+            skipped, refresh_ms) and the totals 'skipped' and 'saved_ms', the
+            estimated main-thread time not spent on skipped refreshes.
+        """
+        views = {}
+        skipped_total = 0
+        saved_ms = 0.0
+        for name, view in self._views.items():
+            skipped = view.requests - view.refreshes - (1 if view.keys is not None else 0)
+            skipped = max(skipped, 0)
+            average_ms = view.seconds * 1000 / view.refreshes if view.refreshes else 0.0
+            views[name] = {
+                'requests': view.requests,
+                'refreshes': view.refreshes,
+                'skipped': skipped,
+                'refresh_ms': round(view.seconds * 1000, 3),
+            }
+            skipped_total += skipped
+            saved_ms += skipped * average_ms
+        return {
+            'frames': self.frames,
+            'views': views,
+            'skipped': skipped_total,
+            'saved_ms': round(saved_ms, 3),
+        }
+
+    def reset_metrics(self) -> None:
+        self.frames = 0
+        for view in self._views.values():
+            view.requests = 0
+            view.refreshes = 0
+            view.seconds = 0.0
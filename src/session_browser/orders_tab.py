@@ -4,7 +4,7 @@ from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
     QTreeWidget, QTreeWidgetItem, QLabel, QLineEdit
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QColor
 
 from datetime import datetime
@@ -12,6 +12,15 @@ from logger import get_logger
 
 logger = get_logger(__name__)
 
+# Order rows added per event-loop pass, so a session with thousands of orders
+# shows its first rows at once and the dialog stays responsive while the rest
+# are added. Item and quality rows are only built when an order is expanded.
+ORDER_CHUNK_SIZE = 200
+
+# Position of a top-level row's order in filtered_orders
+_ORDER_ROLE = Qt.ItemDataRole.UserRole
+_SHOW_INDICATOR = QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator
+
 
 class OrdersTab(QWidget):
     """Tab showing orders tree with items and timing"""
@@ -29,6 +38,7 @@ class OrdersTab(QWidget):
         self.details = details
         self.all_orders = []
         self.filtered_orders = []
+        self._fill_position = 0  # filtered_orders added to the tree so far
 
         self._load_orders()
         self._init_ui()
@@ -78,7 +88,7 @@ class OrdersTab(QWidget):
         top_bar.addWidget(self.search_input)
 
         expand_btn = QPushButton("Expand All")
-        expand_btn.clicked.connect(lambda: self.tree.expandAll())
+        expand_btn.clicked.connect(self._expand_all)
         top_bar.addWidget(expand_btn)
 
         collapse_btn = QPushButton("Collapse All")
@@ -104,11 +114,21 @@ class OrdersTab(QWidget):
         self.tree.setAlternatingRowColors(True)
         self.tree.setColumnWidth(0, 200)
         self.tree.setColumnWidth(5, 140)
+        # Expanding an order row builds its children (expandAll() does not emit this)
+        self.tree.itemExpanded.connect(self._fill_children)
         layout.addWidget(self.tree)
 
+        # Drives chunked population of the order rows
+        self._fill_timer = QTimer(self)
+        self._fill_timer.setSingleShot(True)
+        self._fill_timer.setInterval(0)
+        self._fill_timer.timeout.connect(self._add_order_chunk)
+
     def _populate_tree(self):
         """Populate tree with orders."""
+        self._fill_timer.stop()
         self.tree.clear()
+        self._fill_position = 0
 
         # Apply filter
         search_term = self.search_input.text().strip().lower()
@@ -130,120 +150,157 @@ class OrdersTab(QWidget):
             self.info_label.setText(f"Showing {len(self.filtered_orders)} of {len(self.all_orders)} orders")
             self.info_label.setStyleSheet("")
 
-        # Add orders to tree
-        for order in self.filtered_orders:
-            is_skipped = order.get('status') == 'skipped'
-
-            # Top level: Order
-            order_item = QTreeWidgetItem(self.tree)
-
-            order_label = order.get('order_number', 'Unknown')
-            if is_skipped:
-                order_label = f"[SKIPPED] {order_label}"
-            order_item.setText(0, order_label)
-
-            if is_skipped:
-                # Skipped order — show skip time, no duration/items
-                order_item.setText(1, "—")
-                order_item.setText(2, "—")
-                order_item.setText(3, self._format_timestamp(order.get('skipped_at', '')))
-                order_item.setText(4, "—")
-                order_item.setText(5, "⏭ skipped")
-                grey = QColor(150, 150, 150)
-                for col in range(6):
-                    order_item.setForeground(col, grey)
-            else:
-                # Duration
-                duration = order.get('duration_seconds', 0)
-                order_item.setText(1, f"{duration}s ({duration/60:.1f}m)" if duration else "N/A")
-
-                # Items count (actual scan events)
-                items_count = order.get('items_count', len(order.get('items', [])))
-                order_item.setText(2, f"{items_count} items")
-
-                # Started
-                order_item.setText(3, self._format_timestamp(order.get('started_at', '')))
-
-                # Completed
-                order_item.setText(4, self._format_timestamp(order.get('completed_at', '')))
-
-                # Flags column: quality indicators
-                flags = self._build_order_flags(order)
-                order_item.setText(5, flags if flags else "✓ ok")
-
-                # Colour the flags cell if there are quality issues
-                if any(c in flags for c in ('⟲', '⚡', '+', '?')):
-                    order_item.setForeground(5, QColor(200, 160, 0))
-
-            # Make order row bold
-            font = order_item.font(0)
-            font.setBold(True)
-            for col in range(6):
-                order_item.setFont(col, font)
-
-            if is_skipped:
-                continue
-
-            # --- Children: item scan records ---
-            items = order.get('items', [])
-            if items:
-                for item in items:
-                    item_node = QTreeWidgetItem(order_item)
-
-                    sku = item.get('sku', 'Unknown')
-                    method = item.get('confirmation_method', 'scanned')
-                    prefix = "⚡ " if method == 'force_confirmed' else "→ "
-                    item_node.setText(0, f"  {prefix}{sku}")
-
-                    time_from_start = item.get('time_from_order_start_seconds', 0)
-                    if time_from_start:
-                        item_node.setText(1, f"+{time_from_start}s")
-
-                    qty = item.get('quantity', 1)
-                    item_node.setText(2, f"×{qty}")
-
-                    item_node.setText(3, self._format_timestamp(item.get('scanned_at', '')))
-
-                    # Show method in flags column
-                    if method == 'force_confirmed':
-                        item_node.setText(5, "⚡ manual")
-                        item_node.setForeground(5, QColor(200, 120, 0))
-                    else:
-                        item_node.setText(5, "✓ scan")
-            else:
-                no_data_node = QTreeWidgetItem(order_item)
-                no_data_node.setText(0, "  (Item details not available)")
-                no_data_node.setForeground(0, Qt.GlobalColor.gray)
-
-            # --- Quality summary sub-nodes (corrections, extras, unknowns) ---
-            corrections = order.get('corrections', 0)
-            extra_scans = order.get('extra_scans_count', 0)
-            unknown_scans = order.get('unknown_scans_count', 0)
-            first_scan = order.get('time_to_first_scan_seconds')
-
-            if corrections:
-                c_node = QTreeWidgetItem(order_item)
-                c_node.setText(0, f"  ⟲ {corrections} scan correction(s) (Undo pressed)")
-                c_node.setForeground(0, QColor(180, 120, 0))
-
-            if extra_scans:
-                e_node = QTreeWidgetItem(order_item)
-                e_node.setText(0, f"  + {extra_scans} extra scan(s) (over-scanned SKU)")
-                e_node.setForeground(0, QColor(160, 100, 0))
-
-            if unknown_scans:
-                u_node = QTreeWidgetItem(order_item)
-                u_node.setText(0, f"  ? {unknown_scans} unknown scan(s) (wrong barcode)")
-                u_node.setForeground(0, QColor(180, 60, 60))
-
-            if first_scan is not None:
-                fs_node = QTreeWidgetItem(order_item)
-                fs_node.setText(0, f"  ⏱ First scan after {first_scan}s from order start")
-                fs_node.setForeground(0, Qt.GlobalColor.gray)
+        # First chunk now, the rest from the event loop
+        self._add_order_chunk()
 
         # Auto-expand if few orders
         if len(self.filtered_orders) <= 10:
-            self.tree.expandAll()
+            self._expand_all()
+
+    def _add_order_chunk(self):
+        """Add the next ORDER_CHUNK_SIZE order rows; reschedule if more are left."""
+        start = self._fill_position
+        end = min(start + ORDER_CHUNK_SIZE, len(self.filtered_orders))
+        self.tree.addTopLevelItems([
+            self._create_order_item(position) for position in range(start, end)
+        ])
+        self._fill_position = end
+        if end < len(self.filtered_orders):
+            self._fill_timer.start()
+
+    def _create_order_item(self, position: int) -> QTreeWidgetItem:
+        """Top-level row of filtered_orders[position]; its children are added on expand."""
+        order = self.filtered_orders[position]
+        is_skipped = order.get('status') == 'skipped'
+
+        # Top level: Order
+        order_item = QTreeWidgetItem()
+
+        order_label = order.get('order_number', 'Unknown')
+        if is_skipped:
+            order_label = f"[SKIPPED] {order_label}"
+        order_item.setText(0, order_label)
+
+        if is_skipped:
+            # Skipped order — show skip time, no duration/items
+            order_item.setText(1, "—")
+            order_item.setText(2, "—")
+            order_item.setText(3, self._format_timestamp(order.get('skipped_at', '')))
+            order_item.setText(4, "—")
+            order_item.setText(5, "⏭ skipped")
+            grey = QColor(150, 150, 150)
+            for col in range(6):
+                order_item.setForeground(col, grey)
+        else:
+            # Duration
+            duration = order.get('duration_seconds', 0)
+            order_item.setText(1, f"{duration}s ({duration/60:.1f}m)" if duration else "N/A")
+
+            # Items count (actual scan events)
+            items_count = order.get('items_count', len(order.get('items', [])))
+            order_item.setText(2, f"{items_count} items")
+
+            # Started
+            order_item.setText(3, self._format_timestamp(order.get('started_at', '')))
+
+            # Completed
+            order_item.setText(4, self._format_timestamp(order.get('completed_at', '')))
+
+            # Flags column: quality indicators
+            flags = self._build_order_flags(order)
+            order_item.setText(5, flags if flags else "✓ ok")
+
+            # Colour the flags cell if there are quality issues
+            if any(c in flags for c in ('⟲', '⚡', '+', '?')):
+                order_item.setForeground(5, QColor(200, 160, 0))
+
+            # Children are created on first expand
+            order_item.setData(0, _ORDER_ROLE, position)
+            order_item.setChildIndicatorPolicy(_SHOW_INDICATOR)
+
+        # Make order row bold
+        font = order_item.font(0)
+        font.setBold(True)
+        for col in range(6):
+            order_item.setFont(col, font)
+
+        return order_item
+
+    def _fill_children(self, order_item: QTreeWidgetItem):
+        """Add the item scan records and quality notes under an order row (once)."""
+        if order_item.parent() is not None or order_item.childCount():
+            return
+        position = order_item.data(0, _ORDER_ROLE)
+        if position is None:
+            return
+        order = self.filtered_orders[position]
+
+        # --- Children: item scan records ---
+        items = order.get('items', [])
+        if items:
+            for item in items:
+                item_node = QTreeWidgetItem(order_item)
+
+                sku = item.get('sku', 'Unknown')
+                method = item.get('confirmation_method', 'scanned')
+                prefix = "⚡ " if method == 'force_confirmed' else "→ "
+                item_node.setText(0, f"  {prefix}{sku}")
+
+                time_from_start = item.get('time_from_order_start_seconds', 0)
+                if time_from_start:
+                    item_node.setText(1, f"+{time_from_start}s")
+
+                qty = item.get('quantity', 1)
+                item_node.setText(2, f"×{qty}")
+
+                item_node.setText(3, self._format_timestamp(item.get('scanned_at', '')))
+
+                # Show method in flags column
+                if method == 'force_confirmed':
+                    item_node.setText(5, "⚡ manual")
+                    item_node.setForeground(5, QColor(200, 120, 0))
+                else:
+                    item_node.setText(5, "✓ scan")
+        else:
+            no_data_node = QTreeWidgetItem(order_item)
+            no_data_node.setText(0, "  (Item details not available)")
+            no_data_node.setForeground(0, Qt.GlobalColor.gray)
+
+        # --- Quality summary sub-nodes (corrections, extras, unknowns) ---
+        corrections = order.get('corrections', 0)
+        extra_scans = order.get('extra_scans_count', 0)
+        unknown_scans = order.get('unknown_scans_count', 0)
+        first_scan = order.get('time_to_first_scan_seconds')
+
+        if corrections:
+            c_node = QTreeWidgetItem(order_item)
+            c_node.setText(0, f"  ⟲ {corrections} scan correction(s) (Undo pressed)")
+            c_node.setForeground(0, QColor(180, 120, 0))
+
+        if extra_scans:
+            e_node = QTreeWidgetItem(order_item)
+            e_node.setText(0, f"  + {extra_scans} extra scan(s) (over-scanned SKU)")
+            e_node.setForeground(0, QColor(160, 100, 0))
+
+        if unknown_scans:
+            u_node = QTreeWidgetItem(order_item)
+            u_node.setText(0, f"  ? {unknown_scans} unknown scan(s) (wrong barcode)")
+            u_node.setForeground(0, QColor(180, 60, 60))
+
+        if first_scan is not None:
+            fs_node = QTreeWidgetItem(order_item)
+            fs_node.setText(0, f"  ⏱ First scan after {first_scan}s from order start")
+            fs_node.setForeground(0, Qt.GlobalColor.gray)
+
+    def _expand_all(self):
+        """Add every remaining order row and its children, then expand them all."""
+        self._fill_timer.stop()
+        while self._fill_position < len(self.filtered_orders):
+            self._add_order_chunk()
+        self._fill_timer.stop()
+        for i in range(self.tree.topLevelItemCount()):
+            self._fill_children(self.tree.topLevelItem(i))
+        self.tree.expandAll()
 
     def _build_order_flags(self, order: dict) -> str:
         """Build a short flags string for the order's quality indicators."""
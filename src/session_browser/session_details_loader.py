@@ -0,0 +1,423 @@
+"""
+Background loading of the data shown by SessionDetailsDialog.
+
+The dialog used to read packing_state.json, session_summary.json and
+session_info.json from the file server in its constructor, on the UI thread,
+so for a large session nothing appeared for several seconds.
+
+load_session_details() holds that reading and assembling logic as plain
+functions without any widget access. SessionDetailsLoadWorker runs it on a
+QThread; the dialog opens right away with a loading state and builds its
+tabs when the worker reports back.
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+
+from PySide6.QtCore import QThread, Qt, Signal
+
+from logger import get_logger
+from json_cache import get_cached_json
+from fs_instrumentation import fs_operation
+
+logger = get_logger(__name__)
+
+
+def load_session_details(session_data: dict, session_history_manager) -> Dict[str, Any]:
+    """
+    Read and assemble the details of one session.
+
+    Does file I/O only; safe to call from a worker thread.
+
+    Args:
+        session_data: Dict with session info (see SessionDetailsDialog)
+        session_history_manager: SessionHistoryManager instance
+
+    Returns:
+        Dict with 'record', 'packing_state', 'session_info' and 'session_summary'.
+
+    Raises:
+        ValueError: If no session data could be found.
+    """
+    # Check if session_data already has complete information (standardized format)
+    if is_standardized_data(session_data):
+        return _details_from_standardized_data(session_data)
+
+    client_id = session_data['client_id']
+    session_id = session_data['session_id']
+    work_dir = session_data.get('work_dir')
+
+    # If work_dir specified explicitly, use it directly
+    if work_dir:
+        return _details_from_work_dir(Path(work_dir), client_id, session_id)
+
+    # If no work_dir, try to load using SessionHistoryManager
+    details = session_history_manager.get_session_details(
+        client_id=client_id,
+        session_id=session_id
+    )
+
+    if not details:
+        raise ValueError(f"Session not found: {session_id}")
+    return details
+
+
+def _details_from_work_dir(work_dir_path: Path, client_id: str, session_id: str) -> Dict[str, Any]:
+    """Build details from the JSON files of a packing work directory."""
+
+    # OPTIMIZED: Load packing_state.json for basic info (with caching)
+    state_file = work_dir_path / "packing_state.json"
+    packing_state = {}
+    if state_file.exists():
+        try:
+            packing_state = get_cached_json(state_file, default={})
+        except Exception as e:
+            logger.warning(f"Failed to load packing_state.json: {e}")
+
+    # OPTIMIZED: Load session_summary.json for Phase 2b data (with caching)
+    summary_file = work_dir_path / "session_summary.json"
+    session_summary = {}
+    if summary_file.exists():
+        try:
+            session_summary = get_cached_json(summary_file, default={})
+        except Exception as e:
+            logger.warning(f"Failed to load session_summary.json: {e}")
+
+    # OPTIMIZED: Load session_info.json for metadata (with caching)
+    info_file = work_dir_path.parent / "session_info.json"
+    session_info = {}
+    if info_file.exists():
+        try:
+            session_info = get_cached_json(info_file, default={})
+        except Exception as e:
+            logger.warning(f"Failed to load session_info.json: {e}")
+
+    # Build record from available data
+    # Prefer session_summary, fallback to packing_state
+    if session_summary:
+        record = {
+            'session_id': session_summary.get('session_id', session_id),
+            'client_id': session_summary.get('client_id', client_id),
+            'packing_list_path': session_summary.get('packing_list_path', ''),
+            'packing_list_name': session_summary.get('packing_list_name', ''),
+            'worker_id': session_summary.get('worker_id', ''),
+            'worker_name': session_summary.get('worker_name', ''),
+            'pc_name': session_summary.get('pc_name', ''),
+            'start_time': session_summary.get('started_at', ''),
+            'end_time': session_summary.get('completed_at', ''),
+            'duration_seconds': session_summary.get('duration_seconds', 0),
+            'total_orders': session_summary.get('total_orders', 0),
+            'completed_orders': session_summary.get('completed_orders', 0),
+            'in_progress_orders': session_summary.get('in_progress_orders', 0),
+            'skipped_orders_count': session_summary.get('skipped_orders_count', 0),
+            'total_items_packed': session_summary.get('total_items', 0)
+        }
+    elif session_info:
+        record = {
+            'session_id': session_info.get('session_id', session_id),
+            'client_id': session_info.get('client_id', client_id),
+            'packing_list_path': session_info.get('packing_list_path', ''),
+            'packing_list_name': session_info.get('packing_list_name', ''),
+            'worker_id': session_info.get('worker_id', ''),
+            'worker_name': session_info.get('worker_name', ''),
+            'pc_name': session_info.get('pc_name', ''),
+            'start_time': session_info.get('started_at', ''),
+            'end_time': None,
+            'duration_seconds': 0,
+            'total_orders': packing_state.get('progress', {}).get('total_orders', 0),
+            'completed_orders': len(packing_state.get('completed', [])),
+            'in_progress_orders': sum(
+                1 for k in packing_state.get('in_progress', {})
+                if not k.startswith('_')
+            ),
+            'skipped_orders_count': len(packing_state.get('skipped_orders', [])),
+            'total_items_packed': sum(o.get('items_count', 0) for o in packing_state.get('completed', []))
+        }
+    else:
+        raise ValueError(f"No valid session data found in work_dir: {work_dir_path}")
+
+    # For incomplete sessions (no session_summary.json), build a partial summary
+    # from the completed orders stored in packing_state.json so that MetricsTab
+    # can display whatever metrics are available instead of "Metrics not available".
+    if not session_summary and packing_state:
+        session_summary = build_partial_summary(packing_state, session_info)
+        if session_summary:
+            logger.info("Built partial session summary from packing_state.json")
+
+    logger.info(f"Loaded session details from work_dir: {work_dir_path}")
+    return {
+        'record': record,
+        'packing_state': packing_state,
+        'session_info': session_info,
+        'session_summary': session_summary
+    }
+
+
+def build_partial_summary(packing_state: dict, session_info: dict) -> dict:
+    """Build a minimal session_summary-compatible dict from packing_state for incomplete sessions.
+
+    Called when session_summary.json does not yet exist (session ended without full completion).
+    Computes the same metrics that generate_session_summary() would compute, but from the
+    data available in packing_state.json.
+
+    Returns an empty dict if there is insufficient data to compute any metrics.
+    """
+    completed_orders = packing_state.get('completed', [])
+    if not completed_orders:
+        return {}
+
+    # Only orders with timing metadata contribute to metrics
+    orders_with_timing = [o for o in completed_orders if isinstance(o, dict) and o.get('duration_seconds')]
+
+    if not orders_with_timing:
+        # No timing data — return minimal summary with just counts
+        return {
+            'metrics': {},
+            'orders': [o for o in completed_orders if isinstance(o, dict)],
+            'skipped_orders': [
+                {"order_number": n, "skipped_at": None, "status": "skipped"}
+                for n in packing_state.get('skipped_orders', [])
+            ],
+            'skipped_orders_count': len(packing_state.get('skipped_orders', [])),
+            'completed_orders': len([o for o in completed_orders if isinstance(o, dict)]),
+            'total_orders': packing_state.get('progress', {}).get('total_orders', 0),
+            'started_at': session_info.get('started_at') or packing_state.get('started_at'),
+            'status': 'incomplete',
+        }
+
+    # Compute the same metrics as generate_session_summary()
+    durations = [o['duration_seconds'] for o in orders_with_timing]
+    avg_time_per_order = round(sum(durations) / len(durations), 1)
+    fastest_order_seconds = min(durations)
+    slowest_order_seconds = max(durations)
+
+    all_items = []
+    for order in orders_with_timing:
+        all_items.extend(order.get('items', []))
+    item_times = [
+        item['time_from_order_start_seconds']
+        for item in all_items
+        if 'time_from_order_start_seconds' in item
+    ]
+    avg_time_per_item = round(sum(item_times) / len(item_times), 1) if item_times else 0
+
+    # 1.7 metrics
+    first_scan_latencies = [
+        o['time_to_first_scan_seconds']
+        for o in orders_with_timing
+        if o.get('time_to_first_scan_seconds') is not None
+    ]
+    avg_time_to_first_scan = (
+        round(sum(first_scan_latencies) / len(first_scan_latencies), 1)
+        if first_scan_latencies else 0
+    )
+    total_corrections = sum(o.get('corrections', 0) for o in orders_with_timing)
+    total_extra_scans = sum(o.get('extra_scans_count', 0) for o in orders_with_timing)
+    total_unknown_scans = sum(o.get('unknown_scans_count', 0) for o in orders_with_timing)
+    avg_corrections_per_order = (
+        round(total_corrections / len(orders_with_timing), 2) if orders_with_timing else 0
+    )
+
+    # Session duration from state timestamps (best-effort)
+    started_at = session_info.get('started_at') or packing_state.get('started_at')
+    last_updated = packing_state.get('last_updated')
+    duration_seconds = 0
+    orders_per_hour = 0
+    items_per_hour = 0
+    if started_at and last_updated:
+        try:
+            start_dt = datetime.fromisoformat(started_at)
+            end_dt = datetime.fromisoformat(last_updated)
+            duration_seconds = max(0, int((end_dt - start_dt).total_seconds()))
+            if duration_seconds > 0:
+                hours = duration_seconds / 3600.0
+                orders_per_hour = round(len(orders_with_timing) / hours, 1)
+                total_items_packed = sum(o.get('items_count', 0) for o in orders_with_timing)
+                if total_items_packed > 0:
+                    items_per_hour = round(total_items_packed / hours, 1)
+        except (ValueError, TypeError):
+            pass
+
+    # Count in-progress orders from raw in_progress dict (exclude _timing key)
+    raw_in_progress = packing_state.get('in_progress', {})
+    in_progress_count = sum(1 for k in raw_in_progress if not k.startswith('_'))
+
+    skipped_timing = packing_state.get('skipped_orders_timing', {})
+    return {
+        'status': 'incomplete',
+        'started_at': started_at,
+        'completed_at': last_updated,
+        'duration_seconds': duration_seconds,
+        'total_orders': packing_state.get('progress', {}).get('total_orders', 0),
+        'completed_orders': len([o for o in completed_orders if isinstance(o, dict)]),
+        'in_progress_orders': in_progress_count,
+        'skipped_orders_count': len(packing_state.get('skipped_orders', [])),
+        'metrics': {
+            'avg_time_per_order': avg_time_per_order,
+            'avg_time_per_item': avg_time_per_item,
+            'fastest_order_seconds': fastest_order_seconds,
+            'slowest_order_seconds': slowest_order_seconds,
+            'orders_per_hour': orders_per_hour,
+            'items_per_hour': items_per_hour,
+            'avg_time_to_first_scan': avg_time_to_first_scan,
+            'total_corrections': total_corrections,
+            'avg_corrections_per_order': avg_corrections_per_order,
+            'total_extra_scans': total_extra_scans,
+            'total_unknown_scans': total_unknown_scans,
+        },
+        'orders': [o for o in completed_orders if isinstance(o, dict)],
+        'skipped_orders': [
+            {"order_number": n, "skipped_at": skipped_timing.get(n), "status": "skipped"}
+            for n in packing_state.get('skipped_orders', [])
+        ],
+    }
+
+
+def is_standardized_data(data: dict) -> bool:
+    """Check if session_data is in standardized format (has all required fields)."""
+    required_fields = ['session_id', 'client_id', 'packing_list_name', 'status']
+    return all(field in data for field in required_fields)
+
+
+def _details_from_standardized_data(data: dict) -> Dict[str, Any]:
+    """Build details from standardized session_data format."""
+
+    # Convert ISO timestamp strings to datetime objects if needed
+    start_time = data.get('started_at')
+    if start_time and isinstance(start_time, str):
+        try:
+            start_time = datetime.fromisoformat(start_time)
+        except (ValueError, TypeError):
+            pass
+
+    end_time = data.get('ended_at')
+    if end_time and isinstance(end_time, str):
+        try:
+            end_time = datetime.fromisoformat(end_time)
+        except (ValueError, TypeError):
+            pass
+
+    # Build record in expected format
+    record = {
+        'session_id': data.get('session_id'),
+        'client_id': data.get('client_id'),
+        'packing_list_path': data.get('packing_list_name', ''),  # Name, not full path
+        'packing_list_name': data.get('packing_list_name', ''),
+        'worker_id': data.get('worker_id', 'Unknown'),
+        'worker_name': data.get('worker_name', ''),
+        'pc_name': data.get('pc_name', 'Unknown'),
+        'start_time': start_time,
+        'end_time': end_time,
+        'duration_seconds': data.get('duration_seconds', 0),
+        'total_orders': data.get('orders_total', 0),
+        'completed_orders': data.get('orders_completed', 0),
+        'in_progress_orders': data.get('in_progress_orders', 0),
+        'skipped_orders_count': data.get('skipped_orders_count', 0),
+        'total_items_packed': data.get('items_packed', 0)
+    }
+
+    # Load additional data from work_dir if available
+    work_dir = data.get('work_dir')
+    packing_state = {}
+    session_summary = {}
+
+    if work_dir:
+        work_dir_path = Path(work_dir)
+
+        # Load packing_state.json
+        state_file = work_dir_path / "packing_state.json"
+        if state_file.exists():
+            try:
+                with open(state_file, 'r', encoding='utf-8') as f:
+                    packing_state = json.load(f)
+            except Exception as e:
+                logger.warning(f"Failed to load packing_state.json: {e}")
+
+        # Load session_summary.json
+        summary_file = work_dir_path / "session_summary.json"
+        if summary_file.exists():
+            try:
+                with open(summary_file, 'r', encoding='utf-8') as f:
+                    session_summary = json.load(f)
+                    orders_count = len(session_summary.get('orders', []))
+                    logger.info(f"Loaded session_summary.json for session {data.get('session_id')} with {orders_count} orders")
+
+                    # Update record with worker info from session_summary if available
+                    if 'worker_id' in session_summary:
+                        record['worker_id'] = session_summary['worker_id']
+                    if 'worker_name' in session_summary:
+                        record['worker_name'] = session_summary['worker_name']
+            except Exception as e:
+                logger.warning(f"Failed to load session_summary.json: {e}")
+
+    # Same partial-metrics fallback as the work_dir path: build from packing_state when
+    # session_summary.json hasn't been created yet (incomplete session).
+    if not session_summary and packing_state:
+        session_info_hint = {'started_at': data.get('started_at')}
+        session_summary = build_partial_summary(packing_state, session_info_hint)
+        if session_summary:
+            logger.info("Built partial session summary from packing_state.json (standardized path)")
+
+    logger.info(f"Built session details from standardized data for session: {data.get('session_id')}")
+    return {
+        'record': record,
+        'packing_state': packing_state,
+        'session_info': {},
+        'session_summary': session_summary
+    }
+
+
+# A QThread must not be destroyed while it runs, but the dialog that started a
+# load can be closed and garbage-collected first. Workers are referenced here
+# until they are done and dropped again on the main thread.
+_running_workers: Set["SessionDetailsLoadWorker"] = set()
+
+
+def _release_finished_workers():
+    for worker in [w for w in _running_workers if w.done]:
+        worker.wait()  # returns at once: run() has already returned
+        _running_workers.discard(worker)
+
+
+class SessionDetailsLoadWorker(QThread):
+    """
+    Background thread that runs load_session_details() for one session.
+
+    The result is also kept on the worker (details / error), so the dialog
+    can pick it up synchronously after wait(). The worker keeps itself alive
+    while running and may outlive the dialog that started it.
+
+    Emits load_complete with the details dict on success, or load_failed
+    with an error string on failure.
+    """
+
+    load_complete = Signal(object)  # details dict
+    load_failed   = Signal(str)     # error_message
+
+    def __init__(self, session_data: dict, session_history_manager):
+        super().__init__()
+        self._session_data = session_data
+        self._history_mgr = session_history_manager
+        self.details: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.done = False
+        self.finished.connect(_release_finished_workers, Qt.ConnectionType.QueuedConnection)
+
+    def start(self):
+        _running_workers.add(self)
+        super().start()
+
+    def run(self):
+        try:
+            with fs_operation("load session details"):
+                self.details = load_session_details(self._session_data, self._history_mgr)
+        except Exception as exc:
+            logger.error(f"SessionDetailsLoadWorker failed: {exc}", exc_info=True)
+            self.error = str(exc)
+        self.done = True
+        if self.error is not None:
+            self.load_failed.emit(self.error)
+        else:
+            self.load_complete.emit(self.details)
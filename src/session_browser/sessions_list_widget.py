@@ -7,9 +7,12 @@ so initial load is < 1 second regardless of session count.
 
 Background refresh path:
     RegistryRefreshWorker → registry file read + lock-file staleness checks
-    → emit refresh_complete(entries) → populate_table()
+    → emit refresh_complete(entries) → SessionsTableModel.apply_entries()
 
-Filter / search works purely on already-loaded table data (no server I/O).
+Refreshes are applied as keyed diffs, so the selection and scroll position
+survive the auto-refresh. Filter / search / sorting run in
+SessionsFilterProxyModel on already-loaded data (no server I/O); see
+sessions_table_model.py.
 """
 
 import csv
@@ -20,47 +23,21 @@ from typing import Optional
 
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton,
-    QTableWidget, QTableWidgetItem, QHeaderView, QComboBox, QGroupBox,
+    QTableView, QAbstractItemView, QHeaderView, QComboBox, QGroupBox,
     QFileDialog, QMessageBox, QDateEdit, QFrame, QSizePolicy, QProgressBar
 )
 from PySide6.QtCore import Signal, Qt, QThread, QDate, QSize
-from PySide6.QtGui import QColor, QFont
 
 from logger import get_logger
-from shared.metadata_utils import parse_timestamp
+from fs_instrumentation import fs_operation
+from .sessions_table_model import (
+    COL_STATUS, COL_LIST_NAME, COL_SESSION_ID, COL_WORKER, COL_PC, COL_PROGRESS,
+    COL_STARTED, COL_DURATION, COL_ITEMS, STATUS_CONFIG,
+    SessionsFilterProxyModel, SessionsTableModel, fmt_duration, fmt_progress,
+)
 
 logger = get_logger(__name__)
 
-# ------------------------------------------------------------------ #
-#  Status display configuration                                         #
-# ------------------------------------------------------------------ #
-
-STATUS_CONFIG = {
-    "not_started":  {"label": "Not Started",  "icon": "🔵", "color": "#4A90D9"},
-    "in_progress":  {"label": "Active",        "icon": "🟢", "color": "#27AE60"},
-    "stale":        {"label": "Stale",         "icon": "🟠", "color": "#E67E22"},
-    "paused":       {"label": "Paused",        "icon": "🟡", "color": "#F1C40F"},
-    "completed":    {"label": "Completed",     "icon": "✅", "color": "#2ECC71"},
-    "incomplete":   {"label": "Incomplete",    "icon": "⚠️",  "color": "#E74C3C"},
-    "abandoned":    {"label": "Abandoned",     "icon": "🔴", "color": "#C0392B"},
-}
-
-# Column indices
-COL_STATUS      = 0
-COL_LIST_NAME   = 1
-COL_SESSION_ID  = 2
-COL_WORKER      = 3
-COL_PC          = 4
-COL_PROGRESS    = 5
-COL_STARTED     = 6
-COL_DURATION    = 7
-COL_ITEMS       = 8
-COLUMN_COUNT    = 9
-
-COLUMN_HEADERS = ["Status", "Packing List", "Session", "Worker", "PC",
-                  "Progress", "Started", "Duration", "Items"]
-
-
 # ------------------------------------------------------------------ #
 #  Background refresh worker                                           #
 # ------------------------------------------------------------------ #
@@ -89,57 +66,19 @@ class RegistryRefreshWorker(QThread):
 
     def run(self):
         try:
-            # One-time migration: build registry from scan if not present
-            self._registry.ensure_registry(self._client_id)
-            # Lightweight: find new packing lists not yet in registry
-            self._registry.refresh_available_lists(self._client_id)
-            # Resolve statuses (reads lock files for in_progress entries)
-            entries = self._registry.get_all_entries(self._client_id)
+            with fs_operation("refresh session registry"):
+                # One-time migration: build registry from scan if not present
+                self._registry.ensure_registry(self._client_id)
+                # Lightweight: find new packing lists not yet in registry
+                self._registry.refresh_available_lists(self._client_id)
+                # Resolve statuses (reads lock files for in_progress entries)
+                entries = self._registry.get_all_entries(self._client_id)
             self.refresh_complete.emit(self._client_id, entries)
         except Exception as exc:
             logger.error(f"RegistryRefreshWorker failed: {exc}", exc_info=True)
             self.refresh_failed.emit(self._client_id, str(exc))
 
 
-# ------------------------------------------------------------------ #
-#  Helper functions                                                    #
-# ------------------------------------------------------------------ #
-
-def _fmt_duration(seconds: Optional[float]) -> str:
-    if not seconds:
-        return "—"
-    h = int(seconds // 3600)
-    m = int((seconds % 3600) // 60)
-    s = int(seconds % 60)
-    if h > 0:
-        return f"{h}h {m}m"
-    if m > 0:
-        return f"{m}m {s}s"
-    return f"{s}s"
-
-
-def _fmt_date(ts_str: Optional[str]) -> str:
-    if not ts_str:
-        return "—"
-    dt = parse_timestamp(ts_str)
-    if dt is None:
-        return ts_str[:10] if len(ts_str) >= 10 else ts_str
-    return dt.strftime("%Y-%m-%d %H:%M")
-
-
-def _fmt_progress(entry: dict) -> str:
-    total = entry.get("total_orders", 0)
-    done  = entry.get("completed_orders", 0)
-    if total == 0:
-        return "—"
-    return f"{done}/{total}"
-
-
-def _status_display(status: str) -> str:
-    cfg = STATUS_CONFIG.get(status, {"icon": "?", "label": status.replace("_", " ").title()})
-    return f"{cfg['icon']} {cfg['label']}"
-
-
 # ------------------------------------------------------------------ #
 #  Sessions List Widget                                                #
 # ------------------------------------------------------------------ #
@@ -238,9 +177,12 @@ class SessionsListWidget(QWidget):
         self._status_bar.setStyleSheet("color: #888; font-style: italic; font-size: 11px;")
         main_layout.addWidget(self._status_bar)
 
-        # Table
-        self._table = QTableWidget(0, COLUMN_COUNT)
-        self._table.setHorizontalHeaderLabels(COLUMN_HEADERS)
+        # Table: model (keyed rows) → proxy (filters, sorting) → view
+        self._model = SessionsTableModel(self)
+        self._proxy = SessionsFilterProxyModel(self)
+        self._proxy.setSourceModel(self._model)
+        self._table = QTableView()
+        self._table.setModel(self._proxy)
         self._table.horizontalHeader().setSectionResizeMode(
             COL_LIST_NAME, QHeaderView.ResizeMode.Stretch
         )
@@ -255,12 +197,15 @@ class SessionsListWidget(QWidget):
         self._table.setColumnWidth(COL_STARTED,    130)
         self._table.setColumnWidth(COL_DURATION,    75)
         self._table.setColumnWidth(COL_ITEMS,       55)
-        self._table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self._table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self._table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self._table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self._table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self._table.setAlternatingRowColors(True)
         self._table.verticalHeader().setVisible(False)
         self._table.verticalHeader().setDefaultSectionSize(24)
         self._table.setShowGrid(False)
+        # Status column = active first, newest first (the default order)
+        self._table.sortByColumn(COL_STATUS, Qt.SortOrder.AscendingOrder)
         self._table.setSortingEnabled(True)
         self._table.selectionModel().currentRowChanged.connect(
             lambda current, _prev: self._on_row_selected(current.row())
@@ -357,7 +302,7 @@ class SessionsListWidget(QWidget):
         if client_id != self._client_id:
             return
         self._all_entries = entries
-        self._populate_table(entries)
+        self._update_table(entries)
         self._update_header_stats(entries)
         self._status_bar.setText(
             f"Last refreshed: {datetime.now().strftime('%H:%M:%S')}  "
@@ -370,86 +315,16 @@ class SessionsListWidget(QWidget):
         self._status_bar.setText(f"Refresh failed: {error}")
         logger.error(f"SessionsListWidget refresh failed: {error}")
 
-    def _populate_table(self, entries: list):
-        self._table.setSortingEnabled(False)
-        self._table.setRowCount(0)
-
-        # Sort: active first, then by started_at descending within each group
-        _STATUS_PRIORITY = {
-            "in_progress": 0, "stale": 1, "paused": 2, "not_started": 3,
-            "incomplete": 4, "abandoned": 5, "completed": 6,
-        }
-        sorted_entries = sorted(
-            entries,
-            key=lambda e: (
-                _STATUS_PRIORITY.get(e.get("status", ""), 9),
-                -(self._ts_to_epoch(e.get("started_at") or e.get("created_at", "")))
-            ),
+    def _update_table(self, entries: list):
+        """Apply a refreshed entry list as a keyed diff (unchanged rows are untouched)."""
+        current = self._get_row_entry(self._table.currentIndex().row())
+        inserted, updated, removed = self._model.apply_entries(entries)
+        logger.debug(
+            f"Sessions list refresh: {inserted} inserted, {updated} updated, {removed} removed"
         )
-
-        for entry in sorted_entries:
-            row = self._table.rowCount()
-            self._table.insertRow(row)
-            self._fill_row(row, entry)
-
-        self._table.setSortingEnabled(True)
-        self._apply_filters()
-
-    @staticmethod
-    def _ts_to_epoch(ts: str) -> float:
-        if not ts:
-            return 0.0
-        dt = parse_timestamp(ts)
-        if dt:
-            return dt.timestamp()
-        return 0.0
-
-    def _fill_row(self, row: int, entry: dict):
-        status = entry.get("status", "")
-        cfg = STATUS_CONFIG.get(status, {"icon": "?", "label": status, "color": "#888"})
-
-        # Col 0: Status
-        status_item = QTableWidgetItem(f"{cfg['icon']} {cfg['label']}")
-        status_item.setForeground(QColor(cfg["color"]))
-        status_item.setFont(QFont("Segoe UI", 9))
-        status_item.setData(Qt.ItemDataRole.UserRole, entry)
-        self._table.setItem(row, COL_STATUS, status_item)
-
-        # Col 1: Packing List
-        self._table.setItem(row, COL_LIST_NAME,
-                            QTableWidgetItem(entry.get("packing_list_name", "—")))
-
-        # Col 2: Session ID
-        self._table.setItem(row, COL_SESSION_ID,
-                            QTableWidgetItem(entry.get("session_id", "—")))
-
-        # Col 3: Worker
-        worker = entry.get("worker_name") or entry.get("worker_id") or "—"
-        self._table.setItem(row, COL_WORKER, QTableWidgetItem(worker))
-
-        # Col 4: PC
-        self._table.setItem(row, COL_PC,
-                            QTableWidgetItem(entry.get("pc_name") or "—"))
-
-        # Col 5: Progress (center-aligned)
-        prog_item = QTableWidgetItem(_fmt_progress(entry))
-        prog_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-        self._table.setItem(row, COL_PROGRESS, prog_item)
-
-        # Col 6: Started
-        ts = entry.get("started_at") or entry.get("created_at") or ""
-        self._table.setItem(row, COL_STARTED, QTableWidgetItem(_fmt_date(ts)))
-
-        # Col 7: Duration (center-aligned)
-        dur_item = QTableWidgetItem(_fmt_duration(entry.get("duration_seconds")))
-        dur_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-        self._table.setItem(row, COL_DURATION, dur_item)
-
-        # Col 8: Items (center-aligned)
-        items = entry.get("total_items", 0)
-        items_item = QTableWidgetItem(str(items) if items else "—")
-        items_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-        self._table.setItem(row, COL_ITEMS, items_item)
+        # The selected row may itself have changed (e.g. paused → completed)
+        if current is not None and self._get_row_entry(self._table.currentIndex().row()) is not current:
+            self._on_row_selected(self._table.currentIndex().row())
 
     def _update_header_stats(self, entries: list):
         counts = {}
@@ -471,63 +346,27 @@ class SessionsListWidget(QWidget):
         self._header_label.setText("   ·   ".join(parts))
 
     def _clear_table(self):
-        self._table.setSortingEnabled(False)
-        self._table.setRowCount(0)
-        self._table.setSortingEnabled(True)
+        self._model.clear()
 
     # ------------------------------------------------------------------ #
     #  Filters                                                             #
     # ------------------------------------------------------------------ #
 
     def _apply_filters(self):
-        status_filter = self._status_combo.currentData()
-        search = self._search_input.text().strip().lower()
-        date_from = self._date_from.date().toPython()
-        date_to   = self._date_to.date().toPython()
-
-        for row in range(self._table.rowCount()):
-            entry = self._table.item(row, COL_STATUS).data(Qt.ItemDataRole.UserRole)
-            show = True
-
-            # Status filter
-            if status_filter and entry.get("status", "") != status_filter:
-                show = False
-
-            # Date filter
-            if show:
-                ts_str = entry.get("started_at") or entry.get("created_at", "")
-                if ts_str:
-                    dt = parse_timestamp(ts_str)
-                    if dt:
-                        d = dt.date()
-                        if d < date_from or d > date_to:
-                            show = False
-
-            # Text search
-            if show and search:
-                haystack = " ".join([
-                    entry.get("packing_list_name", ""),
-                    entry.get("session_id", ""),
-                    entry.get("worker_name", ""),
-                    entry.get("worker_id", ""),
-                    entry.get("pc_name", ""),
-                ]).lower()
-                if search not in haystack:
-                    show = False
-
-            self._table.setRowHidden(row, not show)
+        self._proxy.set_filters(
+            status=self._status_combo.currentData(),
+            search=self._search_input.text(),
+            date_from=self._date_from.date().toPython(),
+            date_to=self._date_to.date().toPython(),
+        )
 
     # ------------------------------------------------------------------ #
     #  Row selection / preview panel                                       #
     # ------------------------------------------------------------------ #
 
     def _get_row_entry(self, row: int) -> Optional[dict]:
-        if row < 0:
-            return None
-        item = self._table.item(row, COL_STATUS)
-        if item is None:
-            return None
-        return item.data(Qt.ItemDataRole.UserRole)
+        """Entry shown in a (proxy / view) row."""
+        return self._proxy.entry(row)
 
     def _on_row_selected(self, row: int):
         entry = self._get_row_entry(row)
@@ -543,7 +382,7 @@ class SessionsListWidget(QWidget):
         done   = entry.get("completed_orders", 0)
         skip   = entry.get("skipped_orders", 0)
         items  = entry.get("total_items", 0)
-        dur    = _fmt_duration(entry.get("duration_seconds"))
+        dur    = fmt_duration(entry.get("duration_seconds"))
         metrics = entry.get("metrics") or {}
         corrections = metrics.get("total_corrections", "—")
         unknowns    = metrics.get("total_unknown_scans", "—")
@@ -584,7 +423,7 @@ class SessionsListWidget(QWidget):
             self._open_details_for_entry(entry)
 
     def _on_preview_action(self):
-        row = self._table.currentRow()
+        row = self._table.currentIndex().row()
         entry = self._get_row_entry(row)
         if entry is None:
             return
@@ -597,7 +436,7 @@ class SessionsListWidget(QWidget):
             self._open_details_for_entry(entry)
 
     def _on_preview_details(self):
-        row = self._table.currentRow()
+        row = self._table.currentIndex().row()
         entry = self._get_row_entry(row)
         if entry:
             self._open_details_for_entry(entry)
@@ -648,14 +487,8 @@ class SessionsListWidget(QWidget):
     # ------------------------------------------------------------------ #
 
     def _visible_entries(self) -> list:
-        """Return entries corresponding to currently visible (non-hidden) rows."""
-        result = []
-        for row in range(self._table.rowCount()):
-            if not self._table.isRowHidden(row):
-                entry = self._get_row_entry(row)
-                if entry:
-                    result.append(entry)
-        return result
+        """Return entries of the rows passing the filters, in display order."""
+        return [self._proxy.entry(row) for row in range(self._proxy.rowCount())]
 
     def _export_csv(self):
         entries = self._visible_entries()
@@ -682,7 +515,7 @@ class SessionsListWidget(QWidget):
                         e.get("session_id", ""),
                         e.get("worker_name") or e.get("worker_id", ""),
                         e.get("pc_name", ""),
-                        _fmt_progress(e),
+                        fmt_progress(e),
                         e.get("started_at") or e.get("created_at", ""),
                         e.get("duration_seconds", ""),
                         e.get("total_items", ""),
@@ -718,7 +551,7 @@ class SessionsListWidget(QWidget):
                     "Session ID":        e.get("session_id", ""),
                     "Worker":            e.get("worker_name") or e.get("worker_id", ""),
                     "PC":                e.get("pc_name", ""),
-                    "Progress":          _fmt_progress(e),
+                    "Progress":          fmt_progress(e),
                     "Started":           e.get("started_at") or e.get("created_at", ""),
                     "Duration (s)":      e.get("duration_seconds"),
                     "Total Items":       e.get("total_items"),
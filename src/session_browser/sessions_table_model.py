@@ -0,0 +1,337 @@
+"""
+Table model + filter proxy behind SessionsListWidget.
+
+The sessions list used to be a QTableWidget that was cleared and refilled row
+by row on every registry refresh (including the 2-minute auto-refresh), with
+filters applied by hiding rows one at a time. For clients with thousands of
+sessions each refresh stalled the UI and lost the scroll position and the
+selected row.
+
+SessionsTableModel keeps one row per registry entry, keyed like the registry
+itself ("{session_id}::{packing_list_name}"). apply_entries() diffs a fresh
+entry list against the rows it has:
+
+- keys no longer present  -> rows removed (contiguous runs at once)
+- entries that changed    -> dataChanged for that row only
+- new keys                -> appended in one insert
+
+so unchanged rows, the selection and the scroll position survive a refresh.
+Display texts, sort keys and filter fields are computed once per entry
+change, not per paint or per filter pass.
+
+SessionsFilterProxyModel does the status / date / text filtering and the
+column sorting. Sorting by the Status column orders active sessions first and
+newest first within a status (the list's default order).
+"""
+
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, QSortFilterProxyModel, Qt
+from PySide6.QtGui import QColor, QFont
+
+from shared.metadata_utils import parse_timestamp
+
+# Column indices
+COL_STATUS      = 0
+COL_LIST_NAME   = 1
+COL_SESSION_ID  = 2
+COL_WORKER      = 3
+COL_PC          = 4
+COL_PROGRESS    = 5
+COL_STARTED     = 6
+COL_DURATION    = 7
+COL_ITEMS       = 8
+COLUMN_COUNT    = 9
+
+COLUMN_HEADERS = ["Status", "Packing List", "Session", "Worker", "PC",
+                  "Progress", "Started", "Duration", "Items"]
+
+STATUS_CONFIG = {
+    "not_started":  {"label": "Not Started",  "icon": "🔵", "color": "#4A90D9"},
+    "in_progress":  {"label": "Active",        "icon": "🟢", "color": "#27AE60"},
+    "stale":        {"label": "Stale",         "icon": "🟠", "color": "#E67E22"},
+    "paused":       {"label": "Paused",        "icon": "🟡", "color": "#F1C40F"},
+    "completed":    {"label": "Completed",     "icon": "✅", "color": "#2ECC71"},
+    "incomplete":   {"label": "Incomplete",    "icon": "⚠️",  "color": "#E74C3C"},
+    "abandoned":    {"label": "Abandoned",     "icon": "🔴", "color": "#C0392B"},
+}
+
+# Default order: active first, then by started_at descending within each group
+STATUS_PRIORITY = {
+    "in_progress": 0, "stale": 1, "paused": 2, "not_started": 3,
+    "incomplete": 4, "abandoned": 5, "completed": 6,
+}
+
+# Registry entry dict of a row
+ENTRY_ROLE = Qt.ItemDataRole.UserRole
+
+_DISPLAY_ROLE = Qt.ItemDataRole.DisplayRole
+_FOREGROUND_ROLE = Qt.ItemDataRole.ForegroundRole
+_FONT_ROLE = Qt.ItemDataRole.FontRole
+_ALIGNMENT_ROLE = Qt.ItemDataRole.TextAlignmentRole
+_CENTERED_COLUMNS = frozenset((COL_PROGRESS, COL_DURATION, COL_ITEMS))
+_ALIGN_CENTER = int(Qt.AlignmentFlag.AlignCenter)
+
+
+def entry_key(entry: Dict[str, Any]) -> str:
+    """Registry key of an entry (same as SessionRegistryManager._session_key)."""
+    return f"{entry.get('session_id', '')}::{entry.get('packing_list_name', '')}"
+
+
+def fmt_duration(seconds: Optional[float]) -> str:
+    if not seconds:
+        return "—"
+    h = int(seconds // 3600)
+    m = int((seconds % 3600) // 60)
+    s = int(seconds % 60)
+    if h > 0:
+        return f"{h}h {m}m"
+    if m > 0:
+        return f"{m}m {s}s"
+    return f"{s}s"
+
+
+def fmt_progress(entry: dict) -> str:
+    total = entry.get("total_orders", 0)
+    done  = entry.get("completed_orders", 0)
+    if total == 0:
+        return "—"
+    return f"{done}/{total}"
+
+
+def _fmt_date(ts_str: Optional[str], dt) -> str:
+    if not ts_str:
+        return "—"
+    if dt is None:
+        return ts_str[:10] if len(ts_str) >= 10 else ts_str
+    return dt.strftime("%Y-%m-%d %H:%M")
+
+
+def _number(value) -> float:
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class _Row:
+    """Display texts, sort keys and filter fields of one entry, computed once."""
+
+    __slots__ = ("entry", "texts", "sort_keys", "status", "date", "haystack", "color")
+
+    def __init__(self, entry: Dict[str, Any]):
+        self.entry = entry
+        status = entry.get("status", "")
+        cfg = STATUS_CONFIG.get(status, {"icon": "?", "label": status, "color": "#888"})
+        ts = entry.get("started_at") or entry.get("created_at") or ""
+        dt = parse_timestamp(ts) if ts else None
+        epoch = dt.timestamp() if dt else 0.0
+        worker = entry.get("worker_name") or entry.get("worker_id") or "—"
+        items = entry.get("total_items", 0)
+        total_orders = _number(entry.get("total_orders"))
+
+        self.status = status
+        self.date: Optional[date] = dt.date() if dt else None
+        self.color = QColor(cfg["color"])
+        self.texts = [
+            f"{cfg['icon']} {cfg['label']}",
+            entry.get("packing_list_name") or "—",
+            entry.get("session_id") or "—",
+            worker,
+            entry.get("pc_name") or "—",
+            fmt_progress(entry),
+            _fmt_date(ts, dt),
+            fmt_duration(entry.get("duration_seconds")),
+            str(items) if items else "—",
+        ]
+        self.sort_keys = [
+            (STATUS_PRIORITY.get(status, 9), -epoch),
+            self.texts[COL_LIST_NAME].lower(),
+            self.texts[COL_SESSION_ID].lower(),
+            worker.lower(),
+            self.texts[COL_PC].lower(),
+            (_number(entry.get("completed_orders")) / total_orders if total_orders else -1.0,
+             total_orders),
+            epoch,
+            _number(entry.get("duration_seconds")),
+            _number(items),
+        ]
+        # Registry fields are None when the source file does not record them
+        self.haystack = " ".join(
+            str(entry.get(key) or "")
+            for key in ("packing_list_name", "session_id", "worker_name", "worker_id", "pc_name")
+        ).lower()
+
+
+class SessionsTableModel(QAbstractTableModel):
+    """
+    Registry entries of one client, one row per entry key, updated by diffs.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._keys: List[str] = []
+        self._rows: List[_Row] = []
+        self._positions: Dict[str, int] = {}
+        self._status_font = QFont("Segoe UI", 9)
+
+    # ------------------------------------------------------------------ #
+    #  Qt model interface                                                  #
+    # ------------------------------------------------------------------ #
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else COLUMN_COUNT
+
+    def headerData(self, section, orientation, role=_DISPLAY_ROLE):
+        if orientation == Qt.Orientation.Horizontal and role == _DISPLAY_ROLE:
+            return COLUMN_HEADERS[section]
+        return None
+
+    def data(self, index, role=_DISPLAY_ROLE):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        column = index.column()
+        if role == _DISPLAY_ROLE:
+            return row.texts[column]
+        if role == ENTRY_ROLE:
+            return row.entry
+        if column == COL_STATUS:
+            if role == _FOREGROUND_ROLE:
+                return row.color
+            if role == _FONT_ROLE:
+                return self._status_font
+        elif role == _ALIGNMENT_ROLE and column in _CENTERED_COLUMNS:
+            return _ALIGN_CENTER
+        return None
+
+    # ------------------------------------------------------------------ #
+    #  Row access for the proxy / widget                                   #
+    # ------------------------------------------------------------------ #
+
+    def entry(self, row: int) -> Dict[str, Any]:
+        return self._rows[row].entry
+
+    def row_of(self, key: str) -> int:
+        return self._positions.get(key, -1)
+
+    def sort_key(self, row: int, column: int):
+        return self._rows[row].sort_keys[column]
+
+    def filter_fields(self, row: int) -> Tuple[str, Optional[date], str]:
+        """(status, started date, lowercased search text) of a row."""
+        r = self._rows[row]
+        return r.status, r.date, r.haystack
+
+    # ------------------------------------------------------------------ #
+    #  Updates                                                             #
+    # ------------------------------------------------------------------ #
+
+    def clear(self):
+        if not self._rows:
+            return
+        self.beginResetModel()
+        self._keys, self._rows, self._positions = [], [], {}
+        self.endResetModel()
+
+    def apply_entries(self, entries: List[Dict[str, Any]]) -> Tuple[int, int, int]:
+        """
+        Bring the rows in line with a fresh entry list, touching only what changed.
+
+        Returns:
+            (inserted, updated, removed) row counts.
+        """
+        fresh: Dict[str, Dict[str, Any]] = {}
+        for entry in entries:
+            fresh[entry_key(entry)] = entry  # a duplicate key keeps the last entry
+
+        # Removals, from the bottom up, one signal per contiguous run
+        gone = sorted((self._positions[key] for key in self._positions if key not in fresh),
+                      reverse=True)
+        removed = len(gone)
+        i = 0
+        while i < len(gone):
+            last = first = gone[i]
+            while i + 1 < len(gone) and gone[i + 1] == first - 1:
+                i += 1
+                first = gone[i]
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._keys[first:last + 1]
+            del self._rows[first:last + 1]
+            self.endRemoveRows()
+            i += 1
+        if removed:
+            self._positions = {key: row for row, key in enumerate(self._keys)}
+
+        # Updates in place
+        updated = 0
+        last_column = COLUMN_COUNT - 1
+        for key, entry in fresh.items():
+            row = self._positions.get(key)
+            if row is not None and self._rows[row].entry != entry:
+                self._rows[row] = _Row(entry)
+                self.dataChanged.emit(self.index(row, 0), self.index(row, last_column))
+                updated += 1
+
+        # Inserts, appended in one block
+        new_keys = [key for key in fresh if key not in self._positions]
+        if new_keys:
+            start = len(self._rows)
+            self.beginInsertRows(QModelIndex(), start, start + len(new_keys) - 1)
+            for offset, key in enumerate(new_keys):
+                self._keys.append(key)
+                self._rows.append(_Row(fresh[key]))
+                self._positions[key] = start + offset
+            self.endInsertRows()
+
+        return len(new_keys), updated, removed
+
+
+class SessionsFilterProxyModel(QSortFilterProxyModel):
+    """
+    Status / date range / text filters and typed column sorting for SessionsTableModel.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._status = ""
+        self._search = ""
+        self._date_from: Optional[date] = None
+        self._date_to: Optional[date] = None
+        self.setDynamicSortFilter(True)
+
+    def set_filters(self, status: str = "", search: str = "",
+                    date_from: Optional[date] = None, date_to: Optional[date] = None):
+        """Replace the filters and re-filter once."""
+        filters = (status or "", (search or "").strip().lower(), date_from, date_to)
+        if filters == (self._status, self._search, self._date_from, self._date_to):
+            return
+        self._status, self._search, self._date_from, self._date_to = filters
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
+        status, started, haystack = self.sourceModel().filter_fields(source_row)
+        if self._status and status != self._status:
+            return False
+        # Entries without a (parseable) start date are never hidden by the date range
+        if started is not None:
+            if self._date_from is not None and started < self._date_from:
+                return False
+            if self._date_to is not None and started > self._date_to:
+                return False
+        return not self._search or self._search in haystack
+
+    def lessThan(self, left: QModelIndex, right: QModelIndex) -> bool:
+        model = self.sourceModel()
+        column = left.column()
+        return model.sort_key(left.row(), column) < model.sort_key(right.row(), column)
+
+    def entry(self, proxy_row: int) -> Optional[Dict[str, Any]]:
+        """Registry entry shown in a proxy row (None if out of range)."""
+        if not 0 <= proxy_row < self.rowCount():
+            return None
+        return self.sourceModel().entry(self.mapToSource(self.index(proxy_row, 0)).row())
@@ -0,0 +1,519 @@
+"""
+Persistent local index of parsed session history records.
+
+SessionHistoryManager.get_client_sessions() used to re-read and re-parse
+every session_summary.json / packing_state.json of a client on every call;
+for clients with years of daily sessions, opening history took tens of
+seconds over SMB.
+
+SessionHistoryIndex keeps the parsed SessionHistoryRecord fields in a local
+SQLite database (stdlib sqlite3), one row per source file, keyed by the file's
+path and validated by its (mtime, size):
+
+- A file whose mtime and size match its row is not read again.
+- packing_state.json rows also depend on the session's session_info.json
+  (PC name, packing list path); its signature is stored with the row.
+- A row written within RACY_WINDOW seconds of its file's mtime is re-parsed
+  on the next sync, because a rewrite in the same mtime tick with the same
+  size would otherwise go unnoticed.
+- Files that could not be parsed are stored without a record, so a broken
+  file is not re-parsed on every call either.
+
+Date-range, client and completeness filters are answered by an indexed query
+(client_id, start_ts) instead of filtering the full record list in Python.
+
+Completed records are also pre-aggregated into daily rollups, one row per
+client x day x worker x packing list (sessions, orders, items, duration,
+corrections, extra and unknown scans). SQLite triggers on the sources table
+recompute the affected rollup row whenever a source row is stored or
+dropped, so the rollups stay in step with every incremental sync. Analytics
+over a date range read whole days from the rollups and only re-aggregate the
+records of the (at most two) days the range boundaries cut through.
+
+The database lives in the local cache directory (ProfileManager.cache_dir),
+never on the file share: it is a per-PC cache that can be deleted at any time
+and is rebuilt on the next scan.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Union
+
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+DB_FILENAME = "session_history.sqlite3"
+
+# Bump when the table layout or the parsed fields change: the index is rebuilt
+SCHEMA_VERSION = 2
+
+# A row stored this close to its file's mtime may have missed a same-tick rewrite
+RACY_WINDOW = 2.0
+
+KIND_SUMMARY = "summary"
+KIND_STATE = "state"
+
+# SessionHistoryRecord fields stored per row, in table column order
+RECORD_FIELDS = (
+    "session_id", "client_id", "start_time", "end_time", "duration_seconds",
+    "total_orders", "completed_orders", "in_progress_orders", "total_items_packed",
+    "worker_id", "worker_name", "pc_name", "packing_list_path", "session_path",
+)
+
+# Scan-quality totals of a session summary, stored per row for the rollups
+COUNT_FIELDS = ("corrections", "extra_scans", "unknown_scans")
+
+# Aggregates of one rollup row, in table column order
+ROLLUP_FIELDS = (
+    "sessions", "orders", "items", "duration_sessions", "duration_seconds",
+) + COUNT_FIELDS
+
+# Key of one rollup row besides client_id; missing values are stored as ''
+ROLLUP_KEY = ("day", "worker_id", "worker_name", "packing_list")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    path               TEXT PRIMARY KEY,
+    client_id          TEXT NOT NULL,
+    session_dir        TEXT NOT NULL,
+    kind               TEXT NOT NULL,
+    mtime_ns           INTEGER NOT NULL,
+    size               INTEGER NOT NULL,
+    dep_sig            TEXT NOT NULL DEFAULT '',
+    racy               INTEGER NOT NULL DEFAULT 0,
+    has_record         INTEGER NOT NULL,
+    start_ts           REAL,
+    session_id         TEXT,
+    start_time         TEXT,
+    end_time           TEXT,
+    duration_seconds   REAL,
+    total_orders       INTEGER,
+    completed_orders   INTEGER,
+    in_progress_orders INTEGER,
+    total_items_packed INTEGER,
+    worker_id          TEXT,
+    worker_name        TEXT,
+    pc_name            TEXT,
+    packing_list_path  TEXT,
+    session_path       TEXT,
+    day                TEXT NOT NULL DEFAULT '',
+    corrections        INTEGER NOT NULL DEFAULT 0,
+    extra_scans        INTEGER NOT NULL DEFAULT 0,
+    unknown_scans      INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_sources_client_start ON sources (client_id, start_ts);
+CREATE INDEX IF NOT EXISTS idx_sources_client_day ON sources (client_id, day);
+
+CREATE TABLE IF NOT EXISTS daily_rollups (
+    client_id          TEXT NOT NULL,
+    day                TEXT NOT NULL,
+    worker_id          TEXT NOT NULL,
+    worker_name        TEXT NOT NULL,
+    packing_list       TEXT NOT NULL,
+    sessions           INTEGER NOT NULL,
+    orders             INTEGER NOT NULL,
+    items              INTEGER NOT NULL,
+    duration_sessions  INTEGER NOT NULL,
+    duration_seconds   REAL NOT NULL,
+    corrections        INTEGER NOT NULL,
+    extra_scans        INTEGER NOT NULL,
+    unknown_scans      INTEGER NOT NULL,
+    first_start_ts     REAL,
+    last_start_ts      REAL,
+    PRIMARY KEY (client_id, day, worker_id, worker_name, packing_list)
+);
+"""
+
+# Rows of sources that count towards the rollups (completed records)
+_ROLLED_UP = "has_record = 1 AND in_progress_orders = 0"
+
+# Aggregates of a set of source rows, as ROLLUP_FIELDS
+_AGGREGATES = """
+    COUNT(*), COALESCE(SUM(completed_orders), 0), COALESCE(SUM(total_items_packed), 0),
+    COUNT(duration_seconds), COALESCE(SUM(duration_seconds), 0.0),
+    SUM(corrections), SUM(extra_scans), SUM(unknown_scans)
+"""
+
+# Recompute the rollup row of one source row ({row} is NEW or OLD) from its sources
+_REFRESH_ROLLUP = f"""
+    DELETE FROM daily_rollups
+     WHERE client_id = {{row}}.client_id AND day = {{row}}.day
+       AND worker_id = COALESCE({{row}}.worker_id, '')
+       AND worker_name = COALESCE({{row}}.worker_name, '')
+       AND packing_list = COALESCE({{row}}.packing_list_path, '');
+    INSERT INTO daily_rollups
+    SELECT client_id, day, COALESCE(worker_id, ''), COALESCE(worker_name, ''),
+           COALESCE(packing_list_path, ''), {_AGGREGATES}, MIN(start_ts), MAX(start_ts)
+      FROM sources
+     WHERE client_id = {{row}}.client_id AND day = {{row}}.day
+       AND COALESCE(worker_id, '') = COALESCE({{row}}.worker_id, '')
+       AND COALESCE(worker_name, '') = COALESCE({{row}}.worker_name, '')
+       AND COALESCE(packing_list_path, '') = COALESCE({{row}}.packing_list_path, '')
+       AND {_ROLLED_UP}
+     GROUP BY 1, 2, 3, 4, 5;
+"""
+
+_TRIGGERS = f"""
+CREATE TRIGGER IF NOT EXISTS rollup_on_insert AFTER INSERT ON sources
+WHEN NEW.has_record = 1 AND NEW.in_progress_orders = 0
+BEGIN {_REFRESH_ROLLUP.format(row="NEW")} END;
+
+CREATE TRIGGER IF NOT EXISTS rollup_on_delete AFTER DELETE ON sources
+WHEN OLD.has_record = 1 AND OLD.in_progress_orders = 0
+BEGIN {_REFRESH_ROLLUP.format(row="OLD")} END;
+"""
+
+_INSERT = f"""
+INSERT INTO sources (
+    path, client_id, session_dir, kind, mtime_ns, size, dep_sig, racy, has_record,
+    start_ts, day, {", ".join(f for f in RECORD_FIELDS + COUNT_FIELDS if f != "client_id")}
+) VALUES ({", ".join("?" * (11 + len(RECORD_FIELDS) - 1 + len(COUNT_FIELDS)))})
+"""
+
+
+class IndexedSource(NamedTuple):
+    """What the index knows about one source file."""
+    mtime_ns: int
+    size: int
+    dep_sig: str
+    racy: bool
+    has_record: bool
+
+
+class SourceRow(NamedTuple):
+    """
+    One source file to store: its signature, parsed record fields (None if
+    unparseable) and scan-quality totals (COUNT_FIELDS; summaries only).
+    """
+    path: str
+    session_dir: str
+    kind: str
+    mtime_ns: int
+    size: int
+    dep_sig: str
+    record: Optional[Dict[str, Any]]
+    counts: Optional[Dict[str, int]] = None
+
+
+def stat_signature(st: Optional[os.stat_result]) -> str:
+    """Compact (mtime, size) signature of a dependency file ('' if missing)."""
+    return f"{st.st_mtime_ns}:{st.st_size}" if st is not None else ""
+
+
+def _to_iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def _from_iso(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+class SessionHistoryIndex:
+    """
+    SQLite-backed index of session history records, one row per source file.
+
+    Thread Safety:
+        One connection shared under a lock; the history widget and worker
+        threads may use the same SessionHistoryManager.
+
+    Attributes:
+        db_path (str): Database file, or ":memory:" for a per-process index
+    """
+
+    def __init__(self, db_path: Union[str, Path] = ":memory:"):
+        self.db_path = str(db_path)
+        self._lock = threading.Lock()
+        self._conn = self._open()
+
+    # ------------------------------------------------------------------ #
+    #  Connection                                                          #
+    # ------------------------------------------------------------------ #
+
+    def _open(self) -> sqlite3.Connection:
+        """Open the database, rebuilding it if it is unreadable or from another schema."""
+        try:
+            return self._connect(self.db_path)
+        except sqlite3.DatabaseError as e:
+            logger.warning(f"Session history index unreadable, rebuilding: {self.db_path} ({e})")
+        if self.db_path != ":memory:":
+            try:
+                os.remove(self.db_path)
+                return self._connect(self.db_path)
+            except (OSError, sqlite3.DatabaseError) as e:
+                logger.error(f"Cannot rebuild session history index, using memory: {e}")
+        self.db_path = ":memory:"
+        return self._connect(self.db_path)
+
+    @staticmethod
+    def _connect(db_path: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(db_path, timeout=5.0, check_same_thread=False)
+        try:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != SCHEMA_VERSION:
+                conn.execute("DROP TABLE IF EXISTS sources")
+                conn.execute("DROP TABLE IF EXISTS daily_rollups")
+            conn.executescript(_SCHEMA + _TRIGGERS)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.commit()
+        except sqlite3.DatabaseError:
+            conn.close()
+            raise
+        return conn
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def reset(self):
+        """Delete and recreate the database (after it was found damaged)."""
+        with self._lock:
+            self._conn.close()
+            if self.db_path != ":memory:":
+                try:
+                    os.remove(self.db_path)
+                except OSError as e:
+                    logger.warning(f"Could not delete session history index: {e}")
+            self._conn = self._open()
+
+    def clear(self):
+        """Drop every row (forces a full re-parse on the next sync)."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM sources")
+            self._conn.execute("DELETE FROM daily_rollups")
+
+    # ------------------------------------------------------------------ #
+    #  Sync                                                                #
+    # ------------------------------------------------------------------ #
+
+    def sources(self, client_id: str) -> Dict[str, IndexedSource]:
+        """Signature of every indexed source file of a client, by path."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, mtime_ns, size, dep_sig, racy, has_record "
+                "FROM sources WHERE client_id = ?",
+                (client_id,)
+            ).fetchall()
+        return {
+            path: IndexedSource(mtime_ns, size, dep_sig, bool(racy), bool(has_record))
+            for path, mtime_ns, size, dep_sig, racy, has_record in rows
+        }
+
+    def update(
+        self,
+        client_id: str,
+        rows: Iterable[SourceRow],
+        keep_paths: Set[str],
+        within: Optional[str] = None
+    ):
+        """
+        Store re-parsed source files and drop the client's rows not in keep_paths.
+
+        Rows are deleted and re-inserted (not replaced) so the rollup triggers
+        see both the old and the new version of a changed file.
+
+        Args:
+            client_id: Client identifier
+            rows: Source files parsed in this sync
+            keep_paths: Every source path of the client that is still current
+                       (re-parsed or unchanged); other rows are deleted
+            within: Only consider rows under this directory for deletion
+                    (a sync of one session directory)
+        """
+        now_ns = time.time_ns()
+        params = []
+        for row in rows:
+            record = row.record or {}
+            counts = row.counts or {}
+            start_time = record.get("start_time")
+            params.append((
+                row.path, client_id, row.session_dir, row.kind, row.mtime_ns, row.size,
+                row.dep_sig, int(now_ns - row.mtime_ns < RACY_WINDOW * 1e9),
+                int(row.record is not None),
+                start_time.timestamp() if start_time else None,
+                start_time.date().isoformat() if start_time else "",
+                *(
+                    _to_iso(record.get(f)) if f in ("start_time", "end_time") else record.get(f)
+                    for f in RECORD_FIELDS if f != "client_id"
+                ),
+                *(int(counts.get(f) or 0) for f in COUNT_FIELDS),
+            ))
+
+        prefix = within.rstrip(os.sep) + os.sep if within else ""
+        with self._lock, self._conn:
+            if params:
+                self._conn.executemany(
+                    "DELETE FROM sources WHERE path = ?", [(p[0],) for p in params]
+                )
+                self._conn.executemany(_INSERT, params)
+            stale = [
+                (path,) for (path,) in self._conn.execute(
+                    "SELECT path FROM sources WHERE client_id = ?", (client_id,)
+                )
+                if path not in keep_paths and path.startswith(prefix)
+            ]
+            if stale:
+                self._conn.executemany("DELETE FROM sources WHERE path = ?", stale)
+
+    # ------------------------------------------------------------------ #
+    #  Queries                                                             #
+    # ------------------------------------------------------------------ #
+
+    def query(
+        self,
+        client_id: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        include_incomplete: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Indexed records of a client, newest first.
+
+        Records without a start time are never excluded by the date filters
+        and sort last, as in the original in-memory filtering.
+
+        Args:
+            client_id: Client identifier
+            start_date: Only records starting at or after this (timezone-aware)
+            end_date: Only records starting at or before this (timezone-aware)
+            include_incomplete: Include records with in-progress orders
+
+        Returns:
+            List of dicts with the SessionHistoryRecord fields
+        """
+        sql = [
+            f"SELECT {', '.join(RECORD_FIELDS)} FROM sources",
+            "WHERE client_id = ? AND has_record = 1",
+        ]
+        args: List[Any] = [client_id]
+        if start_date is not None:
+            sql.append("AND (start_ts IS NULL OR start_ts >= ?)")
+            args.append(start_date.timestamp())
+        if end_date is not None:
+            sql.append("AND (start_ts IS NULL OR start_ts <= ?)")
+            args.append(end_date.timestamp())
+        if not include_incomplete:
+            sql.append("AND in_progress_orders = 0")
+        sql.append("ORDER BY start_ts IS NULL, start_ts DESC, session_dir, path")
+
+        with self._lock:
+            rows = self._conn.execute(" ".join(sql), args).fetchall()
+
+        records = []
+        for row in rows:
+            record = dict(zip(RECORD_FIELDS, row))
+            record["start_time"] = _from_iso(record["start_time"])
+            record["end_time"] = _from_iso(record["end_time"])
+            records.append(record)
+        return records
+
+    def rollups(
+        self,
+        client_id: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Daily rollups of a client's completed records in a date range.
+
+        Days entirely inside the range come straight from the rollup table;
+        the records of days the range boundaries cut through are aggregated
+        from their source rows, so the result matches query() exactly at any
+        boundary. Records without a start time (day '') are never excluded.
+
+        Args:
+            client_id: Client identifier
+            start_date: Only records starting at or after this (timezone-aware)
+            end_date: Only records starting at or before this (timezone-aware)
+
+        Returns:
+            List of dicts with the ROLLUP_KEY and ROLLUP_FIELDS columns,
+            ordered by day, worker and packing list
+        """
+        lo = start_date.timestamp() if start_date is not None else None
+        hi = end_date.timestamp() if end_date is not None else None
+        columns = ", ".join(ROLLUP_KEY + ROLLUP_FIELDS)
+
+        with self._lock:
+            days = self._conn.execute(
+                "SELECT day, MIN(first_start_ts), MAX(last_start_ts) FROM daily_rollups "
+                "WHERE client_id = ? GROUP BY day",
+                (client_id,)
+            ).fetchall()
+
+            whole, partial = [], []
+            for day, first, last in days:
+                if first is None or ((lo is None or first >= lo) and (hi is None or last <= hi)):
+                    whole.append(day)
+                elif (lo is None or last >= lo) and (hi is None or first <= hi):
+                    partial.append(day)
+
+            rows = []
+            for chunk in _chunks(whole):
+                rows += self._conn.execute(
+                    f"SELECT {columns} FROM daily_rollups WHERE client_id = ? "
+                    f"AND day IN ({', '.join('?' * len(chunk))})",
+                    [client_id, *chunk]
+                ).fetchall()
+            if partial:
+                sql = [
+                    "SELECT day, COALESCE(worker_id, ''), COALESCE(worker_name, ''),",
+                    f"COALESCE(packing_list_path, ''), {_AGGREGATES} FROM sources",
+                    f"WHERE client_id = ? AND {_ROLLED_UP}",
+                    f"AND day IN ({', '.join('?' * len(partial))})",
+                ]
+                args: List[Any] = [client_id, *partial]
+                if lo is not None:
+                    sql.append("AND start_ts >= ?")
+                    args.append(lo)
+                if hi is not None:
+                    sql.append("AND start_ts <= ?")
+                    args.append(hi)
+                sql.append("GROUP BY 1, 2, 3, 4")
+                rows += self._conn.execute(" ".join(sql), args).fetchall()
+
+        rows.sort(key=lambda r: r[:len(ROLLUP_KEY)])
+        return [dict(zip(ROLLUP_KEY + ROLLUP_FIELDS, row)) for row in rows]
+
+    def latest_start(
+        self,
+        client_id: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Optional[datetime]:
+        """Start time of the client's most recent completed record in a date range."""
+        sql = [
+            "SELECT start_time FROM sources",
+            f"WHERE client_id = ? AND {_ROLLED_UP} AND start_ts IS NOT NULL",
+        ]
+        args: List[Any] = [client_id]
+        if start_date is not None:
+            sql.append("AND start_ts >= ?")
+            args.append(start_date.timestamp())
+        if end_date is not None:
+            sql.append("AND start_ts <= ?")
+            args.append(end_date.timestamp())
+        sql.append("ORDER BY start_ts DESC LIMIT 1")
+
+        with self._lock:
+            row = self._conn.execute(" ".join(sql), args).fetchone()
+        return _from_iso(row[0]) if row else None
+
+    def stats(self) -> Dict[str, Any]:
+        """Row counts for monitoring: 'sources', 'records', 'clients', 'rollups'."""
+        with self._lock:
+            sources, records, clients = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(has_record), 0), COUNT(DISTINCT client_id) FROM sources"
+            ).fetchone()
+            rollups = self._conn.execute("SELECT COUNT(*) FROM daily_rollups").fetchone()[0]
+        return {'sources': sources, 'records': records, 'clients': clients, 'rollups': rollups}
+
+
+def _chunks(values: List[str], size: int = 500) -> Iterable[List[str]]:
+    """Split values into lists of at most size (SQLite bound-parameter limit)."""
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
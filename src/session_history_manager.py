@@ -5,13 +5,20 @@ This module provides functionality to retrieve, analyze, and search through
 completed packing sessions, enabling historical reporting and analytics.
 """
 import json
+import os
+import sqlite3
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, Optional, Set, Tuple
 from dataclasses import dataclass, asdict
 
 from logger import get_logger
 from json_cache import get_cached_json
+from fs_metadata_cache import fs_exists, fs_is_dir, fs_scan_pass, scan_dir
+from session_history_index import (
+    SessionHistoryIndex, SourceRow, IndexedSource, stat_signature,
+    DB_FILENAME, KIND_STATE, KIND_SUMMARY, ROLLUP_FIELDS,
+)
 
 logger = get_logger(__name__)
 
@@ -75,6 +82,9 @@ class ClientAnalytics:
         average_session_duration_minutes: Average session duration in minutes
         total_items_packed: Total items packed
         last_session_date: Date of most recent session
+        total_corrections: Scan corrections (cancelled scans) across all sessions
+        total_extra_scans: Scans beyond the required quantity across all sessions
+        total_unknown_scans: Scans of SKUs not in the order across all sessions
     """
     client_id: str
     total_sessions: int
@@ -83,6 +93,9 @@ class ClientAnalytics:
     average_session_duration_minutes: float
     total_items_packed: int
     last_session_date: Optional[datetime]
+    total_corrections: int = 0
+    total_extra_scans: int = 0
+    total_unknown_scans: int = 0
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary with datetime objects as ISO strings."""
@@ -92,23 +105,145 @@ class ClientAnalytics:
         return data
 
 
+@dataclass
+class AnalyticsRollup:
+    """
+    Aggregated metrics of a client's completed sessions for one group.
+
+    Dimensions not grouped by are None; day is None also for sessions
+    without a start time.
+
+    Attributes:
+        client_id: Client identifier
+        day: Session start date (YYYY-MM-DD, in the session's own timezone)
+        worker_id: Worker ID
+        worker_name: Worker display name
+        packing_list: Packing list name
+        sessions: Number of sessions
+        orders_packed: Completed orders
+        items_packed: Items packed
+        duration_seconds: Total duration of the timed sessions
+        timed_sessions: Sessions with a known duration
+        corrections: Scan corrections (cancelled scans)
+        extra_scans: Scans beyond the required quantity
+        unknown_scans: Scans of SKUs not in the order
+    """
+    client_id: str
+    day: Optional[str]
+    worker_id: Optional[str]
+    worker_name: Optional[str]
+    packing_list: Optional[str]
+    sessions: int = 0
+    orders_packed: int = 0
+    items_packed: int = 0
+    duration_seconds: float = 0.0
+    timed_sessions: int = 0
+    corrections: int = 0
+    extra_scans: int = 0
+    unknown_scans: int = 0
+
+    @property
+    def average_session_duration_minutes(self) -> float:
+        return self.duration_seconds / self.timed_sessions / 60.0 if self.timed_sessions else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        data = asdict(self)
+        data['average_session_duration_minutes'] = self.average_session_duration_minutes
+        return data
+
+
+# Rollup dimensions accepted by get_client_rollups(), and their AnalyticsRollup fields
+ROLLUP_DIMENSIONS = {
+    'day': ('day',),
+    'worker': ('worker_id', 'worker_name'),
+    'packing_list': ('packing_list',),
+}
+
+# Index rollup columns -> AnalyticsRollup fields
+_ROLLUP_METRICS = {
+    'sessions': 'sessions',
+    'orders': 'orders_packed',
+    'items': 'items_packed',
+    'duration_seconds': 'duration_seconds',
+    'duration_sessions': 'timed_sessions',
+    'corrections': 'corrections',
+    'extra_scans': 'extra_scans',
+    'unknown_scans': 'unknown_scans',
+}
+
+
+def _aware(value: Optional[datetime]) -> Optional[datetime]:
+    """Date filter as a timezone-aware datetime (naive values are taken as UTC)."""
+    from datetime import timezone
+
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _summary_counts(summary: Dict[str, Any]) -> Dict[str, int]:
+    """Scan-quality totals of a v1.3.0 summary (0 for summaries written before 1.7)."""
+    metrics = summary.get('metrics') or {}
+    return {
+        'corrections': metrics.get('total_corrections') or 0,
+        'extra_scans': metrics.get('total_extra_scans') or 0,
+        'unknown_scans': metrics.get('total_unknown_scans') or 0,
+    }
+
+
+def _stat_or_none(path: Path) -> Optional[os.stat_result]:
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+def _stat_files(directory: Path, names: Tuple[str, ...]) -> Dict[str, os.stat_result]:
+    """Stat of each of names present in directory, from one directory listing."""
+    found = {}
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.name in names:
+                    try:
+                        found[entry.name] = entry.stat()
+                    except OSError:
+                        pass
+    except OSError:
+        pass  # Missing directory: nothing to index
+    return found
+
+
 class SessionHistoryManager:
     """
     Manages historical session data retrieval and analytics.
 
     This class provides methods to scan session directories, extract metrics
     from completed sessions, and generate analytics reports for clients.
+
+    Parsed records are kept in a SessionHistoryIndex (local SQLite, see
+    session_history_index.py); each call only re-parses session files that
+    are new or changed since the last call. Analytics are read from the
+    index's daily rollups instead of the individual records.
     """
 
-    def __init__(self, profile_manager):
+    def __init__(self, profile_manager, index_path: Optional[str] = None):
         """
         Initialize SessionHistoryManager.
 
         Args:
             profile_manager: ProfileManager instance for accessing session paths
+            index_path: SQLite file for the history index (default:
+                        session_history.sqlite3 in profile_manager.cache_dir,
+                        or an in-memory index if there is no cache directory)
         """
         self.profile_manager = profile_manager
-        logger.info("SessionHistoryManager initialized")
+        if index_path is None:
+            cache_dir = getattr(profile_manager, 'cache_dir', None)
+            index_path = str(cache_dir / DB_FILENAME) if isinstance(cache_dir, Path) else ":memory:"
+        self.index = SessionHistoryIndex(index_path)
+        logger.info(f"SessionHistoryManager initialized (index: {self.index.db_path})")
 
     def get_client_sessions(
         self,
@@ -130,79 +265,170 @@ class SessionHistoryManager:
             List of SessionHistoryRecord objects, sorted by start time (newest first)
         """
         # Ensure date filters are timezone-aware for comparison with session timestamps
-        from datetime import timezone
-
-        if start_date is not None and start_date.tzinfo is None:
-            # Assume local timezone if naive
-            start_date = start_date.replace(tzinfo=timezone.utc)
-            logger.debug(f"Converted naive start_date to timezone-aware (UTC)")
-
-        if end_date is not None and end_date.tzinfo is None:
-            # Assume local timezone if naive
-            end_date = end_date.replace(tzinfo=timezone.utc)
-            logger.debug(f"Converted naive end_date to timezone-aware (UTC)")
+        start_date, end_date = _aware(start_date), _aware(end_date)
 
         logger.info(f"Retrieving sessions for client {client_id}")
 
         try:
-            sessions_root = self.profile_manager.get_sessions_root() / f"CLIENT_{client_id}"
+            rows = self._read_synced(
+                client_id,
+                lambda: self.index.query(client_id, start_date, end_date, include_incomplete)
+            )
+            sessions = [SessionHistoryRecord(**row) for row in rows or []]
+            logger.info(f"Found {len(sessions)} sessions for client {client_id}")
+            return sessions
 
-            if not sessions_root.exists():
-                logger.warning(f"Sessions directory not found for client {client_id}: {sessions_root}")
-                return []
+        except Exception as e:
+            logger.error(f"Error retrieving sessions for client {client_id}: {e}", exc_info=True)
+            return []
 
-            logger.debug(f"Searching for sessions in: {sessions_root}")
-            sessions = []
-            session_dirs = list(sessions_root.iterdir())
-            logger.info(f"Found {len(session_dirs)} directories/files in {sessions_root}")
+    # ------------------------------------------------------------------ #
+    #  History index                                                       #
+    # ------------------------------------------------------------------ #
 
-            # Iterate through all session directories
-            for session_dir in session_dirs:
-                if not session_dir.is_dir():
-                    logger.debug(f"Skipping non-directory: {session_dir.name}")
-                    continue
+    @fs_scan_pass()
+    def _read_synced(self, client_id: str, read: Callable[[], Any]) -> Any:
+        """
+        Bring the client's index up to date and run read() against it.
 
-                logger.debug(f"Parsing session directory: {session_dir.name}")
-                try:
-                    records = self._parse_session_directory(client_id, session_dir)
+        Returns None if the client has no sessions directory. A damaged
+        index is only a cache: it is rebuilt from the files and read again.
+        """
+        sessions_root = self.profile_manager.get_sessions_root() / f"CLIENT_{client_id}"
 
-                    if not records:
-                        logger.debug(f"Skipping session {session_dir.name}: _parse_session_directory returned empty list")
-                        continue
+        if not fs_is_dir(sessions_root):
+            logger.warning(f"Sessions directory not found for client {client_id}: {sessions_root}")
+            return None
 
-                    # Apply filters to each record
-                    for record in records:
-                        if not include_incomplete and record.in_progress_orders > 0:
-                            logger.debug(f"Skipping incomplete packing list in session: {session_dir.name}")
-                            continue
+        try:
+            self._sync_index(client_id, sessions_root)
+            return read()
+        except sqlite3.DatabaseError as e:
+            logger.warning(f"Session history index failed ({e}), rebuilding")
+            self.index.reset()
+            self._sync_index(client_id, sessions_root)
+            return read()
+
+    @fs_scan_pass()
+    def refresh_session(self, client_id: str, session_dir: Path):
+        """
+        Re-index one session directory right away.
 
-                        if start_date and record.start_time and record.start_time < start_date:
-                            logger.debug(f"Skipping session {session_dir.name}: before start_date")
-                            continue
+        Called after a session summary is written, so the history and the
+        analytics rollups include the session without waiting for the next
+        full sync (which would pick it up as a changed file all the same).
 
-                        if end_date and record.start_time and record.start_time > end_date:
-                            logger.debug(f"Skipping session {session_dir.name}: after end_date")
-                            continue
+        Args:
+            client_id: Client identifier
+            session_dir: Session directory (CLIENT_<id>/<session_id>)
+        """
+        session_dir = Path(session_dir)
+        try:
+            rows: List[SourceRow] = []
+            keep: Set[str] = set()
+            self._sync_session_dir(client_id, session_dir, self.index.sources(client_id), rows, keep)
+            self.index.update(client_id, rows, keep, within=str(session_dir))
+        except Exception as e:
+            logger.warning(f"Could not index session {session_dir.name}: {e}", exc_info=True)
 
-                        logger.debug(f"Adding session {session_dir.name} to results")
-                        sessions.append(record)
+    def _sync_index(self, client_id: str, sessions_root: Path):
+        """
+        Bring the index of one client up to date with its session directories.
 
-                except Exception as e:
-                    logger.warning(f"Error parsing session {session_dir.name}: {e}", exc_info=True)
-                    continue
+        Walks the session tree, taking each packing file's mtime and size from
+        the directory listing (free with the listing on Windows shares), and
+        re-parses only the files whose signature differs from the index.
+        Rows of sessions and files that no longer exist are dropped.
+        """
+        known = self.index.sources(client_id)
+        rows: List[SourceRow] = []
+        keep: Set[str] = set()
+
+        for entry in scan_dir(sessions_root):
+            if not entry.is_dir:
+                continue
+            session_dir = Path(entry.path)
+            try:
+                self._sync_session_dir(client_id, session_dir, known, rows, keep)
+            except Exception as e:
+                logger.warning(f"Error indexing session {session_dir.name}: {e}", exc_info=True)
+                # Keep what the index already has for this session
+                prefix = str(session_dir) + os.sep
+                keep.update(path for path in known if path.startswith(prefix))
 
-            # Sort by start time, newest first
-            # Use timezone-aware min for compatibility with new timestamps
-            from datetime import timezone
-            min_dt = datetime.min.replace(tzinfo=timezone.utc)
-            sessions.sort(key=lambda s: s.start_time or min_dt, reverse=True)
+        self.index.update(client_id, rows, keep)
+        if rows:
+            logger.info(f"Session history index: re-parsed {len(rows)} file(s) for client {client_id}")
 
-            logger.info(f"Found {len(sessions)} sessions for client {client_id}")
-            return sessions
+    def _sync_session_dir(
+        self,
+        client_id: str,
+        session_dir: Path,
+        known: Dict[str, IndexedSource],
+        rows: List[SourceRow],
+        keep: Set[str]
+    ):
+        """
+        Index the packing files of one session directory.
 
-        except Exception as e:
-            logger.error(f"Error retrieving sessions for client {client_id}: {e}", exc_info=True)
-            return []
+        Follows the selection rules of _parse_session_directory(): Phase 1
+        work dirs (session_summary.json, else packing_state.json) if any of
+        them yields a record, otherwise the legacy barcodes/ files.
+        """
+        info_sig = None  # session_info.json signature, looked up once if needed
+
+        def indexed(kind: str, path: Path, st: os.stat_result) -> bool:
+            """Whether the file yields a record; re-parses it only if changed."""
+            nonlocal info_sig
+            dep_sig = ""
+            if kind == KIND_STATE:
+                if info_sig is None:
+                    info_sig = stat_signature(_stat_or_none(session_dir / "session_info.json"))
+                dep_sig = info_sig
+
+            key = str(path)
+            keep.add(key)
+            cached = known.get(key)
+            if (cached is not None and not cached.racy
+                    and cached.mtime_ns == st.st_mtime_ns and cached.size == st.st_size
+                    and cached.dep_sig == dep_sig):
+                return cached.has_record
+
+            counts: Dict[str, int] = {}
+            if kind == KIND_SUMMARY:
+                record = self._parse_session_summary(client_id, session_dir, path, counts)
+            else:
+                record = self._parse_packing_state(client_id, session_dir, path)
+            rows.append(SourceRow(
+                key, str(session_dir), kind, st.st_mtime_ns, st.st_size, dep_sig,
+                asdict(record) if record else None, counts
+            ))
+            return record is not None
+
+        # Phase 1 (Shopify): one record per packing list work directory
+        packing_dir = session_dir / "packing"
+        found_phase1 = False
+        if fs_is_dir(packing_dir):
+            for entry in scan_dir(packing_dir):
+                if not entry.is_dir:
+                    continue
+                work_dir = Path(entry.path)
+                files = _stat_files(work_dir, ("session_summary.json", "packing_state.json"))
+                if "session_summary.json" in files:
+                    found_phase1 |= indexed(KIND_SUMMARY, work_dir / "session_summary.json",
+                                            files["session_summary.json"])
+                elif "packing_state.json" in files:
+                    found_phase1 |= indexed(KIND_STATE, work_dir / "packing_state.json",
+                                            files["packing_state.json"])
+        if found_phase1:
+            return
+
+        # Legacy (Excel): barcodes/packing_state.json, else barcodes/session_summary.json
+        barcodes_dir = session_dir / "barcodes"
+        files = _stat_files(barcodes_dir, ("packing_state.json", "session_summary.json"))
+        for name, kind in (("packing_state.json", KIND_STATE), ("session_summary.json", KIND_SUMMARY)):
+            if name in files and indexed(kind, barcodes_dir / name, files[name]):
+                return
 
     def _parse_session_directory(
         self,
@@ -230,19 +456,20 @@ class SessionHistoryManager:
         # PHASE 1 (Shopify) - Try first
         # ========================================
         packing_dir = session_dir / "packing"
-        if packing_dir.exists() and packing_dir.is_dir():
+        if fs_is_dir(packing_dir):
             logger.debug(f"Found packing/ directory in {session_id}, checking for Phase 1 data")
 
             # Iterate through all packing list work directories
-            for work_dir in packing_dir.iterdir():
-                if not work_dir.is_dir():
+            for entry in scan_dir(packing_dir):
+                if not entry.is_dir:
                     continue
+                work_dir = Path(entry.path)
 
                 logger.debug(f"Checking work directory: {work_dir.name}")
 
                 # Check for session_summary.json (completed session)
                 summary_file = work_dir / "session_summary.json"
-                if summary_file.exists():
+                if fs_exists(summary_file):
                     logger.info(f"Found session_summary.json in {session_id}/{work_dir.name}")
                     record = self._parse_session_summary(client_id, session_dir, summary_file)
                     if record:
@@ -251,7 +478,7 @@ class SessionHistoryManager:
 
                 # Check for packing_state.json (in-progress or completed)
                 state_file = work_dir / "packing_state.json"
-                if state_file.exists():
+                if fs_exists(state_file):
                     logger.info(f"Found packing_state.json in {session_id}/{work_dir.name}")
                     record = self._parse_packing_state(client_id, session_dir, state_file)
                     if record:
@@ -269,7 +496,7 @@ class SessionHistoryManager:
         # ========================================
         # Check barcodes/packing_state.json
         state_file = session_dir / "barcodes" / "packing_state.json"
-        if state_file.exists():
+        if fs_exists(state_file):
             logger.info(f"Found Legacy Excel packing_state.json in {session_id}")
             record = self._parse_packing_state(client_id, session_dir, state_file)
             if record:
@@ -277,7 +504,7 @@ class SessionHistoryManager:
 
         # Check barcodes/session_summary.json (if exists)
         summary_file = session_dir / "barcodes" / "session_summary.json"
-        if summary_file.exists():
+        if fs_exists(summary_file):
             logger.info(f"Found Legacy Excel session_summary.json in {session_id}")
             record = self._parse_session_summary(client_id, session_dir, summary_file)
             if record:
@@ -293,7 +520,8 @@ class SessionHistoryManager:
         self,
         client_id: str,
         session_dir: Path,
-        summary_file: Path
+        summary_file: Path,
+        counts: Optional[Dict[str, int]] = None
     ) -> Optional[SessionHistoryRecord]:
         """
         Parse session_summary.json for completed sessions (v1.3.0 format only).
@@ -302,6 +530,8 @@ class SessionHistoryManager:
             client_id: Client identifier
             session_dir: Path to session directory
             summary_file: Path to session_summary.json file
+            counts: If given, filled with the summary's scan-quality totals
+                    (corrections, extra_scans, unknown_scans) for the rollups
 
         Returns:
             SessionHistoryRecord or None if parsing fails
@@ -318,6 +548,9 @@ class SessionHistoryManager:
             start_time = parse_timestamp(summary.get('started_at', ''))
             end_time = parse_timestamp(summary.get('completed_at', ''))
 
+            if counts is not None:
+                counts.update(_summary_counts(summary))
+
             # Get duration
             duration_seconds = summary.get('duration_seconds')
             if duration_seconds is None and start_time and end_time:
@@ -449,7 +682,7 @@ class SessionHistoryManager:
     def _load_session_info(self, session_dir: Path) -> Optional[Dict[str, Any]]:
         """Load session_info.json if it exists."""
         info_file = session_dir / "session_info.json"
-        if info_file.exists():
+        if fs_exists(info_file):
             try:
                 # OPTIMIZED: Use JSON cache for session_info.json
                 # This file is read repeatedly when scanning sessions
@@ -517,6 +750,9 @@ class SessionHistoryManager:
         """
         Generate analytics for a specific client.
 
+        Totals come from the index's daily rollups of completed sessions, so
+        the cost grows with the number of days in the range, not sessions.
+
         Args:
             client_id: Client identifier
             start_date: Include sessions after this date
@@ -525,14 +761,8 @@ class SessionHistoryManager:
         Returns:
             ClientAnalytics object with aggregated metrics
         """
-        sessions = self.get_client_sessions(
-            client_id,
-            start_date=start_date,
-            end_date=end_date,
-            include_incomplete=False
-        )
-
-        if not sessions:
+        totals = self.get_client_rollups(client_id, start_date, end_date, group_by=())
+        if not totals:
             return ClientAnalytics(
                 client_id=client_id,
                 total_sessions=0,
@@ -542,32 +772,81 @@ class SessionHistoryManager:
                 total_items_packed=0,
                 last_session_date=None
             )
+        total = totals[0]
 
-        total_sessions = len(sessions)
-        total_orders = sum(s.completed_orders for s in sessions)
-        total_items = sum(s.total_items_packed for s in sessions)
-
-        # Calculate average orders per session
-        avg_orders = total_orders / total_sessions if total_sessions > 0 else 0.0
-
-        # Calculate average session duration
-        durations = [s.duration_seconds for s in sessions if s.duration_seconds is not None]
-        avg_duration_seconds = sum(durations) / len(durations) if durations else 0.0
-        avg_duration_minutes = avg_duration_seconds / 60.0
-
-        # Get last session date
-        last_session_date = sessions[0].start_time if sessions else None
+        try:
+            last_session_date = self.index.latest_start(client_id, _aware(start_date), _aware(end_date))
+        except sqlite3.DatabaseError as e:
+            logger.warning(f"Could not read last session date for client {client_id}: {e}")
+            last_session_date = None
 
         return ClientAnalytics(
             client_id=client_id,
-            total_sessions=total_sessions,
-            total_orders_packed=total_orders,
-            average_orders_per_session=avg_orders,
-            average_session_duration_minutes=avg_duration_minutes,
-            total_items_packed=total_items,
-            last_session_date=last_session_date
+            total_sessions=total.sessions,
+            total_orders_packed=total.orders_packed,
+            average_orders_per_session=total.orders_packed / total.sessions,
+            average_session_duration_minutes=total.average_session_duration_minutes,
+            total_items_packed=total.items_packed,
+            last_session_date=last_session_date,
+            total_corrections=total.corrections,
+            total_extra_scans=total.extra_scans,
+            total_unknown_scans=total.unknown_scans
         )
 
+    def get_client_rollups(
+        self,
+        client_id: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        group_by: Tuple[str, ...] = ('day', 'worker', 'packing_list')
+    ) -> List[AnalyticsRollup]:
+        """
+        Per-day / per-worker / per-packing-list breakdown of completed sessions.
+
+        Read from the index's daily rollups (client x day x worker x packing
+        list); dimensions left out of group_by are summed over.
+
+        Args:
+            client_id: Client identifier
+            start_date: Include sessions after this date
+            end_date: Include sessions before this date
+            group_by: Any of 'day', 'worker', 'packing_list'; () for one total
+
+        Returns:
+            List of AnalyticsRollup, ordered by the grouped dimensions
+            (empty if the client has no completed sessions in the range)
+
+        Raises:
+            ValueError: If group_by names an unknown dimension
+        """
+        unknown = set(group_by) - set(ROLLUP_DIMENSIONS)
+        if unknown:
+            raise ValueError(f"Unknown rollup dimension(s): {', '.join(sorted(unknown))}")
+        key_fields = [f for dim in group_by for f in ROLLUP_DIMENSIONS[dim]]
+        start_date, end_date = _aware(start_date), _aware(end_date)
+
+        try:
+            rows = self._read_synced(
+                client_id, lambda: self.index.rollups(client_id, start_date, end_date)
+            ) or []
+        except Exception as e:
+            logger.error(f"Error reading rollups for client {client_id}: {e}", exc_info=True)
+            return []
+
+        groups: Dict[Tuple, AnalyticsRollup] = {}
+        for row in rows:
+            key = tuple(row[f] or None for f in key_fields)
+            group = groups.get(key)
+            if group is None:
+                dims = {f: None for dims in ROLLUP_DIMENSIONS.values() for f in dims}
+                dims.update(zip(key_fields, key))
+                group = groups[key] = AnalyticsRollup(client_id=client_id, **dims)
+            for column in ROLLUP_FIELDS:
+                field = _ROLLUP_METRICS[column]
+                setattr(group, field, getattr(group, field) + row[column])
+
+        return [groups[key] for key in sorted(groups, key=lambda k: [v or "" for v in k])]
+
     def search_sessions(
         self,
         client_id: str,
@@ -602,6 +881,7 @@ class SessionHistoryManager:
 
         return matching_sessions
 
+    @fs_scan_pass()
     def get_session_details(
         self,
         client_id: str,
@@ -622,7 +902,7 @@ class SessionHistoryManager:
         try:
             session_dir = self.profile_manager.get_sessions_root() / f"CLIENT_{client_id}" / session_id
 
-            if not session_dir.exists():
+            if not fs_is_dir(session_dir):
                 logger.warning(f"Session directory not found: {session_dir}")
                 return None
 
@@ -631,18 +911,18 @@ class SessionHistoryManager:
 
             # Try Phase 1 structure first
             packing_dir = session_dir / "packing"
-            if packing_dir.exists() and packing_dir.is_dir():
-                for work_dir in packing_dir.iterdir():
-                    if work_dir.is_dir():
-                        candidate = work_dir / "packing_state.json"
-                        if candidate.exists():
+            if fs_is_dir(packing_dir):
+                for entry in scan_dir(packing_dir):
+                    if entry.is_dir:
+                        candidate = Path(entry.path) / "packing_state.json"
+                        if fs_exists(candidate):
                             state_file = candidate
                             break
 
             # Fallback to Legacy structure
             if not state_file:
                 candidate = session_dir / "barcodes" / "packing_state.json"
-                if candidate.exists():
+                if fs_exists(candidate):
                     state_file = candidate
 
             if not state_file:
@@ -662,7 +942,7 @@ class SessionHistoryManager:
             session_summary = {}
             work_dir_path = state_file.parent  # work_dir containing packing_state.json
             summary_file = work_dir_path / "session_summary.json"
-            if summary_file.exists():
+            if fs_exists(summary_file):
                 try:
                     from shared.metadata_utils import load_session_summary
                     session_summary = load_session_summary(summary_file)
@@ -23,6 +23,7 @@ except ImportError:
     WINDOWS_LOCKING_AVAILABLE = False
 
 from logger import AppLogger
+from fs_metadata_cache import invalidate_fs_cache
 
 
 class SessionLockManager:
@@ -162,6 +163,7 @@ class SessionLockManager:
 
             # Atomic move
             shutil.move(tmp_path, lock_path)
+            invalidate_fs_cache(lock_path)
 
             self.logger.info(
                 f"Session lock acquired successfully",
@@ -206,6 +208,7 @@ class SessionLockManager:
                     lock_info.get('process_id') == self.process_id):
                     # It's our lock, safe to delete
                     lock_path.unlink()
+                    invalidate_fs_cache(lock_path)
                     self.logger.info(
                         f"Session lock released",
                         extra={"session_dir": str(session_dir)}
@@ -225,6 +228,7 @@ class SessionLockManager:
             else:
                 # Lock file exists but invalid, safe to delete
                 lock_path.unlink()
+                invalidate_fs_cache(lock_path)
                 return True
 
         except Exception as e:
@@ -419,6 +423,7 @@ class SessionLockManager:
 
             # Delete the lock file
             lock_path.unlink()
+            invalidate_fs_cache(lock_path)
 
             if lock_info:
                 stale_minutes = self._get_stale_minutes(lock_info)
@@ -28,6 +28,7 @@ from typing import Optional  # Type hints
 
 # Local imports
 from logger import get_logger
+from fs_metadata_cache import invalidate_fs_cache
 from exceptions import SessionLockedError, StaleLockError
 
 # Initialize module-level logger
@@ -217,6 +218,7 @@ class SessionManager:
             # This ensures unique session IDs and natural chronological sorting
             self.output_dir = self.profile_manager.get_session_dir(self.client_id)
             self.output_dir.mkdir(parents=True, exist_ok=True)
+            invalidate_fs_cache(self.output_dir)
             self.session_id = self.output_dir.name
 
             # Create barcodes subdirectory for this session
@@ -278,6 +280,7 @@ class SessionManager:
         try:
             with open(info_path, 'w', encoding='utf-8') as f:
                 json.dump(session_info, f, indent=2)
+            invalidate_fs_cache(info_path)
             logger.debug(f"Created session info file: {info_path}")
         except Exception as e:
             # Non-critical failure - session can still function
@@ -340,6 +343,7 @@ class SessionManager:
         if info_path.exists():
             try:
                 info_path.unlink()
+                invalidate_fs_cache(info_path)
                 logger.debug(f"Removed session info file: {info_path}")
             except OSError as e:
                 logger.warning(f"Failed to remove session info file: {e}")
@@ -689,6 +693,8 @@ class SessionManager:
         # 3. Create packing/{clean_name}/ directory structure
         work_dir = session_dir / "packing" / clean_name
         work_dir.mkdir(parents=True, exist_ok=True)
+        invalidate_fs_cache(work_dir)
+        invalidate_fs_cache(work_dir.parent)
 
         # 4. Create subdirectories
         barcodes_dir = work_dir / "barcodes"
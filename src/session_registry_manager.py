@@ -33,6 +33,7 @@ from pathlib import Path
 from typing import Optional
 
 from logger import get_logger
+from fs_metadata_cache import fs_exists, fs_is_dir, fs_scan_pass, scan_dir
 from shared.metadata_utils import get_current_timestamp, parse_timestamp
 
 logger = get_logger(__name__)
@@ -190,6 +191,7 @@ class SessionRegistryManager:
             )
             return False
 
+    @fs_scan_pass()
     def build_from_scan(self, client_id: str) -> dict:
         """
         Walk the Sessions/CLIENT_{id}/ directory tree and build a registry.
@@ -201,14 +203,14 @@ class SessionRegistryManager:
         registry = self._empty_registry(client_id)
         client_dir = self.profile_manager.get_sessions_root() / f"CLIENT_{client_id}"
 
-        if not client_dir.exists():
+        if not fs_is_dir(client_dir):
             logger.warning(f"Client directory not found: {client_dir}")
             return registry
 
         session_count = 0
         try:
-            for entry in os.scandir(client_dir):
-                if not entry.is_dir():
+            for entry in scan_dir(client_dir):
+                if not entry.is_dir:
                     continue
                 if entry.name.startswith(".") or entry.name == self.REGISTRY_FILENAME:
                     continue
@@ -247,14 +249,15 @@ class SessionRegistryManager:
         packing_lists_dir = session_dir / "packing_lists"
         packing_dir_root = session_dir / "packing"
 
-        if packing_lists_dir.exists():
-            for pl_entry in os.scandir(packing_lists_dir):
+        has_packing_lists = fs_is_dir(packing_lists_dir)
+        if has_packing_lists:
+            for pl_entry in scan_dir(packing_lists_dir):
                 if not pl_entry.name.endswith(".json"):
                     continue
                 pl_name = Path(pl_entry.name).stem
                 work_dir = packing_dir_root / pl_name
 
-                if work_dir.exists():
+                if fs_exists(work_dir):
                     # Session was started for this list
                     self._register_from_work_dir(
                         registry, session_id, pl_name, work_dir, session_dir
@@ -267,9 +270,9 @@ class SessionRegistryManager:
 
         # --- Legacy Excel: session_dir/barcodes/ ---
         barcodes_dir = session_dir / "barcodes"
-        if barcodes_dir.exists() and not packing_lists_dir.exists():
+        if not has_packing_lists and fs_exists(barcodes_dir):
             state_file = barcodes_dir / "packing_state.json"
-            if state_file.exists():
+            if fs_exists(state_file):
                 try:
                     with open(state_file, "r", encoding="utf-8") as f:
                         state = json.load(f)
@@ -300,7 +303,7 @@ class SessionRegistryManager:
 
         # Read session_info for basic metadata
         session_info = {}
-        if info_file.exists():
+        if fs_exists(info_file):
             try:
                 with open(info_file, "r", encoding="utf-8") as f:
                     session_info = json.load(f)
@@ -308,7 +311,7 @@ class SessionRegistryManager:
             except Exception:
                 pass
 
-        if summary_file.exists():
+        if fs_exists(summary_file):
             try:
                 with open(summary_file, "r", encoding="utf-8") as f:
                     summary = json.load(f)
@@ -338,15 +341,15 @@ class SessionRegistryManager:
             except Exception as e:
                 logger.debug(f"Could not read summary {summary_file}: {e}")
 
-        if state_file.exists():
+        if fs_exists(state_file):
             try:
                 with open(state_file, "r", encoding="utf-8") as f:
                     state = json.load(f)
                 progress = state.get("progress", {})
 
-                if lock_file.exists():
+                if fs_exists(lock_file):
                     status = "in_progress"
-                elif info_file.exists():
+                elif fs_exists(info_file):
                     status = "paused"
                 else:
                     status = "incomplete"
@@ -573,6 +576,7 @@ class SessionRegistryManager:
         """Return list of available packing list dicts for a client."""
         return list(self.read_registry(client_id).get("available_lists", {}).values())
 
+    @fs_scan_pass()
     def get_all_entries(self, client_id: str) -> list:
         """
         Return a combined list of all sessions + available lists with resolved statuses.
@@ -633,7 +637,7 @@ class SessionRegistryManager:
             session_path = entry.get("session_path", "")
             if session_path:
                 lock_file = Path(session_path) / ".session.lock"
-                if lock_file.exists():
+                if fs_exists(lock_file):
                     heartbeat_age = self._get_lock_heartbeat_age(lock_file)
                     if heartbeat_age is not None:
                         return "in_progress" if heartbeat_age < STALE_HEARTBEAT_SECONDS else "stale"
@@ -668,6 +672,7 @@ class SessionRegistryManager:
     #  Incremental available-list discovery                               #
     # ------------------------------------------------------------------ #
 
+    @fs_scan_pass()
     def refresh_available_lists(self, client_id: str) -> int:
         """
         Scan packing_lists/ directories for this client and register any new
@@ -680,7 +685,7 @@ class SessionRegistryManager:
         """
         registry = self.read_registry(client_id)
         client_dir = self.profile_manager.get_sessions_root() / f"CLIENT_{client_id}"
-        if not client_dir.exists():
+        if not fs_is_dir(client_dir):
             return 0
 
         known_keys = set(registry["sessions"].keys()) | set(
@@ -690,16 +695,16 @@ class SessionRegistryManager:
         changed = False
 
         try:
-            for s_entry in os.scandir(client_dir):
-                if not s_entry.is_dir():
+            for s_entry in scan_dir(client_dir):
+                if not s_entry.is_dir:
                     continue
                 session_id = s_entry.name
                 pl_dir = Path(s_entry.path) / "packing_lists"
                 packing_root = Path(s_entry.path) / "packing"
-                if not pl_dir.exists():
+                if not fs_is_dir(pl_dir):
                     continue
 
-                for pl_entry in os.scandir(pl_dir):
+                for pl_entry in scan_dir(pl_dir):
                     if not pl_entry.name.endswith(".json"):
                         continue
                     pl_name = Path(pl_entry.name).stem
@@ -710,7 +715,7 @@ class SessionRegistryManager:
 
                     # New list — check if a work dir exists
                     work_dir = packing_root / pl_name
-                    if work_dir.exists():
+                    if fs_exists(work_dir):
                         # Session was started; do a full register
                         self._register_from_work_dir(
                             registry, session_id, pl_name, work_dir, Path(s_entry.path)
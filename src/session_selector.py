@@ -27,6 +27,8 @@ from PySide6.QtCore import Qt, QDate, QThread, Signal
 
 from logger import get_logger
 from json_cache import get_cached_json
+from fs_metadata_cache import fs_exists, fs_is_dir, fs_scan_pass, scan_dir
+from fs_instrumentation import fs_operation
 
 logger = get_logger(__name__)
 
@@ -49,7 +51,8 @@ class SessionScanWorker(QThread):
 
     def run(self) -> None:
         try:
-            sessions = self._scan_fn(self._client_id)
+            with fs_operation("scan sessions"):
+                sessions = self._scan_fn(self._client_id)
             self.scan_complete.emit(sessions)
         except Exception as exc:
             logger.error(f"SessionScanWorker failed: {exc}", exc_info=True)
@@ -449,6 +452,7 @@ class SessionSelectorDialog(QDialog):
             # No cached data yet — trigger a full background scan
             self._refresh_sessions_for_client(client_id)
 
+    @fs_scan_pass()
     def _scan_shopify_sessions(self, client_id: str) -> List[Dict]:
         """
         Scan for Shopify sessions in Sessions/CLIENT_{ID}/ directory.
@@ -465,16 +469,17 @@ class SessionSelectorDialog(QDialog):
         """
         sessions_dir = self.profile_manager.get_sessions_root() / f"CLIENT_{client_id}"
 
-        if not sessions_dir.exists():
+        if not fs_is_dir(sessions_dir):
             logger.debug(f"No sessions directory for client {client_id}")
             return []
 
         sessions = []
 
         try:
-            for session_dir in sessions_dir.iterdir():
-                if not session_dir.is_dir():
+            for entry in scan_dir(sessions_dir):
+                if not entry.is_dir:
                     continue
+                session_dir = Path(entry.path)
 
                 session_info = {
                     'name': session_dir.name,
@@ -487,7 +492,7 @@ class SessionSelectorDialog(QDialog):
                 # Check for Shopify data
                 analysis_data_path = session_dir / "analysis" / "analysis_data.json"
 
-                if analysis_data_path.exists():
+                if fs_exists(analysis_data_path):
                     try:
                         analysis_data = get_cached_json(str(analysis_data_path), default={})
                         if analysis_data:
@@ -531,6 +536,7 @@ class SessionSelectorDialog(QDialog):
 
         return filtered
 
+    @fs_scan_pass()
     def _scan_packing_lists(self, session_path: Path) -> List[Dict]:
         """
         Scan for packing list JSON files in session/packing_lists/ directory.
@@ -543,16 +549,17 @@ class SessionSelectorDialog(QDialog):
         """
         packing_lists_dir = session_path / "packing_lists"
 
-        if not packing_lists_dir.exists():
+        if not fs_is_dir(packing_lists_dir):
             logger.debug(f"No packing_lists directory in {session_path.name}")
             return []
 
         packing_lists = []
 
         try:
-            for json_file in packing_lists_dir.glob("*.json"):
-                if not json_file.is_file():
+            for entry in scan_dir(packing_lists_dir):
+                if entry.is_dir or not entry.name.endswith(".json"):
                     continue
+                json_file = Path(entry.path)
 
                 packing_list_info = {
                     'name': json_file.stem,
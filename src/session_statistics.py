@@ -0,0 +1,141 @@
+"""
+Statistics-tab aggregates maintained by deltas.
+
+MainWindow._update_statistics ran on every item packed: it re-summed the
+packed quantity of every in-progress and completed order per SKU, rebuilt the
+whole SKU table and destroyed and recreated every courier card.
+
+SessionStatistics computes the per-courier and per-SKU totals once from the
+SessionStore when a packing list is loaded. After that each state change is
+applied as a delta: the changed order's previous contribution (status and
+units per SKU) is subtracted and its new one added, which costs O(lines of
+that order) and reports which SKUs changed so the UI can update just those
+table rows.
+
+An order's contribution matches what the statistics tab always showed:
+'packed' of its in-progress item states per SKU, plus the full quantity of
+each line once the order is completed.
+"""
+
+from typing import Any, Dict, List, Set, Tuple
+
+from packing_progress import CompletedOrderSet
+from session_store import SessionStore, to_number
+
+STATUS_PENDING = "pending"
+STATUS_IN_PROGRESS = "in_progress"
+STATUS_COMPLETED = "completed"
+
+
+class SessionStatistics:
+    """
+    Per-status, per-courier and per-SKU totals of one packing list.
+
+    Attributes:
+        store (SessionStore): The packing list the totals belong to.
+        courier_summary (List[Tuple]): (courier, order count, total quantity), static.
+        sku_rows (List[Tuple]): (sku, product, total quantity) per SKU table row, static.
+        status_counts (Dict[str, int]): Orders per STATUS_* value.
+    """
+
+    def __init__(self, store: SessionStore):
+        self.store = store
+        self.courier_summary = store.courier_summary() if 'Courier' in store.columns else []
+        self.sku_rows = store.sku_summary()
+        self._rows_by_sku: Dict[Any, List[int]] = {}
+        for row, (sku, _, _) in enumerate(self.sku_rows):
+            self._rows_by_sku.setdefault(sku, []).append(row)
+
+        self._scanned_by_sku: Dict[Any, float] = {}
+        # order -> (status, {sku: units}) currently counted in the totals
+        self._contributions: Dict[Any, Tuple[str, Dict[Any, float]]] = {}
+        self._completed = CompletedOrderSet()
+        self.status_counts = {STATUS_PENDING: len(store), STATUS_IN_PROGRESS: 0, STATUS_COMPLETED: 0}
+
+    # ------------------------------------------------------------------
+    # Read API
+    # ------------------------------------------------------------------
+
+    @property
+    def total_orders(self) -> int:
+        return len(self.store)
+
+    @property
+    def completed_orders(self) -> int:
+        return self.status_counts[STATUS_COMPLETED]
+
+    def scanned(self, sku: Any) -> int:
+        return int(self._scanned_by_sku.get(sku, 0))
+
+    def rows_for_skus(self, skus: Set[Any]) -> List[int]:
+        """SKU table rows showing any of the given SKUs."""
+        return [row for sku in skus for row in self._rows_by_sku.get(sku, ())]
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def rebuild(self, packing_state: Dict[str, Any]) -> None:
+        """Recount everything from the packing state (list loaded or state restored)."""
+        self._scanned_by_sku = {}
+        self._contributions = {}
+        self._completed = CompletedOrderSet()
+        self.status_counts = {STATUS_PENDING: len(self.store), STATUS_IN_PROGRESS: 0, STATUS_COMPLETED: 0}
+        orders = set(packing_state.get('completed_orders', []))
+        orders.update(o for o in packing_state.get('in_progress', {}) if not str(o).startswith('_'))
+        for order_number in orders:
+            self.order_changed(order_number, packing_state)
+
+    def order_changed(self, order_number: Any, packing_state: Dict[str, Any]) -> Set[Any]:
+        """
+        Apply one order's state change.
+
+        Returns:
+            Set of SKUs whose scanned total changed.
+        """
+        if not self.store.has_order(order_number):
+            return set()
+
+        old_status, old_units = self._contributions.get(order_number, (STATUS_PENDING, {}))
+        new_status, new_units = self._contribution(order_number, packing_state)
+
+        changed = set()
+        for sku in old_units.keys() | new_units.keys():
+            delta = new_units.get(sku, 0) - old_units.get(sku, 0)
+            if delta:
+                self._scanned_by_sku[sku] = self._scanned_by_sku.get(sku, 0) + delta
+                changed.add(sku)
+
+        self.status_counts[old_status] -= 1
+        self.status_counts[new_status] += 1
+        if new_status == STATUS_PENDING and not new_units:
+            self._contributions.pop(order_number, None)
+        else:
+            self._contributions[order_number] = (new_status, new_units)
+        return changed
+
+    def _contribution(self, order_number: Any, packing_state: Dict[str, Any]) -> Tuple[str, Dict[Any, float]]:
+        units: Dict[Any, float] = {}
+        status = STATUS_PENDING
+
+        order_state = packing_state.get('in_progress', {}).get(order_number)
+        if order_state is not None:
+            status = STATUS_IN_PROGRESS
+            items = order_state if isinstance(order_state, list) else order_state.values()
+            for item_state in items:
+                if not isinstance(item_state, dict):
+                    continue
+                sku = item_state.get('original_sku')
+                packed = item_state.get('packed', 0)
+                if sku and packed:
+                    units[sku] = units.get(sku, 0) + packed
+
+        if self._completed.contains(packing_state.get('completed_orders', []), order_number):
+            status = STATUS_COMPLETED
+            for i in self.store.line_range(order_number):
+                sku, _, qty = self.store.line(i)
+                number = to_number(qty)
+                if number is not None:
+                    units[sku] = units.get(sku, 0) + number
+
+        return status, units
@@ -0,0 +1,555 @@
+"""
+Compact columnar store for the orders and items of a packing list.
+
+The packing list used to be held three times: packing_list_df, a
+processed_df copy of it, and orders_data[order]['items'] built with
+to_dict('records'). Every row also carried every extra order field
+(customer name, address, tags, ...) as its own freshly stringified value.
+For a 60k-line list that was hundreds of MB.
+
+SessionStore is now the single source of truth:
+
+- Lines are grouped per order and kept in parallel column lists (SKU,
+  product name, quantity). Repeated strings are interned, so each cell
+  is a pointer to a shared string.
+- Orders map to [start, end) offset ranges into those columns.
+- The courier and extra order fields are stored once per source order
+  record ("entry"), deduplicated, as a tuple of values plus a shared tuple
+  of field names. Each line keeps only a small entry index.
+- Order metadata for the Packer Mode info panel is kept as one tuple per
+  order.
+
+Legacy shapes are produced on demand:
+
+- items(order) rebuilds the familiar list of row dicts for one order.
+- OrdersView exposes the store as the orders_data mapping.
+- to_dataframe() materialises a DataFrame, used for Excel export and for
+  callers that still expect processed_df / packing_list_df.
+
+The store is immutable once built, so the derived aggregates are cached.
+"""
+
+import math
+import sys
+from array import array
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Columns every packing-list row has, in DataFrame column order
+STANDARD_COLUMNS = ('Order_Number', 'SKU', 'Product_Name', 'Quantity')
+
+# Order metadata fields shown in Packer Mode (orders_data[order]['metadata'])
+METADATA_FIELDS = (
+    'order_type', 'shipping_provider', 'destination_country', 'tags', 'notes',
+    'system_note', 'internal_tags', 'order_min_box', 'order_fulfillment_status',
+)
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else value
+
+
+def to_number(value: Any) -> Optional[float]:
+    """
+    Coerce a Quantity cell to a number, like pd.to_numeric(errors='coerce').
+
+    Returns:
+        float, or None for empty / non-numeric values.
+    """
+    if isinstance(value, bool):
+        return float(value)
+    if isinstance(value, (int, float)):
+        return None if isinstance(value, float) and math.isnan(value) else float(value)
+    if isinstance(value, str):
+        try:
+            number = float(value.strip())
+        except ValueError:
+            return None
+        return None if math.isnan(number) else number
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(number) else number
+
+
+def build_order_metadata(raw: Dict[str, Any]) -> Tuple:
+    """Extract the Packer Mode metadata fields from a raw order record."""
+    return (
+        raw.get('order_type') or '',
+        raw.get('shipping_provider') or raw.get('courier') or '',
+        raw.get('destination_country') or raw.get('shipping_country') or '',
+        tuple(raw.get('tags') or ()),
+        raw.get('notes') or '',
+        raw.get('system_note') or '',
+        tuple(raw.get('internal_tags') or ()),
+        raw.get('order_min_box') or '',
+        raw.get('order_fulfillment_status') or '',
+    )
+
+
+class SessionStoreBuilder:
+    """
+    Single-pass builder for SessionStore.
+
+    Lines can be added in any order; build() lays them out grouped by order
+    (orders in first-seen order, lines in insertion order within an order).
+    """
+
+    def __init__(self):
+        self._lines: Dict[str, List[Tuple[Any, Any, Any, int]]] = {}
+        self._entries: List[Tuple[Tuple[str, ...], Tuple[Any, ...]]] = []
+        self._entry_index: Dict[Tuple, int] = {}
+        self._schemas: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+        self._extra_columns: Dict[str, None] = {}
+        self._metadata: Dict[str, Tuple] = {}
+
+    def add_entry(self, fields: Dict[str, Any]) -> int:
+        """
+        Register the per-order fields shared by a group of lines (Courier, extras).
+
+        Identical field sets are stored once.
+
+        Returns:
+            int: Entry id to pass to add_line().
+        """
+        key = tuple(fields.items())
+        try:
+            entry_id = self._entry_index.get(key)
+        except TypeError:  # unhashable value: store without deduplication
+            entry_id = None
+            key = None
+        if entry_id is None:
+            entry_id = len(self._entries)
+            names = tuple(fields)
+            schema = self._schemas.setdefault(names, tuple(_intern(k) for k in names))
+            self._entries.append((schema, tuple(_intern(v) for v in fields.values())))
+            if key is not None:
+                self._entry_index[key] = entry_id
+            for column in fields:
+                self._extra_columns.setdefault(column, None)
+        return entry_id
+
+    def add_line(self, order_number: Any, sku: Any, product_name: Any, quantity: Any, entry_id: int) -> None:
+        """Append one item line to an order."""
+        lines = self._lines.get(order_number)
+        if lines is None:
+            lines = self._lines[_intern(order_number)] = []
+        lines.append((_intern(sku), _intern(product_name), _intern(quantity), entry_id))
+
+    def set_metadata(self, order_number: Any, raw_order: Dict[str, Any]) -> None:
+        """Record Packer Mode metadata for an order (last record wins)."""
+        self._metadata[order_number] = build_order_metadata(raw_order)
+
+    def build(self, columns: Optional[List[str]] = None) -> 'SessionStore':
+        """
+        Lay the collected lines out column-wise.
+
+        Args:
+            columns: Explicit column order (e.g. from a DataFrame). Defaults to
+                     the standard columns followed by entry fields in first-seen order.
+        """
+        if columns is None:
+            columns = list(STANDARD_COLUMNS) + [c for c in self._extra_columns if c not in STANDARD_COLUMNS]
+
+        order_numbers = list(self._lines)
+        offsets = array('l', [0])
+        sku: List[Any] = []
+        product_name: List[Any] = []
+        quantity: List[Any] = []
+        entry = array('l')
+        for order_number in order_numbers:
+            for line_sku, line_product, line_qty, entry_id in self._lines[order_number]:
+                sku.append(line_sku)
+                product_name.append(line_product)
+                quantity.append(line_qty)
+                entry.append(entry_id)
+            offsets.append(len(sku))
+
+        return SessionStore(
+            columns=columns,
+            order_numbers=order_numbers,
+            offsets=offsets,
+            sku=sku,
+            product_name=product_name,
+            quantity=quantity,
+            entry=entry,
+            entries=self._entries,
+            metadata={o: m for o, m in self._metadata.items() if o in self._lines},
+        )
+
+
+class SessionStore:
+    """
+    Immutable columnar store of a packing list's orders and lines.
+
+    Attributes:
+        columns (List[str]): Column names of the equivalent packing-list DataFrame.
+        order_numbers (List[str]): Orders in packing-list order.
+    """
+
+    def __init__(self, columns, order_numbers, offsets, sku, product_name, quantity, entry, entries, metadata,
+                 normalized_sku=None):
+        self.columns = columns
+        self.order_numbers = order_numbers
+        self._offsets = offsets
+        self._sku = sku
+        self._product_name = product_name
+        self._quantity = quantity
+        self._entry = entry
+        self._entries = entries
+        self._metadata = metadata
+        self._normalized_sku: Optional[List[str]] = normalized_sku
+        self._order_pos = {order: i for i, order in enumerate(order_numbers)}
+
+        # Derived aggregates, computed on first use (store never changes)
+        self._order_quantities: Optional[Dict[Any, float]] = None
+        self._courier_summary: Optional[List[Tuple[Any, int, float]]] = None
+        self._sku_summary: Optional[List[Tuple[Any, Any, float]]] = None
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_dataframe(cls, df) -> 'SessionStore':
+        """
+        Build a store from a packing-list DataFrame (legacy callers / tests).
+
+        Cell values are kept as-is; columns other than the standard ones are
+        treated as per-order entry fields.
+        """
+        builder = SessionStoreBuilder()
+        if df is None or len(df.columns) == 0:
+            return builder.build(columns=[] if df is None else list(df.columns))
+
+        columns = list(df.columns)
+        data = df.to_dict('list')
+        n = len(df)
+        missing = [None] * n
+        orders = data.get('Order_Number', missing)
+        skus = data.get('SKU', missing)
+        products = data.get('Product_Name', missing)
+        quantities = data.get('Quantity', missing)
+        extra_columns = [c for c in columns if c not in STANDARD_COLUMNS]
+        extra_values = [data[c] for c in extra_columns]
+
+        for i in range(n):
+            entry_id = builder.add_entry({c: values[i] for c, values in zip(extra_columns, extra_values)})
+            builder.add_line(orders[i], skus[i], products[i], quantities[i], entry_id)
+        return builder.build(columns=columns)
+
+    def to_compiled(self) -> Dict[str, Any]:
+        """
+        Columnar, JSON-serialisable form of the store (see packing_list_cache).
+
+        Entry field-name tuples are written once each; lines keep entry ids.
+        """
+        schema_ids: Dict[Tuple[str, ...], int] = {}
+        entries = []
+        for schema, values in self._entries:
+            schema_id = schema_ids.setdefault(schema, len(schema_ids))
+            entries.append([schema_id, list(values)])
+        return {
+            'columns': list(self.columns),
+            'order_numbers': list(self.order_numbers),
+            'offsets': list(self._offsets),
+            'sku': self._sku,
+            'product_name': self._product_name,
+            'quantity': self._quantity,
+            'entry': list(self._entry),
+            'schemas': [list(schema) for schema in schema_ids],
+            'entries': entries,
+            'metadata': [
+                None if self._metadata.get(order) is None else list(self._metadata[order])
+                for order in self.order_numbers
+            ],
+            'normalized_sku': self._normalized_sku,
+        }
+
+    @classmethod
+    def from_compiled(cls, data: Dict[str, Any]) -> 'SessionStore':
+        """
+        Rebuild a store from to_compiled() output.
+
+        Raises:
+            KeyError, TypeError, ValueError: If the data is malformed.
+        """
+        order_numbers = [_intern(o) for o in data['order_numbers']]
+        offsets = array('l', data['offsets'])
+        if len(offsets) != len(order_numbers) + 1:
+            raise ValueError("offsets do not match order count")
+        total = offsets[-1]
+        columns = [data[name] for name in ('sku', 'product_name', 'quantity', 'entry')]
+        if any(len(column) != total for column in columns):
+            raise ValueError("line columns have inconsistent lengths")
+
+        schemas = [tuple(_intern(name) for name in schema) for schema in data['schemas']]
+        entries = [(schemas[schema_id], tuple(_intern(v) for v in values))
+                   for schema_id, values in data['entries']]
+        metadata = {}
+        for order, values in zip(order_numbers, data['metadata']):
+            if values is not None:
+                values = list(values)
+                values[3] = tuple(values[3])  # tags
+                values[6] = tuple(values[6])  # internal_tags
+                metadata[order] = tuple(values)
+
+        normalized_sku = data.get('normalized_sku')
+        if normalized_sku is not None:
+            if len(normalized_sku) != total:
+                raise ValueError("normalized_sku does not match line count")
+            normalized_sku = [_intern(v) for v in normalized_sku]
+
+        return cls(
+            columns=list(data['columns']),
+            order_numbers=order_numbers,
+            offsets=offsets,
+            sku=[_intern(v) for v in data['sku']],
+            product_name=[_intern(v) for v in data['product_name']],
+            quantity=[_intern(v) for v in data['quantity']],
+            entry=array('l', data['entry']),
+            entries=entries,
+            metadata=metadata,
+            normalized_sku=normalized_sku,
+        )
+
+    # ------------------------------------------------------------------
+    # Orders and lines
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.order_numbers)
+
+    def has_order(self, order_number: Any) -> bool:
+        return order_number in self._order_pos
+
+    @property
+    def total_lines(self) -> int:
+        return len(self._sku)
+
+    def line_range(self, order_number: Any) -> range:
+        """Indices of the order's lines in the column lists (empty if unknown)."""
+        pos = self._order_pos.get(order_number)
+        if pos is None:
+            return range(0)
+        return range(self._offsets[pos], self._offsets[pos + 1])
+
+    def iter_lines(self, order_number: Any) -> Iterator[Tuple[Any, Any, Any]]:
+        """Yield (sku, product_name, quantity) for each line of an order."""
+        for i in self.line_range(order_number):
+            yield self._sku[i], self._product_name[i], self._quantity[i]
+
+    def line(self, index: int) -> Tuple[Any, Any, Any]:
+        """(sku, product_name, quantity) of one line by its column index (see line_range)."""
+        return self._sku[index], self._product_name[index], self._quantity[index]
+
+    def normalize_skus(self, normalize: Callable[[Any], str]) -> None:
+        """
+        Compute the normalized SKU of every line once (no-op if already present).
+
+        Args:
+            normalize: SKU normalisation function (PackerLogic._normalize_sku)
+        """
+        if self._normalized_sku is not None:
+            return
+        memo: Dict[Any, str] = {}
+        result = []
+        for sku in self._sku:
+            try:
+                value = memo.get(sku)
+            except TypeError:  # unhashable cell
+                value = None
+            if value is None:
+                value = _intern(normalize(sku))
+                try:
+                    memo[sku] = value
+                except TypeError:
+                    pass
+            result.append(value)
+        self._normalized_sku = result
+
+    def normalized_skus(self, order_number: Any) -> Optional[List[str]]:
+        """Normalized SKUs of an order's lines, or None if not computed."""
+        if self._normalized_sku is None:
+            return None
+        lines = self.line_range(order_number)
+        return self._normalized_sku[lines.start:lines.stop]
+
+    def _entry_field(self, entry_id: int, column: str, default: Any = None) -> Any:
+        schema, values = self._entries[entry_id]
+        try:
+            return values[schema.index(column)]
+        except ValueError:
+            return default
+
+    def courier(self, order_number: Any, default: str = 'N/A') -> Any:
+        """Courier of the order's first line."""
+        lines = self.line_range(order_number)
+        if not lines:
+            return default
+        return self._entry_field(self._entry[lines.start], 'Courier', default)
+
+    def items(self, order_number: Any) -> List[Dict[str, Any]]:
+        """Rebuild the order's lines as packing-list row dicts (DataFrame column names)."""
+        has = set(self.columns).__contains__
+        records = []
+        for i in self.line_range(order_number):
+            record = {}
+            if has('Order_Number'):
+                record['Order_Number'] = order_number
+            if has('SKU'):
+                record['SKU'] = self._sku[i]
+            if has('Product_Name'):
+                record['Product_Name'] = self._product_name[i]
+            if has('Quantity'):
+                record['Quantity'] = self._quantity[i]
+            schema, values = self._entries[self._entry[i]]
+            record.update(zip(schema, values))
+            records.append(record)
+        return records
+
+    def metadata(self, order_number: Any) -> Dict[str, Any]:
+        """Packer Mode metadata dict for an order (fresh dict, lists copied)."""
+        values = self._metadata.get(order_number)
+        if values is None:
+            values = build_order_metadata({})
+        metadata = dict(zip(METADATA_FIELDS, values))
+        metadata['tags'] = list(metadata['tags'])
+        metadata['internal_tags'] = list(metadata['internal_tags'])
+        return metadata
+
+    # ------------------------------------------------------------------
+    # Aggregates (cached)
+    # ------------------------------------------------------------------
+
+    def order_quantities(self) -> Dict[Any, float]:
+        """Order number -> sum of numeric quantities of its lines."""
+        if self._order_quantities is None:
+            quantity = self._quantity
+            offsets = self._offsets
+            result = {}
+            for pos, order in enumerate(self.order_numbers):
+                total = 0.0
+                for i in range(offsets[pos], offsets[pos + 1]):
+                    number = to_number(quantity[i])
+                    if number is not None:
+                        total += number
+                result[order] = total
+            self._order_quantities = result
+        return self._order_quantities
+
+    def unique_sku_count(self) -> int:
+        if 'SKU' not in self.columns:
+            return 0
+        return len({sku for sku in self._sku if sku is not None and sku == sku})
+
+    def courier_summary(self) -> List[Tuple[Any, int, float]]:
+        """(courier, order count, total quantity) per courier, sorted by courier."""
+        if self._courier_summary is None:
+            orders_by_courier: Dict[Any, set] = {}
+            qty_by_courier: Dict[Any, float] = {}
+            for pos, order in enumerate(self.order_numbers):
+                for i in range(self._offsets[pos], self._offsets[pos + 1]):
+                    courier = self._entry_field(self._entry[i], 'Courier')
+                    if courier is None or courier != courier:
+                        continue
+                    orders_by_courier.setdefault(courier, set()).add(order)
+                    number = to_number(self._quantity[i])
+                    qty_by_courier[courier] = qty_by_courier.get(courier, 0.0) + (number or 0.0)
+            self._courier_summary = [
+                (courier, len(orders_by_courier[courier]), qty_by_courier[courier])
+                for courier in sorted(orders_by_courier, key=str)
+            ]
+        return self._courier_summary
+
+    def sku_summary(self) -> List[Tuple[Any, Any, float]]:
+        """(sku, product_name, total quantity) per SKU/product pair, sorted."""
+        if self._sku_summary is None:
+            totals: Dict[Tuple[Any, Any], float] = {}
+            for sku, product, qty in zip(self._sku, self._product_name, self._quantity):
+                if sku is None or product is None or sku != sku or product != product:
+                    continue
+                number = to_number(qty)
+                totals[(sku, product)] = totals.get((sku, product), 0.0) + (number or 0.0)
+            self._sku_summary = [
+                (sku, product, total)
+                for (sku, product), total in sorted(totals.items(), key=lambda kv: (str(kv[0][0]), str(kv[0][1])))
+            ]
+        return self._sku_summary
+
+    def sku_quantities(self, order_numbers) -> Dict[Any, float]:
+        """SKU -> sum of numeric quantities across the given orders."""
+        totals: Dict[Any, float] = {}
+        for order in order_numbers:
+            for i in self.line_range(order):
+                number = to_number(self._quantity[i])
+                if number is not None:
+                    sku = self._sku[i]
+                    totals[sku] = totals.get(sku, 0.0) + number
+        return totals
+
+    # ------------------------------------------------------------------
+    # Views
+    # ------------------------------------------------------------------
+
+    def to_dataframe(self):
+        """
+        Materialise the packing list as a new DataFrame.
+
+        Built on every call and not cached — use for export, not per scan.
+        """
+        import pandas as pd
+
+        counts = [self._offsets[p + 1] - self._offsets[p] for p in range(len(self.order_numbers))]
+        standard = {
+            'Order_Number': [order for order, count in zip(self.order_numbers, counts) for _ in range(count)],
+            'SKU': self._sku,
+            'Product_Name': self._product_name,
+            'Quantity': self._quantity,
+        }
+        data = {}
+        for column in self.columns:
+            if column in standard:
+                data[column] = list(standard[column])
+            else:
+                per_entry = [self._entry_field(e, column, float('nan')) for e in range(len(self._entries))]
+                data[column] = [per_entry[e] for e in self._entry]
+        return pd.DataFrame(data, columns=self.columns)
+
+
+class OrdersView(Mapping):
+    """
+    Read-only orders_data mapping backed by a SessionStore.
+
+    view[order] returns {'items': [...], 'metadata': {...}} like the dict that
+    used to be stored per order. The last entry built is cached, so repeated
+    lookups of the order being packed do not rebuild its rows.
+    """
+
+    def __init__(self, store: SessionStore):
+        self.store = store
+        self._cached_order = None
+        self._cached_entry: Optional[Dict[str, Any]] = None
+
+    def __getitem__(self, order_number):
+        if self._cached_entry is not None and order_number == self._cached_order:
+            return self._cached_entry
+        if not self.store.has_order(order_number):
+            raise KeyError(order_number)
+        entry = {
+            'items': self.store.items(order_number),
+            'metadata': self.store.metadata(order_number),
+        }
+        self._cached_order = order_number
+        self._cached_entry = entry
+        return entry
+
+    def __contains__(self, order_number) -> bool:
+        return self.store.has_order(order_number)
+
+    def __iter__(self):
+        return iter(self.store.order_numbers)
+
+    def __len__(self) -> int:
+        return len(self.store)
@@ -0,0 +1,197 @@
+"""
+Append-only scan journal for packing_state.json.
+
+Rewriting the whole packing_state.json on every scan gets more expensive as the
+session grows: the file carries every completed order's per-item scan records,
+so late in a large session each scan pushed hundreds of KB over the network
+share. In journaled mode each hot-path event (scan, cancel, extra, skip, order
+start, order complete) is instead appended as one small JSON line to
+packing_state.journal next to the state file. A full snapshot is only written
+at checkpoints (order completion, every N events, session end).
+
+Recovery = latest snapshot + replay of the journal records written after it.
+
+Record format (one JSON object per line)::
+
+    {"seq": 42, "event": "scan", "at": "2026-01-10T14:35:12+02:00",
+     "order_number": "ORDER-001", "order_state": [...], "timing": {...} | null,
+     "current_extras": {...}, "skipped_orders": [...], "skipped_orders_timing": {...},
+     "completed": {...}}            # only on "complete" events
+
+Records are order-level and last-writer-wins: each one carries the full item
+state of the order it touches (not a delta), so replaying a record twice or
+replaying a record the snapshot already contains is harmless.
+
+Every snapshot stores the seq of the last journal record it covers
+("journal_seq"). After a snapshot lands, the journal is compacted down to the
+records newer than that seq — usually an empty file.
+
+Threading: encode() runs on the main thread (it serialises the live state, so
+the caller can keep mutating it); write_lines() and compact() run on the
+AsyncStateWriter thread.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+JOURNAL_FILE_NAME = "packing_state.journal"
+
+# Hot-path events between two automatic snapshots
+DEFAULT_SNAPSHOT_INTERVAL = 200
+
+
+class StateJournal:
+    """
+    Append-only journal of packing events for one work directory.
+
+    Attributes:
+        path (Path): Location of the journal file.
+        seq (int): Seq of the last record handed out by encode().
+        events_since_snapshot (int): Records encoded since the last snapshot
+            was scheduled (see mark_snapshot()).
+        snapshot_interval (int): Number of events after which PackerLogic
+            schedules a compaction snapshot.
+    """
+
+    def __init__(self, path: Path, snapshot_interval: int = DEFAULT_SNAPSHOT_INTERVAL):
+        self.path = Path(path)
+        self.snapshot_interval = snapshot_interval
+        self.seq = 0
+        self.events_since_snapshot = 0
+        # Highest seq appended to disk by this process (writer thread only)
+        self._written_seq = 0
+
+    # ------------------------------------------------------------------
+    # Main thread
+    # ------------------------------------------------------------------
+
+    def encode(self, event: str, record: Dict[str, Any]) -> str:
+        """
+        Assign the next seq to record and serialise it to one journal line.
+
+        Args:
+            event: Event name ("start", "scan", "cancel", "extra", "skip", ...)
+            record: Event payload (see module docstring)
+
+        Returns:
+            str: The encoded line, including the trailing newline.
+        """
+        self.seq += 1
+        self.events_since_snapshot += 1
+        line = json.dumps({"seq": self.seq, "event": event, **record}, ensure_ascii=False)
+        return line + "\n"
+
+    def snapshot_due(self) -> bool:
+        """True when enough events accumulated to warrant a compaction snapshot."""
+        return self.events_since_snapshot >= self.snapshot_interval
+
+    def mark_snapshot(self) -> int:
+        """
+        Note that a snapshot covering every record so far is being written.
+
+        Returns:
+            int: The seq to store in the snapshot as "journal_seq".
+        """
+        self.events_since_snapshot = 0
+        return self.seq
+
+    def read_records(self, after_seq: int = 0) -> List[Dict[str, Any]]:
+        """
+        Read journal records with seq > after_seq, in file order (used on load).
+
+        Also advances self.seq past every record on disk so new records never
+        reuse a seq.
+        """
+        records, max_seq = self._read(after_seq)
+        self.seq = max(self.seq, max_seq)
+        self._written_seq = max_seq
+        return records
+
+    def _read(self, after_seq: int) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Parse the journal file.
+
+        A torn last line (crash during append) or any other undecodable line
+        is skipped with a warning.
+
+        Returns:
+            Tuple of (records with seq > after_seq, highest seq in the file)
+        """
+        if not self.path.exists():
+            return [], 0
+
+        records = []
+        max_seq = 0
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line_no, line in enumerate(f, start=1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        logger.warning(f"Skipping unreadable journal line {line_no} in {self.path.name}")
+                        continue
+                    if not isinstance(record, dict) or not isinstance(record.get('seq'), int):
+                        logger.warning(f"Skipping malformed journal record at line {line_no}")
+                        continue
+                    max_seq = max(max_seq, record['seq'])
+                    if record['seq'] > after_seq:
+                        records.append(record)
+        except OSError as e:
+            logger.error(f"Could not read state journal {self.path}: {e}")
+            return [], 0
+
+        return records, max_seq
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+
+    def write_lines(self, lines: List[str]) -> None:
+        """Append encoded lines to the journal (AsyncStateWriter append_fn)."""
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write("".join(lines))
+            f.flush()
+        last = json.loads(lines[-1]).get('seq', 0)
+        self._written_seq = max(self._written_seq, last)
+
+    def compact(self, snapshot_seq: int) -> None:
+        """
+        Drop records already covered by a snapshot with journal_seq = snapshot_seq.
+
+        Must only be called after that snapshot was written successfully.
+        """
+        try:
+            if self._written_seq <= snapshot_seq:
+                # Common case: everything on disk is covered — truncate without reading
+                if self.path.exists():
+                    with open(self.path, 'w', encoding='utf-8'):
+                        pass
+                return
+
+            # Records newer than the snapshot were appended before it landed: keep them
+            newer, _ = self._read(snapshot_seq)
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for record in newer:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            # Not fatal: stale records are ignored on replay via journal_seq
+            logger.warning(f"State journal compaction failed: {e}")
+
+    def discard(self) -> None:
+        """Delete the journal file (e.g. when it cannot belong to the current snapshot)."""
+        try:
+            self.path.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"Could not remove state journal {self.path}: {e}")
+        self._written_seq = 0
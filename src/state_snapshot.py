@@ -0,0 +1,110 @@
+"""
+Copy-free state snapshots for AsyncStateWriter.
+
+AsyncStateWriter used to deep-copy the whole state dict on the UI thread for
+every scheduled write, including 'completed' with every finished order's
+per-item scan records — so the UI-thread cost of a save grew linearly with
+session progress.
+
+Completed-order records never change once the order is finished. They are
+encoded to JSON once, on the main thread, and the snapshot handed to the
+writer thread only references the encoded fragments:
+
+- CompletedOrdersEncoder keeps an append-only list of encoded records and
+  encodes only the records added since the previous snapshot.
+- EncodedList is an immutable view (shared list + length) of that list, so
+  taking a snapshot is O(1) no matter how many orders are completed.
+- dumps_state() serialises a state dict whose top-level values may be
+  EncodedList, splicing the fragments in verbatim.
+
+Only the small mutable parts of the state (in-progress orders, extras,
+current-order timing) still need copying on the main thread.
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+
+class EncodedList:
+    """
+    Immutable view of the first `length` fragments of an append-only list.
+
+    Each fragment is the JSON encoding of one list element. The underlying
+    list may keep growing on the main thread; the view never sees elements
+    appended after it was created.
+    """
+
+    __slots__ = ('_fragments', '_length')
+
+    def __init__(self, fragments: List[str], length: Optional[int] = None):
+        self._fragments = fragments
+        self._length = len(fragments) if length is None else length
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self):
+        fragments = self._fragments
+        for i in range(self._length):
+            yield fragments[i]
+
+    def to_list(self) -> List[Any]:
+        """Decode back to plain Python objects (tests / debugging)."""
+        return [json.loads(fragment) for fragment in self]
+
+
+class CompletedOrdersEncoder:
+    """
+    Incremental JSON encoder for the append-only completed-orders list.
+
+    encode() is O(new records): it remembers which list it encoded and how
+    far, and only re-encodes everything if the list was replaced or shrank
+    (e.g. state reloaded from disk, or tests assigning a new list).
+    """
+
+    def __init__(self):
+        self._source: Optional[List[Dict[str, Any]]] = None
+        self._fragments: List[str] = []
+
+    def encode(self, records: List[Dict[str, Any]]) -> EncodedList:
+        """Return an immutable encoded view of records, encoding only new entries."""
+        if records is not self._source or len(records) < len(self._fragments):
+            # Start a new list: views handed out earlier keep the old one
+            self._source = records
+            self._fragments = []
+
+        for record in records[len(self._fragments):]:
+            self._fragments.append(json.dumps(record, ensure_ascii=False))
+
+        return EncodedList(self._fragments, len(records))
+
+
+def dumps_state(state: Dict[str, Any], indent: int = 2) -> str:
+    """
+    Serialise a state dict to JSON text, splicing in EncodedList values.
+
+    Output is equivalent to json.dumps(state, indent=indent, ensure_ascii=False)
+    for readers; EncodedList elements are written one per line in compact form.
+    Only top-level values may be EncodedList.
+    """
+    encoded = {key: value for key, value in state.items() if isinstance(value, EncodedList)}
+    if not encoded:
+        return json.dumps(state, indent=indent, ensure_ascii=False)
+
+    placeholders = {key: f"\x00encoded:{key}\x00" for key in encoded}
+    text = json.dumps(
+        {key: placeholders.get(key, value) for key, value in state.items()},
+        indent=indent,
+        ensure_ascii=False,
+    )
+
+    item_indent = " " * (indent * 2)
+    for key, value in encoded.items():
+        if len(value):
+            body = ",\n".join(item_indent + fragment for fragment in value)
+            replacement = "[\n" + body + "\n" + " " * indent + "]"
+        else:
+            replacement = "[]"
+        text = text.replace(json.dumps(placeholders[key]), replacement, 1)
+
+    return text
@@ -0,0 +1,186 @@
+"""
+Wave packing: several orders open at one station, product scans routed to them.
+
+In single-order mode every order costs an order-barcode scan before its items,
+which dominates the time spent on small one- or two-item orders. In wave mode
+the packer opens up to max_orders orders at once (one per tote / slot) and then
+just scans products; each product scan goes to the open order that still needs
+that SKU.
+
+Wave keeps the open orders and an inverted index of normalized SKU -> open
+orders carrying that SKU (in slot order). Routing a scan looks up the few
+candidate orders and asks each order's OrderProgress whether it still needs a
+unit of the SKU (O(1) each), so cancels and force-confirms never need to
+update the index. When several orders need the SKU, tie_break decides:
+
+- "slot": lowest slot first (the order opened first);
+- "fewest_remaining": the order closest to completion, so totes free up sooner;
+- "most_remaining": the order with the most units left.
+
+Each open order's packing context (item state, progress index, timer, scan
+records, per-order counters, extras) lives in a WaveOrderContext. PackerLogic
+swaps the routed order's context into its current_order_* fields and runs the
+normal single-order code path, so state, timing and completed-order records
+are exactly what single-order mode produces.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from order_timer import OrderTimer
+from packing_progress import OrderProgress
+
+TIE_BREAK_SLOT = "slot"
+TIE_BREAK_FEWEST_REMAINING = "fewest_remaining"
+TIE_BREAK_MOST_REMAINING = "most_remaining"
+TIE_BREAK_MODES = (TIE_BREAK_SLOT, TIE_BREAK_FEWEST_REMAINING, TIE_BREAK_MOST_REMAINING)
+
+# Default number of open orders (totes) per wave
+DEFAULT_WAVE_SIZE = 6
+
+
+class WaveOrderContext:
+    """
+    Packing context of one open wave order.
+
+    Attributes mirror PackerLogic's current_order_* fields; they are only
+    authoritative while the order is parked (not the focused order).
+    """
+
+    def __init__(self, order_number: str, order_state: List[Dict[str, Any]], progress: OrderProgress):
+        self.order_number = order_number
+        self.slot = 0
+        self.order_state = order_state
+        self.progress = progress
+        self.timer = OrderTimer()
+        self.start_time: Optional[str] = None
+        self.items_scanned: List[Dict[str, Any]] = []
+        self.corrections = 0
+        self.extra_scan_count = 0
+        self.unknown_scan_count = 0
+        self.extra_items: Dict[str, int] = {}
+
+    def timing_block(self) -> Dict[str, Any]:
+        """Persisted form, same keys as the in_progress '_timing' block plus extras."""
+        return {
+            "current_order_start_time": self.start_time,
+            "items_scanned": self.items_scanned,
+            "corrections": self.corrections,
+            "extra_scan_count": self.extra_scan_count,
+            "unknown_scan_count": self.unknown_scan_count,
+            "extras": self.extra_items,
+        }
+
+    def restore_timing(self, timing: Dict[str, Any]) -> None:
+        """Inverse of timing_block() (resume after restart)."""
+        self.start_time = timing.get('current_order_start_time')
+        self.items_scanned = list(timing.get('items_scanned') or [])
+        self.corrections = timing.get('corrections', 0)
+        self.extra_scan_count = timing.get('extra_scan_count', 0)
+        self.unknown_scan_count = timing.get('unknown_scan_count', 0)
+        self.extra_items = dict(timing.get('extras') or {})
+        if self.start_time:
+            self.timer.resume(self.start_time)
+
+
+class Wave:
+    """
+    Open orders of a wave with the SKU -> orders routing index.
+
+    Attributes:
+        max_orders (int): Number of slots.
+        tie_break (str): One of TIE_BREAK_MODES.
+    """
+
+    def __init__(self, max_orders: int = DEFAULT_WAVE_SIZE, tie_break: str = TIE_BREAK_SLOT):
+        if max_orders < 1:
+            raise ValueError(f"Wave needs at least one slot, got {max_orders}")
+        if tie_break not in TIE_BREAK_MODES:
+            raise ValueError(f"Unknown wave tie-break '{tie_break}', expected one of {TIE_BREAK_MODES}")
+        self.max_orders = max_orders
+        self.tie_break = tie_break
+        self._orders: Dict[str, WaveOrderContext] = {}
+        # normalized SKU -> open orders carrying it, in slot order
+        self._sku_orders: Dict[str, List[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def __contains__(self, order_number) -> bool:
+        return order_number in self._orders
+
+    @property
+    def is_full(self) -> bool:
+        return len(self._orders) >= self.max_orders
+
+    def get(self, order_number: str) -> Optional[WaveOrderContext]:
+        return self._orders.get(order_number)
+
+    def contexts(self) -> List[WaveOrderContext]:
+        """Open orders sorted by slot."""
+        return sorted(self._orders.values(), key=lambda ctx: ctx.slot)
+
+    def add(self, context: WaveOrderContext, slot: Optional[int] = None) -> int:
+        """
+        Open an order in the lowest free slot (or the given one, on resume).
+
+        Returns:
+            int: Slot number (1-based).
+
+        Raises:
+            ValueError: If the wave is full or the order is already open.
+        """
+        if context.order_number in self._orders:
+            raise ValueError(f"Order {context.order_number} is already in the wave")
+        if self.is_full:
+            raise ValueError("Wave is full")
+        used = {ctx.slot for ctx in self._orders.values()}
+        if slot is None or slot < 1 or slot in used:
+            slot = next(n for n in range(1, self.max_orders + len(used) + 2) if n not in used)
+        context.slot = slot
+        self._orders[context.order_number] = context
+        for sku in context.progress.skus():
+            orders = self._sku_orders.setdefault(sku, [])
+            orders.append(context.order_number)
+            orders.sort(key=lambda o: self._orders[o].slot)
+        return slot
+
+    def remove(self, order_number: str) -> Optional[WaveOrderContext]:
+        """Close an order's slot (completed, skipped or wave ended)."""
+        context = self._orders.pop(order_number, None)
+        if context is None:
+            return None
+        for sku in context.progress.skus():
+            orders = self._sku_orders.get(sku)
+            if orders and order_number in orders:
+                orders.remove(order_number)
+                if not orders:
+                    del self._sku_orders[sku]
+        return context
+
+    def route(self, normalized_sku: str, focused: Optional[str] = None) -> Tuple[Optional[str], bool]:
+        """
+        Pick the open order a product scan belongs to.
+
+        Args:
+            normalized_sku: Scanned SKU after mapping + normalisation
+            focused: Order currently shown to the packer, preferred for extras
+
+        Returns:
+            (order_number, needs_unit): the chosen order and whether it still
+            needs a unit of the SKU. (None, False) if no open order carries it;
+            needs_unit False means every carrying order is already complete for
+            this SKU (the scan is an extra for the returned order).
+        """
+        candidates = self._sku_orders.get(normalized_sku)
+        if not candidates:
+            return None, False
+
+        needing = [o for o in candidates if self._orders[o].progress.next_open_item(normalized_sku) is not None]
+        if needing:
+            if self.tie_break == TIE_BREAK_FEWEST_REMAINING:
+                return min(needing, key=lambda o: self._orders[o].progress.remaining_total), True
+            if self.tie_break == TIE_BREAK_MOST_REMAINING:
+                return max(needing, key=lambda o: self._orders[o].progress.remaining_total), True
+            return needing[0], True
+
+        return (focused if focused in candidates else candidates[0]), False
@@ -8,6 +8,8 @@ from both the 'src' and 'shared' directories.
 import sys
 from pathlib import Path
 
+import pytest
+
 # Get the repository root directory (parent of tests directory)
 repo_root = Path(__file__).parent.parent
 
@@ -21,6 +23,15 @@ if str(src_dir) not in sys.path:
     sys.path.insert(0, str(src_dir))
 
 
+@pytest.fixture(autouse=True)
+def _clear_fs_metadata_cache():
+    """Start every test with an empty shared directory-listing cache."""
+    from fs_metadata_cache import clear_fs_cache
+    clear_fs_cache()
+    yield
+    clear_fs_cache()
+
+
 def create_v130_session_summary(
     session_id: str,
     client_id: str,
@@ -0,0 +1,99 @@
+"""
+Tests for the barcode thumbnail cache/loader and the PrintDialog preview grid.
+"""
+
+import os
+
+import pytest
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QColor, QImage
+
+from barcode_thumbnails import ThumbnailCache, ThumbnailLoader
+from print_dialog import PrintDialog
+
+
+def _label(path, color="black", width=1000):
+    image = QImage(width, 400, QImage.Format.Format_RGB32)
+    image.fill(QColor(color))
+    assert image.save(str(path))
+    return str(path)
+
+
+def test_cache_is_keyed_by_path_and_mtime(qapp, tmp_path):
+    label = _label(tmp_path / "1001.png")
+    cache = ThumbnailCache(tmp_path / "cache", width=100)
+
+    thumbnail = cache.load(label)
+    assert thumbnail.width() == 100
+    cached = list((tmp_path / "cache").iterdir())
+    assert len(cached) == 1
+
+    # Second load comes from the cache file, not the source
+    os.utime(cached[0])
+    assert cache.load(label).width() == 100
+    assert len(list((tmp_path / "cache").iterdir())) == 1
+
+    # Regenerated label: new mtime, new entry
+    _label(label, "white", width=1200)
+    stat = os.stat(label)
+    os.utime(label, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000))
+    assert cache.load(label).pixelColor(0, 0) == QColor("white")
+    assert len(list((tmp_path / "cache").iterdir())) == 2
+
+    assert cache.load(str(tmp_path / "missing.png")) is None
+
+
+def test_loader_delivers_on_owner_thread(qtbot, tmp_path):
+    label = _label(tmp_path / "1001.png")
+    loader = ThumbnailLoader(ThumbnailCache(tmp_path / "cache"))
+    with qtbot.waitSignal(loader.loaded) as blocker:
+        loader.request(label)
+        loader.request(label)  # already queued
+    path, image = blocker.args
+    assert path == label and not image.isNull()
+    assert not loader.is_pending(label)
+
+    with qtbot.waitSignal(loader.loaded) as blocker:
+        loader.request(str(tmp_path / "missing.png"))
+    assert blocker.args[1].isNull()
+    loader.shutdown()
+
+
+@pytest.fixture
+def orders(tmp_path):
+    return {f"#{n}": {'barcode_path': _label(tmp_path / f"{n}.png", width=300)} for n in range(200)}
+
+
+def test_print_dialog_loads_only_visible_labels(qtbot, tmp_path, orders):
+    dialog = PrintDialog(orders, cache_dir=tmp_path / "cache")
+    qtbot.addWidget(dialog)
+    requested = []
+    dialog.loader.loaded.connect(lambda path, _image: requested.append(path))
+
+    assert dialog.model.rowCount() == 200
+    assert dialog.model.thumbnail(0) is None  # nothing decoded before the view paints
+
+    dialog.show()
+    qtbot.waitExposed(dialog)
+    qtbot.waitUntil(lambda: dialog.model.thumbnail(0) is not None)
+    # Only the first screen of rows asked for thumbnails
+    assert dialog.model.thumbnail(199) is None
+    assert len(set(requested)) < 50
+    dialog.done(0)
+
+
+def test_print_dialog_selection(qtbot, tmp_path, orders):
+    dialog = PrintDialog(orders, cache_dir=tmp_path / "cache")
+    qtbot.addWidget(dialog)
+    model = dialog.model
+    assert len(model.checked_orders()) == 200
+
+    dialog.deselect_all()
+    assert model.checked_orders() == []
+    assert model.setData(model.index(5), Qt.CheckState.Checked.value, Qt.ItemDataRole.CheckStateRole)
+    assert model.checked_orders() == ["#5"]
+    assert model.is_checked("#5") and not model.is_checked("#6")
+
+    dialog.select_all()
+    assert len(model.checked_orders()) == 200
+    dialog.done(0)
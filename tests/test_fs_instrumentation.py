@@ -0,0 +1,241 @@
+"""
+Unit tests for src/fs_instrumentation.py — file-system round-trip counts per operation scope.
+
+Tests cover:
+- Disabled by default: nothing wrapped, fs_operation() yields None
+- open / stat / scandir / rename / unlink / mkdir counted inside a scope only
+- Bytes read / written
+- Nested scopes credit their parent
+- attach_fs_scope() counts a worker thread's operations in the caller's scope
+- Decorator use
+- One structured summary record logged per scope
+- disable restores the original functions
+"""
+
+import builtins
+import io
+import json
+import logging
+import os
+import shutil
+import threading
+from pathlib import Path
+
+import pytest
+
+import fs_instrumentation
+from fs_instrumentation import (
+    FSScope,
+    attach_fs_scope,
+    current_fs_scope,
+    disable_fs_instrumentation,
+    enable_fs_instrumentation,
+    fs_operation,
+    is_fs_instrumentation_enabled,
+)
+
+
+@pytest.fixture
+def enabled():
+    enable_fs_instrumentation()
+    yield
+    disable_fs_instrumentation()
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def log_records():
+    handler = _ListHandler()
+    fs_instrumentation.logger.addHandler(handler)
+    yield handler.records
+    fs_instrumentation.logger.removeHandler(handler)
+
+
+# ---------------------------------------------------------------------------
+# Enable / disable
+# ---------------------------------------------------------------------------
+
+class TestEnableDisable:
+
+    def test_disabled_by_default(self):
+        assert not is_fs_instrumentation_enabled()
+        assert not hasattr(os.stat, '__wrapped__')
+        with fs_operation("scan SKU") as scope:
+            assert scope is None
+            assert current_fs_scope() is None
+
+    def test_enable_wraps_and_disable_restores(self):
+        original_stat, original_open = os.stat, builtins.open
+        enable_fs_instrumentation()
+        try:
+            enable_fs_instrumentation()  # idempotent
+            assert os.stat.__wrapped__ is original_stat
+            assert builtins.open.__wrapped__ is original_open
+            assert io.open.__wrapped__ is original_open
+        finally:
+            disable_fs_instrumentation()
+        assert os.stat is original_stat
+        assert builtins.open is original_open
+        assert io.open is original_open
+        disable_fs_instrumentation()  # idempotent
+
+    def test_calls_outside_a_scope_are_not_counted(self, enabled, tmp_path):
+        os.stat(tmp_path)
+        with fs_operation("empty") as scope:
+            pass
+        assert scope.ops == {}
+
+
+# ---------------------------------------------------------------------------
+# Counting
+# ---------------------------------------------------------------------------
+
+class TestCounting:
+
+    def test_counts_each_operation(self, enabled, tmp_path):
+        src = tmp_path / "a.json"
+        src.write_text("{}")
+        with fs_operation("test") as scope:
+            src.exists()                         # stat
+            os.path.isdir(tmp_path)              # stat
+            list(tmp_path.iterdir())             # scandir (listdir)
+            with os.scandir(tmp_path) as it:     # scandir
+                list(it)
+            with open(src) as f:                 # open
+                f.read()
+            src.rename(tmp_path / "b.json")      # rename
+            os.replace(tmp_path / "b.json", tmp_path / "c.json")  # rename
+            (tmp_path / "d").mkdir()             # mkdir
+            (tmp_path / "c.json").unlink()       # unlink
+
+        assert scope.ops == {
+            'stat': 2, 'scandir': 2, 'open': 1, 'rename': 2, 'mkdir': 1, 'unlink': 1,
+        }
+        assert scope.total_ops == 9
+        assert set(scope.op_seconds) == set(scope.ops)
+
+    def test_shutil_move_counts_as_rename(self, enabled, tmp_path):
+        (tmp_path / "lock.tmp").write_text("x")
+        with fs_operation("test") as scope:
+            shutil.move(str(tmp_path / "lock.tmp"), str(tmp_path / ".session.lock"))
+        assert scope.ops.get('rename') == 1
+
+    def test_bytes_read_and_written(self, enabled, tmp_path):
+        src = tmp_path / "state.json"
+        src.write_text("x" * 100)
+        with fs_operation("test") as scope:
+            src.read_text()
+            (tmp_path / "out.json").write_text("y" * 40)
+        assert scope.bytes_read == 100
+        assert scope.bytes_written == 40
+
+    def test_atomic_write_credits_renamed_file(self, enabled, tmp_path):
+        import tempfile
+        with fs_operation("test") as scope:
+            with tempfile.NamedTemporaryFile(
+                "w", dir=tmp_path, delete=False, suffix=".tmp"
+            ) as tmp:
+                tmp.write("z" * 25)
+            os.replace(tmp.name, tmp_path / "packing_state.json")
+        assert scope.ops['open'] == 1          # os.open in tempfile; the fd reopen is free
+        assert scope.ops['rename'] == 1
+        assert scope.bytes_written == 25
+
+
+# ---------------------------------------------------------------------------
+# Scopes
+# ---------------------------------------------------------------------------
+
+class TestScopes:
+
+    def test_nested_scope_credits_parent(self, enabled, tmp_path):
+        with fs_operation("end session") as outer:
+            os.stat(tmp_path)
+            with fs_operation("save summary") as inner:
+                assert inner.parent is outer
+                assert current_fs_scope() is inner
+                os.stat(tmp_path)
+            assert current_fs_scope() is outer
+        assert inner.ops == {'stat': 1}
+        assert outer.ops == {'stat': 2}
+
+    def test_attach_counts_other_thread_in_scope(self, enabled, tmp_path):
+        def worker(scope):
+            with attach_fs_scope(scope):
+                os.stat(tmp_path)
+                os.listdir(tmp_path)
+
+        with fs_operation("resume") as scope:
+            thread = threading.Thread(target=worker, args=(current_fs_scope(),))
+            thread.start()
+            thread.join()
+        assert scope.ops == {'stat': 1, 'scandir': 1}
+
+    def test_other_threads_are_not_counted_without_attach(self, enabled, tmp_path):
+        with fs_operation("scan SKU") as scope:
+            thread = threading.Thread(target=os.stat, args=(tmp_path,))
+            thread.start()
+            thread.join()
+        assert scope.ops == {}
+
+    def test_attach_none_is_noop(self):
+        with attach_fs_scope(None) as scope:
+            assert scope is None
+
+    def test_decorator(self, enabled, tmp_path):
+        scopes = []
+
+        @fs_operation("scan SKU")
+        def on_scan():
+            scopes.append(current_fs_scope())
+            os.stat(tmp_path)
+
+        on_scan()
+        on_scan()
+        assert len(scopes) == 2 and scopes[0] is not scopes[1]
+        assert all(s.name == "scan SKU" and s.ops == {'stat': 1} for s in scopes)
+        assert current_fs_scope() is None
+
+
+# ---------------------------------------------------------------------------
+# Summary record
+# ---------------------------------------------------------------------------
+
+class TestSummary:
+
+    def test_one_structured_record_per_scope(self, enabled, log_records, tmp_path):
+        with fs_operation("open session browser"):
+            os.stat(tmp_path)
+            os.stat(tmp_path)
+
+        records = [r for r in log_records if hasattr(r, 'extra_data')]
+        assert len(records) == 1
+        data = records[0].extra_data
+        assert data['fs_scope'] == "open session browser"
+        assert data['ops'] == {'stat': 2}
+        assert data['total_ops'] == 2
+        assert set(data) == {
+            'fs_scope', 'ops', 'total_ops', 'op_ms', 'bytes_read', 'bytes_written', 'wall_ms'
+        }
+        json.dumps(data)  # serializable by the JSON formatter
+        assert "open session browser" in records[0].getMessage()
+
+    def test_summary_logged_when_scope_raises(self, enabled, log_records, tmp_path):
+        with pytest.raises(RuntimeError):
+            with fs_operation("end session"):
+                os.stat(tmp_path)
+                raise RuntimeError("write failed")
+        records = [r for r in log_records if hasattr(r, 'extra_data')]
+        assert records[0].extra_data['ops'] == {'stat': 1}
+
+    def test_summary_of_unclosed_scope(self):
+        scope = FSScope("manual")
+        assert scope.summary()['total_ops'] == 0
@@ -0,0 +1,430 @@
+"""
+Unit tests for src/fs_metadata_cache.py — directory-listing and negative-lookup cache.
+
+Tests cover:
+- exists() / is_dir() / is_file() / scan_dir() answered from one listing
+- Revalidation by directory mtime (unchanged → no rescan, changed → rescan)
+- Racy listings (scanned in the directory's mtime tick) are rescanned
+- Listings trusted for the validate interval, or for the rest of a scan pass
+- A registry scan costs fewer stat/scandir calls than plain Path.exists() probes
+- Negative lookups of missing directories and their TTL
+- invalidate() drops the path and its parent
+- Case-insensitive lookup where the platform folds case
+- LRU eviction at max_dirs
+- Convenience module-level functions
+"""
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+import fs_metadata_cache
+from fs_metadata_cache import (
+    FSEntry,
+    FSMetadataCache,
+    fs_scan_pass,
+    scan_dir,
+    fs_exists,
+    fs_is_dir,
+    fs_is_file,
+    invalidate_fs_cache,
+    clear_fs_cache,
+    get_fs_cache_stats,
+)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def settle(path: Path, age: float = 60.0):
+    """Back-date a directory's mtime so its listing is not racy."""
+    when = time.time() - age
+    os.utime(path, (when, when))
+
+
+class FakeClock:
+    """Stand-in for the time module with a monotonic clock the test advances."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def time_ns(self):
+        return time.time_ns()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(fs_metadata_cache, "time", fake)
+    return fake
+
+
+@pytest.fixture
+def session_dir(tmp_path):
+    """A directory with one file and one subdirectory, mtime settled."""
+    d = tmp_path / "session"
+    d.mkdir()
+    (d / "session_info.json").write_text("{}")
+    (d / "packing").mkdir()
+    settle(d)
+    return d
+
+
+# ---------------------------------------------------------------------------
+# Probes
+# ---------------------------------------------------------------------------
+
+class TestFSMetadataCacheProbes:
+
+    def test_probes_match_filesystem(self, session_dir):
+        cache = FSMetadataCache()
+        assert cache.exists(session_dir / "session_info.json")
+        assert cache.is_file(session_dir / "session_info.json")
+        assert not cache.is_dir(session_dir / "session_info.json")
+        assert cache.is_dir(session_dir / "packing")
+        assert not cache.is_file(session_dir / "packing")
+        assert not cache.exists(session_dir / ".session.lock")
+
+    def test_scan_dir_lists_entries_with_types(self, session_dir):
+        cache = FSMetadataCache()
+        entries = {e.name: e for e in cache.scan_dir(session_dir)}
+        assert set(entries) == {"session_info.json", "packing"}
+        assert entries["packing"].is_dir
+        assert not entries["session_info.json"].is_dir
+        assert entries["packing"].path == os.path.join(str(session_dir), "packing")
+
+    def test_probes_in_one_directory_share_one_scan(self, session_dir):
+        cache = FSMetadataCache()
+        cache.exists(session_dir / "session_info.json")
+        cache.exists(session_dir / "packing")
+        cache.exists(session_dir / ".session.lock")
+        stats = cache.stats()
+        assert stats["scans"] == 1
+        assert stats["hits"] == 2  # within the validate interval: no I/O
+
+    def test_scan_dir_of_missing_directory_is_empty(self, tmp_path):
+        cache = FSMetadataCache()
+        assert cache.scan_dir(tmp_path / "nope") == []
+
+    def test_file_is_not_listed_as_directory(self, session_dir):
+        cache = FSMetadataCache()
+        assert cache.scan_dir(session_dir / "session_info.json") == []
+        assert not cache.exists(session_dir / "session_info.json" / "child")
+
+
+# ---------------------------------------------------------------------------
+# Revalidation
+# ---------------------------------------------------------------------------
+
+class TestFSMetadataCacheRevalidation:
+    """mtime revalidation, with validate_interval=0 so every lookup revalidates."""
+
+    def test_unchanged_directory_is_not_rescanned(self, session_dir):
+        cache = FSMetadataCache(validate_interval=0.0)
+        cache.scan_dir(session_dir)
+        cache.scan_dir(session_dir)
+        stats = cache.stats()
+        assert stats["scans"] == 1
+        assert stats["revalidations"] == 1
+
+    def test_added_entry_is_seen_after_mtime_change(self, session_dir):
+        cache = FSMetadataCache(validate_interval=0.0)
+        assert not cache.exists(session_dir / "session_summary.json")
+
+        (session_dir / "session_summary.json").write_text("{}")
+        settle(session_dir, age=30.0)  # a later, still settled mtime
+
+        assert cache.exists(session_dir / "session_summary.json")
+        assert cache.stats()["scans"] == 2
+
+    def test_removed_entry_is_gone_after_mtime_change(self, session_dir):
+        cache = FSMetadataCache(validate_interval=0.0)
+        assert cache.exists(session_dir / "session_info.json")
+
+        (session_dir / "session_info.json").unlink()
+        settle(session_dir, age=30.0)
+
+        assert not cache.exists(session_dir / "session_info.json")
+
+    def test_racy_listing_is_rescanned(self, tmp_path):
+        """A listing read right after a change is not trusted on its mtime alone."""
+        cache = FSMetadataCache(validate_interval=0.0)
+        assert cache.scan_dir(tmp_path) == []  # mtime is "now": racy
+
+        (tmp_path / "session_001").mkdir()
+        assert cache.exists(tmp_path / "session_001")
+        assert cache.stats()["scans"] == 2
+
+    def test_validate_interval_trusts_listing_without_stat(self, session_dir, clock):
+        cache = FSMetadataCache(validate_interval=10.0)
+        cache.scan_dir(session_dir)
+        (session_dir / "new.json").write_text("{}")
+        settle(session_dir, age=30.0)
+
+        assert not cache.exists(session_dir / "new.json")  # within the interval
+        assert cache.stats()["hits"] == 1
+
+        clock.now += 11.0
+        assert cache.exists(session_dir / "new.json")
+
+    def test_racy_listing_is_trusted_within_interval(self, tmp_path, clock):
+        """A busy directory is rescanned once per interval, not on every probe."""
+        cache = FSMetadataCache(validate_interval=2.0)
+        (tmp_path / ".session.lock").write_text("{}")  # mtime is "now": racy
+        for _ in range(5):
+            assert cache.exists(tmp_path / ".session.lock")
+        assert cache.stats()["scans"] == 1
+
+        clock.now += 3.0
+        assert cache.exists(tmp_path / ".session.lock")
+        assert cache.stats()["scans"] == 2
+
+
+# ---------------------------------------------------------------------------
+# Scan passes
+# ---------------------------------------------------------------------------
+
+class TestFSScanPass:
+
+    def test_each_pass_revalidates_once(self, session_dir, clock):
+        cache = FSMetadataCache(validate_interval=60.0)
+        with fs_scan_pass():
+            for _ in range(3):
+                cache.exists(session_dir / "session_info.json")
+        assert (cache.stats()["scans"], cache.stats()["hits"]) == (1, 2)
+
+        # A new pass ignores the interval and sees another PC's new session
+        (session_dir / "session_summary.json").write_text("{}")
+        settle(session_dir, age=30.0)
+        with fs_scan_pass():
+            assert cache.exists(session_dir / "session_summary.json")
+            assert cache.exists(session_dir / "session_info.json")
+        stats = cache.stats()
+        assert (stats["scans"], stats["hits"]) == (2, 3)
+
+    def test_nested_pass_joins_outer(self, session_dir):
+        cache = FSMetadataCache(validate_interval=0.0)
+        with fs_scan_pass() as outer:
+            cache.scan_dir(session_dir)
+            with fs_scan_pass() as inner:
+                assert inner == outer
+                cache.scan_dir(session_dir)
+        assert cache.stats()["hits"] == 1
+
+    def test_decorator(self, session_dir):
+        cache = FSMetadataCache(validate_interval=0.0)
+
+        @fs_scan_pass()
+        def scan():
+            return [cache.exists(session_dir / n) for n in ("packing", "nope", "session_info.json")]
+
+        assert scan() == [True, False, True]
+        assert scan() == [True, False, True]
+        stats = cache.stats()
+        assert (stats["scans"], stats["revalidations"], stats["hits"]) == (1, 1, 4)
+
+
+# ---------------------------------------------------------------------------
+# Round trips of a registry scan
+# ---------------------------------------------------------------------------
+
+class _RoundTrips:
+    """Counts os.stat / os.scandir / os.listdir calls (each one an SMB round trip)."""
+
+    def __init__(self, monkeypatch):
+        self.calls = 0
+        for name in ("stat", "scandir", "listdir"):
+            monkeypatch.setattr(os, name, self._counted(getattr(os, name)))
+
+    def _counted(self, original):
+        def counted(*args, **kwargs):
+            self.calls += 1
+            return original(*args, **kwargs)
+        return counted
+
+
+def _client_tree(root: Path, sessions: int = 10, lists: int = 3) -> Path:
+    import json
+    client_dir = root / "Sessions" / "CLIENT_M"
+    for s in range(sessions):
+        session = client_dir / f"2025-01-{s + 1:02d}_1"
+        (session / "packing_lists").mkdir(parents=True)
+        (session / "session_info.json").write_text("{}")
+        for n in range(lists):
+            (session / "packing_lists" / f"List{n}.json").write_text(
+                json.dumps({"list_name": f"List{n}", "orders": []}))
+            work_dir = session / "packing" / f"List{n}"
+            work_dir.mkdir(parents=True)
+            (work_dir / "packing_state.json").write_text(
+                json.dumps({"data": {"in_progress": {}, "completed_orders": []}}))
+    for path in sorted(client_dir.rglob("*"), reverse=True):
+        settle(path)
+    return client_dir
+
+
+class TestRegistryScanRoundTrips:
+
+    def _scan_calls(self, tmp_path, monkeypatch):
+        from unittest.mock import Mock
+        from session_registry_manager import SessionRegistryManager
+
+        profile_manager = Mock()
+        profile_manager.get_sessions_root.return_value = tmp_path / "Sessions"
+        registry = SessionRegistryManager(profile_manager)
+        counter = _RoundTrips(monkeypatch)
+        registry.build_from_scan("M")
+        registry.build_from_scan("M")  # a refresh a moment later
+        return counter.calls
+
+    def test_cached_scan_costs_fewer_round_trips_than_path_exists(self, tmp_path, monkeypatch):
+        import session_registry_manager
+        _client_tree(tmp_path)
+
+        with monkeypatch.context() as m:
+            # The probes as they were before the cache
+            m.setattr(session_registry_manager, "fs_exists", lambda p: Path(p).exists())
+            m.setattr(session_registry_manager, "fs_is_dir", lambda p: Path(p).is_dir())
+            m.setattr(session_registry_manager, "scan_dir", lambda d: [
+                FSEntry(e.name, e.path, e.is_dir()) for e in os.scandir(d)
+            ])
+            uncached = self._scan_calls(tmp_path, m)
+
+        clear_fs_cache()
+        cached = self._scan_calls(tmp_path, monkeypatch)
+
+        print(f"\nregistry scan x2: {uncached} round trips uncached, {cached} cached")
+        assert cached < uncached / 2
+
+
+# ---------------------------------------------------------------------------
+# Negative lookups
+# ---------------------------------------------------------------------------
+
+class TestFSMetadataCacheNegative:
+
+    def test_missing_directory_is_remembered(self, tmp_path, clock):
+        cache = FSMetadataCache(negative_ttl=5.0)
+        missing = tmp_path / "packing"
+        assert not cache.exists(missing / "session_summary.json")
+        assert not cache.exists(missing / "packing_state.json")
+        stats = cache.stats()
+        assert stats["missing"] == 1
+        assert stats["negative_hits"] == 1
+
+    def test_negative_entry_expires_after_ttl(self, tmp_path, clock):
+        cache = FSMetadataCache(negative_ttl=5.0)
+        packing = tmp_path / "packing"
+        assert cache.scan_dir(packing) == []
+
+        packing.mkdir()
+        (packing / "list").mkdir()
+        clock.now += 4.0
+        assert cache.scan_dir(packing) == []  # still remembered as missing
+
+        clock.now += 2.0
+        assert [e.name for e in cache.scan_dir(packing)] == ["list"]
+
+    def test_invalidate_clears_negative_entry(self, tmp_path, clock):
+        cache = FSMetadataCache(negative_ttl=5.0)
+        packing = tmp_path / "packing"
+        assert cache.scan_dir(packing) == []
+
+        packing.mkdir()
+        (packing / "list").mkdir()
+        cache.invalidate(packing)
+        assert [e.name for e in cache.scan_dir(packing)] == ["list"]
+
+
+# ---------------------------------------------------------------------------
+# Maintenance
+# ---------------------------------------------------------------------------
+
+class TestFSMetadataCacheMaintenance:
+
+    def test_invalidate_drops_path_and_parent(self, session_dir):
+        cache = FSMetadataCache()
+        packing = session_dir / "packing"
+        cache.scan_dir(session_dir)
+        cache.scan_dir(packing)
+        assert cache.stats()["directories"] == 2
+
+        cache.invalidate(packing)
+        assert cache.stats()["directories"] == 0
+
+    def test_invalidate_leaves_unrelated_listings(self, session_dir, tmp_path):
+        other = tmp_path / "other"
+        other.mkdir()
+        cache = FSMetadataCache()
+        cache.scan_dir(session_dir / "packing")
+        cache.scan_dir(other)
+
+        cache.invalidate(session_dir / "packing")
+        assert cache.stats()["directories"] == 1
+
+    def test_case_insensitive_lookup(self, session_dir, monkeypatch):
+        monkeypatch.setattr(fs_metadata_cache, "_normcase", str.lower)
+        cache = FSMetadataCache()
+        assert cache.exists(session_dir / "SESSION_INFO.JSON")
+        assert cache.is_dir(session_dir / "Packing")
+        # Entries keep the name as it is on disk
+        assert {e.name for e in cache.scan_dir(session_dir)} == {"session_info.json", "packing"}
+
+    def test_lru_eviction_at_max_dirs(self, tmp_path):
+        dirs = []
+        for i in range(3):
+            d = tmp_path / f"d{i}"
+            d.mkdir()
+            settle(d)
+            dirs.append(d)
+
+        cache = FSMetadataCache(max_dirs=2)
+        cache.scan_dir(dirs[0])
+        cache.scan_dir(dirs[1])
+        cache.scan_dir(dirs[0])  # d0 becomes most recently used
+        cache.scan_dir(dirs[2])  # evicts d1
+
+        stats = cache.stats()
+        assert stats["directories"] == 2
+        assert stats["evictions"] == 1
+
+        cache.scan_dir(dirs[0])
+        assert cache.stats()["scans"] == 3  # d0 still cached
+        cache.scan_dir(dirs[1])
+        assert cache.stats()["scans"] == 4  # d1 had to be rescanned
+
+    def test_clear_resets_everything(self, session_dir, tmp_path):
+        cache = FSMetadataCache()
+        cache.scan_dir(session_dir)
+        cache.scan_dir(tmp_path / "missing")
+        cache.clear()
+        assert cache.stats() == {
+            'directories': 0, 'missing': 0, 'hits': 0, 'negative_hits': 0,
+            'revalidations': 0, 'scans': 0, 'evictions': 0,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Module-level functions
+# ---------------------------------------------------------------------------
+
+class TestModuleFunctions:
+
+    def test_shared_cache_functions(self, session_dir):
+        assert fs_exists(session_dir / "session_info.json")
+        assert fs_is_file(session_dir / "session_info.json")
+        assert fs_is_dir(session_dir / "packing")
+        assert {e.name for e in scan_dir(session_dir)} == {"session_info.json", "packing"}
+        assert get_fs_cache_stats()["directories"] == 1
+
+        invalidate_fs_cache(session_dir / "packing")
+        assert get_fs_cache_stats()["directories"] == 0
+
+        scan_dir(session_dir)
+        clear_fs_cache()
+        assert get_fs_cache_stats()["scans"] == 0
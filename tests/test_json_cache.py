@@ -3,8 +3,10 @@ Unit tests for src/json_cache.py — LRU JSON file cache.
 
 Tests cover:
 - Cache miss (file read from disk) and cache hit (served from memory)
+- Stat validation (changed mtime / size is re-read)
 - TTL expiration
-- LRU eviction when max_size is exceeded
+- LRU eviction when max_size or the byte budget is exceeded
+- Concurrent access from several threads
 - invalidate() removes a single entry
 - clear() empties the entire cache
 - stats() returns correct values
@@ -13,6 +15,8 @@ Tests cover:
 """
 
 import json
+import os
+import threading
 import pytest
 from pathlib import Path
 
@@ -49,10 +53,9 @@ class TestJSONCacheGet:
         f = write_json(tmp_path / "data.json", {"x": 1})
         cache = JSONCache()
         first = cache.get(f)
-        # Overwrite file on disk — cache should still serve the old data
-        f.write_text(json.dumps({"x": 999}), encoding="utf-8")
         second = cache.get(f)
-        assert first == second == {"x": 1}
+        assert first is second
+        assert cache.stats()["hits"] == 1
 
     def test_missing_file_returns_default(self, tmp_path):
         cache = JSONCache()
@@ -79,6 +82,61 @@ class TestJSONCacheGet:
         assert result == [1, 2, 3]
 
 
+# ============================================================================
+# JSONCache — stat validation
+# ============================================================================
+
+def set_mtime(path: Path, mtime_ns: int):
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+class TestJSONCacheStatValidation:
+    def test_changed_size_re_reads_file(self, tmp_path):
+        f = write_json(tmp_path / "data.json", {"x": 1})
+        cache = JSONCache(ttl_seconds=9999)
+        cache.get(f)
+
+        write_json(f, {"x": 999})  # written by another PC
+        assert cache.get(f) == {"x": 999}
+        assert cache.stats()["stale_reloads"] == 1
+
+    def test_changed_mtime_same_size_re_reads_file(self, tmp_path):
+        f = write_json(tmp_path / "data.json", {"x": 1})
+        set_mtime(f, 1_000_000_000_000_000_000)
+        cache = JSONCache()
+        cache.get(f)
+
+        write_json(f, {"x": 2})
+        set_mtime(f, 1_000_000_001_000_000_000)
+        assert cache.get(f) == {"x": 2}
+
+    def test_unchanged_file_not_re_read(self, tmp_path, monkeypatch):
+        f = write_json(tmp_path / "data.json", {"x": 1})
+        cache = JSONCache()
+        cache.get(f)
+
+        loads = []
+        real_load = json.load
+        monkeypatch.setattr(json, "load", lambda fp: loads.append(fp) or real_load(fp))
+        for _ in range(5):
+            cache.get(f)
+
+        assert loads == []
+        stats = cache.stats()
+        assert stats["hits"] == 5
+        assert stats["revalidations"] == 5
+        assert stats["misses"] == 1
+
+    def test_deleted_file_returns_default_and_drops_entry(self, tmp_path):
+        f = write_json(tmp_path / "data.json", {"x": 1})
+        cache = JSONCache()
+        cache.get(f)
+
+        f.unlink()
+        assert cache.get(f, default={}) == {}
+        assert cache.stats()["size"] == 0
+
+
 # ============================================================================
 # JSONCache — TTL expiration
 # ============================================================================
@@ -97,11 +155,9 @@ class TestJSONCacheTTL:
     def test_valid_entry_served_from_cache(self, tmp_path):
         f = write_json(tmp_path / "data.json", {"v": 1})
         cache = JSONCache(ttl_seconds=9999)
-        cache.get(f)
+        first = cache.get(f)
 
-        write_json(f, {"v": 2})  # change file
-        result = cache.get(f)
-        assert result == {"v": 1}  # still served from cache
+        assert cache.get(f) is first  # unchanged file, within TTL
 
 
 # ============================================================================
@@ -131,6 +187,74 @@ class TestJSONCacheEviction:
 
         assert cache.stats()["size"] <= max_size
 
+    def test_least_recently_used_evicted_first(self, tmp_path):
+        cache = JSONCache(max_size=3)
+        a, b, c, d = (write_json(tmp_path / f"{n}.json", {"n": n}) for n in "abcd")
+        for f in (a, b, c):
+            cache.get(f)
+        cache.get(a)  # a becomes most recently used
+
+        cache.get(d)  # evicts b
+
+        cache.get(a)
+        cache.get(c)
+        stats = cache.stats()
+        assert stats["evictions"] == 1
+        assert stats["misses"] == 4  # a, b, c, d once each
+        cache.get(b)
+        assert cache.stats()["misses"] == 5
+
+    def test_byte_budget_limits_total_size(self, tmp_path):
+        payload = {"data": "x" * 1000}
+        file_size = len(json.dumps(payload))
+        cache = JSONCache(max_bytes=file_size * 3)
+        for i in range(10):
+            cache.get(write_json(tmp_path / f"f{i}.json", payload))
+
+        stats = cache.stats()
+        assert stats["size"] == 3
+        assert stats["bytes"] == file_size * 3
+        assert stats["bytes"] <= stats["max_bytes"]
+        assert stats["evictions"] == 7
+
+    def test_file_larger_than_budget_not_cached(self, tmp_path):
+        f = write_json(tmp_path / "big.json", {"data": "x" * 1000})
+        cache = JSONCache(max_bytes=100)
+        assert cache.get(f) == {"data": "x" * 1000}
+        assert cache.stats()["size"] == 0
+
+
+# ============================================================================
+# JSONCache — concurrent access
+# ============================================================================
+
+class TestJSONCacheThreads:
+    def test_concurrent_reads_and_invalidations(self, tmp_path):
+        files = [write_json(tmp_path / f"f{i}.json", {"i": i}) for i in range(20)]
+        cache = JSONCache(max_size=8)
+        errors = []
+
+        def reader(offset):
+            try:
+                for n in range(300):
+                    f = files[(n + offset) % len(files)]
+                    assert cache.get(f) == {"i": files.index(f)}
+                    if n % 25 == 0:
+                        cache.invalidate(f)
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+
+        threads = [threading.Thread(target=reader, args=(k,)) for k in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert errors == []
+        stats = cache.stats()
+        assert stats["size"] <= 8
+        assert stats["hits"] + stats["misses"] + stats["stale_reloads"] == 6 * 300
+
 
 # ============================================================================
 # JSONCache.invalidate
@@ -200,6 +324,8 @@ class TestJSONCacheStats:
         assert stats["max_size"] == 50
         assert stats["ttl_seconds"] == 30
         assert stats["oldest_age"] == 0
+        assert stats["hits"] == stats["misses"] == stats["revalidations"] == 0
+        assert stats["hit_rate"] == 0.0
 
     def test_stats_reflect_cached_entries(self, tmp_path):
         cache = JSONCache(max_size=100, ttl_seconds=60)
@@ -252,3 +378,12 @@ class TestConvenienceFunctions:
         assert "size" in stats
         assert "max_size" in stats
         assert "ttl_seconds" in stats
+
+    def test_get_json_cache_stats_counts_lookups(self, tmp_path):
+        f = write_json(tmp_path / "data.json", {"v": 1})
+        get_cached_json(f)
+        get_cached_json(f)
+        stats = get_json_cache_stats()
+        assert stats["misses"] == 1
+        assert stats["hits"] == 1
+        assert stats["hit_rate"] == 0.5
@@ -0,0 +1,81 @@
+"""
+Tests for OrderSearchIndex — per-session free-text search over orders.
+"""
+
+import time
+
+import pandas as pd
+import pytest
+
+from order_search_index import OrderSearchIndex
+from session_store import SessionStore
+
+
+def _store(orders):
+    rows = [
+        {'Order_Number': order, 'SKU': sku, 'Product_Name': product, 'Quantity': '1'}
+        for order, lines in orders.items()
+        for sku, product in lines
+    ]
+    return SessionStore.from_dataframe(pd.DataFrame(rows))
+
+
+@pytest.fixture
+def index():
+    return OrderSearchIndex(_store({
+        '#1001': [('RED-1', 'Red Mug'), ('BLUE-2', 'Blue Cup')],
+        '#1002': [('GREEN-3', 'Green Mug')],
+        '#2001': [(None, 'Gift Card')],
+    }))
+
+
+def test_search_matches_number_sku_and_product(index):
+    assert index.search('') is None
+    assert index.search('mug') == {'#1001', '#1002'}
+    assert index.search('BLUE') == {'#1001'}
+    assert index.search('#2') == {'#2001'}
+    assert index.search('gift') == {'#2001'}
+    # Fields are separated: no match across the end of one and the start of the next
+    assert index.search('1red') == set()
+
+
+def test_narrowed_search_equals_fresh_search(index):
+    assert index.search('m') == {'#1001', '#1002'}
+    assert index.search('mu') == {'#1001', '#1002'}
+    assert index.search('red m') == {'#1001'}
+    assert index.search('green') == {'#1002'}  # not a refinement: full scan again
+
+
+def test_status_is_searchable_and_updated(index):
+    index.set_status('#1001', 'In Progress')
+    index.set_status('#1002', 'New')
+    assert index.search('progress') == {'#1001'}
+    assert index.matches('#1001', 'progress')
+
+    index.set_status('#1001', 'Completed')
+    assert index.search('progress') == set()
+    assert index.search('complete') == {'#1001'}
+    assert not index.matches('#1002', 'complete')
+    assert index.matches('#1002', 'green')
+
+
+@pytest.mark.slow
+def test_benchmark_search_10k_orders():
+    """Typing a SKU against a 10,000-order list (40k lines). Run with -s for timings."""
+    store = _store({
+        f"#ORD-{n:05d}": [(f"SKU-{(n * 7 + i) % 900:03d}", f"Product {(n + i) % 300}") for i in range(4)]
+        for n in range(10_000)
+    })
+    start = time.perf_counter()
+    index = OrderSearchIndex(store)
+    built = time.perf_counter() - start
+
+    timings = []
+    for term in ('s', 'sk', 'sku', 'sku-', 'sku-1', 'sku-12', 'sku-123'):
+        start = time.perf_counter()
+        matches = index.search(term)
+        timings.append(time.perf_counter() - start)
+
+    print(f"\n10k orders: index built in {built * 1000:.0f} ms, "
+          f"keystrokes {', '.join(f'{t * 1000:.1f}' for t in timings)} ms")
+    assert matches
@@ -0,0 +1,31 @@
+"""
+Tests for OrderSkuSummary — per-SKU packed/total aggregate of the displayed order.
+"""
+
+from order_sku_summary import OrderSkuSummary
+
+ITEMS = [
+    {"SKU": "SKU-B", "Product_Name": "Beta", "Quantity": "2"},
+    {"SKU": "SKU-A", "Product_Name": "Alpha", "Quantity": 1},
+    {"SKU": "SKU-B", "Product_Name": "Beta (dup)", "Quantity": "bad"},
+]
+
+
+def test_aggregates_by_sku_with_resumed_state():
+    summary = OrderSkuSummary(ITEMS, [{"row": 0, "packed": 1}, {"row": 2, "packed": 1}])
+    assert summary.skus == ["SKU-A", "SKU-B"]
+    assert summary.names == ["Alpha", "Beta"]
+    assert summary.totals == [1, 3]
+    assert summary.packed == [0, 2]
+    assert not summary.is_done(1)
+
+
+def test_set_packed_applies_deltas():
+    summary = OrderSkuSummary(ITEMS)
+    assert summary.set_packed(0, 2) == 1
+    assert summary.set_packed(0, 2) is None  # unchanged
+    assert summary.set_packed(2, 1) == 1
+    assert summary.is_done(1)
+    assert summary.set_packed(0, 1) == 1  # undo
+    assert summary.packed == [0, 2]
+    assert summary.set_packed(99, 1) is None
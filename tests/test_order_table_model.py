@@ -0,0 +1,66 @@
+"""
+Tests for OrderTableModel — cached display columns and targeted dataChanged.
+"""
+
+import time
+
+import pandas as pd
+import pytest
+from PySide6.QtCore import Qt
+
+from order_table_model import COMPLETED_ROW_COLOR, OrderTableModel
+
+
+@pytest.fixture
+def model(qapp):
+    return OrderTableModel(pd.DataFrame({
+        'Order_Number': ['O1', 'O2'],
+        'Status': ['New', 'Completed'],
+        'Items': [2, 3],
+    }))
+
+
+def test_display_and_background(model):
+    assert (model.rowCount(), model.columnCount()) == (2, 3)
+    assert model.headerData(1, Qt.Horizontal) == 'Status'
+    assert model.data(model.index(0, 2)) == '2'
+    assert model.data(model.index(0, 0), Qt.BackgroundRole) is None
+    assert model.data(model.index(1, 0), Qt.BackgroundRole) == COMPLETED_ROW_COLOR
+
+
+def test_set_data_updates_cache_and_emits_precise_ranges(model):
+    changed = []
+    model.dataChanged.connect(lambda top, bottom, roles: changed.append(
+        (top.row(), top.column(), bottom.row(), bottom.column())))
+
+    assert model.setData(model.index(0, 2), 5)
+    assert model.data(model.index(0, 2)) == '5'
+    assert changed == [(0, 2, 0, 2)]
+
+    # Completing a row repaints the whole row (background)
+    assert model.setData(model.index(0, 1), 'Completed')
+    assert model.data(model.index(0, 1)) == 'Completed'
+    assert model.data(model.index(0, 2), Qt.BackgroundRole) == COMPLETED_ROW_COLOR
+    assert changed[-1] == (0, 0, 0, 2)
+    assert model._data.iat[0, 1] == 'Completed'
+
+
+@pytest.mark.slow
+def test_benchmark_paint_50k_rows(qapp):
+    """Reading every cell of a 50,000-row table, as a full repaint would."""
+    rows = 50_000
+    model = OrderTableModel(pd.DataFrame({
+        'Order_Number': [f"#{n}" for n in range(rows)],
+        'Status': ['Completed' if n % 3 == 0 else 'New' for n in range(rows)],
+        'Items': [n % 7 for n in range(rows)],
+    }))
+    indexes = [model.index(row, col) for row in range(rows) for col in range(3)]
+    display, background = Qt.DisplayRole, Qt.BackgroundRole  # as the view passes them
+
+    start = time.perf_counter()
+    for index in indexes:
+        model.data(index, display)
+        model.data(index, background)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n50k rows x 3 columns: all cells read in {elapsed:.2f} s")
@@ -0,0 +1,70 @@
+"""
+Tests for order_timer — monotonic order timing and resume anchoring.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from order_timer import OrderTimer
+from shared.metadata_utils import calculate_duration
+
+
+class FakeClocks:
+    """Independent monotonic and wall clocks that tests can move separately."""
+
+    def __init__(self):
+        self.mono = 1000.0
+        self.wall = datetime(2026, 1, 10, 10, 0, 0, tzinfo=timezone(timedelta(hours=2)))
+
+    def advance(self, seconds):
+        self.mono += seconds
+        self.wall += timedelta(seconds=seconds)
+
+    def timer(self):
+        return OrderTimer(clock=lambda: self.mono, wall_clock=lambda: self.wall)
+
+
+def test_elapsed_matches_calculate_duration_semantics():
+    clocks = FakeClocks()
+    timer = clocks.timer()
+    started_at = timer.start()
+
+    clocks.advance(2.7)
+
+    assert timer.elapsed_seconds() == 2  # truncated, like calculate_duration()
+    assert calculate_duration(started_at, timer.timestamp()) == timer.elapsed_seconds()
+
+
+def test_wall_clock_jump_does_not_affect_offsets():
+    clocks = FakeClocks()
+    timer = clocks.timer()
+    timer.start()
+
+    clocks.advance(5)
+    clocks.wall -= timedelta(minutes=10)  # NTP correction backwards
+
+    assert timer.elapsed_seconds() == 5
+    # Persisted timestamps stay consistent with the offsets
+    assert calculate_duration(timer.started_at, timer.timestamp()) == 5
+
+
+def test_resume_continues_from_persisted_start():
+    clocks = FakeClocks()
+    started_at = clocks.timer().start()
+
+    # App restarted 90s later: new process, unrelated monotonic clock
+    clocks.advance(90)
+    clocks.mono = 5.0
+    resumed = clocks.timer()
+    resumed.resume(started_at)
+    assert resumed.elapsed_seconds() == 90
+
+    clocks.advance(10)
+    assert resumed.elapsed_seconds() == 100
+
+
+def test_resume_with_unparsable_start_reports_zero():
+    timer = FakeClocks().timer()
+    timer.resume("not-a-timestamp")
+
+    assert timer.elapsed_seconds() == 0
+    assert timer.started_at == "not-a-timestamp"
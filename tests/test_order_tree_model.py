@@ -0,0 +1,95 @@
+"""
+Tests for OrderTreeModel — the packing view's order tree read straight from
+PackerLogic's session store and packing state.
+"""
+
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+from PySide6.QtCore import Qt
+
+from order_tree_model import OrderTreeModel
+from packer_logic import PackerLogic
+
+
+@pytest.fixture
+def logic(tmp_path):
+    profile_manager = MagicMock()
+    profile_manager.load_sku_mapping.return_value = {}
+    logic = PackerLogic(client_id="TEST", profile_manager=profile_manager, work_dir=str(tmp_path))
+    logic.processed_df = pd.DataFrame({
+        'Order_Number': ['#1002', '#1001', '#1001'],
+        'SKU': ['BLUE-2', 'RED-1', 'RED-1'],
+        'Product_Name': ['Blue', 'Red', 'Red'],
+        'Quantity': ['1', '1', '2'],
+        'Courier': ['UPS', 'DHL', 'DHL'],
+    })
+    logic.orders_data = {
+        order: {'items': group.to_dict('records'), 'metadata': {}}
+        for order, group in logic.processed_df.groupby('Order_Number', sort=False)
+    }
+    yield logic
+    logic.close()
+
+
+@pytest.fixture
+def model(qapp, logic):
+    model = OrderTreeModel()
+    model.set_logic(logic)
+    return model
+
+
+def _row(model, row, parent=None):
+    args = (row, 0) if parent is None else (row, 0, parent)
+    first = model.index(*args)
+    return [model.data(first.siblingAtColumn(c)) for c in range(model.columnCount())]
+
+
+def test_orders_and_lines(model):
+    assert model.rowCount() == 2
+    assert _row(model, 0) == ['#1001', '2 items', '', '⏳ 0/2 items', 'DHL']
+    order = model.index(0, 0)
+    assert model.rowCount(order) == 2
+    assert _row(model, 1, order) == ['  RED-1', 'Red', '2', '⏳ Pending (0/2)', '']
+    assert model.parent(model.index(1, 0, order)) == order
+    assert model.data(order, Qt.FontRole).bold()
+
+
+def test_scan_updates_only_the_scanned_order(model, logic):
+    changed = []
+    model.dataChanged.connect(lambda top, bottom: changed.append(
+        (top.parent().row(), top.row(), bottom.row())))
+
+    logic.start_order_packing('1001')
+    logic.process_sku_scan('RED-1')
+    model.order_changed('#1001')
+
+    # Order row plus one range for its lines; #1002 untouched
+    assert changed == [(-1, 0, 0), (0, 0, 1)]
+    order = model.index(0, 0)
+    # Duplicate SKU lines are matched by row, not by the first SKU hit
+    assert _row(model, 0, order)[3] == '✅ Scanned'
+    assert _row(model, 1, order)[3] == '⏳ Pending (0/2)'
+    assert _row(model, 0)[3] == '⏳ 1/2 items'
+
+    logic.process_sku_scan('RED-1')
+    logic.process_sku_scan('RED-1')
+    assert _row(model, 0)[3] == '✅ Completed'
+    assert _row(model, 1, order)[3] == '✅ Scanned'
+    assert _row(model, 1)[3] == '⏳ 0/1 items'
+
+
+def test_clear(model):
+    model.clear()
+    assert model.rowCount() == 0
+    model.order_changed('#1001')  # no-op once cleared
+
+
+def test_search_index_tracks_order_status(model, logic):
+    assert model.search_index.search('new') == {'#1001', '#1002'}
+    assert model.search_index.search('blue') == {'#1002'}
+
+    logic.start_order_packing('1001')
+    model.order_changed('#1001')
+    assert model.search_index.search('progress') == {'#1001'}
@@ -156,6 +156,45 @@ def test_start_order_packing_order_not_found_with_normalization(packer_logic):
     assert items is None
 
 
+def test_resolve_order_uses_normalized_index(packer_logic):
+    """Test resolve_order maps scanned text to the original order number."""
+    packer_logic.orders_data = {
+        "#1001": {"items": []},
+        "ORD-123!": {"items": []},
+    }
+
+    assert packer_logic.resolve_order("1001") == "#1001"
+    assert packer_logic.resolve_order("#1001") == "#1001"
+    assert packer_logic.resolve_order("ORD-123") == "ORD-123!"
+    assert packer_logic.resolve_order("9999") is None
+    assert packer_logic.resolve_order("###") is None
+
+
+def test_resolve_order_index_follows_orders_data_reassignment(packer_logic):
+    """Test the order index is rebuilt whenever orders_data is replaced."""
+    packer_logic.orders_data = {"#1001": {"items": []}}
+    assert packer_logic.resolve_order("1001") == "#1001"
+
+    packer_logic.orders_data = {"#2002": {"items": []}}
+    assert packer_logic.resolve_order("1001") is None
+    assert packer_logic.resolve_order("2002") == "#2002"
+
+
+def test_resolve_order_detects_collisions(packer_logic):
+    """Test orders that normalize to the same string are reported as collisions."""
+    packer_logic.orders_data = {
+        "#1001": {"items": []},
+        "1001!": {"items": []},
+        "2002": {"items": []},
+    }
+
+    assert packer_logic.order_number_collisions == {"1001": ["#1001", "1001!"]}
+    # First order in list order keeps the normalized slot (previous linear-scan behaviour)
+    assert packer_logic.resolve_order("1001") == "#1001"
+    # An exact match on the original order number always wins
+    assert packer_logic.resolve_order("1001!") == "1001!"
+
+
 # ============================================================================
 # JSON Packing List Tests
 # ============================================================================
@@ -378,3 +417,77 @@ def test_packing_workflow_with_json_list(packer_logic, test_dir):
 
     # Verify order completed
     assert 'ORD-100' in packer_logic.session_packing_state['completed_orders']
+
+
+def test_cancel_and_force_confirm_keep_order_counters_in_sync(packer_logic):
+    """Cancel / force-confirm must keep the per-order SKU index consistent with scans."""
+    packer_logic.orders_data = {
+        "ORD-1": {
+            "items": [
+                {"SKU": "SKU-A", "Quantity": "1", "Product_Name": "A"},
+                {"SKU": "SKU-B", "Quantity": "3", "Product_Name": "B"},
+                {"SKU": "SKU-A", "Quantity": "1", "Product_Name": "A (split line)"},
+            ]
+        }
+    }
+    packer_logic.start_order_packing("ORD-1")
+
+    result, status = packer_logic.process_sku_scan("SKU-A")
+    assert (status, result["row"]) == ("SKU_OK", 0)
+    result, status = packer_logic.process_sku_scan("SKU-A")
+    assert (status, result["row"]) == ("SKU_OK", 2)
+
+    # Undo the scan on row 0 — the next SKU-A scan must target row 0 again
+    _, status = packer_logic.cancel_item_scan(0)
+    assert status == "ITEM_DECREMENTED"
+    result, status = packer_logic.process_sku_scan("SKU-A")
+    assert (status, result["row"]) == ("SKU_OK", 0)
+
+    _, status = packer_logic.process_sku_scan("SKU-A")
+    assert status == "SKU_EXTRA"
+    packer_logic.remove_extra_item(packer_logic._normalize_sku("SKU-A"))
+
+    result, status = packer_logic.force_confirm_item(1)
+    assert status == "FORCE_CONFIRMED"
+    assert result["order_complete"] is True
+    assert "ORD-1" in packer_logic.session_packing_state['completed_orders']
+
+
+def test_state_progress_counters_follow_scans(packer_logic, test_dir):
+    """progress.packed_items in the saved state tracks scans, cancels and completions."""
+    import json
+    from pathlib import Path
+
+    packing_list_data = {
+        "list_name": "Progress",
+        "orders": [
+            {"order_number": "ORD-1", "courier": "DHL",
+             "items": [{"sku": "SKU-A", "quantity": 2, "product_name": "A"}]},
+            {"order_number": "ORD-2", "courier": "DHL",
+             "items": [{"sku": "SKU-B", "quantity": 3, "product_name": "B"}]},
+        ]
+    }
+    json_path = Path(test_dir) / "progress.json"
+    json_path.write_text(json.dumps(packing_list_data), encoding='utf-8')
+    packer_logic.load_packing_list_json(json_path)
+
+    def progress():
+        return packer_logic._build_state_dict()["progress"]
+
+    assert (progress()["total_items"], progress()["packed_items"]) == (5, 0)
+
+    packer_logic.start_order_packing("ORD-1")
+    packer_logic.process_sku_scan("SKU-A")
+    assert progress()["packed_items"] == 1
+    packer_logic.cancel_item_scan(0)
+    assert progress()["packed_items"] == 0
+    packer_logic.process_sku_scan("SKU-A")
+    packer_logic.process_sku_scan("SKU-A")
+    assert progress()["packed_items"] == 2
+    assert progress()["completed_orders"] == 1
+
+    packer_logic.clear_current_order()
+    packer_logic.start_order_packing("ORD-2")
+    packer_logic.force_confirm_item(0)
+    assert progress()["packed_items"] == 5
+    assert packer_logic.generate_session_summary()["total_items"] == 5
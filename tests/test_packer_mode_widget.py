@@ -12,12 +12,15 @@ Tests cover:
 - update_raw_scan_display() — raw scan label updated
 - add_order_to_history() — row inserted at top of history table
 - _on_scan() / barcode_scanned signal emitted
-- _on_manual_confirm() / barcode_scanned signal emitted from button
+- _on_manual_confirm() / barcode_scanned signal emitted from the painted button
+- Actions column delegate state (Map for unmapped SKUs, Confirm disabled when packed)
+- Wave mode toggle and slot list
 """
 
 import pytest
 from PySide6.QtCore import Qt
 
+from item_actions_delegate import ACTION_CONFIRM, ACTION_MAP, ACTION_UNDO
 from packer_mode_widget import PackerModeWidget
 
 
@@ -134,13 +137,26 @@ class TestDisplayOrder:
         widget = PackerModeWidget()
         qtbot.addWidget(widget)
         widget.display_order(SAMPLE_ITEMS, EMPTY_STATE)
-        cell_widget = widget.table.cellWidget(0, 4)
-        assert cell_widget is not None
-        # Actions column is now a container widget with multiple buttons
-        from PySide6.QtWidgets import QPushButton
-        buttons = cell_widget.findChildren(QPushButton)
-        tooltips = [b.toolTip() for b in buttons]
-        assert "Confirm Manually" in tooltips
+        # Actions column is painted by a delegate, not a cell widget
+        assert widget.table.cellWidget(0, 4) is None
+        actions = widget.actions_delegate.actions(widget.table.model().index(0, 4))
+        assert (ACTION_CONFIRM, True) in actions
+        assert widget.actions_delegate.tooltip(ACTION_CONFIRM) == "Confirm Manually"
+
+    def test_map_button_only_for_unmapped_skus(self, qtbot):
+        widget = PackerModeWidget()
+        qtbot.addWidget(widget)
+        widget.display_order(SAMPLE_ITEMS, EMPTY_STATE, sku_map={"4001": "SKU-A"})
+
+        def shown(row):
+            return [a for a, _ in widget.actions_delegate.actions(widget.table.model().index(row, 4))]
+
+        assert ACTION_MAP not in shown(0)
+        assert ACTION_MAP in shown(1)
+
+        # A new mapping updates the rows already on screen
+        widget.set_sku_map({"4001": "SKU-A", "4002": "sku-b"})
+        assert ACTION_MAP not in shown(1)
 
 
 # ============================================================================
@@ -167,14 +183,10 @@ class TestUpdateItemRow:
         qtbot.addWidget(widget)
         widget.display_order(SAMPLE_ITEMS, EMPTY_STATE)
         widget.update_item_row(0, 2, True)
-        cell_widget = widget.table.cellWidget(0, 4)
-        assert cell_widget is not None
-        from PySide6.QtWidgets import QPushButton
-        buttons = cell_widget.findChildren(QPushButton)
-        # Confirm Manually button must be disabled after item is complete
-        confirm_btns = [b for b in buttons if b.toolTip() == "Confirm Manually"]
-        assert confirm_btns, "Confirm button not found"
-        assert not confirm_btns[0].isEnabled()
+        actions = dict(widget.actions_delegate.actions(widget.table.model().index(0, 4)))
+        # Confirm Manually must be disabled after item is complete; undo stays available
+        assert actions[ACTION_CONFIRM] is False
+        assert actions[ACTION_UNDO] is True
 
     def test_invalid_row_does_not_raise(self, qtbot):
         """Calling update_item_row for a row that doesn't exist should not crash."""
@@ -184,6 +196,49 @@ class TestUpdateItemRow:
         widget.update_item_row(99, 1, False)  # Should log warning, not raise
 
 
+# ============================================================================
+# Summary panel
+# ============================================================================
+
+DUPLICATE_SKU_ITEMS = SAMPLE_ITEMS + [
+    {"Order_Number": "ORD-001", "SKU": "SKU-A", "Product_Name": "Product Alpha", "Quantity": 1},
+]
+
+
+class TestSummaryPanel:
+    def _summary(self, widget):
+        return [
+            [widget.summary_table.item(r, c).text() for c in range(4)]
+            for r in range(widget.summary_table.rowCount())
+        ]
+
+    def test_duplicate_skus_are_summed(self, qtbot):
+        widget = PackerModeWidget()
+        qtbot.addWidget(widget)
+        widget.display_order(DUPLICATE_SKU_ITEMS, PARTIAL_STATE)
+        assert self._summary(widget) == [
+            ["SKU-A", "Product Alpha", "1 / 3", "Pending"],
+            ["SKU-B", "Product Beta", "0 / 1", "Pending"],
+        ]
+
+    def test_scan_updates_only_its_sku_row(self, qtbot):
+        widget = PackerModeWidget()
+        qtbot.addWidget(widget)
+        widget.display_order(DUPLICATE_SKU_ITEMS, EMPTY_STATE)
+        changed = []
+        widget.summary_table.model().dataChanged.connect(
+            lambda top, bottom: changed.append((top.row(), bottom.row())))
+
+        widget.update_item_row(2, 1, True)
+        assert changed and all(rows == (0, 0) for rows in changed)
+        widget.update_item_row(0, 2, True)
+        assert self._summary(widget)[0][2:] == ["3 / 3", "Done"]
+
+        widget.update_item_row(0, 1, False)  # undo
+        assert self._summary(widget)[0][2:] == ["2 / 3", "Pending"]
+        assert self._summary(widget)[1][2:] == ["0 / 1", "Pending"]
+
+
 # ============================================================================
 # show_notification
 # ============================================================================
@@ -316,14 +371,54 @@ class TestBarcodeScanSignal:
         received = []
         widget.barcode_scanned.connect(received.append)
 
-        # Actions column is now a container; find the Confirm Manually button inside
-        from PySide6.QtWidgets import QPushButton
-        cell_widget = widget.table.cellWidget(0, 4)
-        confirm_btn = next(
-            (b for b in cell_widget.findChildren(QPushButton) if b.toolTip() == "Confirm Manually"),
-            None,
-        )
-        assert confirm_btn is not None
-        confirm_btn.click()
+        # Click the painted Confirm Manually button of row 0
+        widget.show()
+        qtbot.waitExposed(widget)
+        index = widget.table.model().index(0, 4)
+        rects = widget.actions_delegate.button_rects(widget.table.visualRect(index), index)
+        confirm_rect = next(rect for action, _, rect in rects if action == ACTION_CONFIRM)
+        qtbot.mouseClick(widget.table.viewport(), Qt.LeftButton, pos=confirm_rect.center())
 
         assert received == ["SKU-A"]
+
+
+# ============================================================================
+# Wave mode
+# ============================================================================
+
+class TestWaveMode:
+    def test_toggle_emits_and_shows_slots(self, qtbot):
+        widget = PackerModeWidget()
+        qtbot.addWidget(widget)
+
+        received = []
+        widget.wave_mode_toggled.connect(received.append)
+        widget.wave_mode_button.click()
+
+        assert received == [True]
+        assert not widget.wave_slots_label.isHidden()
+
+    def test_set_wave_mode_does_not_emit(self, qtbot):
+        widget = PackerModeWidget()
+        qtbot.addWidget(widget)
+
+        received = []
+        widget.wave_mode_toggled.connect(received.append)
+        widget.set_wave_mode(True)
+
+        assert received == []
+        assert widget.wave_mode_button.isChecked()
+
+    def test_set_wave_slots_lists_orders_and_free_slots(self, qtbot):
+        widget = PackerModeWidget()
+        qtbot.addWidget(widget)
+
+        widget.set_wave_slots([
+            {"slot": 1, "order_number": "ORD-001", "packed": 1, "required": 2, "focused": True},
+            {"slot": 2, "order_number": "ORD-002", "packed": 0, "required": 1, "focused": False},
+        ], max_orders=4)
+
+        lines = widget.wave_slots_label.text().splitlines()
+        assert lines[0].startswith("▶") and "ORD-001" in lines[0] and "1/2" in lines[0]
+        assert "ORD-002" in lines[1]
+        assert "2 free slot(s)" in lines[2]
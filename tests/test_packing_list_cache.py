@@ -0,0 +1,146 @@
+"""
+Tests for packing_list_cache — the compiled packing list in the work directory —
+and PackerLogic.load_packing_list_json(use_compiled_cache=True).
+"""
+
+import json
+import os
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from packer_logic import PackerLogic
+from packing_list_cache import COMPILED_FILE_NAME, load_compiled
+
+
+def _packing_list(count):
+    return {
+        "list_name": "DHL Orders",
+        "orders": [
+            {
+                "order_number": f"#ORD-{n:05d}",
+                "courier": "DHL",
+                "customer_name": f"Customer {n}",
+                "tags": ["priority"] if n % 2 else [],
+                "items": [
+                    {"sku": f"SKU-{n % 50:03d} A", "product_name": f"Product {n % 50}", "quantity": 1 + i}
+                    for i in range(3)
+                ],
+            }
+            for n in range(count)
+        ],
+    }
+
+
+def _logic(work_dir):
+    profile_manager = MagicMock()
+    profile_manager.load_sku_mapping.return_value = {}
+    return PackerLogic(client_id="TEST", profile_manager=profile_manager, work_dir=str(work_dir))
+
+
+def _load(tmp_path, source, use_compiled_cache=True):
+    logic = _logic(tmp_path / "work")
+    try:
+        result = logic.load_packing_list_json(source, use_compiled_cache=use_compiled_cache)
+        orders = {order: dict(logic.orders_data[order]) for order in logic.orders_data}
+        return result, orders, logic
+    finally:
+        logic.close()
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "DHL_Orders.json"
+    path.write_text(json.dumps(_packing_list(20)), encoding="utf-8")
+    return path
+
+
+def test_compiled_load_matches_full_parse(tmp_path, source):
+    full_result, full_orders, _ = _load(tmp_path, source)
+    assert (tmp_path / "work" / COMPILED_FILE_NAME).exists()
+
+    with patch("packer_logic.SessionStoreBuilder", side_effect=AssertionError("list rebuilt")):
+        result, orders, logic = _load(tmp_path, source)
+
+    assert result == full_result == (20, "DHL Orders")
+    assert orders == full_orders
+    assert logic.resolve_order("ORD-00003") == "#ORD-00003"
+    assert logic.session_store.normalized_skus("#ORD-00003") == ["sku003a"] * 3
+
+
+def test_start_order_uses_compiled_normalized_skus(tmp_path, source):
+    _load(tmp_path, source)
+    logic = _logic(tmp_path / "work")
+    try:
+        logic.load_packing_list_json(source, use_compiled_cache=True)
+        items, status = logic.start_order_packing("ORD-00001")
+        assert status == "ORDER_LOADED"
+        assert [s['normalized_sku'] for s in logic.current_order_state] == ["sku001a"] * 3
+        assert [s['required'] for s in logic.current_order_state] == [1, 2, 3]
+    finally:
+        logic.close()
+
+
+def test_changed_source_is_recompiled(tmp_path, source):
+    _load(tmp_path, source)
+
+    source.write_text(json.dumps(_packing_list(5)), encoding="utf-8")
+    (count, _), _, _ = _load(tmp_path, source)
+
+    assert count == 5
+    assert len(load_compiled(tmp_path / "work" / COMPILED_FILE_NAME, source).store) == 5
+
+
+def test_same_size_new_mtime_is_validated_by_hash(tmp_path, source):
+    _load(tmp_path, source)
+    cache = tmp_path / "work" / COMPILED_FILE_NAME
+    later = time.time() + 100
+
+    # Copied file: same bytes, new mtime -> still valid
+    os.utime(source, (later, later))
+    assert load_compiled(cache, source) is not None
+
+    # Edited in place, same size -> stale
+    content = source.read_text(encoding="utf-8").replace("Customer 1", "Customer X")
+    source.write_text(content, encoding="utf-8")
+    os.utime(source, (later + 100, later + 100))
+    assert load_compiled(cache, source) is None
+
+
+def test_corrupt_compiled_file_falls_back_to_parse(tmp_path, source):
+    _load(tmp_path, source)
+    cache = tmp_path / "work" / COMPILED_FILE_NAME
+    cache.write_text('{"format": 1, "store": ', encoding="utf-8")
+
+    (count, _), _, _ = _load(tmp_path, source)
+
+    assert count == 20
+    assert load_compiled(cache, source) is not None  # rewritten
+
+
+def test_cache_is_opt_in(tmp_path, source):
+    _load(tmp_path, source, use_compiled_cache=False)
+    assert not (tmp_path / "work" / COMPILED_FILE_NAME).exists()
+
+
+@pytest.mark.slow
+def test_benchmark_reopen_10k_order_list(tmp_path):
+    """
+    Reopening a 10,000-order list (30k lines) from the compiled form vs a
+    full parse. Run with -s to see the timings.
+    """
+    source = tmp_path / "Big.json"
+    source.write_text(json.dumps(_packing_list(10_000)), encoding="utf-8")
+
+    def timed():
+        start = time.perf_counter()
+        (count, _), _, _ = _load(tmp_path, source)
+        return time.perf_counter() - start, count
+
+    full, _ = timed()  # parses and writes the compiled form
+    with patch("packer_logic.SessionStoreBuilder", side_effect=AssertionError("list rebuilt")):
+        compiled, count = timed()
+
+    print(f"\n10k orders: full parse {full:.2f} s, compiled {compiled:.2f} s")
+    assert count == 10_000
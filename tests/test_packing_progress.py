@@ -0,0 +1,164 @@
+"""
+Tests for packing_progress — per-order SKU index and session progress counters.
+"""
+
+import pandas as pd
+import pytest
+
+from packing_progress import OrderProgress, SessionProgress
+
+
+def _state(*rows):
+    """Build an order-state list from (normalized_sku, required, packed) tuples."""
+    return [
+        {'original_sku': sku.upper(), 'normalized_sku': sku, 'required': req, 'packed': packed, 'row': i}
+        for i, (sku, req, packed) in enumerate(rows)
+    ]
+
+
+def test_counters_initialized_from_state():
+    state = _state(('a', 2, 1), ('b', 3, 0), ('c', 1, 1))
+    progress = OrderProgress(state)
+
+    assert progress.packed_total == 2
+    assert progress.required_total == 6
+    assert not progress.is_complete
+    assert progress.contains_sku('c')
+    assert not progress.contains_sku('zzz')
+
+
+def test_next_open_item_follows_row_order_for_split_lines():
+    """Same SKU on two rows: the first row fills before the second."""
+    state = _state(('a', 1, 0), ('b', 1, 0), ('a', 2, 0))
+    progress = OrderProgress(state)
+
+    first = progress.next_open_item('a')
+    assert first is state[0]
+    progress.pack_one(first)
+
+    second = progress.next_open_item('a')
+    assert second is state[2]
+    progress.pack_one(second)
+    progress.pack_one(second)
+
+    assert progress.next_open_item('a') is None
+    assert progress.contains_sku('a')  # still in order → extra, not unknown
+    assert progress.packed_total == 3
+
+
+def test_completion_is_counter_check():
+    state = _state(('a', 1, 0), ('b', 2, 0))
+    progress = OrderProgress(state)
+
+    progress.pack_one(progress.next_open_item('a'))
+    progress.pack_one(progress.next_open_item('b'))
+    assert not progress.is_complete
+    progress.pack_one(progress.next_open_item('b'))
+    assert progress.is_complete
+    assert progress.packed_total == progress.required_total
+
+
+def test_unpack_reopens_row_in_original_position():
+    state = _state(('a', 1, 0), ('a', 1, 0))
+    progress = OrderProgress(state)
+
+    progress.pack_one(progress.next_open_item('a'))
+    progress.pack_one(progress.next_open_item('a'))
+    assert progress.is_complete
+
+    # Cancel one unit on the FIRST row: it must be packed next again
+    progress.unpack_one(progress.get_item(0))
+    assert not progress.is_complete
+    assert progress.next_open_item('a') is state[0]
+    assert progress.packed_total == 1
+
+
+def test_force_complete_adds_remaining_units():
+    state = _state(('a', 5, 2), ('b', 1, 0))
+    progress = OrderProgress(state)
+
+    added = progress.force_complete(progress.get_item(0))
+    assert added == 3
+    assert state[0]['packed'] == 5
+    assert progress.packed_total == 5
+    assert progress.next_open_item('a') is None
+
+    # Already full → no-op
+    assert progress.force_complete(progress.get_item(0)) == 0
+
+
+def test_get_item_unknown_row_returns_none():
+    progress = OrderProgress(_state(('a', 1, 0)))
+    assert progress.get_item(99) is None
+
+
+@pytest.mark.parametrize("lines", [500, 2000])
+def test_large_b2b_order_completes_with_consistent_totals(lines):
+    state = _state(*[(f"sku{i % 50}", 2, 0) for i in range(lines)])
+    progress = OrderProgress(state)
+
+    for i in range(lines * 2):
+        item = progress.next_open_item(f"sku{i % 50}")
+        assert item is not None
+        progress.pack_one(item)
+
+    assert progress.is_complete
+    assert progress.packed_total == progress.required_total == lines * 2
+    assert all(s['packed'] == s['required'] for s in state)
+
+
+# ============================================================================
+# SessionProgress
+# ============================================================================
+
+
+def _df():
+    return pd.DataFrame({
+        'Order_Number': ['O1', 'O1', 'O2', 'O3'],
+        'SKU': ['A', 'B', 'A', 'C'],
+        'Quantity': ['2', '1', '3', 'n/a'],
+    })
+
+
+def test_session_progress_totals_from_dataframe():
+    progress = SessionProgress.from_dataframe(_df())
+
+    assert progress.total_orders == 3
+    assert progress.total_items == 6  # non-numeric quantity ignored
+    assert progress.total_lines == 4
+    assert progress.unique_skus == 3
+
+
+def test_session_progress_events_match_recount():
+    progress = SessionProgress.from_dataframe(_df())
+    state = {
+        'in_progress': {'O1': [{'packed': 1}, {'packed': 0}]},
+        'completed_orders': ['O2'],
+    }
+    progress.sync(state)
+    assert progress.packed_items == 3 + 1
+
+    progress.add_packed(2)
+    assert progress.packed_items == 6
+
+    # O1 completes: its 3 in-progress units become 3 completed units (from Quantity)
+    state['in_progress'].pop('O1')
+    state['completed_orders'].append('O1')
+    progress.order_completed('O1', packed_units=3)
+    progress.sync(state)  # no external change → counters kept
+    assert progress.in_progress_packed == 0
+    assert progress.packed_items == 6
+
+
+def test_session_progress_resyncs_after_state_replaced():
+    progress = SessionProgress.from_dataframe(_df())
+    progress.sync({'in_progress': {}, 'completed_orders': []})
+    assert progress.packed_items == 0
+
+    progress.sync({'in_progress': {'O3': [{'packed': 4}]}, 'completed_orders': ['O1', 'O2']})
+    assert progress.packed_items == 3 + 3 + 4
+
+
+def test_session_progress_empty_dataframe():
+    assert SessionProgress.from_dataframe(None).total_items == 0
+    assert SessionProgress.from_dataframe(pd.DataFrame()).total_items == 0
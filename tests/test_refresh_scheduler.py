@@ -0,0 +1,54 @@
+"""
+Tests for RefreshScheduler — per-frame coalescing of view refreshes.
+"""
+
+from refresh_scheduler import RefreshScheduler
+
+
+def test_burst_refreshes_each_view_once(qtbot):
+    calls = []
+    scheduler = RefreshScheduler(frame_ms=10)
+    scheduler.register("tree", lambda keys: calls.append(("tree", keys)))
+    scheduler.register("progress", lambda keys: calls.append(("progress", keys)))
+
+    for order in ("#1", "#2", "#1", "#1"):
+        scheduler.mark_dirty("tree", order)
+        scheduler.mark_dirty("progress")
+    assert calls == []  # nothing runs inside the burst
+    assert scheduler.is_dirty("tree")
+
+    qtbot.waitUntil(lambda: len(calls) == 2)
+    assert sorted(calls, key=lambda c: c[0]) == [("progress", None), ("tree", {"#1", "#2"})]
+    assert not scheduler.is_dirty("tree")
+
+    metrics = scheduler.metrics()
+    assert metrics['frames'] == 1
+    assert metrics['views']['tree'] == {
+        'requests': 4, 'refreshes': 1, 'skipped': 3,
+        'refresh_ms': metrics['views']['tree']['refresh_ms'],
+    }
+    assert metrics['skipped'] == 6
+    assert metrics['saved_ms'] >= 0
+
+
+def test_full_refresh_wins_over_keys_and_errors_are_contained(qapp):
+    calls = []
+
+    def failing(_keys):
+        raise RuntimeError("boom")
+
+    scheduler = RefreshScheduler()
+    scheduler.register("stats", calls.append)
+    scheduler.register("broken", failing)
+    scheduler.mark_dirty("stats", "#1")
+    scheduler.mark_dirty("stats")
+    scheduler.mark_dirty("broken")
+    scheduler.flush()
+    assert calls == [None]
+
+    scheduler.mark_dirty("stats", "#2")
+    scheduler.cancel()
+    scheduler.flush()
+    assert calls == [None]
+    scheduler.reset_metrics()
+    assert scheduler.metrics()['frames'] == 0
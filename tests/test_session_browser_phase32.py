@@ -119,6 +119,7 @@ class TestSessionDetailsDialog(unittest.TestCase):
             session_history_manager=self.mock_history_manager
         )
 
+        self.assertTrue(dialog.ensure_loaded())
         self.assertIsNotNone(dialog.details)
         self.assertEqual(dialog.details['record']['session_id'], '2025-11-20_1')
 
@@ -132,12 +133,99 @@ class TestSessionDetailsDialog(unittest.TestCase):
             session_history_manager=self.mock_history_manager
         )
 
+        dialog.ensure_loaded()
         orders = dialog._get_orders_for_export()
 
         self.assertEqual(len(orders), 1)
         self.assertEqual(orders[0]['order_number'], 'ORDER-001')
         self.assertEqual(len(orders[0]['items']), 1)
 
+    def test_opens_in_loading_state(self):
+        """Tabs are placeholders and export is disabled until the details arrive."""
+        dialog = SessionDetailsDialog(
+            session_data={
+                'client_id': 'M',
+                'session_id': '2025-11-20_1'
+            },
+            session_history_manager=self.mock_history_manager
+        )
+        if dialog.details is None:
+            self.assertIsNone(dialog.orders_tab)
+            self.assertFalse(dialog.export_excel_btn.isEnabled())
+
+        dialog.ensure_loaded()
+
+        self.assertTrue(dialog.export_excel_btn.isEnabled())
+        self.assertIsNotNone(dialog.overview_tab)
+
+    def test_tabs_built_on_first_activation(self):
+        """Only the visible tab is built; the others are built when first shown."""
+        dialog = SessionDetailsDialog(
+            session_data={
+                'client_id': 'M',
+                'session_id': '2025-11-20_1'
+            },
+            session_history_manager=self.mock_history_manager
+        )
+        dialog.ensure_loaded()
+
+        self.assertIsNotNone(dialog.overview_tab)
+        self.assertIsNone(dialog.orders_tab)
+        self.assertIsNone(dialog.metrics_tab)
+
+        dialog.tab_widget.setCurrentIndex(1)
+
+        self.assertIsNotNone(dialog.orders_tab)
+        self.assertEqual(len(dialog.orders_tab.all_orders), 1)
+        self.assertIsNone(dialog.metrics_tab)
+
+    def test_load_failure_shown_in_dialog(self):
+        """A session that cannot be found reports the error instead of raising."""
+        self.mock_history_manager.get_session_details.return_value = None
+
+        dialog = SessionDetailsDialog(
+            session_data={
+                'client_id': 'M',
+                'session_id': 'missing'
+            },
+            session_history_manager=self.mock_history_manager
+        )
+
+        self.assertFalse(dialog.ensure_loaded())
+        self.assertIn("Session not found", dialog.load_error)
+        self.assertIsNone(dialog.overview_tab)
+        self.assertEqual(dialog._get_orders_for_export(), [])
+
+    def test_load_from_work_dir(self):
+        """Details are read from packing_state.json / session_summary.json of work_dir."""
+        temp_dir = Path(tempfile.mkdtemp())
+        try:
+            work_dir = temp_dir / "packing" / "DHL_Orders"
+            work_dir.mkdir(parents=True)
+            summary = {
+                'session_id': '2025-11-20_1',
+                'client_id': 'M',
+                'worker_name': 'John Doe',
+                'orders': [{'order_number': 'ORDER-9', 'items': []}],
+            }
+            (work_dir / "session_summary.json").write_text(json.dumps(summary), encoding='utf-8')
+
+            dialog = SessionDetailsDialog(
+                session_data={
+                    'client_id': 'M',
+                    'session_id': '2025-11-20_1',
+                    'work_dir': str(work_dir)
+                },
+                session_history_manager=self.mock_history_manager
+            )
+
+            self.assertTrue(dialog.ensure_loaded())
+            self.assertEqual(dialog.details['record']['worker_name'], 'John Doe')
+            self.assertEqual(dialog._get_orders_for_export()[0]['order_number'], 'ORDER-9')
+            self.mock_history_manager.get_session_details.assert_not_called()
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
 
 class TestOverviewTab(unittest.TestCase):
     """Test cases for Overview Tab."""
@@ -251,6 +339,59 @@ class TestOrdersTab(unittest.TestCase):
 
         self.assertEqual(len(tab.all_orders), 0)
 
+    def test_children_built_on_expand(self):
+        """Item rows are only created when their order is expanded."""
+        orders = [
+            {'order_number': f'ORDER-{i:03d}', 'items': [{'sku': 'PROD-001', 'quantity': 1}]}
+            for i in range(20)
+        ]
+        tab = OrdersTab({'session_summary': {'orders': orders}})
+
+        order_item = tab.tree.topLevelItem(0)
+        self.assertEqual(order_item.childCount(), 0)
+
+        order_item.setExpanded(True)
+
+        self.assertEqual(order_item.childCount(), 1)
+        self.assertIn('PROD-001', order_item.child(0).text(0))
+
+    def test_few_orders_expanded_with_children(self):
+        """Sessions with up to 10 orders still open fully expanded."""
+        tab = OrdersTab(self.mock_details)
+
+        order_item = tab.tree.topLevelItem(0)
+        self.assertTrue(order_item.isExpanded())
+        self.assertEqual(order_item.childCount(), 2)
+
+    def test_large_session_populated_in_chunks(self):
+        """Order rows beyond the first chunk are added from the event loop."""
+        from session_browser.orders_tab import ORDER_CHUNK_SIZE
+
+        orders = [{'order_number': f'ORDER-{i:05d}', 'items': []} for i in range(ORDER_CHUNK_SIZE * 3 + 5)]
+        tab = OrdersTab({'session_summary': {'orders': orders}})
+
+        self.assertEqual(tab.tree.topLevelItemCount(), ORDER_CHUNK_SIZE)
+
+        while tab._fill_timer.isActive():
+            tab._fill_timer.stop()
+            tab._add_order_chunk()
+
+        self.assertEqual(tab.tree.topLevelItemCount(), len(orders))
+        self.assertEqual(tab.tree.topLevelItem(len(orders) - 1).text(0), orders[-1]['order_number'])
+
+    def test_search_restarts_population(self):
+        """A new search discards the rows of the previous fill."""
+        from session_browser.orders_tab import ORDER_CHUNK_SIZE
+
+        orders = [{'order_number': f'ORDER-{i:05d}', 'items': []} for i in range(ORDER_CHUNK_SIZE * 2)]
+        tab = OrdersTab({'session_summary': {'orders': orders}})
+
+        tab.search_input.setText('ORDER-0000')
+
+        self.assertFalse(tab._fill_timer.isActive())
+        self.assertEqual(tab.tree.topLevelItemCount(), 10)
+        self.assertEqual(tab.info_label.text(), f"Showing 10 of {len(orders)} orders")
+
 
 class TestMetricsTab(unittest.TestCase):
     """Test cases for Metrics Tab."""
@@ -0,0 +1,408 @@
+"""
+Unit tests for src/session_history_index.py and its use by SessionHistoryManager.
+
+Tests cover:
+- Unchanged files are not re-parsed (within a manager and across restarts)
+- Changed, new and removed session files are picked up
+- session_info.json changes re-parse the packing_state.json records that use it
+- Racy rows (stored in their file's mtime tick) are re-parsed
+- Unparseable files are remembered and not re-parsed
+- Date-range / completeness / client filters answered by the index
+- Damaged and outdated databases are rebuilt
+- Daily rollups: grouping, incremental updates, range boundaries, analytics
+"""
+
+import json
+import os
+import shutil
+import sqlite3
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from session_history_index import SessionHistoryIndex, SourceRow, SCHEMA_VERSION, DB_FILENAME
+from session_history_manager import AnalyticsRollup, SessionHistoryManager
+from conftest import create_v130_session_summary
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def settle(path: Path, age: float = 60.0):
+    """Back-date a file's mtime so the index trusts its signature."""
+    when = time.time() - age
+    os.utime(path, (when, when))
+
+
+def write_json(path: Path, data: dict) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data), encoding="utf-8")
+    settle(path)
+    return path
+
+
+@pytest.fixture
+def sessions_root(tmp_path):
+    root = tmp_path / "Sessions"
+    root.mkdir()
+    return root
+
+
+@pytest.fixture
+def profile_manager(sessions_root, tmp_path):
+    pm = Mock()
+    pm.get_sessions_root.return_value = sessions_root
+    pm.cache_dir = tmp_path / "cache"
+    pm.cache_dir.mkdir()
+    return pm
+
+
+@pytest.fixture
+def manager(profile_manager):
+    mgr = SessionHistoryManager(profile_manager)
+    yield mgr
+    mgr.index.close()
+
+
+def add_completed(sessions_root, client_id, session_id, list_name="List1",
+                  started_at="2025-01-15T10:00:00+00:00", completed_orders=8,
+                  metrics=None, **fields):
+    summary = create_v130_session_summary(
+        session_id=session_id, client_id=client_id, started_at=started_at,
+        completed_orders=completed_orders, packing_list_name=list_name, **fields
+    )
+    summary["metrics"].update(metrics or {})
+    work_dir = sessions_root / f"CLIENT_{client_id}" / session_id / "packing" / list_name
+    return write_json(work_dir / "session_summary.json", summary)
+
+
+def add_in_progress(sessions_root, client_id, session_id, list_name="List1", pc_name="PC-1"):
+    session_dir = sessions_root / f"CLIENT_{client_id}" / session_id
+    state = {
+        "timestamp": "2025-01-20T12:00:00+00:00",
+        "data": {
+            "in_progress": {"ORD-1": {"SKU-A": {"packed": 1, "required": 2}}},
+            "completed_orders": ["ORD-2", "ORD-3"],
+        },
+    }
+    write_json(session_dir / "packing" / list_name / "packing_state.json", state)
+    write_json(session_dir / "session_info.json", {"pc_name": pc_name})
+    return session_dir
+
+
+class ParseCounter:
+    """Counts calls of the manager's file parsers."""
+
+    def __init__(self, manager, monkeypatch):
+        self.calls = 0
+        for name in ("_parse_session_summary", "_parse_packing_state"):
+            original = getattr(manager, name)
+            monkeypatch.setattr(manager, name, self._wrap(original))
+
+    def _wrap(self, original):
+        def counted(*args, **kwargs):
+            self.calls += 1
+            return original(*args, **kwargs)
+        return counted
+
+
+# ---------------------------------------------------------------------------
+# Incremental re-parsing
+# ---------------------------------------------------------------------------
+
+class TestIncrementalSync:
+
+    def test_unchanged_files_are_not_reparsed(self, manager, sessions_root, monkeypatch):
+        add_completed(sessions_root, "M", "2025-01-15_1")
+        add_in_progress(sessions_root, "M", "2025-01-20_1")
+        counter = ParseCounter(manager, monkeypatch)
+
+        assert len(manager.get_client_sessions("M")) == 2
+        assert counter.calls == 2
+
+        assert len(manager.get_client_sessions("M")) == 2
+        manager.get_client_analytics("M")
+        manager.search_sessions("M", "PC")
+        assert counter.calls == 2
+
+    def test_index_survives_restart(self, profile_manager, sessions_root, monkeypatch):
+        add_completed(sessions_root, "M", "2025-01-15_1")
+        first = SessionHistoryManager(profile_manager)
+        first.get_client_sessions("M")
+        first.index.close()
+        assert (profile_manager.cache_dir / DB_FILENAME).exists()
+
+        second = SessionHistoryManager(profile_manager)
+        counter = ParseCounter(second, monkeypatch)
+        sessions = second.get_client_sessions("M")
+        assert [s.session_id for s in sessions] == ["2025-01-15_1"]
+        assert counter.calls == 0
+        second.index.close()
+
+    def test_changed_file_is_reparsed(self, manager, sessions_root, monkeypatch):
+        summary_file = add_completed(sessions_root, "M", "2025-01-15_1", completed_orders=8)
+        manager.get_client_sessions("M")
+
+        data = json.loads(summary_file.read_text())
+        data["completed_orders"] = 10
+        write_json(summary_file, data)
+        settle(summary_file, age=30.0)
+
+        counter = ParseCounter(manager, monkeypatch)
+        sessions = manager.get_client_sessions("M")
+        assert sessions[0].completed_orders == 10
+        assert counter.calls == 1
+
+    def test_new_and_removed_sessions(self, manager, sessions_root):
+        add_completed(sessions_root, "M", "2025-01-15_1")
+        assert len(manager.get_client_sessions("M")) == 1
+
+        add_completed(sessions_root, "M", "2025-01-16_1", started_at="2025-01-16T10:00:00+00:00")
+        assert [s.session_id for s in manager.get_client_sessions("M")] == [
+            "2025-01-16_1", "2025-01-15_1"
+        ]
+
+        shutil.rmtree(sessions_root / "CLIENT_M" / "2025-01-15_1")
+        assert [s.session_id for s in manager.get_client_sessions("M")] == ["2025-01-16_1"]
+        assert manager.index.stats()["sources"] == 1
+
+    def test_session_info_change_reparses_state_record(self, manager, sessions_root):
+        session_dir = add_in_progress(sessions_root, "M", "2025-01-20_1", pc_name="PC-1")
+        assert manager.get_client_sessions("M")[0].pc_name == "PC-1"
+
+        write_json(session_dir / "session_info.json", {"pc_name": "WAREHOUSE-PC-2"})
+        settle(session_dir / "session_info.json", age=30.0)
+        assert manager.get_client_sessions("M")[0].pc_name == "WAREHOUSE-PC-2"
+
+    def test_racy_row_is_reparsed(self, manager, sessions_root, monkeypatch):
+        summary_file = add_completed(sessions_root, "M", "2025-01-15_1")
+        os.utime(summary_file)  # mtime "now": same tick as the sync
+        manager.get_client_sessions("M")
+
+        counter = ParseCounter(manager, monkeypatch)
+        manager.get_client_sessions("M")
+        assert counter.calls == 1
+
+    def test_unparseable_file_is_not_reparsed(self, manager, sessions_root, monkeypatch):
+        work_dir = sessions_root / "CLIENT_M" / "2025-01-15_1" / "packing" / "List1"
+        work_dir.mkdir(parents=True)
+        (work_dir / "session_summary.json").write_text("{not json")
+        settle(work_dir / "session_summary.json")
+
+        assert manager.get_client_sessions("M") == []
+        counter = ParseCounter(manager, monkeypatch)
+        assert manager.get_client_sessions("M") == []
+        assert counter.calls == 0
+
+    def test_legacy_session_without_packing_dir(self, manager, sessions_root):
+        session_dir = sessions_root / "CLIENT_M" / "20250101_120000"
+        write_json(session_dir / "barcodes" / "packing_state.json", {
+            "data": {"in_progress": {}, "completed_orders": ["A", "B"]}
+        })
+        sessions = manager.get_client_sessions("M")
+        assert len(sessions) == 1
+        assert sessions[0].completed_orders == 2
+
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+
+class TestIndexedQueries:
+
+    def test_date_range_filter_and_order(self, manager, sessions_root):
+        for day in (1, 15, 28):
+            add_completed(sessions_root, "M", f"2025-01-{day:02d}_1",
+                          started_at=f"2025-01-{day:02d}T10:00:00+00:00")
+
+        sessions = manager.get_client_sessions(
+            "M", start_date=datetime(2025, 1, 10), end_date=datetime(2025, 1, 31)
+        )
+        assert [s.session_id for s in sessions] == ["2025-01-28_1", "2025-01-15_1"]
+        assert sessions[0].start_time == datetime(2025, 1, 28, 10, tzinfo=timezone.utc)
+
+    def test_exclude_incomplete(self, manager, sessions_root):
+        add_completed(sessions_root, "M", "2025-01-15_1")
+        add_in_progress(sessions_root, "M", "2025-01-20_1")
+        sessions = manager.get_client_sessions("M", include_incomplete=False)
+        assert [s.session_id for s in sessions] == ["2025-01-15_1"]
+
+    def test_clients_are_isolated(self, manager, sessions_root):
+        add_completed(sessions_root, "M", "2025-01-15_1")
+        add_completed(sessions_root, "R", "2025-01-16_1")
+        assert [s.client_id for s in manager.get_client_sessions("M")] == ["M"]
+        assert [s.client_id for s in manager.get_client_sessions("R")] == ["R"]
+        assert manager.index.stats()["clients"] == 2
+
+    def test_records_without_start_time_sort_last(self):
+        index = SessionHistoryIndex()
+        base = dict(session_id="s", client_id="M", end_time=None, duration_seconds=None,
+                    total_orders=1, completed_orders=1, in_progress_orders=0,
+                    total_items_packed=1, worker_id=None, worker_name=None, pc_name=None,
+                    packing_list_path=None, session_path="")
+        rows = [
+            SourceRow("/a", "/s1", "summary", 1, 1, "", dict(base, session_id="none", start_time=None)),
+            SourceRow("/b", "/s2", "summary", 1, 1, "", dict(
+                base, session_id="dated", start_time=datetime(2025, 1, 1, tzinfo=timezone.utc))),
+        ]
+        index.update("M", rows, {"/a", "/b"})
+        records = index.query("M", start_date=datetime(2025, 6, 1, tzinfo=timezone.utc))
+        assert [r["session_id"] for r in records] == ["none"]
+        assert [r["session_id"] for r in index.query("M")] == ["dated", "none"]
+
+
+# ---------------------------------------------------------------------------
+# Database lifecycle
+# ---------------------------------------------------------------------------
+
+class TestDatabaseLifecycle:
+
+    def test_damaged_database_is_rebuilt(self, tmp_path):
+        db = tmp_path / DB_FILENAME
+        db.write_bytes(b"this is not a sqlite database" * 100)
+        index = SessionHistoryIndex(db)
+        assert index.db_path == str(db)
+        assert index.stats() == {'sources': 0, 'records': 0, 'clients': 0, 'rollups': 0}
+        index.close()
+
+    def test_outdated_schema_is_rebuilt(self, tmp_path):
+        db = tmp_path / DB_FILENAME
+        conn = sqlite3.connect(db)
+        conn.execute("CREATE TABLE sources (path TEXT)")
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION - 1}")
+        conn.commit()
+        conn.close()
+
+        index = SessionHistoryIndex(db)
+        assert index.stats()['sources'] == 0
+        index.close()
+
+    def test_mock_profile_manager_uses_memory_index(self):
+        pm = Mock()  # cache_dir is not a Path
+        manager = SessionHistoryManager(pm)
+        assert manager.index.db_path == ":memory:"
+
+
+# ---------------------------------------------------------------------------
+# Daily rollups
+# ---------------------------------------------------------------------------
+
+class TestRollups:
+
+    def test_grouped_by_day_worker_and_packing_list(self, manager, sessions_root):
+        add_completed(sessions_root, "M", "2025-01-15_1", list_name="DHL",
+                      started_at="2025-01-15T09:00:00+00:00", completed_orders=5,
+                      worker_id="worker_001", worker_name="Dolphin", duration_seconds=600,
+                      metrics={"total_corrections": 2, "total_extra_scans": 1,
+                               "total_unknown_scans": 3})
+        add_completed(sessions_root, "M", "2025-01-15_2", list_name="DHL",
+                      started_at="2025-01-15T14:00:00+00:00", completed_orders=7,
+                      worker_id="worker_001", worker_name="Dolphin", duration_seconds=1200,
+                      metrics={"total_corrections": 1})
+        add_completed(sessions_root, "M", "2025-01-16_1", list_name="PostOne",
+                      started_at="2025-01-16T09:00:00+00:00", completed_orders=4,
+                      worker_id="worker_002", worker_name="Seal")
+
+        rollups = manager.get_client_rollups("M")
+        assert [(r.day, r.worker_id, r.packing_list) for r in rollups] == [
+            ("2025-01-15", "worker_001", "DHL"),
+            ("2025-01-16", "worker_002", "PostOne"),
+        ]
+        dhl = rollups[0]
+        assert (dhl.sessions, dhl.orders_packed, dhl.items_packed) == (2, 12, 90)
+        assert dhl.worker_name == "Dolphin"
+        assert dhl.average_session_duration_minutes == 15.0
+        assert (dhl.corrections, dhl.extra_scans, dhl.unknown_scans) == (3, 1, 3)
+
+        by_worker = manager.get_client_rollups("M", group_by=("worker",))
+        assert [(r.worker_name, r.sessions, r.day) for r in by_worker] == [
+            ("Dolphin", 2, None), ("Seal", 1, None)
+        ]
+
+    def test_unknown_dimension_raises(self, manager):
+        with pytest.raises(ValueError):
+            manager.get_client_rollups("M", group_by=("courier",))
+
+    def test_incomplete_sessions_are_not_rolled_up(self, manager, sessions_root):
+        add_completed(sessions_root, "M", "2025-01-15_1")
+        add_in_progress(sessions_root, "M", "2025-01-20_1")
+        (total,) = manager.get_client_rollups("M", group_by=())
+        assert total.sessions == 1
+        assert total == AnalyticsRollup(
+            client_id="M", day=None, worker_id=None, worker_name=None, packing_list=None,
+            sessions=1, orders_packed=8, items_packed=45, duration_seconds=3600.0,
+            timed_sessions=1,
+        )
+
+    def test_changed_and_removed_summaries_update_rollups(self, manager, sessions_root):
+        summary_file = add_completed(sessions_root, "M", "2025-01-15_1", completed_orders=8)
+        add_completed(sessions_root, "M", "2025-01-16_1", completed_orders=3,
+                      started_at="2025-01-16T10:00:00+00:00")
+        assert manager.get_client_analytics("M").total_orders_packed == 11
+
+        data = json.loads(summary_file.read_text())
+        data["completed_orders"] = 10
+        write_json(summary_file, data)
+        settle(summary_file, age=30.0)
+        assert manager.get_client_analytics("M").total_orders_packed == 13
+
+        shutil.rmtree(sessions_root / "CLIENT_M" / "2025-01-16_1")
+        assert manager.get_client_analytics("M").total_orders_packed == 10
+        assert manager.index.stats()["rollups"] == 1
+
+    def test_range_boundaries_cut_through_days(self, manager, sessions_root):
+        for hour in (8, 12, 16):
+            add_completed(sessions_root, "M", f"2025-01-15_{hour}", completed_orders=hour,
+                          started_at=f"2025-01-15T{hour:02d}:00:00+00:00")
+        add_completed(sessions_root, "M", "2025-01-16_1", completed_orders=1,
+                      started_at="2025-01-16T10:00:00+00:00")
+
+        start = datetime(2025, 1, 15, 10, tzinfo=timezone.utc)
+        end = datetime(2025, 1, 16, 23, tzinfo=timezone.utc)
+        rollups = manager.get_client_rollups("M", start, end, group_by=("day",))
+        assert [(r.day, r.sessions, r.orders_packed) for r in rollups] == [
+            ("2025-01-15", 2, 28), ("2025-01-16", 1, 1)
+        ]
+
+    def test_analytics_match_session_records(self, manager, sessions_root):
+        for day, orders, duration in ((1, 5, 600), (2, 3, 1800), (3, 7, 900)):
+            add_completed(sessions_root, "M", f"2025-01-{day:02d}_1", completed_orders=orders,
+                          started_at=f"2025-01-{day:02d}T10:00:00+02:00",
+                          duration_seconds=duration)
+        start, end = datetime(2025, 1, 2), datetime(2025, 1, 31)
+
+        analytics = manager.get_client_analytics("M", start, end)
+        sessions = manager.get_client_sessions("M", start, end, include_incomplete=False)
+        assert analytics.total_sessions == len(sessions) == 2
+        assert analytics.total_orders_packed == sum(s.completed_orders for s in sessions)
+        assert analytics.average_session_duration_minutes == 22.5
+        assert analytics.last_session_date == sessions[0].start_time
+
+    def test_sessions_without_start_time_are_always_included(self):
+        index = SessionHistoryIndex()
+        record = dict(session_id="s", client_id="M", start_time=None, end_time=None,
+                      duration_seconds=None, total_orders=2, completed_orders=2,
+                      in_progress_orders=0, total_items_packed=4, worker_id=None,
+                      worker_name=None, pc_name=None, packing_list_path=None, session_path="")
+        index.update("M", [SourceRow("/a", "/s", "summary", 1, 1, "", record)], {"/a"})
+        rows = index.rollups("M", start_date=datetime(2025, 6, 1, tzinfo=timezone.utc))
+        assert [(r["day"], r["sessions"], r["duration_sessions"]) for r in rows] == [("", 1, 0)]
+
+    def test_refresh_session_indexes_written_summary(self, manager, sessions_root, monkeypatch):
+        add_completed(sessions_root, "M", "2025-01-15_1")
+        manager.get_client_sessions("M")
+
+        add_completed(sessions_root, "M", "2025-01-16_1", completed_orders=4,
+                      started_at="2025-01-16T10:00:00+00:00")
+        manager.refresh_session("M", sessions_root / "CLIENT_M" / "2025-01-16_1")
+        rows = manager.index.rollups("M")
+        assert [(r["day"], r["orders"]) for r in rows] == [("2025-01-15", 8), ("2025-01-16", 4)]
+
+        # The next sync has nothing left to parse
+        counter = ParseCounter(manager, monkeypatch)
+        assert manager.get_client_analytics("M").total_sessions == 2
+        assert counter.calls == 0
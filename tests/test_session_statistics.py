@@ -0,0 +1,71 @@
+"""
+Tests for SessionStatistics — statistics-tab totals maintained by per-order deltas.
+"""
+
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from packer_logic import PackerLogic
+from session_statistics import STATUS_COMPLETED, STATUS_IN_PROGRESS, STATUS_PENDING, SessionStatistics
+
+
+@pytest.fixture
+def logic(tmp_path):
+    profile_manager = MagicMock()
+    profile_manager.load_sku_mapping.return_value = {}
+    logic = PackerLogic(client_id="TEST", profile_manager=profile_manager, work_dir=str(tmp_path))
+    logic.processed_df = pd.DataFrame({
+        'Order_Number': ['#1001', '#1001', '#1002', '#1003'],
+        'SKU': ['RED-1', 'BLUE-2', 'RED-1', 'GREEN-3'],
+        'Product_Name': ['Red', 'Blue', 'Red', 'Green'],
+        'Quantity': ['2', '1', '1', '1'],
+        'Courier': ['DHL', 'DHL', 'UPS', 'UPS'],
+    })
+    logic.orders_data = {
+        order: {'items': group.to_dict('records'), 'metadata': {}}
+        for order, group in logic.processed_df.groupby('Order_Number', sort=False)
+    }
+    yield logic
+    logic.close()
+
+
+def _scanned(stats):
+    return {sku: stats.scanned(sku) for sku, _, _ in stats.sku_rows}
+
+
+def test_deltas_match_full_recount(logic):
+    stats = SessionStatistics(logic.session_store)
+    stats.rebuild(logic.session_packing_state)
+    assert stats.courier_summary == [('DHL', 1, 3.0), ('UPS', 2, 2.0)]
+    assert stats.status_counts == {STATUS_PENDING: 3, STATUS_IN_PROGRESS: 0, STATUS_COMPLETED: 0}
+
+    state = logic.session_packing_state
+    logic.start_order_packing('1001')
+    assert stats.order_changed('#1001', state) == set()
+    logic.process_sku_scan('RED-1')
+    assert stats.order_changed('#1001', state) == {'RED-1'}
+    assert stats.rows_for_skus({'RED-1'}) == [2]  # rows sorted by SKU
+    assert stats.status_counts[STATUS_IN_PROGRESS] == 1
+
+    logic.process_sku_scan('RED-1')
+    logic.process_sku_scan('BLUE-2')
+    assert stats.order_changed('#1001', state) == {'RED-1', 'BLUE-2'}
+    assert stats.completed_orders == 1
+    assert stats.status_counts == {STATUS_PENDING: 2, STATUS_IN_PROGRESS: 0, STATUS_COMPLETED: 1}
+
+    logic.start_order_packing('1002')
+    logic.process_sku_scan('RED-1')
+    stats.order_changed('#1002', state)
+
+    full = SessionStatistics(logic.session_store)
+    full.rebuild(state)
+    assert _scanned(stats) == _scanned(full) == {'BLUE-2': 1, 'GREEN-3': 0, 'RED-1': 3}
+    assert stats.status_counts == full.status_counts
+
+
+def test_unknown_order_is_ignored(logic):
+    stats = SessionStatistics(logic.session_store)
+    assert stats.order_changed('#9999', logic.session_packing_state) == set()
+    assert stats.status_counts[STATUS_PENDING] == 3
@@ -0,0 +1,220 @@
+"""
+Tests for session_store — the columnar order/item store behind PackerLogic —
+plus a memory measurement against the previous DataFrame + dict-of-records layout.
+"""
+
+import gc
+import tracemalloc
+
+import pandas as pd
+import pytest
+
+from session_store import OrdersView, SessionStore, SessionStoreBuilder
+
+
+def _orders(count, lines_per_order=4):
+    """Shopify-style order records with per-order extra fields."""
+    return [
+        {
+            "order_number": f"ORD-{n:06d}",
+            "courier": ("DHL", "PostOne", "Speedy")[n % 3],
+            "customer_name": f"Customer {n}",
+            "shipping_address": f"{n} Long Street, Apartment {n % 97}, Sofia",
+            "phone": f"+359 88 {n:07d}",
+            "email": f"customer{n}@example.com",
+            "tags": ["priority", "gift"] if n % 5 == 0 else [],
+            "notes": "Leave at the door" if n % 7 == 0 else "",
+            "items": [
+                {"sku": f"SKU-{(n * 7 + i) % 800:04d}", "product_name": f"Product {(n * 7 + i) % 800}",
+                 "quantity": 1 + i % 3}
+                for i in range(lines_per_order)
+            ],
+        }
+        for n in range(count)
+    ]
+
+
+def _build(orders):
+    builder = SessionStoreBuilder()
+    for order in orders:
+        fields = {'Courier': order['courier']}
+        for key, value in order.items():
+            if key not in ('order_number', 'courier', 'items'):
+                fields[key.replace('_', ' ').title().replace(' ', '_')] = str(value)
+        entry_id = builder.add_entry(fields)
+        for item in order['items']:
+            builder.add_line(order['order_number'], item['sku'], item['product_name'],
+                             str(item['quantity']), entry_id)
+        builder.set_metadata(order['order_number'], order)
+    return builder.build()
+
+
+def _legacy_layout(orders):
+    """The previous layout: packing_list_df + processed_df copy + per-order record dicts."""
+    rows = []
+    for order in orders:
+        for item in order['items']:
+            row = {
+                'Order_Number': order['order_number'],
+                'SKU': item['sku'],
+                'Product_Name': item['product_name'],
+                'Quantity': str(item['quantity']),
+                'Courier': order['courier'],
+            }
+            for key, value in order.items():
+                if key not in ('order_number', 'courier', 'items'):
+                    row[key.replace('_', ' ').title().replace(' ', '_')] = str(value)
+            rows.append(row)
+    df = pd.DataFrame(rows)
+    processed = df.copy()
+    # Same per-row record dicts as to_dict('records') per order group, built in one pass
+    orders_data = {}
+    for record in df.to_dict('records'):
+        orders_data.setdefault(record['Order_Number'], {'items': []})['items'].append(record)
+    return df, processed, orders_data
+
+
+def test_items_match_previous_row_dicts():
+    orders = _orders(3)
+    store = _build(orders)
+    df, _, legacy = _legacy_layout(orders)
+
+    assert store.columns == list(df.columns)
+    for order_number in store.order_numbers:
+        assert store.items(order_number) == legacy[order_number]['items']
+
+
+def test_dataframe_view_matches_previous_dataframe():
+    orders = _orders(5)
+    df, _, _ = _legacy_layout(orders)
+
+    pd.testing.assert_frame_equal(_build(orders).to_dataframe(), df)
+
+
+def test_lines_of_repeated_order_number_are_grouped():
+    builder = SessionStoreBuilder()
+    entry = builder.add_entry({'Courier': 'DHL'})
+    builder.add_line('A', 'S1', 'P1', '1', entry)
+    builder.add_line('B', 'S2', 'P2', '1', entry)
+    builder.add_line('A', 'S3', 'P3', '2', entry)
+    store = builder.build()
+
+    assert store.order_numbers == ['A', 'B']
+    assert [sku for sku, _, _ in store.iter_lines('A')] == ['S1', 'S3']
+    assert store.order_quantities() == {'A': 3.0, 'B': 1.0}
+
+
+def test_aggregates():
+    df = pd.DataFrame({
+        'Order_Number': ['O1', 'O1', 'O2', 'O3'],
+        'SKU': ['A', 'B', 'A', 'C'],
+        'Product_Name': ['Pa', 'Pb', 'Pa', 'Pc'],
+        'Quantity': ['2', '1', '3', 'n/a'],
+        'Courier': ['DHL', 'DHL', 'UPS', 'DHL'],
+    })
+    store = SessionStore.from_dataframe(df)
+
+    assert store.courier_summary() == [('DHL', 2, 3.0), ('UPS', 1, 3.0)]
+    assert store.sku_summary() == [('A', 'Pa', 5.0), ('B', 'Pb', 1.0), ('C', 'Pc', 0.0)]
+    assert store.sku_quantities(['O1']) == {'A': 2.0, 'B': 1.0}
+    assert store.unique_sku_count() == 3
+    assert store.courier('O2') == 'UPS'
+    assert store.courier('missing') == 'N/A'
+
+
+def test_orders_view_mapping():
+    orders = _orders(2)
+    orders[0]['tags'] = ['vip']
+    view = OrdersView(_build(orders))
+
+    assert list(view) == ['ORD-000000', 'ORD-000001']
+    assert len(view) == 2
+    assert 'ORD-000001' in view and 'nope' not in view
+    assert view['ORD-000000']['metadata']['tags'] == ['vip']
+    assert view['ORD-000000'] is view['ORD-000000']  # current order cached
+    with pytest.raises(KeyError):
+        view['nope']
+
+
+def test_from_dataframe_without_standard_columns():
+    store = SessionStore.from_dataframe(pd.DataFrame({'Order_Number': ['O1'], 'Quantity': [2]}))
+
+    assert store.items('O1') == [{'Order_Number': 'O1', 'Quantity': 2}]
+    assert store.unique_sku_count() == 0
+    assert list(store.to_dataframe().columns) == ['Order_Number', 'Quantity']
+
+
+def _retained_bytes(build):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return current
+
+
+@pytest.mark.slow
+def test_memory_60k_lines_store_vs_previous_layout():
+    """
+    Memory retained for a 60k-line list (15,000 orders x 4 lines, 6 extra
+    order fields). Run with -s to see the numbers.
+    """
+    orders = _orders(15_000)
+
+    legacy = _retained_bytes(lambda: _legacy_layout(orders))
+    store = _retained_bytes(lambda: _build(orders))
+
+    print(f"\n60k lines: previous layout {legacy / 2**20:.1f} MiB, session store {store / 2**20:.1f} MiB "
+          f"({legacy / store:.1f}x smaller)")
+    assert store * 3 < legacy
+
+
+def test_filter_proxy_matches_order_skus(qapp):
+    from custom_filter_proxy_model import CustomFilterProxyModel
+    from order_table_model import OrderTableModel
+
+    source = OrderTableModel(pd.DataFrame({'Order_Number': ['O1', 'O2', 'O3'], 'Status': ['New'] * 3}))
+    proxy = CustomFilterProxyModel()
+    proxy.setSourceModel(source)
+    proxy.set_processed_df(pd.DataFrame({
+        'Order_Number': ['O1', 'O2', 'O2', 'O3'],
+        'SKU': ['RED-1', 'BLUE-2', 'Red-9', None],
+        'Product_Name': ['a', 'b', 'c', 'd'],
+        'Quantity': ['1', '1', '1', '1'],
+    }))
+
+    proxy.setFilterFixedString('red')
+    visible = [proxy.index(row, 0).data() for row in range(proxy.rowCount())]
+
+    assert visible == ['O1', 'O2']
+
+
+@pytest.mark.slow
+def test_benchmark_load_10k_order_packing_list(tmp_path):
+    """
+    Session start for a 10,000-order JSON packing list (40k lines). The
+    previous per-order boolean-mask grouping took about a minute here.
+    """
+    import json
+    import time
+    from unittest.mock import MagicMock
+    from packer_logic import PackerLogic
+
+    path = tmp_path / "list.json"
+    path.write_text(json.dumps({"list_name": "Bench", "orders": _orders(10_000)}), encoding='utf-8')
+    profile_manager = MagicMock()
+    profile_manager.load_sku_mapping.return_value = {}
+    logic = PackerLogic(client_id="TEST", profile_manager=profile_manager, work_dir=str(tmp_path / "work"))
+    try:
+        start = time.perf_counter()
+        order_count, _ = logic.load_packing_list_json(path)
+        elapsed = time.perf_counter() - start
+    finally:
+        logic.close()
+
+    print(f"\n10k orders loaded in {elapsed:.2f} s")
+    assert order_count == 10_000
@@ -0,0 +1,127 @@
+"""
+Tests for SessionsTableModel / SessionsFilterProxyModel and the keyed-diff
+refresh of SessionsListWidget.
+"""
+
+from datetime import date
+
+import pytest
+from PySide6.QtCore import QModelIndex
+
+from session_browser.sessions_list_widget import SessionsListWidget
+from session_browser.sessions_table_model import (
+    COL_ITEMS, COL_STATUS, ENTRY_ROLE, SessionsFilterProxyModel, SessionsTableModel, entry_key,
+)
+
+
+def _entry(session_id, status="completed", day=1, worker="Anna", items=10, **extra):
+    entry = {
+        "session_id": session_id,
+        "packing_list_name": "DHL_Orders",
+        "status": status,
+        "started_at": f"2025-11-{day:02d}T10:00:00",
+        "worker_name": worker,
+        "pc_name": "PC-1",
+        "total_items": items,
+        "total_orders": 4,
+        "completed_orders": 4,
+    }
+    entry.update(extra)
+    return entry
+
+
+ENTRIES = [
+    _entry("S1", day=1),
+    _entry("S2", status="in_progress", day=2, worker="Bob"),
+    _entry("S3", status="paused", day=3),
+    _entry("S4", day=4, items=3),
+]
+
+
+@pytest.fixture
+def models(qapp):
+    model = SessionsTableModel()
+    proxy = SessionsFilterProxyModel()
+    proxy.setSourceModel(model)
+    proxy.sort(COL_STATUS)
+    model.apply_entries(ENTRIES)
+    return model, proxy
+
+
+def _ids(proxy):
+    return [proxy.entry(row)["session_id"] for row in range(proxy.rowCount())]
+
+
+def test_apply_entries_is_a_keyed_diff(models):
+    model, _ = models
+    events = []
+    model.rowsInserted.connect(lambda _p, first, last: events.append(("insert", first, last)))
+    model.rowsRemoved.connect(lambda _p, first, last: events.append(("remove", first, last)))
+    model.dataChanged.connect(lambda top, _bottom: events.append(("update", top.row())))
+    model.modelReset.connect(lambda: events.append("reset"))
+
+    assert model.apply_entries(ENTRIES) == (0, 0, 0)
+    assert events == []
+
+    refreshed = [ENTRIES[0], _entry("S2", status="completed", day=2, worker="Bob"),
+                 ENTRIES[3], _entry("S5", day=5)]
+    assert model.apply_entries(refreshed) == (1, 1, 1)
+    assert events == [("remove", 2, 2), ("update", 1), ("insert", 3, 3)]
+    assert model.row_of(entry_key(ENTRIES[2])) == -1
+    assert model.index(1, COL_STATUS).data() == "✅ Completed"
+    assert model.index(3, 0).data(ENTRY_ROLE)["session_id"] == "S5"
+
+
+def test_proxy_default_order_and_typed_sorting(models):
+    _, proxy = models
+    # Active first, then newest first within a status
+    assert _ids(proxy) == ["S2", "S3", "S4", "S1"]
+    proxy.sort(COL_ITEMS)
+    assert _ids(proxy)[0] == "S4"  # 3 items sorts before 10 (numeric, not text)
+
+
+def test_proxy_filters(models):
+    _, proxy = models
+    proxy.set_filters(status="completed")
+    assert sorted(_ids(proxy)) == ["S1", "S4"]
+    proxy.set_filters(search="  BOB ")
+    assert _ids(proxy) == ["S2"]
+    proxy.set_filters(date_from=date(2025, 11, 2), date_to=date(2025, 11, 3))
+    assert _ids(proxy) == ["S2", "S3"]
+    proxy.set_filters()
+    assert proxy.rowCount() == 4
+    assert proxy.entry(99) is None
+
+
+def test_entries_without_worker_pc_or_name(models):
+    """In-progress registry entries carry None for fields packing_state.json lacks."""
+    model, proxy = models
+    bare = _entry("S6", status="in_progress", day=6, worker=None,
+                  worker_id=None, pc_name=None, packing_list_name=None)
+    assert model.apply_entries(ENTRIES + [bare]) == (1, 0, 0)
+    assert model.rowCount() == 5
+    assert model.index(4, 0).data(ENTRY_ROLE)["session_id"] == "S6"
+
+    proxy.set_filters(search="s6")
+    assert _ids(proxy) == ["S6"]
+
+
+def test_widget_refresh_keeps_selection(qtbot):
+    widget = SessionsListWidget(registry_manager=None, session_history_manager=None)
+    qtbot.addWidget(widget)
+    widget.load_client("M")
+    widget._on_refresh_complete("M", ENTRIES)
+
+    table = widget._table
+    table.selectRow(2)  # S4
+    assert widget._get_row_entry(table.currentIndex().row())["session_id"] == "S4"
+
+    # Auto-refresh: S3 finished, a new list appeared; S4 stays selected
+    widget._on_refresh_complete("M", [ENTRIES[0], ENTRIES[1], _entry("S3", day=3), ENTRIES[3],
+                                      _entry("S9", status="not_started", day=9)])
+    assert widget._get_row_entry(table.currentIndex().row())["session_id"] == "S4"
+    assert widget._proxy.rowCount() == 5
+
+    widget._search_input.setText("nobody")
+    assert widget._visible_entries() == []
+    assert widget._model.rowCount(QModelIndex()) == 5
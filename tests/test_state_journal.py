@@ -0,0 +1,221 @@
+"""
+Tests for the append-only scan journal (state_journal) and its use by PackerLogic:
+snapshot + journal replay on resume, compaction at checkpoints, legacy files.
+"""
+
+import json
+import os
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from async_state_writer import AsyncStateWriter
+from packer_logic import PackerLogic, STATE_FILE_NAME
+from state_journal import JOURNAL_FILE_NAME, StateJournal
+
+
+def _make_logic(work_dir, **kwargs):
+    profile_manager = MagicMock()
+    profile_manager.load_sku_mapping.return_value = {}
+    return PackerLogic(client_id="TEST", profile_manager=profile_manager, work_dir=str(work_dir), **kwargs)
+
+
+def _load_orders(logic):
+    df = pd.DataFrame({
+        'Order_Number': ['O1', 'O1', 'O2'],
+        'SKU': ['A', 'B', 'C'],
+        'Product_Name': ['Prod A', 'Prod B', 'Prod C'],
+        'Quantity': ['2', '1', '1'],
+        'Courier': ['DHL', 'DHL', 'DHL'],
+    })
+    logic.processed_df = df
+    logic.orders_data = {
+        order: {'items': group.to_dict('records')}
+        for order, group in df.groupby('Order_Number', sort=False)
+    }
+
+
+def _journal_lines(work_dir):
+    path = Path(work_dir) / JOURNAL_FILE_NAME
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines() if line.strip()]
+
+
+@pytest.fixture
+def logic(tmp_path):
+    logic = _make_logic(tmp_path)
+    _load_orders(logic)
+    yield logic
+    logic.close()
+
+
+def test_scans_append_journal_records_instead_of_snapshots(logic, tmp_path):
+    logic.start_order_packing('O1')
+    logic.process_sku_scan('A')
+    logic._state_writer.flush()
+
+    assert not (tmp_path / STATE_FILE_NAME).exists()
+    records = _journal_lines(tmp_path)
+    assert [r['event'] for r in records] == ['start', 'scan']
+    assert [r['seq'] for r in records] == [1, 2]
+    assert records[-1]['order_state'][0]['packed'] == 1
+
+
+def test_resume_after_crash_replays_journal(tmp_path):
+    first = _make_logic(tmp_path)
+    _load_orders(first)
+    first.start_order_packing('O1')
+    first.process_sku_scan('A')
+    first.process_sku_scan('A')
+    first.clear_current_order()
+    first.start_order_packing('O2')
+    first.skip_order()
+    # Simulated crash: journal appended, no close() / final snapshot
+    first._state_writer.flush()
+
+    resumed = _make_logic(tmp_path)
+    try:
+        state = resumed.session_packing_state
+        assert [i['packed'] for i in state['in_progress']['O1']] == [2, 0]
+        assert state['skipped_orders'] == ['O2']
+        assert 'O2' in state['skipped_orders_timing']
+        # New records continue after the replayed ones
+        assert resumed._journal.seq == 5
+    finally:
+        resumed.close()
+        first._state_writer.shutdown()
+
+
+def test_order_completion_writes_snapshot_and_compacts_journal(logic, tmp_path):
+    logic.start_order_packing('O1')
+    logic.process_sku_scan('A')
+    logic.process_sku_scan('A')
+    _, status = logic.process_sku_scan('B')
+    assert status == "ORDER_COMPLETE"
+
+    state = json.loads((tmp_path / STATE_FILE_NAME).read_text(encoding='utf-8'))
+    assert state['journal_seq'] == 4
+    assert [c['order_number'] for c in state['completed']] == ['O1']
+    assert _journal_lines(tmp_path) == []
+
+
+def test_snapshot_every_n_events(tmp_path):
+    logic = _make_logic(tmp_path)
+    logic._journal.snapshot_interval = 3
+    _load_orders(logic)
+    try:
+        logic.start_order_packing('O1')
+        logic.process_sku_scan('A')
+        logic.process_sku_scan('X')  # unknown SKU: not persisted
+        assert not (tmp_path / STATE_FILE_NAME).exists()
+
+        logic.process_sku_scan('A')  # third event → compaction snapshot
+        logic._state_writer.flush()
+
+        state = json.loads((tmp_path / STATE_FILE_NAME).read_text(encoding='utf-8'))
+        assert state['journal_seq'] == 3
+        assert [i['packed'] for i in state['in_progress']['O1']] == [2, 0]
+        assert _journal_lines(tmp_path) == []
+    finally:
+        logic.close()
+
+
+def test_stale_journal_records_before_snapshot_are_ignored(tmp_path):
+    logic = _make_logic(tmp_path)
+    _load_orders(logic)
+    logic.start_order_packing('O1')
+    logic.process_sku_scan('A')
+    logic.save_state()
+    logic.process_sku_scan('A')
+    logic._state_writer.flush()
+
+    # Compaction failed / was interrupted: the covered records are still there
+    journal_path = tmp_path / JOURNAL_FILE_NAME
+    stale = [
+        json.dumps({"seq": 1, "event": "start", "order_number": "O1",
+                    "order_state": [{"normalized_sku": "a", "required": 2, "packed": 0, "row": 0}]}),
+    ]
+    journal_path.write_text("\n".join(stale) + "\n" + journal_path.read_text(encoding='utf-8'), encoding='utf-8')
+    logic._state_writer.shutdown()
+
+    resumed = _make_logic(tmp_path)
+    try:
+        assert resumed.session_packing_state['in_progress']['O1'][0]['packed'] == 2
+    finally:
+        resumed.close()
+
+
+def test_legacy_snapshot_without_journal_seq_discards_journal(tmp_path):
+    (tmp_path / STATE_FILE_NAME).write_text(json.dumps({
+        "in_progress": {"O1": [{"original_sku": "A", "normalized_sku": "a", "required": 2, "packed": 1, "row": 0}]},
+        "completed_orders": [],
+    }), encoding='utf-8')
+    (tmp_path / JOURNAL_FILE_NAME).write_text(json.dumps({
+        "seq": 7, "event": "scan", "order_number": "O1",
+        "order_state": [{"original_sku": "A", "normalized_sku": "a", "required": 2, "packed": 2, "row": 0}],
+    }) + "\n", encoding='utf-8')
+
+    logic = _make_logic(tmp_path)
+    try:
+        assert logic.session_packing_state['in_progress']['O1'][0]['packed'] == 1
+        assert not (tmp_path / JOURNAL_FILE_NAME).exists()
+    finally:
+        logic.close()
+
+
+def test_torn_last_journal_line_is_skipped(tmp_path):
+    journal = StateJournal(tmp_path / JOURNAL_FILE_NAME)
+    lines = [journal.encode("scan", {"order_number": "O1"}), journal.encode("scan", {"order_number": "O1"})]
+    journal.write_lines(lines)
+    with open(journal.path, 'a', encoding='utf-8') as f:
+        f.write('{"seq": 3, "event": "sc')
+
+    reader = StateJournal(journal.path)
+    records = reader.read_records()
+    assert [r['seq'] for r in records] == [1, 2]
+    assert reader.seq == 2
+
+
+def test_compact_keeps_records_newer_than_snapshot(tmp_path):
+    journal = StateJournal(tmp_path / JOURNAL_FILE_NAME)
+    journal.write_lines([journal.encode("scan", {}) for _ in range(5)])
+
+    journal.compact(3)
+
+    assert [r['seq'] for r in _journal_lines(tmp_path)] == [4, 5]
+
+
+def test_legacy_mode_rewrites_state_file_without_journal(tmp_path):
+    logic = _make_logic(tmp_path, use_state_journal=False)
+    _load_orders(logic)
+    try:
+        logic.start_order_packing('O1')
+        logic.process_sku_scan('A')
+        logic._state_writer.flush()
+
+        state = json.loads((tmp_path / STATE_FILE_NAME).read_text(encoding='utf-8'))
+        assert 'journal_seq' not in state
+        assert state['in_progress']['O1'][0]['packed'] == 1
+        assert not os.path.exists(tmp_path / JOURNAL_FILE_NAME)
+    finally:
+        logic.close()
+
+
+def test_writer_appends_lines_before_the_state_scheduled_after_them():
+    calls = []
+    writer = AsyncStateWriter(lambda state: calls.append(('state', state['n'])),
+                              append_fn=lambda lines: calls.append(('lines', list(lines))))
+    try:
+        writer.append("a\n")
+        writer.append("b\n")
+        writer.schedule({'n': 1})
+        writer.flush()
+    finally:
+        writer.shutdown()
+
+    flat_lines = [line for kind, payload in calls if kind == 'lines' for line in payload]
+    assert flat_lines == ["a\n", "b\n"]
+    assert calls[-1] == ('state', 1)
@@ -0,0 +1,146 @@
+"""
+Tests for state_snapshot — pre-encoded completed orders and copy-free
+AsyncStateWriter snapshots — plus a micro-benchmark of schedule() cost
+as the session grows.
+"""
+
+import copy
+import json
+import statistics
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from async_state_writer import AsyncStateWriter
+from packer_logic import PackerLogic
+from state_snapshot import CompletedOrdersEncoder, EncodedList, dumps_state
+
+
+def _record(n):
+    return {
+        "order_number": f"ORDER-{n}",
+        "started_at": "2026-01-10T10:00:00",
+        "completed_at": "2026-01-10T10:01:00",
+        "duration_seconds": 60,
+        "items_count": 3,
+        "items": [
+            {"sku": f"SKU-{i}", "title": "Товар", "quantity": 1, "row": i,
+             "scanned_at": "2026-01-10T10:00:30", "time_from_order_start_seconds": 30}
+            for i in range(3)
+        ],
+    }
+
+
+def test_dumps_state_matches_plain_json():
+    records = [_record(1), _record(2)]
+    encoder = CompletedOrdersEncoder()
+    state = {"version": "1.3.0", "completed": encoder.encode(records), "skipped_orders": ["X"]}
+
+    loaded = json.loads(dumps_state(state))
+
+    assert loaded == {"version": "1.3.0", "completed": records, "skipped_orders": ["X"]}
+    assert list(loaded) == ["version", "completed", "skipped_orders"]  # key order kept
+
+
+def test_dumps_state_empty_encoded_list():
+    state = {"completed": CompletedOrdersEncoder().encode([])}
+    assert json.loads(dumps_state(state)) == {"completed": []}
+
+
+def test_encoder_only_encodes_new_records():
+    records = [_record(1)]
+    encoder = CompletedOrdersEncoder()
+    first = encoder.encode(records)
+
+    records.append(_record(2))
+    second = encoder.encode(records)
+
+    # Earlier view is unaffected by later appends
+    assert len(first) == 1
+    assert [r["order_number"] for r in second.to_list()] == ["ORDER-1", "ORDER-2"]
+    assert second._fragments is first._fragments
+
+
+def test_encoder_restarts_when_list_replaced():
+    encoder = CompletedOrdersEncoder()
+    first = encoder.encode([_record(1), _record(2)])
+
+    replaced = encoder.encode([_record(9)])
+
+    assert [r["order_number"] for r in replaced.to_list()] == ["ORDER-9"]
+    assert [r["order_number"] for r in first.to_list()] == ["ORDER-1", "ORDER-2"]
+
+
+def test_snapshot_is_detached_from_live_state(tmp_path):
+    profile_manager = MagicMock()
+    profile_manager.load_sku_mapping.return_value = {}
+    logic = PackerLogic(client_id="TEST", profile_manager=profile_manager, work_dir=str(tmp_path))
+    try:
+        logic.completed_orders_metadata = [_record(1)]
+        logic.session_packing_state['in_progress']['O1'] = [
+            {'original_sku': 'A', 'normalized_sku': 'a', 'required': 2, 'packed': 0, 'row': 0}
+        ]
+        logic.current_extra_items = {'a': 1}
+
+        snapshot = logic._build_state_snapshot()
+        logic.session_packing_state['in_progress']['O1'][0]['packed'] = 2
+        logic.current_extra_items['a'] = 5
+        logic.completed_orders_metadata.append(_record(2))
+
+        loaded = json.loads(dumps_state(snapshot))
+        assert loaded['in_progress']['O1'][0]['packed'] == 0
+        assert loaded['_current_extras'] == {'a': 1}
+        assert [c['order_number'] for c in loaded['completed']] == ['ORDER-1']
+    finally:
+        logic.close()
+
+
+@pytest.mark.slow
+def test_benchmark_schedule_cost_flat_across_session(tmp_path):
+    """
+    Micro-benchmark: UI-thread cost of building + scheduling a state snapshot
+    after 1 vs 5,000 completed orders. Run with -s to see the timings.
+    """
+    profile_manager = MagicMock()
+    profile_manager.load_sku_mapping.return_value = {}
+    logic = PackerLogic(client_id="TEST", profile_manager=profile_manager, work_dir=str(tmp_path))
+    writer = AsyncStateWriter(lambda state: None)
+    logic.session_packing_state['in_progress']['CURRENT'] = [
+        {'original_sku': f'S{i}', 'normalized_sku': f's{i}', 'required': 1, 'packed': 0, 'row': i}
+        for i in range(5)
+    ]
+
+    def measure(repeats=30):
+        logic._build_state_snapshot()  # warm the encoder with newly completed orders
+        samples = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            writer.schedule(logic._build_state_snapshot(), copy_state=False)
+            samples.append(time.perf_counter() - start)
+        return statistics.median(samples)
+
+    try:
+        results = {}
+        logic.completed_orders_metadata = [_record(0)]
+        results[1] = measure()
+        for target in (1000, 5000):
+            logic.completed_orders_metadata.extend(
+                _record(n) for n in range(len(logic.completed_orders_metadata), target)
+            )
+            results[target] = measure()
+
+        start = time.perf_counter()
+        copy.deepcopy(logic._build_state_dict())
+        deepcopy_5000 = time.perf_counter() - start
+
+        print("\nschedule() cost (median):")
+        for orders, seconds in results.items():
+            print(f"  {orders:>5} completed orders: {seconds * 1e6:8.1f} us")
+        print(f"  previous deepcopy at 5000 orders: {deepcopy_5000 * 1e6:8.1f} us")
+
+        assert results[5000] < max(results[1] * 5, results[1] + 0.002)
+        assert results[5000] < deepcopy_5000
+    finally:
+        writer.shutdown()
+        logic.close()
@@ -0,0 +1,248 @@
+"""
+Tests for wave packing — SKU routing across several open orders
+(wave_packing.Wave) and PackerLogic's wave mode.
+"""
+
+import json
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from packer_logic import PackerLogic
+from packing_progress import OrderProgress
+from wave_packing import (
+    TIE_BREAK_FEWEST_REMAINING, TIE_BREAK_MOST_REMAINING, Wave, WaveOrderContext,
+)
+
+
+def _context(order_number, lines):
+    state = [
+        {'original_sku': sku, 'normalized_sku': sku, 'required': qty, 'packed': 0, 'row': i}
+        for i, (sku, qty) in enumerate(lines)
+    ]
+    return WaveOrderContext(order_number, state, OrderProgress(state))
+
+
+# ----------------------------------------------------------------------------
+# Wave routing
+# ----------------------------------------------------------------------------
+
+def test_route_prefers_lowest_slot_then_moves_on():
+    wave = Wave(max_orders=3)
+    a, b = _context('A', [('x', 1)]), _context('B', [('x', 1), ('y', 1)])
+    wave.add(a)
+    wave.add(b)
+
+    assert wave.route('x') == ('A', True)
+    a.progress.pack_one(a.order_state[0])
+    assert wave.route('x') == ('B', True)
+    b.progress.pack_one(b.order_state[0])
+    # Nobody needs x any more: an extra for the focused order (or the first carrier)
+    assert wave.route('x', focused='B') == ('B', False)
+    assert wave.route('x') == ('A', False)
+    assert wave.route('unknown') == (None, False)
+
+
+@pytest.mark.parametrize("tie_break, expected", [
+    (TIE_BREAK_FEWEST_REMAINING, 'SMALL'),
+    (TIE_BREAK_MOST_REMAINING, 'BIG'),
+])
+def test_route_tie_breaks(tie_break, expected):
+    wave = Wave(max_orders=2, tie_break=tie_break)
+    wave.add(_context('BIG', [('x', 1), ('y', 5)]))
+    wave.add(_context('SMALL', [('x', 1)]))
+
+    assert wave.route('x') == (expected, True)
+
+
+def test_slots_are_reused_and_index_cleaned():
+    wave = Wave(max_orders=2)
+    assert wave.add(_context('A', [('x', 1)])) == 1
+    assert wave.add(_context('B', [('y', 1)])) == 2
+    assert wave.is_full
+    with pytest.raises(ValueError):
+        wave.add(_context('C', [('z', 1)]))
+
+    wave.remove('A')
+    assert wave.route('x') == (None, False)
+    assert wave.add(_context('C', [('z', 1)])) == 1
+
+
+def test_invalid_settings_rejected():
+    with pytest.raises(ValueError):
+        Wave(max_orders=0)
+    with pytest.raises(ValueError):
+        Wave(tie_break='random')
+
+
+# ----------------------------------------------------------------------------
+# PackerLogic wave mode
+# ----------------------------------------------------------------------------
+
+@pytest.fixture
+def profile_manager():
+    pm = MagicMock()
+    pm.load_sku_mapping.return_value = {}
+    return pm
+
+
+def _make_logic(profile_manager, work_dir):
+    logic = PackerLogic(client_id="TEST", profile_manager=profile_manager, work_dir=str(work_dir))
+    logic.processed_df = pd.DataFrame({
+        'Order_Number': ['#1001', '#1002', '#1003', '#1003'],
+        'SKU': ['RED-1', 'BLUE-2', 'RED-1', 'GREEN-3'],
+        'Product_Name': ['Red', 'Blue', 'Red', 'Green'],
+        'Quantity': ['1', '1', '1', '2'],
+        'Courier': ['DHL'] * 4,
+    })
+    logic.orders_data = {
+        order: {'items': group.to_dict('records'), 'metadata': {}}
+        for order, group in logic.processed_df.groupby('Order_Number', sort=False)
+    }
+    return logic
+
+
+@pytest.fixture
+def logic(profile_manager, tmp_path):
+    logic = _make_logic(profile_manager, tmp_path)
+    yield logic
+    logic.close()
+
+
+def _open_all(logic):
+    logic.start_wave(max_orders=3)
+    for order in ('1001', '1002', '1003'):
+        _, status = logic.open_wave_order(order)
+        assert status == "ORDER_LOADED"
+
+
+def test_scans_complete_orders_without_order_barcodes(logic):
+    _open_all(logic)
+
+    statuses = [logic.process_wave_scan(sku)[1] for sku in ('blue-2', 'RED-1', 'RED-1', 'GREEN-3')]
+    assert statuses == ["ORDER_COMPLETE", "ORDER_COMPLETE", "SKU_OK", "SKU_OK"]
+    assert logic.session_packing_state['completed_orders'] == ['#1002', '#1001']
+
+    result, status = logic.process_wave_scan('GREEN-3')
+    assert status == "ORDER_COMPLETE"
+    assert result['order_number'] == '#1003' and result['slot'] == 3
+    assert len(logic.wave) == 0
+
+
+def test_completed_records_match_single_order_mode(logic, profile_manager, tmp_path):
+    _open_all(logic)
+    for sku in ('RED-1', 'BLUE-2', 'RED-1', 'GREEN-3', 'GREEN-3'):
+        logic.process_wave_scan(sku)
+
+    single = _make_logic(profile_manager, tmp_path / "single")
+    try:
+        single.start_order_packing('1003')
+        for sku in ('RED-1', 'GREEN-3', 'GREEN-3'):
+            single.process_sku_scan(sku)
+        expected = single.completed_orders_metadata[0]
+    finally:
+        single.close()
+
+    wave_record = next(r for r in logic.completed_orders_metadata if r['order_number'] == '#1003')
+    assert wave_record.keys() == expected.keys()
+    assert [(i['sku'], i['row']) for i in wave_record['items']] == [(i['sku'], i['row']) for i in expected['items']]
+    assert wave_record['items_count'] == 3
+
+    summary = logic.generate_session_summary()
+    assert summary['completed_orders'] == 3
+
+
+def test_extra_and_unknown_scans_are_charged_to_an_order(logic):
+    _open_all(logic)
+    logic.process_wave_scan('BLUE-2')  # #1002 complete
+
+    _, status = logic.process_wave_scan('BLUE-2')
+    assert status == "SKU_NOT_FOUND"  # no open order carries it, none focused
+
+    logic.process_wave_scan('GREEN-3')  # focuses #1003
+    _, status = logic.process_wave_scan('NOPE')
+    assert status == "SKU_NOT_FOUND"
+    assert logic.current_order_number == '#1003'
+    assert logic.current_order_unknown_scan_count == 1
+
+    logic.process_wave_scan('GREEN-3')
+    logic.process_wave_scan('RED-1')  # -> #1001 (slot 1) completes
+    _, status = logic.process_wave_scan('GREEN-3')
+    assert status == "SKU_EXTRA"
+    assert logic.current_order_number == '#1003'
+    assert logic.current_extra_items == {'green3': 1}
+
+
+def test_cancel_applies_to_focused_order_and_reopens_routing(logic):
+    _open_all(logic)
+    logic.process_wave_scan('GREEN-3')
+    assert logic.focus_wave_order('#1003')
+
+    _, status = logic.cancel_item_scan(1)
+    assert status == "ITEM_DECREMENTED"
+    assert logic.wave.route('green3') == ('#1003', True)
+    assert logic.current_order_corrections == 1
+
+
+def test_open_wave_order_statuses(logic):
+    assert logic.open_wave_order('1001') == (None, "NO_ACTIVE_WAVE")
+    logic.start_wave(max_orders=1)
+    assert logic.open_wave_order('1001')[1] == "ORDER_LOADED"
+    assert logic.open_wave_order('1001') == (None, "ORDER_ALREADY_IN_WAVE")
+    assert logic.open_wave_order('1002') == (None, "WAVE_FULL")
+
+
+@pytest.mark.parametrize("clean_close", [True, False])
+def test_wave_survives_restart(logic, profile_manager, tmp_path, clean_close):
+    _open_all(logic)
+    logic.process_wave_scan('GREEN-3')
+    logic.process_wave_scan('RED-1')  # #1001 completes
+    started = logic.wave.get('#1003').start_time
+
+    if clean_close:
+        logic.close()
+    else:
+        # Crash: journal records flushed, no final snapshot
+        logic._state_writer.flush()
+        logic._state_writer.shutdown()
+
+    resumed = _make_logic(profile_manager, tmp_path)
+    try:
+        assert [(s['slot'], s['order_number'], s['packed']) for s in resumed.get_wave_slots()] == [
+            (2, '#1002', 0), (3, '#1003', 1),
+        ]
+        assert resumed.wave.get('#1003').start_time == started
+
+        for sku in ('RED-1', 'GREEN-3', 'BLUE-2'):
+            resumed.process_wave_scan(sku)
+        record = next(r for r in resumed.completed_orders_metadata if r['order_number'] == '#1003')
+        assert record['started_at'] == started
+        assert record['items_count'] == 3
+    finally:
+        resumed.close()
+
+
+def test_state_file_keeps_existing_format(logic, tmp_path):
+    _open_all(logic)
+    logic.process_wave_scan('GREEN-3')
+    logic.save_state()
+
+    with open(tmp_path / "packing_state.json", encoding='utf-8') as f:
+        state = json.load(f)
+
+    orders = {k for k in state['in_progress'] if not k.startswith('_')}
+    assert orders == {'#1001', '#1002', '#1003'}
+    assert state['in_progress']['_timing']['current_order_start_time']
+    assert [o['slot'] for o in state['in_progress']['_wave']['orders']] == [1, 2, 3]
+
+
+def test_end_wave_keeps_orders_resumable(logic):
+    _open_all(logic)
+    logic.process_wave_scan('GREEN-3')
+    logic.end_wave()
+
+    assert logic.wave is None
+    assert logic.current_order_number == '#1003'
+    assert logic.process_sku_scan('GREEN-3')[1] == "SKU_OK"
+    assert set(logic.session_packing_state['in_progress']) == {'#1001', '#1002', '#1003'}